@@ -0,0 +1,231 @@
+"""
+대시보드 분석 결과 사전 계산 (백그라운드 스케줄러)
+========================================
+- 시작 시: 모든 종목의 analyze_ticker / 팩터 분석 / 포트폴리오 분석을 미리 계산
+- 이후: 주기적으로 DB 변경을 확인하여 바뀐 종목만 다시 계산
+  (시장 종목(SPY)이 바뀌면 모든 종목의 팩터 분석을 다시 계산)
+- 결과는 ResultsStore에 스냅샷 단위로 게시 → API 핸들러는 계산 없이 읽기만 함
+
+ResultsStore.publish는 기존 스냅샷을 복사·병합한 새 스냅샷을 만든 뒤 참조만 교체하므로,
+읽는 쪽은 항상 일관된(부분 갱신 중이 아닌) 스냅샷을 잠금 없이 얻습니다.
+게시 한 번이 기존 결과 수에 비례하므로 종목 분석 결과는 모아서 게시합니다
+(publish_batch개가 모이거나 publish_interval초가 지나면 → 종목 수 N에 대해 O(N²)이 아닌 O(N²/batch)).
+
+실패 처리:
+- 계산에 실패한 종목은 errors에 사유와 시도 횟수를 기록 → API는 무한히 503(계산 중)이 아니라 오류를 반환
+  실패한 종목은 주기마다 max_attempts회까지 다시 시도하고, 종목 데이터가 바뀌면 다시 계산
+- 시작 시 사전 계산이 실패하면(DB 잠금 등) 간격을 늘려가며 다시 시도 (스레드가 조용히 종료되지 않음)
+"""
+
+import time
+import threading
+import traceback
+from datetime import datetime
+
+SECTIONS = ('tickers', 'factors')
+MAX_RETRY_DELAY = 300.0  # 시작 시 사전 계산 재시도 간격 상한 (초)
+
+
+class ResultsStore:
+    """
+    사전 계산된 분석 결과 (불변 스냅샷의 참조 교체로 게시)
+
+    snapshot() 구조:
+        {'tickers': {ticker: analyze_ticker 결과}, 'factors': {ticker: 팩터 분석 응답},
+         'portfolio': 포트폴리오 분석 응답 또는 None,
+         'as_of': {('tickers'|'factors'|'portfolio', ticker): ISO 시각},
+         'errors': {('tickers'|'factors'|'portfolio', ticker): {'error', 'attempts', 'failed_at'}},
+         'data_version': 계산에 사용한 시장 데이터 버전, 'warm': 최초 계산 완료 여부,
+         'revision': 게시할 때마다 증가 (HTTP ETag용), 'updated_at': 마지막 게시 시각 (time.time())}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = {'tickers': {}, 'factors': {}, 'portfolio': None, 'as_of': {}, 'errors': {},
+                          'data_version': None, 'warm': False, 'revision': 0, 'updated_at': time.time()}
+
+    def snapshot(self):
+        """현재 스냅샷 (읽기 전용으로 취급)"""
+        return self._snapshot
+
+    def publish(self, section=None, results=None, removed=(), portfolio=None, failed=None, **fields):
+        """
+        결과를 병합한 새 스냅샷으로 교체
+        :param section: 'tickers', 'factors' ('portfolio'는 failed 기록에만 사용)
+        :param results: {ticker: 결과} → 그 종목의 실패 기록은 지움
+        :param removed: 스냅샷에서 제거할 종목 (DB에서 삭제된 종목)
+        :param portfolio: 포트폴리오 분석 응답 (None이면 유지)
+        :param failed: {ticker: 실패 사유} → section의 실패 기록 (시도 횟수 누적, 이전 결과는 유지)
+        :param fields: data_version, warm 등 최상위 필드
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            current = self._snapshot
+            snapshot = dict(current, **fields)
+            as_of = dict(current['as_of'])
+            errors = dict(current['errors'])
+            for name in SECTIONS:
+                if name == section or removed:
+                    entries = dict(current[name])
+                    for ticker in removed:
+                        entries.pop(ticker, None)
+                        as_of.pop((name, ticker), None)
+                        errors.pop((name, ticker), None)
+                    if name == section:
+                        entries.update(results or {})
+                        as_of.update({(name, ticker): now for ticker in results or {}})
+                        for ticker in results or {}:
+                            errors.pop((name, ticker), None)
+                    snapshot[name] = entries
+            if portfolio is not None:
+                snapshot['portfolio'] = portfolio
+                as_of[('portfolio', None)] = now
+                errors.pop(('portfolio', None), None)
+            for ticker, message in (failed or {}).items():
+                previous = errors.get((section, ticker))
+                errors[(section, ticker)] = {'error': str(message), 'failed_at': now,
+                                             'attempts': previous['attempts'] + 1 if previous else 1}
+            snapshot['as_of'] = as_of
+            snapshot['errors'] = errors
+            snapshot['revision'] = current['revision'] + 1
+            snapshot['updated_at'] = time.time()
+            self._snapshot = snapshot
+
+    def as_of(self, section, ticker=None):
+        """결과가 계산된 시각 (없으면 None)"""
+        return self._snapshot['as_of'].get((section, ticker))
+
+    def error(self, section, ticker=None):
+        """마지막 계산 실패 기록 {'error', 'attempts', 'failed_at'} (실패하지 않았으면 None)"""
+        return self._snapshot['errors'].get((section, ticker))
+
+    def retryable(self, max_attempts):
+        """시도 횟수가 max_attempts 미만인 실패 종목 (tickers/factors 섹션)"""
+        return {ticker for (section, ticker), entry in self._snapshot['errors'].items()
+                if section in SECTIONS and entry['attempts'] < max_attempts}
+
+
+class AnalyticsScheduler:
+    """
+    백그라운드 스레드에서 결과를 계산하여 ResultsStore에 게시
+
+    Args:
+        market_store: MarketDataStore (종목 목록, 변경 감지)
+        results: ResultsStore
+        analyze: tickers → (ticker, 결과) 반복자 (결과가 None이면 실패)
+        factor: ticker → 팩터 분석 응답 (실패 시 예외)
+        portfolio: () → 포트폴리오 분석 응답 (실패 시 예외)
+        interval: DB 변경 확인 주기 (초)
+        market_ticker: 팩터 분석의 시장 종목
+        publish_batch: 종목 분석 결과를 한 번에 게시할 최대 개수
+        publish_interval: 모인 결과가 batch보다 적어도 게시하는 간격 (초) → 먼저 끝난 종목의 응답 지연 상한
+        max_attempts: 실패한 종목을 (데이터 변경 없이) 다시 시도하는 최대 횟수
+    """
+
+    def __init__(self, market_store, results, analyze, factor, portfolio, interval=30.0, market_ticker='SPY',
+                 publish_batch=64, publish_interval=1.0, max_attempts=3):
+        self.market_store = market_store
+        self.results = results
+        self.analyze = analyze
+        self.factor = factor
+        self.portfolio = portfolio
+        self.interval = interval
+        self.market_ticker = market_ticker
+        self.publish_batch = publish_batch
+        self.publish_interval = publish_interval
+        self.max_attempts = max_attempts
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='analytics-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        version = self._startup()
+        if version is None:
+            return
+
+        while not self._stop.wait(self.interval):
+            try:
+                version, changed = self.market_store.changes_since(version)
+                retry = self.results.retryable(self.max_attempts) - set(changed)
+                if changed:
+                    self._recompute(changed, reason='DB 변경 반영')
+                if retry:
+                    self._recompute(retry, reason='실패 종목 재시도')
+                if changed or retry:
+                    self.results.publish(data_version=version)
+            except Exception as e:
+                print(f"스케줄러 오류: {e}")
+                traceback.print_exc()
+
+    def _startup(self):
+        """시작 시 전 종목 사전 계산 (실패하면 간격을 두 배씩 늘려 재시도) → 데이터 버전, 중지되면 None"""
+        delay = self.interval
+        while not self._stop.is_set():
+            try:
+                version, _ = self.market_store.changes_since(0)
+                self._recompute(self.market_store.tickers(), reason='시작 시 사전 계산')
+                self.results.publish(data_version=version, warm=True)
+                return version
+            except Exception as e:
+                print(f"스케줄러 시작 오류: {e} ({delay:g}초 후 재시도)")
+                traceback.print_exc()
+                if self._stop.wait(delay):
+                    return None
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+        return None
+
+    def _recompute(self, tickers, reason):
+        """바뀐 종목의 분석/팩터 결과와 포트폴리오 분석을 다시 계산하여 게시"""
+        current = set(self.market_store.tickers())
+        removed = [ticker for ticker in tickers if ticker not in current]
+        tickers = sorted(ticker for ticker in tickers if ticker in current)
+        print(f"\n[스케줄러] {reason}: {len(tickers)}개 종목 계산, {len(removed)}개 종목 제거")
+        if removed:
+            self.results.publish(removed=removed)
+
+        # 1) 종목 분석: 완료된 결과를 모아 batch/interval 단위로 게시 → 준비된 종목부터 응답 가능
+        pending, failed, published_at = {}, {}, time.monotonic()
+        for ticker, data in self.analyze(tickers):
+            if self._stop.is_set():
+                return
+            if data:
+                pending[ticker] = data
+            else:
+                failed[ticker] = f'Analysis failed for {ticker}'
+            if (pending or failed) and (len(pending) >= self.publish_batch
+                                        or time.monotonic() - published_at >= self.publish_interval):
+                self.results.publish('tickers', pending, failed=failed)
+                pending, failed, published_at = {}, {}, time.monotonic()
+        if pending or failed:
+            self.results.publish('tickers', pending, failed=failed)
+
+        # 2) 팩터 분석: 시장 종목이 바뀌면 전 종목 재계산
+        factor_targets = sorted(current) if self.market_ticker in tickers else tickers
+        factors, failed = {}, {}
+        for ticker in factor_targets:
+            if self._stop.is_set():
+                return
+            try:
+                factors[ticker] = self.factor(ticker)
+            except Exception as e:
+                print(f"  ✗ {ticker} 팩터 분석 실패: {e}")
+                failed[ticker] = str(e)
+        self.results.publish('factors', factors, failed=failed)
+
+        # 3) 포트폴리오 분석
+        try:
+            self.results.publish(portfolio=self.portfolio())
+        except Exception as e:
+            print(f"  ✗ 포트폴리오 분석 실패: {e}")
+            self.results.publish('portfolio', failed={None: str(e)})
+        print(f"[스케줄러] {reason} 완료")
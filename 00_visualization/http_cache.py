@@ -0,0 +1,196 @@
+"""
+HTTP 수준 캐싱: ETag / Last-Modified 조건부 GET + 압축 응답 캐시
+========================================
+- ETag = hash(서버 기동 ID, 데이터 버전, 경로, 정렬된 쿼리 파라미터, 인코딩)
+  → 데이터가 바뀌지 않았으면 같은 ETag, If-None-Match 일치 시 본문 없이 304
+- 200 JSON 응답 본문은 요청별 LRU(항목 수·바이트 상한)에 보관 → 같은 요청은 분석/직렬화 없이 캐시된 바이트 반환
+- Accept-Encoding에 따라 brotli(설치된 경우) 또는 gzip으로 압축, 압축본도 함께 캐시
+
+사용:
+    @app.route('/api/data')
+    @cached_endpoint(lambda: (store.data_token()[0], None))   # 토큰은 DB 커밋마다 바뀌어야 함
+    def get_data(): ...
+"""
+
+import os
+import sys
+import gzip
+import uuid
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+from datetime import datetime, timezone
+from flask import request, make_response, g
+
+# 계측 모듈 (01_Data_Engineering/instrumentation.py)
+DATA_ENG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '01_Data_Engineering')
+if DATA_ENG_PATH not in sys.path:
+    sys.path.insert(0, DATA_ENG_PATH)
+from instrumentation import count_cache
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성: 없으면 gzip만 사용
+    brotli = None
+
+# 서버 재시작 후 버전 카운터가 초기화되어도 이전 ETag와 겹치지 않도록
+BOOT_ID = uuid.uuid4().hex[:8]
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE = ('application/json', 'application/x-ndjson', 'text/')
+
+
+def negotiate_encoding(accept_encoding):
+    """Accept-Encoding → 'br', 'gzip' 또는 None (q=0은 거부로 처리)"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding, level=6):
+    if encoding == 'br':
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class ResponseCache:
+    """요청 digest → (본문, mimetype, 인코딩별 압축본) LRU"""
+
+    def __init__(self, max_entries=128, max_bytes=256 * 2**20, compress_level=6):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, mimetype):
+        entry = {'body': body, 'mimetype': mimetype, 'encoded': {}, 'size': len(body)}
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous['size']
+            self._entries[key] = entry
+            self.size += entry['size']
+            self._evict()
+        return entry
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self.size -= entry['size']
+
+    def encoded(self, entry, encoding):
+        """압축본 (처음 요청될 때 한 번만 압축)"""
+        if encoding is None or len(entry['body']) < MIN_COMPRESS_SIZE \
+                or not entry['mimetype'].startswith(COMPRESSIBLE):
+            return entry['body'], None
+        data = entry['encoded'].get(encoding)
+        if data is None:
+            data = compress(entry['body'], encoding, self.compress_level)
+            with self._lock:
+                if encoding not in entry['encoded']:
+                    entry['encoded'][encoding] = data
+                    entry['size'] += len(data)
+                    if any(cached is entry for cached in self._entries.values()):
+                        self.size += len(data)
+                    self._evict()
+        return data, encoding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+response_cache = ResponseCache()
+
+
+def _cache_control(max_age):
+    # max_age=0: 매번 재검증 (변경 없으면 304로 본문 전송 없음)
+    return 'no-cache' if max_age == 0 else f'private, max-age={max_age}'
+
+
+def cached_endpoint(version, max_age=0, cache=response_cache):
+    """
+    조건부 GET + 응답 캐시 데코레이터
+    :param version: () → (버전 문자열, 마지막 변경 시각 datetime 또는 None)
+    :param max_age: Cache-Control max-age (초)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if g.get('bypass_response_cache'):
+                # 프로파일링 요청 등: 캐시 없이 핸들러를 실제로 실행
+                return view(*args, **kwargs)
+            token, last_modified = version()
+            encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+            query = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+            digest = hashlib.sha1(f'{BOOT_ID}|{token}|{request.path}?{query}'.encode()).hexdigest()[:20]
+            etag = f'{digest}-{encoding}' if encoding else digest
+            if last_modified is not None:
+                last_modified = last_modified.astimezone(timezone.utc).replace(microsecond=0)
+
+            def finish(response, etag=etag):
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = _cache_control(max_age)
+                response.vary.add('Accept-Encoding')
+                if last_modified is not None:
+                    response.last_modified = last_modified
+                return response
+
+            not_modified = request.if_none_match.contains_weak(etag) if request.if_none_match else (
+                last_modified is not None and request.if_modified_since is not None
+                and last_modified <= request.if_modified_since)
+            if not_modified:
+                count_cache('http', 'not_modified')
+                return finish(make_response('', 304))
+
+            # 본문 캐시는 인코딩과 무관한 digest로 → 인코딩별로 다시 계산하지 않음
+            entry = cache.get(digest)
+            count_cache('http', 'miss' if entry is None else 'hit')
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                # 오류 응답과 스트리밍 응답은 캐시하지 않음 (스트리밍도 ETag로 304는 가능)
+                if response.status_code != 200 or response.is_streamed:
+                    return finish(response, digest) if response.status_code == 200 else response
+                entry = cache.put(digest, response.get_data(), response.mimetype)
+
+            body, applied = cache.encoded(entry, encoding)
+            response = make_response(body, 200)
+            response.mimetype = entry['mimetype']
+            if applied:
+                response.headers['Content-Encoding'] = applied
+            return finish(response)
+        return wrapper
+    return decorator
+
+
+def utc_from_timestamp(ts):
+    """time.time() → timezone-aware datetime (Last-Modified용)"""
+    return None if ts is None else datetime.fromtimestamp(ts, tz=timezone.utc)
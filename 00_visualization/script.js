@@ -26,10 +26,11 @@ document.querySelectorAll('.nav-tab').forEach(tab => {
 });
 
 // ===== 데이터 로드 =====
+// /api/data?format=ndjson: 종목 분석이 끝나는 대로 한 줄씩 도착 → 도착 즉시 해당 종목 렌더링
 async function loadData() {
     try {
-        console.log("API 호출 시작: /api/data");
-        const response = await fetch('/api/data');
+        console.log("API 호출 시작: /api/data (ndjson)");
+        const response = await fetch('/api/data?format=ndjson');
         console.log("API 응답 상태:", response.status);
         
         if (!response.ok) {
@@ -37,12 +38,19 @@ async function loadData() {
             console.error("API 오류:", response.status, error);
             throw new Error(`API 호출 실패: ${response.status}`);
         }
-        
-        chartData = await response.json();
-        console.log("데이터 로드 완료:", chartData);
-        buildTimeSeriesUI();
-        renderAllCharts();
+
+        // 빈 종목 목록은 일반 JSON으로 응답
+        if (!(response.headers.get('Content-Type') || '').includes('ndjson')) {
+            chartData = await response.json();
+            buildTimeSeriesUI(Object.keys(chartData.tickers || {}));
+            return true;
+        }
+
+        chartData = { tickers: {}, timestamp: null };
+        await readNDJSON(response, handleStreamMessage);
+        console.log("데이터 로드 완료:", Object.keys(chartData.tickers).length, "개 종목");
         await loadFactorAnalysis();
+        connectStream();
         return true;
     } catch (error) {
         console.error('Error:', error);
@@ -51,71 +59,122 @@ async function loadData() {
     }
 }
 
-// ===== 동적 UI 구성 (시계열 분석) =====
-function buildTimeSeriesUI() {
-    if (!chartData || !chartData.tickers) return;
+async function loadPendingTickers(tickers) {
+    try {
+        const response = await fetch(`/api/data?format=ndjson&tickers=${encodeURIComponent(tickers.join(','))}`);
+        // 섹션은 이미 만들어져 있으므로 meta는 무시하고 결과만 채움
+        if (response.ok) await readNDJSON(response, message => message.type !== 'meta' && handleStreamMessage(message));
+    } catch (error) {
+        console.error('대기 종목 로드 오류:', error);
+    }
+}
 
+// 응답 본문을 줄 단위로 읽어 JSON 메시지마다 콜백 호출
+async function readNDJSON(response, onMessage) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onMessage(JSON.parse(line)));
+    }
+    if (buffer.trim()) onMessage(JSON.parse(buffer));
+}
+
+function handleStreamMessage(message) {
+    if (message.type === 'meta') {
+        // 종목 순서대로 빈 섹션을 먼저 만들고 결과가 도착하면 채움
+        chartData.timestamp = message.timestamp;
+        buildTimeSeriesUI(message.tickers);
+        document.getElementById('updateTime').textContent = new Date(message.timestamp).toLocaleString('ko-KR');
+    } else if (message.type === 'ticker') {
+        chartData.tickers[message.ticker] = message.data;
+        renderTickerCharts(message.ticker);
+    } else if (message.type === 'error') {
+        console.warn(message.error);
+        const section = document.getElementById(`section-${message.ticker}`);
+        if (section) section.remove();
+    } else if (message.type === 'pending') {
+        // 서버가 아직 사전 계산 중인 종목 → 잠시 후 해당 종목만 다시 요청
+        setTimeout(() => loadPendingTickers(message.tickers), message.retry_after * 1000);
+    } else if (message.type === 'done') {
+        console.log(`스트리밍 완료: ${message.count}개 종목 (${message.elapsed}초)`);
+    }
+}
+
+// ===== 동적 UI 구성 (시계열 분석) =====
+function buildTimeSeriesUI(tickers) {
     const container = document.getElementById('timeseries-container');
     container.innerHTML = '';
 
-    const tickers = Object.keys(chartData.tickers);
+    tickers.forEach(ticker => container.appendChild(createTickerSection(ticker)));
+}
 
-    tickers.forEach(ticker => {
-        const section = document.createElement('div');
-        section.className = 'ticker-section';
-        section.id = `section-${ticker}`;
+// 종목 하나의 섹션 (통계 표 + 차트 자리)
+function createTickerSection(ticker) {
+    const section = document.createElement('div');
+    section.className = 'ticker-section';
+    section.id = `section-${ticker}`;
 
-        section.innerHTML = `
-            <div class="ticker-header">
-                <h2>${ticker}</h2>
-            </div>
-            <div class="ticker-content">
-                <div class="stats-insights">
-                    <table class="stats-table">
-                        <tr>
-                            <td class="stat-label">평균</td>
-                            <td class="stat-value stat-mean" data-ticker="${ticker}">-</td>
-                            <td class="stat-label">변동성</td>
-                            <td class="stat-value stat-std" data-ticker="${ticker}">-</td>
-                            <td class="stat-label">최소</td>
-                            <td class="stat-value stat-min" data-ticker="${ticker}">-</td>
-                            <td class="stat-label">최대</td>
-                            <td class="stat-value stat-max" data-ticker="${ticker}">-</td>
-                        </tr>
-                        <tr>
-                            <td class="stat-label">왜도</td>
-                            <td class="stat-value stat-skew" data-ticker="${ticker}">-</td>
-                            <td class="stat-label">첨도</td>
-                            <td class="stat-value stat-kurt" data-ticker="${ticker}">-</td>
-                            <td colspan="4" class="jb-result" data-ticker="${ticker}">-</td>
-                        </tr>
-                    </table>
-                    <div class="insights-compact">
-                        <div class="insight-row">
-                            <span class="insight-label">왜도:</span>
-                            <span class="skewness-interpretation" data-ticker="${ticker}">-</span>
-                        </div>
-                        <div class="insight-row">
-                            <span class="insight-label">첨도:</span>
-                            <span class="kurtosis-interpretation" data-ticker="${ticker}">-</span>
-                        </div>
-                        <div class="insight-row">
-                            <span class="insight-label">VaR(95%):</span>
-                            <span class="risk-insight" data-ticker="${ticker}">-</span>
-                        </div>
+    section.innerHTML = `
+        <div class="ticker-header">
+            <h2>${ticker}</h2>
+        </div>
+        <div class="ticker-content">
+            <div class="stats-insights">
+                <table class="stats-table">
+                    <tr>
+                        <td class="stat-label">평균</td>
+                        <td class="stat-value stat-mean" data-ticker="${ticker}">-</td>
+                        <td class="stat-label">변동성</td>
+                        <td class="stat-value stat-std" data-ticker="${ticker}">-</td>
+                        <td class="stat-label">최소</td>
+                        <td class="stat-value stat-min" data-ticker="${ticker}">-</td>
+                        <td class="stat-label">최대</td>
+                        <td class="stat-value stat-max" data-ticker="${ticker}">-</td>
+                    </tr>
+                    <tr>
+                        <td class="stat-label">왜도</td>
+                        <td class="stat-value stat-skew" data-ticker="${ticker}">-</td>
+                        <td class="stat-label">첨도</td>
+                        <td class="stat-value stat-kurt" data-ticker="${ticker}">-</td>
+                        <td colspan="4" class="jb-result" data-ticker="${ticker}">-</td>
+                    </tr>
+                </table>
+                <div class="insights-compact">
+                    <div class="insight-row">
+                        <span class="insight-label">왜도:</span>
+                        <span class="skewness-interpretation" data-ticker="${ticker}">-</span>
+                    </div>
+                    <div class="insight-row">
+                        <span class="insight-label">첨도:</span>
+                        <span class="kurtosis-interpretation" data-ticker="${ticker}">-</span>
+                    </div>
+                    <div class="insight-row">
+                        <span class="insight-label">VaR(95%):</span>
+                        <span class="risk-insight" data-ticker="${ticker}">-</span>
+                    </div>
+                    <div class="insight-row">
+                        <span class="insight-label">GARCH:</span>
+                        <span class="volatility-insight" data-ticker="${ticker}">-</span>
                     </div>
-                </div>
-                <div class="charts-compact">
-                    <div class="chart-item"><div id="priceChart-${ticker}" class="chart"></div></div>
-                    <div class="chart-item"><div id="histogramChart-${ticker}" class="chart"></div></div>
-                    <div class="chart-item"><div id="qqChart-${ticker}" class="chart"></div></div>
-                    <div class="chart-item"><div id="acfChart-${ticker}" class="chart"></div></div>
                 </div>
             </div>
-        `;
+            <div class="charts-compact">
+                <div class="chart-item"><div id="priceChart-${ticker}" class="chart"></div></div>
+                <div class="chart-item"><div id="histogramChart-${ticker}" class="chart"></div></div>
+                <div class="chart-item"><div id="qqChart-${ticker}" class="chart"></div></div>
+                <div class="chart-item"><div id="acfChart-${ticker}" class="chart"></div></div>
+                <div class="chart-item chart-wide"><div id="volChart-${ticker}" class="chart"></div></div>
+            </div>
+        </div>
+    `;
 
-        container.appendChild(section);
-    });
+    return section;
 }
 
 // ===== 통계 업데이트 =====
@@ -153,6 +212,16 @@ function updateStats(ticker) {
         const riskText = `VaR95%: ${varText} | Sharpe: ${sharpeText}`;
         document.querySelector(`.risk-insight[data-ticker="${ticker}"]`).textContent = riskText;
     }
+
+    // 조건부 변동성 (GARCH)
+    const vol = chartData.tickers[ticker].volatility;
+    if (vol) {
+        const current = (vol.current_volatility * 100).toFixed(2) + '%';
+        const annual = (vol.current_volatility_annual * 100).toFixed(1) + '%';
+        const forecast = (vol.forecast_annual[vol.forecast_annual.length - 1] * 100).toFixed(1) + '%';
+        const volText = `σ_t ${current} (연 ${annual}) | 지속성: ${vol.persistence.toFixed(3)} | ${vol.forecast.length}일 후 예측: 연 ${forecast}`;
+        document.querySelector(`.volatility-insight[data-ticker="${ticker}"]`).textContent = volText;
+    }
 }
 
 // ===== 차트 렌더링 =====
@@ -302,21 +371,44 @@ function renderACFPlot(ticker) {
     Plotly.newPlot(`acfChart-${ticker}`, [trace, upperBound, lowerBound], layout, { responsive: true, displayModeBar: false });
 }
 
-// ===== 모든 차트 렌더링 =====
-function renderAllCharts() {
-    if (!chartData || !chartData.tickers) return;
+function renderVolatilityChart(ticker) {
+    if (!chartData || !chartData.tickers[ticker]) return;
 
-    const tickers = Object.keys(chartData.tickers);
-    tickers.forEach(ticker => {
-        renderPriceChart(ticker);
-        renderHistogram(ticker);
-        renderQQPlot(ticker);
-        renderACFPlot(ticker);
-        updateStats(ticker);
-    });
+    const vol = chartData.tickers[ticker].volatility;
+    if (!vol) return;
+    const color = TICKER_COLORS[ticker] || '#555555';
+
+    const trace = {
+        x: vol.dates,
+        y: vol.conditional_volatility,
+        type: 'scatter',
+        mode: 'lines',
+        name: `${vol.model.toUpperCase()} σ_t`,
+        line: { color, width: 0.8 }
+    };
+
+    const layout = {
+        margin: { l: 25, r: 5, t: 2, b: 15 },
+        hovermode: 'x unified',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        paper_bgcolor: 'white',
+        font: { family: 'Arial, sans-serif', size: 7 },
+        showlegend: false,
+        xaxis: { showgrid: false },
+        yaxis: { showgrid: true, gridwidth: 0.3, gridcolor: '#f0f0f0', tickformat: '.1%' }
+    };
+
+    Plotly.newPlot(`volChart-${ticker}`, [trace], layout, { responsive: true, displayModeBar: false });
+}
 
-    const updateTime = new Date(chartData.timestamp).toLocaleString('ko-KR');
-    document.getElementById('updateTime').textContent = updateTime;
+// ===== 종목별 차트 렌더링 =====
+function renderTickerCharts(ticker) {
+    renderPriceChart(ticker);
+    renderHistogram(ticker);
+    renderQQPlot(ticker);
+    renderACFPlot(ticker);
+    renderVolatilityChart(ticker);
+    updateStats(ticker);
 }
 
 // ===== 팩터 분석 로드 =====
@@ -467,6 +559,9 @@ function renderFactorAnalysisHTML(ticker, result) {
         <div class="factor-interpretation">
             <strong>📌 종합 평가:</strong> ${interpretation.overall_assessment || '-'}
         </div>
+        <div class="factor-interpretation">
+            <strong>📡 실시간 CAPM:</strong> <span class="capm-live" data-ticker="${ticker}">${formatCapm(liveCapm[ticker])}</span>
+        </div>
     `;
 }
 
@@ -522,6 +617,67 @@ function renderPortfolioAnalysisHTML(portfolio) {
     `;
 }
 
+// ===== 실시간 갱신 (Server-Sent Events) =====
+// /api/stream: DB에 새 bar가 쓰이면 바뀐 종목의 delta(새 가격, 증분 통계, CAPM 베타)만 수신
+let eventSource = null;
+const liveCapm = {};
+
+function connectStream() {
+    if (eventSource || !window.EventSource) return;
+    // 연결이 끊기면 브라우저가 Last-Event-ID와 함께 자동 재연결 → 놓친 delta를 서버가 재전송
+    eventSource = new EventSource('/api/stream');
+    eventSource.addEventListener('delta', event => applyDelta(JSON.parse(event.data)));
+    eventSource.addEventListener('removed', event => {
+        const { ticker } = JSON.parse(event.data);
+        delete chartData.tickers[ticker];
+        const section = document.getElementById(`section-${ticker}`);
+        if (section) section.remove();
+    });
+    // 서버의 이벤트 버퍼보다 뒤처짐 → 전체 다시 로드
+    eventSource.addEventListener('reset', () => loadData());
+    eventSource.onerror = () => console.warn('실시간 스트림 연결 끊김 → 재연결 대기');
+}
+
+function applyDelta(delta) {
+    const ticker = delta.ticker;
+    if (!chartData) return;
+    document.getElementById('updateTime').textContent = new Date().toLocaleString('ko-KR');
+    if (delta.capm) {
+        liveCapm[ticker] = delta.capm;
+        const capm = document.querySelector(`.capm-live[data-ticker="${ticker}"]`);
+        if (capm) capm.textContent = formatCapm(delta.capm);
+    }
+
+    if (delta.added && !document.getElementById(`section-${ticker}`)) {
+        document.getElementById('timeseries-container').appendChild(createTickerSection(ticker));
+    }
+    const current = chartData.tickers[ticker];
+    if (delta.reset || !current) {
+        // 과거 데이터가 바뀌었거나 새 종목 → 이 종목만 전체 분석을 다시 받음
+        loadPendingTickers([ticker]);
+        return;
+    }
+
+    // 새 bar만 가격 차트에 추가하고 통계는 서버가 증분 갱신한 값으로 교체
+    if (delta.prices.dates.length && current.price_history) {
+        const history = current.price_history;
+        history.dates.push(...delta.prices.dates);
+        history.prices.push(...delta.prices.prices);
+        // 차트 trace가 같은 배열을 참조하므로 extendTraces 대신 restyle로 다시 그리기만 함
+        Plotly.restyle(`priceChart-${ticker}`, { x: [history.dates], y: [history.prices] }, [0]);
+    }
+    if (delta.statistics && current.statistics) {
+        const risk = { ...(current.statistics.risk || {}), ...delta.statistics.risk };
+        current.statistics = { ...current.statistics, ...delta.statistics, risk };
+        updateStats(ticker);
+    }
+}
+
+function formatCapm(capm) {
+    if (!capm) return '-';
+    return `β ${capm.beta.toFixed(4)} | α ${capm.alpha.toFixed(6)} | R² ${capm.r_squared.toFixed(4)} (n=${capm.n_obs})`;
+}
+
 // ===== 이벤트 리스너 =====
 document.getElementById('refreshBtn').addEventListener('click', () => {
     loadData();
@@ -1,8 +1,35 @@
-import sys
 import os
+
+# 서빙 방식 (SERVER_MODE 환경변수): threaded(기본값, Flask 스레드 서버) 또는 gevent(gevent.pywsgi, 연결당 greenlet)
+# gevent 몽키패치는 threading/socket을 임포트하기 전에 적용해야 하므로 다른 임포트보다 먼저 처리
+# (gunicorn -k gevent 워커는 스스로 패치하므로 python server.py로 직접 실행할 때만 적용)
+SERVER_MODES = ('threaded', 'gevent')
+SERVER_MODE = os.environ.get('SERVER_MODE', 'threaded').lower()
+SERVER_MODE_NOTE = None
+if SERVER_MODE not in SERVER_MODES:
+    SERVER_MODE_NOTE = f"알 수 없는 SERVER_MODE={SERVER_MODE!r} → threaded로 실행 (선택: {', '.join(SERVER_MODES)})"
+    SERVER_MODE = 'threaded'
+elif SERVER_MODE == 'gevent' and __name__ == '__main__':
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+    except ImportError:
+        SERVER_MODE_NOTE = "gevent가 설치되어 있지 않아 threaded로 실행 (pip install gevent)"
+        SERVER_MODE = 'threaded'
+
+import sys
+import json
+import time
+import atexit
+import hashlib
+import itertools
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, send_from_directory, request, stream_with_context, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
 # 경로 설정
@@ -10,77 +37,355 @@ CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
 DATA_ENG_PATH = os.path.join(PROJECT_ROOT, '01_Data_Engineering')
 ANALYSIS_PATH = os.path.join(PROJECT_ROOT, '02_Financial_Analysis')
+PORTFOLIO_PATH = os.path.join(PROJECT_ROOT, '04_Portfolio_Mgmt')
 
 sys.path.insert(0, DATA_ENG_PATH)
 sys.path.insert(0, ANALYSIS_PATH)
+sys.path.insert(0, PORTFOLIO_PATH)
 
 from database_manager import DatabaseManager
-from analyzer_engine import TimeSeriesAnalyzer
+from market_data_store import MarketDataStore
+from pipeline import MaterializedResults, PORTFOLIO_KEY
+from shared_panel import SharedPanelReader
+from analytics_scheduler import AnalyticsScheduler, ResultsStore
+from http_cache import cached_endpoint, utc_from_timestamp
+from bar_resampler import infer_periods_per_year
+from stream_broker import StreamBroker, StreamUpdater
+from instrumentation import metrics, stage, count_cache, ENABLED as METRICS_ENABLED
+from profiler import create_profiler, profile_name, MODES as PROFILE_MODES
+from analyzer_engine import TimeSeriesAnalyzer, ANALYSIS_FIELDS
 from factor_model import FamaFrenchAnalyzer
+from volatility_model import GarchVolatilityModel, PARAM_NAMES, param_cache
+from covariance import CovarianceEstimator, ESTIMATORS
+from optimizer import PortfolioOptimizer
+from backtest_engine import BacktestEngine, STRATEGIES
+from covariance_engine import IncrementalCovariance, cluster_order, METHODS as COVARIANCE_METHODS
+import inspect
 import traceback
 
+class TimedJSONProvider(DefaultJSONProvider):
+    """jsonify 직렬화 시간을 serialize 단계로 기록"""
+    def dumps(self, obj, **kwargs):
+        with stage('serialize'):
+            return super().dumps(obj, **kwargs)
+
 app = Flask(__name__, static_folder='.', static_url_path='')
+app.json = TimedJSONProvider(app)
 CORS(app)  # CORS 활성화
 
+# 요청 프로파일링: PROFILING_ENABLED=1일 때만 X-Profile 헤더 또는 ?profile=1|cprofile 요청에 적용
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(CURRENT_DIR, 'profiles'))
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+    requested = request.headers.get('X-Profile') or request.args.get('profile')
+    if PROFILING_ENABLED and requested and requested != '0':
+        mode = requested if requested in PROFILE_MODES else 'sample'
+        g.bypass_response_cache = True
+        g.profiler = create_profiler(mode).start()
+
+@app.after_request
+def _finish_profile(response):
+    """프로파일 저장 → X-Profile 헤더로 결과 파일 URL 전달 (스트리밍 응답은 헤더 전송까지)"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+        name = profile_name(request.path)
+        paths = profiler.save(PROFILE_DIR, name)
+        response.headers['X-Profile'] = ', '.join(f'/api/profiles/{os.path.basename(p)}' for p in paths)
+        response.headers['Server-Timing'] = f'profile;dur={profiler.elapsed * 1e3:.1f}'
+        print(f"프로파일 저장: {paths[0]} ({profiler.elapsed:.3f}초)")
+    return response
+
+@app.after_request
+def _record_request(response):
+    """엔드포인트별 처리 시간 (스트리밍 응답은 헤더 전송까지)"""
+    started = g.pop('request_started', None)
+    if METRICS_ENABLED and started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                        endpoint=endpoint, method=request.method, status=str(response.status_code))
+    return response
+
 # DB 경로
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', '01_Data_Engineering', 'market_data.db')
 
+# 프로세스 공용 시장 데이터 캐시: 종목별 테이블을 한 번만 읽고 DB 변경 시에만 다시 읽음
+market_store = MarketDataStore(DB_PATH)
+
+# 파이프라인(01_Data_Engineering/pipeline.py)이 기록한 결과 테이블: 입력이 그대로인 종목은 계산 없이 조회
+# PIPELINE_RESULTS=0이면 사용하지 않음
+USE_MATERIALIZED = os.environ.get('PIPELINE_RESULTS', '1') != '0'
+materialized = MaterializedResults(DB_PATH, market_store)
+
+def _materialized(section, key, sources):
+    """파이프라인 결과 (없거나 DB가 그 뒤로 바뀌었으면 None)"""
+    return materialized.get(section, key, sources) if USE_MATERIALIZED else None
+
+# 공유 메모리 가격 패널 (01_Data_Engineering/shared_panel.py serve가 게시): 여러 워커가 한 벌의 종가 행렬을 공유
+# SHARED_PANEL=세그먼트 이름이면 사용, 게시된 세대가 없거나 로더가 확인한 뒤로 DB가 바뀌었으면 market_store로 대체
+SHARED_PANEL = os.environ.get('SHARED_PANEL')
+shared_panel = SharedPanelReader(SHARED_PANEL) if SHARED_PANEL else None
+
+def _shared_snapshot():
+    """현재 DB와 일치하는 공유 패널 스냅샷 (없으면 None)"""
+    if shared_panel is None:
+        return None
+    snapshot = shared_panel.current(DB_PATH)
+    if snapshot is None:
+        count_cache('shared_panel', 'miss')
+        return None
+    count_cache('shared_panel', 'hit')
+    return snapshot
+
+def _price_panel(tickers):
+    """종가 패널 (dates × tickers, 모든 종목에 값이 있는 날짜) — 공유 패널 우선"""
+    snapshot = _shared_snapshot()
+    if snapshot is not None:
+        return snapshot.panel(tickers)
+    return market_store.panel(tickers)
+
+def _close_frames(tickers):
+    """{ticker: 종가 DataFrame} (FamaFrenchAnalyzer 입력) — 공유 패널 우선"""
+    snapshot = _shared_snapshot()
+    if snapshot is not None:
+        return snapshot.frames(tickers)
+    return market_store.frames(tickers)
+
+# 설정(method, decay/window, 종목)별 증분 공분산 엔진: 새 bar만 rank-one 갱신
+# 엔진 하나가 N×N 행렬을 가지므로 (3000종목 ≈ 72MB) 최근에 쓴 설정 몇 개만 보관 (COVARIANCE_ENGINES 환경변수)
+COVARIANCE_ENGINES = int(os.environ.get('COVARIANCE_ENGINES', 2))
+_covariance_engines = OrderedDict()   # key → (엔진, 반영한 종목 테이블 스탬프, 반영한 수익률 이력 지문)
+_covariance_lock = threading.Lock()   # threaded=True 요청 스레드 간 엔진 생성/갱신/조회 직렬화
+
+# /api/data 종목 분석 워커 수 (ANALYSIS_WORKERS 환경변수, 기본값: CPU 수)
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', os.cpu_count() or 1))
+_executor = None
+
+# 대시보드 분석 사전 계산: DASHBOARD_PRECOMPUTE=0이면 끄고 요청 시 계산
+PRECOMPUTE = os.environ.get('DASHBOARD_PRECOMPUTE', '1') != '0'
+REFRESH_INTERVAL = float(os.environ.get('DASHBOARD_REFRESH_INTERVAL', 30))
+RETRY_AFTER = 5  # 계산 중인 결과 요청 시 재시도 권장 시간 (초)
+results_store = ResultsStore()
+scheduler = None
+_scheduler_lock = threading.Lock()
+
+# /api/stream: DB 변경 확인 주기 (STREAM_POLL_INTERVAL 환경변수, 초)
+STREAM_POLL_INTERVAL = float(os.environ.get('STREAM_POLL_INTERVAL', 2))
+stream_broker = StreamBroker()
+stream_updater = None
+
+def _market_version():
+    """ETag용 시장 데이터 버전: DB 커밋(어느 테이블이든)마다 바뀜 (파일 스탬프 + PRAGMA data_version)"""
+    token, changed_at = market_store.data_token()
+    return f"d{token}", utc_from_timestamp(changed_at)
+
+def _results_version():
+    """ETag용 분석 결과 버전: 사전 계산 모드면 결과 게시 revision, 아니면 시장 데이터 버전"""
+    if scheduler is None:
+        return _market_version()
+    snapshot = results_store.snapshot()
+    return f"r{snapshot['revision']}", utc_from_timestamp(snapshot['updated_at'])
+
+def _ticker_version(*related):
+    """
+    종목별 엔드포인트의 ETag 버전: URL의 종목(과 related 종목) 테이블 스탬프
+    → 그 종목 테이블이 바뀌면 새 ETag, 다른 종목/결과 테이블 커밋에는 그대로 304
+    사전 계산 모드면 결과 revision도 포함 (기본 요청은 게시된 스냅샷을, 기간 지정 요청은 DB를 읽으므로)
+    Last-Modified는 마지막 DB 커밋 감지 시각 (종목의 실제 변경 시각 이후 → 오래된 304를 만들지 않음)
+    """
+    def version():
+        stamps = [market_store.stamp(ticker) for ticker in (request.view_args['ticker'], *related)]
+        token = hashlib.sha1(json.dumps(stamps).encode()).hexdigest()[:16]
+        last_modified = market_store.data_changed_at
+        if scheduler is not None:
+            snapshot = results_store.snapshot()
+            token = f"r{snapshot['revision']}.{token}"
+            last_modified = max(last_modified or 0, snapshot['updated_at'])
+        return f"t{token}", utc_from_timestamp(last_modified)
+    return version
+
 def get_ticker_tables():
     """DB의 모든 ticker 테이블 조회"""
     try:
-        with DatabaseManager(DB_PATH) as db:
-            cursor = db.conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE '%_daily'")
-            tables = cursor.fetchall()
-            return [table[0].replace('_daily', '') for table in tables]
+        return market_store.tickers()
     except Exception as e:
         print(f"Error getting ticker tables: {e}")
         return []
 
-def get_ticker_data(ticker):
-    """DB에서 종목 데이터 조회 및 분석"""
+def get_ticker_data(ticker, start=None, end=None, previous=None, **options):
+    """
+    DB에서 종목 데이터 조회 및 분석
+    start/end: 기간을 SQL로 걸러 필요한 행(Date, Close)만 읽음
+    previous: 직전 결과의 GARCH 추정치 {'model', 'params'} (warm start)
+    options: analyze_ticker의 fields, bins, nlags, max_points
+    """
     try:
         with DatabaseManager(DB_PATH) as db:
             table_name = f'{ticker}_daily'
-            df = db.read_dataframe(table_name)
+            if start or end or options:
+                df = db.read_dataframe(table_name, columns=['Date', 'Close'], start=start, end=end)
+            else:
+                df = db.read_dataframe(table_name)
             
             if df is None or df.empty:
                 return None
             
-            # TimeSeriesAnalyzer를 사용하여 모든 분석 수행
-            return TimeSeriesAnalyzer.analyze_ticker(df)
+            # TimeSeriesAnalyzer를 사용하여 요청한 분석 수행
+            return TimeSeriesAnalyzer.analyze_ticker(df, ticker=ticker, previous=previous, **options)
     except Exception as e:
         print(f"Error getting data for {ticker}: {e}")
         import traceback
         traceback.print_exc()
         return None
 
+def _analysis_executor():
+    """종목 분석용 프로세스 풀 (첫 요청 시 생성 후 재사용 → 요청마다 워커 기동 비용 없음)"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS)
+        atexit.register(_executor.shutdown, wait=False)
+    return _executor
+
+def _select_tickers():
+    """?tickers= 부분집합 + offset/limit 페이지네이션 → (선택 종목, 전체 종목 수, 다음 offset)"""
+    requested = request.args.get('tickers')
+    tickers = sorted(requested.split(',') if requested else get_ticker_tables())
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    if offset < 0 or (limit is not None and limit < 1):
+        raise ValueError('offset must be >= 0 and limit must be >= 1')
+    page = tickers[offset:offset + limit] if limit else tickers[offset:]
+    next_offset = offset + len(page) if offset + len(page) < len(tickers) else None
+    return page, len(tickers), next_offset
+
+def _analyze_in_worker(ticker, previous=None):
+    """워커 프로세스용: 분석 결과와 함께 워커에서 누적된 계측값을 반환 (부모의 /metrics에 합산)"""
+    return get_ticker_data(ticker, previous=previous), metrics.drain()
+
+def _previous_volatility(ticker):
+    """게시된 직전 분석 결과의 GARCH 추정치 (워커가 어느 프로세스든 같은 추정치에서 warm start)"""
+    data = results_store.snapshot()['tickers'].get(ticker)
+    return (data or {}).get('volatility')
+
+def _iter_ticker_results(tickers):
+    """
+    파이프라인 결과가 최신인 종목은 바로 반환하고, 나머지는 워커 풀에 분배하여
+    완료되는 순서대로 (ticker, 결과) 반환
+    """
+    remaining = []
+    for ticker in tickers:
+        data = _materialized('tickers', ticker, [ticker])
+        if data is None:
+            remaining.append(ticker)
+        else:
+            yield ticker, data
+    if not remaining:
+        return
+    executor = _analysis_executor()
+    futures = {executor.submit(_analyze_in_worker, ticker, _previous_volatility(ticker)): ticker for ticker in remaining}
+    try:
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                data, worker_metrics = future.result()
+                metrics.merge(worker_metrics)
+                yield ticker, data
+            except Exception as e:
+                print(f"  ✗ {ticker} 실패: {e}")
+                yield ticker, None
+    finally:
+        # 클라이언트 연결이 끊기면 아직 시작되지 않은 작업 취소
+        for future in futures:
+            future.cancel()
+
 @app.route('/api/data')
+@cached_endpoint(_results_version)
 def get_data():
-    """모든 ticker 데이터 조회"""
+    """
+    모든 ticker 데이터 조회
+    - 사전 계산 모드: 스케줄러가 게시한 결과만 읽음 (아직 계산되지 않은 종목은 pending)
+    - 그 외: 종목별 분석을 워커 풀에서 병렬 수행
+    - format=ndjson: 종목별로 한 줄씩 스트리밍 (meta → ticker/error/pending 줄 … → done)
+    - 기본(json): 전체 결과를 하나의 JSON으로 반환
+    - tickers=AAPL,MSFT / offset / limit: 부분집합 및 페이지네이션
+    """
     try:
         print("\n=== API 호출: /api/data ===")
-        tickers = get_ticker_tables()
-        print(f"발견된 종목: {tickers}")
-        
+        try:
+            tickers, total, next_offset = _select_tickers()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        print(f"발견된 종목: {total}개 (요청: {len(tickers)}개)")
+
         if not tickers:
             print("✗ 종목을 찾을 수 없습니다.")
             return jsonify({'error': 'No tickers found', 'tickers': {}, 'timestamp': datetime.now().isoformat()}), 200
-        
+
+        timestamp = datetime.now().isoformat()
+        errors = {}
+        if scheduler is not None:
+            snapshot = results_store.snapshot()
+            ready = [ticker for ticker in tickers if ticker in snapshot['tickers']]
+            # 계산에 실패한 종목은 pending이 아니라 실패로 응답 (사유는 스케줄러 기록)
+            errors = {ticker: snapshot['errors'][('tickers', ticker)]['error'] for ticker in tickers
+                      if ticker not in snapshot['tickers'] and ('tickers', ticker) in snapshot['errors']}
+            pending = [ticker for ticker in tickers if ticker not in snapshot['tickers'] and ticker not in errors]
+            results = itertools.chain(((ticker, snapshot['tickers'][ticker]) for ticker in ready),
+                                      ((ticker, None) for ticker in errors))
+            as_of = {ticker: snapshot['as_of'][('tickers', ticker)] for ticker in ready}
+        else:
+            pending = []
+            results = _iter_ticker_results(tickers)
+            as_of = None
+
+        if request.args.get('format', 'json') == 'ndjson':
+            def generate():
+                started = time.perf_counter()
+                yield json.dumps({'type': 'meta', 'tickers': tickers, 'total': total,
+                                  'next_offset': next_offset, 'timestamp': timestamp}) + '\n'
+                failed = []
+                for ticker, ticker_data in results:
+                    if ticker_data:
+                        yield json.dumps({'type': 'ticker', 'ticker': ticker, 'data': ticker_data,
+                                          'as_of': as_of[ticker] if as_of else timestamp}) + '\n'
+                    else:
+                        failed.append(ticker)
+                        yield json.dumps({'type': 'error', 'ticker': ticker,
+                                          'error': errors.get(ticker, f'Analysis failed for {ticker}')}) + '\n'
+                if pending:
+                    yield json.dumps({'type': 'pending', 'tickers': pending, 'retry_after': RETRY_AFTER}) + '\n'
+                count = len(tickers) - len(failed) - len(pending)
+                elapsed = time.perf_counter() - started
+                print(f"\n총 {count}개 종목 스트리밍 완료 ({elapsed:.2f}초, 대기 {len(pending)}개)")
+                yield json.dumps({'type': 'done', 'count': count, 'failed': failed,
+                                  'elapsed': round(elapsed, 3)}) + '\n'
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                            headers={'X-Accel-Buffering': 'no'})
+
         data = {
             'tickers': {},
-            'timestamp': datetime.now().isoformat()
+            'total': total,
+            'next_offset': next_offset,
+            'pending': pending,
+            'errors': {},
+            'as_of': as_of or {},
+            'timestamp': timestamp
         }
-        
-        for ticker in tickers:
-            print(f"\n처리 중: {ticker}")
-            ticker_data = get_ticker_data(ticker)
+        for ticker, ticker_data in results:
             if ticker_data:
                 data['tickers'][ticker] = ticker_data
                 print(f"  ✓ {ticker} 완료")
             else:
+                data['errors'][ticker] = errors.get(ticker, f'Analysis failed for {ticker}')
                 print(f"  ✗ {ticker} 실패")
-        
+        # 완료 순서와 무관하게 종목 순서 유지
+        data['tickers'] = {ticker: data['tickers'][ticker] for ticker in tickers if ticker in data['tickers']}
+        if as_of is None:
+            data['as_of'] = {ticker: timestamp for ticker in data['tickers']}
+
         print(f"\n총 {len(data['tickers'])}개 종목 데이터 반환")
         return jsonify(data), 200
     except Exception as e:
@@ -89,10 +394,91 @@ def get_data():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+def _failed_response(section, ticker=None):
+    """스케줄러가 계산에 실패한 결과 → 500 + 실패 사유 (없으면 None)"""
+    failure = results_store.error(section, ticker)
+    if failure is None:
+        return None
+    return jsonify({'error': failure['error'], 'attempts': failure['attempts'],
+                    'failed_at': failure['failed_at']}), 500
+
+def _pending_response(ticker, section='tickers'):
+    """
+    사전 계산이 아직 끝나지 않은 종목 → 503 + Retry-After (요청이 계산을 기다리지 않음)
+    계산에 실패한 종목은 503을 반복하지 않고 500 + 실패 사유
+    """
+    if ticker not in get_ticker_tables():
+        return jsonify({'error': f'Ticker {ticker} not found'}), 404
+    failed = _failed_response(section, ticker)
+    if failed is not None:
+        return failed
+    response = jsonify({'error': f'Analysis for {ticker} is being computed', 'retry_after': RETRY_AFTER})
+    response.headers['Retry-After'] = str(RETRY_AFTER)
+    return response, 503
+
+def _ticker_query_options():
+    """
+    /api/ticker 쿼리 파라미터 → (기간, 분석 옵션), 잘못된 값이면 ValueError
+    start/end=YYYY-MM-DD, fields=price_history,statistics,..., bins, nlags, max_points
+    """
+    period = {}
+    for name in ('start', 'end'):
+        value = request.args.get(name)
+        if value:
+            try:
+                period[name] = pd.Timestamp(value).strftime('%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f'Invalid {name} date: {value}')
+    if 'start' in period and 'end' in period and period['start'] > period['end']:
+        raise ValueError('start must be on or before end')
+
+    options = {}
+    if 'fields' in request.args:
+        fields = [f for f in request.args['fields'].split(',') if f]
+        unknown = [f for f in fields if f not in ANALYSIS_FIELDS]
+        if not fields or unknown:
+            raise ValueError(f'Unknown fields: {unknown} (choose from {list(ANALYSIS_FIELDS)})')
+        options['fields'] = fields
+    for name, low, high in (('bins', 1, 500), ('nlags', 1, 252), ('max_points', 2, 100000)):
+        if name in request.args:
+            value = request.args.get(name, type=int)
+            if value is None or not low <= value <= high:
+                raise ValueError(f'{name} must be an integer between {low} and {high}')
+            options[name] = value
+    return period, options
+
 @app.route('/api/ticker/<ticker>')
+@cached_endpoint(_ticker_version())
 def get_single_ticker(ticker):
-    """특정 ticker 데이터 조회"""
-    ticker_data = get_ticker_data(ticker)
+    """
+    특정 ticker 데이터 조회
+    ?start=&end=&fields=&bins=&nlags=&max_points=: 기간·항목·해상도를 DB 조회와 분석 단계까지 전달
+    → 좁은 요청(예: 한 종목 1년치 가격 차트)은 그만큼 적은 I/O와 계산만 수행
+    """
+    try:
+        period, options = _ticker_query_options()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    narrow = period or set(options) - {'fields'}
+    if scheduler is not None and not narrow:
+        # 기본 해상도·전체 기간: 사전 계산 결과에서 필요한 항목만 반환
+        ticker_data = results_store.snapshot()['tickers'].get(ticker)
+        if ticker_data is None:
+            return _pending_response(ticker)
+        if 'fields' in options:
+            ticker_data = {field: ticker_data[field] for field in options['fields']}
+        as_of = results_store.as_of('tickers', ticker)
+    else:
+        found = materialized.lookup('tickers', ticker, [ticker]) if USE_MATERIALIZED and not narrow else None
+        if found is not None:
+            # 파이프라인 결과가 최신이면 계산 없이 기본키 조회로 응답
+            ticker_data, as_of = found
+            if 'fields' in options:
+                ticker_data = {field: ticker_data[field] for field in options['fields']}
+        else:
+            ticker_data = get_ticker_data(ticker, **period, **options)
+            as_of = datetime.now().isoformat()
     
     if ticker_data is None:
         return jsonify({'error': f'Ticker {ticker} not found'}), 404
@@ -100,126 +486,415 @@ def get_single_ticker(ticker):
     return jsonify({
         'ticker': ticker,
         'data': ticker_data,
+        'as_of': as_of,
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/volatility/<ticker>')
+@cached_endpoint(_ticker_version())
+def get_volatility(ticker):
+    """특정 ticker의 조건부 변동성 (GARCH / GJR / EGARCH)"""
+    model = request.args.get('model', 'garch').lower()
+    horizon = request.args.get('horizon', 10, type=int)
+
+    if model not in PARAM_NAMES:
+        return jsonify({'error': f'Unknown model: {model}', 'models': list(PARAM_NAMES)}), 400
+    if not 1 <= horizon <= 252:
+        return jsonify({'error': 'horizon must be between 1 and 252'}), 400
+
+    try:
+        print(f"\n=== API 호출: /api/volatility/{ticker} ({model}) ===")
+        df = market_store.get(ticker)
+        if df is None:
+            return jsonify({'error': f'Ticker {ticker} not found'}), 404
+
+        returns = df['Close'].pct_change().dropna()
+
+        fitted = GarchVolatilityModel(model).fit(returns.rename(ticker), param_cache=param_cache)
+        return jsonify({
+            'ticker': ticker,
+            'volatility': fitted.summary(ticker, horizon=horizon),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        print(f"변동성 분석 오류: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+def compute_factor_analysis(ticker):
+    """
+    특정 ticker의 Fama-French 팩터 분석 응답 계산
+    없는 종목이면 LookupError, 분석 실패 시 ValueError
+    """
+    response = _materialized('factors', ticker, [ticker, 'SPY'])
+    if response is not None:
+        return response
+
+    # 대상 종목과 시장(SPY)만 조회 (공유 패널 또는 캐시)
+    market_data_dict = _close_frames([ticker, 'SPY'])
+    if ticker not in market_data_dict:
+        raise LookupError(f'Ticker {ticker} not found')
+    
+    # 팩터 분석 실행
+    analyzer = FamaFrenchAnalyzer(market_data_dict, risk_free_rate_annual=0.05)
+    result = analyzer.analyze_asset(ticker, market_ticker='SPY')
+    if 'error' in result:
+        raise ValueError(result['error'])
+    
+    return {'ticker': ticker, **FamaFrenchAnalyzer.summarize(result)}
+
+def compute_portfolio_analysis():
+    """포트폴리오(등가중, SPY 제외) 팩터 분석 응답 계산, 분석 불가 시 ValueError"""
+    tickers_list = [t for t in get_ticker_tables() if t != 'SPY']
+    if len(tickers_list) < 2:
+        raise ValueError('Need at least 2 tickers for portfolio analysis')
+    response = _materialized('portfolio', PORTFOLIO_KEY, tickers_list + ['SPY'])
+    if response is not None:
+        return response
+    
+    # 시장 데이터는 공유 패널 또는 캐시에서 조회 (DB 변경 시에만 다시 읽음)
+    market_data_dict = _close_frames(tickers_list + ['SPY'])
+    analyzer = FamaFrenchAnalyzer(market_data_dict, risk_free_rate_annual=0.05)
+    result = analyzer.analyze_portfolio(tickers_list, market_ticker='SPY')
+    if 'error' in result:
+        raise ValueError(result['error'])
+    
+    return {'portfolio': result['portfolio'], 'weights': result['weights'], **FamaFrenchAnalyzer.summarize(result)}
+
 @app.route('/api/factor-analysis/<ticker>')
+@cached_endpoint(_ticker_version('SPY'))
 def get_factor_analysis(ticker):
     """특정 ticker의 Fama-French 팩터 분석"""
     try:
         print(f"\n=== API 호출: /api/factor-analysis/{ticker} ===")
-        
-        # 모든 시장 데이터 로드
-        market_data_dict = {}
-        tickers_list = get_ticker_tables()
-        
-        with DatabaseManager(DB_PATH) as db:
-            for t in tickers_list:
-                table_name = f'{t}_daily'
-                df = db.read_dataframe(table_name)
-                if df is not None and not df.empty:
-                    df['Date'] = pd.to_datetime(df['Date'])
-                    df = df.sort_values('Date').set_index('Date')
-                    market_data_dict[t] = df
-        
-        if ticker not in market_data_dict:
-            return jsonify({'error': f'Ticker {ticker} not found'}), 404
-        
-        # 팩터 분석 실행
-        analyzer = FamaFrenchAnalyzer(market_data_dict, risk_free_rate_annual=0.05)
-        result = analyzer.analyze_asset(ticker, market_ticker='SPY')
-        
-        if 'error' in result:
-            return jsonify({'error': result['error']}), 400
-        
-        # 결과 정리
-        response = {
-            'ticker': ticker,
-            'alpha': float(result['results']['alpha']),
-            'betas': {
-                'MKT': float(result['results']['betas']['MKT']),
-                'SMB': float(result['results']['betas']['SMB']),
-                'HML': float(result['results']['betas']['HML']),
-            },
-            'p_values': {
-                'alpha': float(result['results']['p_values']['alpha']),
-                'MKT': float(result['results']['p_values']['MKT']),
-                'SMB': float(result['results']['p_values']['SMB']),
-                'HML': float(result['results']['p_values']['HML']),
-            },
-            'r_squared': float(result['results']['r_squared']),
-            'adj_r_squared': float(result['results']['adj_r_squared']),
-            'interpretation': result['interpretation'],
-            'timestamp': datetime.now().isoformat()
-        }
+        if scheduler is not None:
+            response = results_store.snapshot()['factors'].get(ticker)
+            if response is None:
+                return _pending_response(ticker, 'factors')
+            response = dict(response, as_of=results_store.as_of('factors', ticker))
+        else:
+            response = dict(compute_factor_analysis(ticker), as_of=datetime.now().isoformat())
+        response['timestamp'] = datetime.now().isoformat()
         
         print(f"✓ {ticker} 팩터 분석 완료")
         return jsonify(response), 200
-        
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"팩터 분석 오류: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/portfolio-analysis')
+@cached_endpoint(_results_version)
 def get_portfolio_analysis():
     """포트폴리오 팩터 분석 (등가중 포트폴리오)"""
     try:
         print(f"\n=== API 호출: /api/portfolio-analysis ===")
+        if scheduler is not None:
+            response = results_store.snapshot()['portfolio']
+            if response is None:
+                failed = _failed_response('portfolio')
+                if failed is not None:
+                    return failed
+                response = jsonify({'error': 'Portfolio analysis is being computed', 'retry_after': RETRY_AFTER})
+                response.headers['Retry-After'] = str(RETRY_AFTER)
+                return response, 503
+            response = dict(response, as_of=results_store.as_of('portfolio'))
+        else:
+            response = dict(compute_portfolio_analysis(), as_of=datetime.now().isoformat())
+        response['timestamp'] = datetime.now().isoformat()
         
-        # 모든 시장 데이터 로드 (SPY 제외)
-        market_data_dict = {}
-        tickers_list = [t for t in get_ticker_tables() if t != 'SPY']
-        
-        if len(tickers_list) < 2:
-            return jsonify({'error': 'Need at least 2 tickers for portfolio analysis'}), 400
-        
-        with DatabaseManager(DB_PATH) as db:
-            for t in tickers_list + ['SPY']:
-                table_name = f'{t}_daily'
-                df = db.read_dataframe(table_name)
-                if df is not None and not df.empty:
-                    df['Date'] = pd.to_datetime(df['Date'])
-                    df = df.sort_values('Date').set_index('Date')
-                    market_data_dict[t] = df
-        
-        # 포트폴리오 분석
-        analyzer = FamaFrenchAnalyzer(market_data_dict, risk_free_rate_annual=0.05)
-        result = analyzer.analyze_portfolio(tickers_list, market_ticker='SPY')
-        
-        if 'error' in result:
-            return jsonify({'error': result['error']}), 400
-        
-        # 결과 정리
+        print(f"✓ 포트폴리오 팩터 분석 완료")
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"포트폴리오 분석 오류: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/efficient-frontier')
+@cached_endpoint(_market_version)
+def get_efficient_frontier():
+    """마코위츠 효율적 투자선 + 최소분산 / 최대 Sharpe / 위험균형 포트폴리오"""
+    estimator = request.args.get('estimator', 'ledoit_wolf')
+    n_points = request.args.get('points', 100, type=int)
+    max_weight = request.args.get('max_weight', 1.0, type=float)
+    risk_free_rate = request.args.get('risk_free_rate', 0.05, type=float)
+    lookback = request.args.get('lookback', type=int)
+    include_weights = request.args.get('include_weights', '0') == '1'
+    max_turnover = request.args.get('max_turnover', type=float)
+    prev_weights = request.args.get('prev_weights') or None
+
+    if estimator not in ESTIMATORS:
+        return jsonify({'error': f'Unknown estimator: {estimator}', 'estimators': list(ESTIMATORS)}), 400
+    if not 2 <= n_points <= 500:
+        return jsonify({'error': 'points must be between 2 and 500'}), 400
+    if max_turnover is not None and max_turnover < 0:
+        return jsonify({'error': 'max_turnover must be non-negative'}), 400
+    if prev_weights:
+        # 현재 보유 비중: prev_weights=AAA:0.4,BBB:0.6 (없는 종목은 0)
+        try:
+            prev_weights = pd.Series({name.strip(): float(weight) for name, weight in
+                                      (item.split(':') for item in prev_weights.split(','))})
+        except ValueError:
+            return jsonify({'error': 'prev_weights must look like TICKER:weight,TICKER:weight'}), 400
+
+    try:
+        print(f"\n=== API 호출: /api/efficient-frontier ({estimator}) ===")
+        requested = request.args.get('tickers')
+        tickers = requested.split(',') if requested else get_ticker_tables()
+        if len(tickers) < 2:
+            return jsonify({'error': 'Need at least 2 tickers for portfolio optimization'}), 400
+
+        panel = _price_panel(tickers)
+        if panel is None or panel.shape[1] < 2:
+            return jsonify({'error': 'Price data not found'}), 404
+
+        returns = panel.pct_change().dropna()
+        if lookback:
+            returns = returns.iloc[-lookback:]
+
+        estimate = CovarianceEstimator.estimate(returns, method=estimator)
+        optimizer = PortfolioOptimizer(estimate['expected_returns'], estimate['cov'],
+                                       risk_free_rate=risk_free_rate, upper=max_weight,
+                                       prev_weights=prev_weights, max_turnover=max_turnover)
+
         response = {
-            'portfolio': result['portfolio'],
-            'weights': result['weights'],
-            'alpha': float(result['results']['alpha']),
-            'betas': {
-                'MKT': float(result['results']['betas']['MKT']),
-                'SMB': float(result['results']['betas']['SMB']),
-                'HML': float(result['results']['betas']['HML']),
-            },
-            'p_values': {
-                'alpha': float(result['results']['p_values']['alpha']),
-                'MKT': float(result['results']['p_values']['MKT']),
-                'SMB': float(result['results']['p_values']['SMB']),
-                'HML': float(result['results']['p_values']['HML']),
+            'tickers': list(returns.columns),
+            'estimator': estimator,
+            'shrinkage': estimate['shrinkage'],
+            'observations': len(returns),
+            'max_turnover': max_turnover,
+            'frontier': optimizer.efficient_frontier(n_points, include_weights=include_weights),
+            'min_variance': optimizer.min_variance(),
+            'max_sharpe': optimizer.max_sharpe(),
+            'risk_parity': optimizer.risk_parity(),
+            'timestamp': datetime.now().isoformat()
+        }
+        print(f"✓ 효율적 투자선 계산 완료 ({len(returns.columns)}개 종목, {n_points}개 지점)")
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"효율적 투자선 오류: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/backtest')
+@cached_endpoint(_market_version)
+def get_backtest():
+    """벡터화 백테스트: 자산곡선 + 성과 지표 + InsightGenerator 해석"""
+    strategy = request.args.get('strategy', 'momentum')
+    rebalance = request.args.get('rebalance', 'M')
+    if strategy not in STRATEGIES:
+        return jsonify({'error': f'Unknown strategy: {strategy}', 'strategies': list(STRATEGIES)}), 400
+
+    # 전략 함수 시그니처의 기본값 타입으로 쿼리 파라미터 변환
+    params = {}
+    for name, param in inspect.signature(STRATEGIES[strategy]).parameters.items():
+        if name == 'ctx' or name not in request.args:
+            continue
+        cast = float if isinstance(param.default, float) else int
+        params[name] = request.args.get(name, type=cast)
+        if params[name] is None:
+            return jsonify({'error': f'Invalid value for {name}'}), 400
+
+    try:
+        print(f"\n=== API 호출: /api/backtest ({strategy}, {rebalance}) ===")
+        requested = request.args.get('tickers')
+        tickers = requested.split(',') if requested else get_ticker_tables()
+        panel = _price_panel(tickers)
+        if panel is None:
+            return jsonify({'error': 'Price data not found'}), 404
+
+        engine = BacktestEngine(
+            panel,
+            risk_free_rate=request.args.get('risk_free_rate', 0.05, type=float),
+            transaction_cost_bps=request.args.get('cost_bps', 5.0, type=float),
+            slippage_bps=request.args.get('slippage_bps', 5.0, type=float)
+        )
+        result = engine.run(strategy, rebalance=int(rebalance) if rebalance.isdigit() else rebalance, **params)
+        equity = result['equity_curve']
+
+        response = {
+            'strategy': strategy,
+            'params': params,
+            'rebalance': rebalance,
+            'tickers': engine.tickers,
+            'equity_curve': {
+                'dates': equity.index.strftime('%Y-%m-%d').tolist(),
+                'values': [float(x) for x in equity.values]
             },
-            'r_squared': float(result['results']['r_squared']),
-            'adj_r_squared': float(result['results']['adj_r_squared']),
-            'interpretation': result['interpretation'],
+            'performance': result['performance'],
+            'statistics': result['statistics'],
             'timestamp': datetime.now().isoformat()
         }
-        
-        print(f"✓ 포트폴리오 팩터 분석 완료")
+        print(f"✓ 백테스트 완료 ({len(engine.tickers)}개 종목, {len(equity)}일)")
         return jsonify(response), 200
-        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"포트폴리오 분석 오류: {e}")
+        print(f"백테스트 오류: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+def _history_digest(returns):
+    """수익률 이력 지문 (날짜 또는 과거 값이 바뀌면 달라짐)"""
+    digest = hashlib.sha1(returns.index.asi8.tobytes())
+    digest.update(returns.to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()
+
+def _covariance_engine(method, decay, window, returns, stamps):
+    """
+    (_covariance_lock 안에서 호출) 설정별 엔진을 returns의 마지막 bar까지 갱신하여 반환
+    - 종목 테이블 스탬프(stamps, MarketDataStore.stamp)가 그대로면 이력 비교 없이 그대로 사용
+    - 스탬프가 바뀌었고 새 bar만 있으면 증분 갱신
+    - 이미 반영한 구간의 수익률이 바뀌었으면 (과거 데이터 수정/삭제) 증분으로는 반영할 수 없으므로 다시 적합
+    """
+    key = (method, decay if method == 'ewma' else window, tuple(returns.columns))
+    entry = _covariance_engines.pop(key, None)
+    if entry is not None and entry[1] == stamps:
+        _covariance_engines[key] = entry
+        count_cache('covariance_engine', 'hit')
+        return entry[0]
+    count_cache('covariance_engine', 'miss')
+    if entry is not None:
+        engine, _, digest = entry
+        seen = returns.index <= engine.last_date
+        if _history_digest(returns[seen]) == digest:
+            new = returns[~seen]
+            for date, row in new.iterrows():
+                engine.update(row.to_numpy(), date)
+            if len(new):
+                digest = _history_digest(returns[returns.index <= engine.last_date])
+        else:
+            print(f"  과거 수익률 변경 감지 → 공분산 엔진 재적합 ({method})")
+            entry = None
+    if entry is None:
+        engine = IncrementalCovariance(returns.columns, method, decay=decay, window=window).fit(returns)
+        digest = _history_digest(returns[returns.index <= engine.last_date])
+    _covariance_engines[key] = (engine, stamps, digest)
+    while len(_covariance_engines) > COVARIANCE_ENGINES:
+        _covariance_engines.popitem(last=False)
+    return engine
+
+@app.route('/api/correlation')
+@cached_endpoint(_market_version)
+def get_correlation():
+    """EWMA / 이동창 상관행렬 (order=cluster이면 계층적 군집 순서로 정렬)"""
+    method = request.args.get('method', 'ewma')
+    decay = request.args.get('decay', 0.94, type=float)
+    window = request.args.get('window', 252, type=int)
+    order = request.args.get('order', 'cluster')
+    if method not in COVARIANCE_METHODS:
+        return jsonify({'error': f'Unknown method: {method}', 'methods': list(COVARIANCE_METHODS)}), 400
+    if not 0 < decay < 1:
+        return jsonify({'error': 'decay must be between 0 and 1'}), 400
+    if window < 2:
+        return jsonify({'error': 'window must be at least 2'}), 400
+    if order not in ('cluster', 'none'):
+        return jsonify({'error': f'Unknown order: {order}'}), 400
+
+    try:
+        print(f"\n=== API 호출: /api/correlation ({method}) ===")
+        requested = request.args.get('tickers')
+        tickers = requested.split(',') if requested else get_ticker_tables()
+        # 패널보다 먼저 읽음: 그 사이 커밋이 있으면 다음 요청에서 스탬프가 달라 이력을 다시 확인
+        stamps = [market_store.stamp(ticker) for ticker in tickers]
+        panel = _price_panel(tickers)
+        if panel is None or panel.shape[1] < 2:
+            return jsonify({'error': 'Price data not found'}), 404
+        returns = panel.pct_change().iloc[1:]
+
+        with _covariance_lock:
+            engine = _covariance_engine(method, decay, window, returns, stamps)
+            corr = engine.correlation()
+            volatility = engine.volatility(infer_periods_per_year(returns.index))
+            last_date, n_obs = engine.last_date, engine.n_obs
+        index = cluster_order(corr) if order == 'cluster' else list(range(len(corr)))
+        corr = corr[index][:, index]
+        response = {
+            'tickers': [engine.tickers[i] for i in index],
+            'matrix': [[None if pd.isna(v) else round(float(v), 6) for v in row] for row in corr],
+            'volatility': [float(v) for v in volatility[index]],
+            'method': method,
+            'decay': decay if method == 'ewma' else None,
+            'window': window if method == 'rolling' else None,
+            'date': last_date.strftime('%Y-%m-%d'),
+            'observations': n_obs,
+            'timestamp': datetime.now().isoformat()
+        }
+        print(f"✓ 상관행렬 계산 완료 ({len(index)}개 종목, {n_obs}개 관측치)")
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"상관행렬 오류: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/profiles/<path:name>')
+def get_profile(name):
+    """저장된 프로파일 파일 (speedscope JSON / collapsed / .prof)"""
+    if not PROFILING_ENABLED:
+        return jsonify({'error': 'Profiling is disabled'}), 404
+    return send_from_directory(PROFILE_DIR, name)
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus 텍스트 형식 계측값 (단계별/엔드포인트별 지연 히스토그램, 캐시 적중 수)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/stream')
+def stream_updates():
+    """
+    Server-Sent Events: DB에 새 bar가 쓰이면 바뀐 종목의 delta만 전송
+    event: delta → {ticker, prices: {dates, prices} (새 bar만), statistics (증분 갱신), capm, reset, added}
+    ?tickers=AAPL,MSFT로 종목을 제한, 재연결 시 Last-Event-ID 이후 이벤트를 재전송
+    """
+    requested = request.args.get('tickers')
+    tickers = [t for t in requested.split(',') if t] if requested else None
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID must be an integer'}), 400
+    start_stream_updater()
+    response = Response(stream_broker.subscribe(tickers, last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 리버스 프록시(nginx) 버퍼링 해제
+    return response
+
+def start_stream_updater():
+    """/api/stream용 증분 갱신 스레드 시작 (첫 구독 또는 서버 시작 시 한 번)"""
+    global stream_updater
+    if stream_updater is None:
+        stream_updater = StreamUpdater(market_store, stream_broker, interval=STREAM_POLL_INTERVAL).start()
+    return stream_updater
+
+def start_scheduler():
+    """사전 계산 스케줄러 시작 → 이후 /api/data, /api/ticker, 팩터 API는 게시된 결과만 읽음"""
+    global scheduler
+    with _scheduler_lock:
+        if scheduler is None:
+            scheduler = AnalyticsScheduler(market_store, results_store, _iter_ticker_results,
+                                           compute_factor_analysis, compute_portfolio_analysis,
+                                           interval=REFRESH_INTERVAL).start()
+    return scheduler
+
+@app.before_request
+def _start_background():
+    """
+    gunicorn 등 WSGI 서버는 __main__ 블록을 실행하지 않으므로 첫 요청에서 스케줄러 시작
+    (워커 프로세스마다 한 번 — fork 이후에 시작하므로 --preload에서도 스레드가 살아 있음)
+    """
+    if PRECOMPUTE and scheduler is None:
+        start_scheduler()
+
 @app.route('/')
 def serve_index():
     """index.html 서빙"""
@@ -240,9 +915,21 @@ if __name__ == '__main__':
     else:
         print("\n⚠️  DB 파일을 찾을 수 없습니다!")
     
+    if PRECOMPUTE:
+        start_scheduler()
+        print(f"\n백그라운드 사전 계산 시작 (DB 변경 확인 주기: {REFRESH_INTERVAL:g}초)")
+    start_stream_updater()
+    print(f"실시간 스트림(/api/stream) 변경 확인 주기: {STREAM_POLL_INTERVAL:g}초")
+    
+    if SERVER_MODE_NOTE:
+        print(f"\n⚠️  {SERVER_MODE_NOTE}")
     print("\n" + "="*50)
-    print("Flask 서버 시작: http://127.0.0.1:8000")
+    print(f"Flask 서버 시작 ({SERVER_MODE}): http://127.0.0.1:8000")
     print("="*50 + "\n")
     
-    app.run(debug=False, port=8000, host='127.0.0.1')
+    if SERVER_MODE == 'gevent':
+        from gevent.pywsgi import WSGIServer
+        WSGIServer(('127.0.0.1', 8000), app).serve_forever()  # SSE 구독자마다 greenlet 하나
+    else:
+        app.run(debug=False, port=8000, host='127.0.0.1', threaded=True)  # SSE 구독자마다 스레드 하나
 
@@ -0,0 +1,219 @@
+"""
+Server-Sent Events 브로커 + 증분 갱신 발행기
+========================================
+- StreamBroker: 이벤트를 SSE 바이트로 한 번만 직렬화하여 공유 링 버퍼에 추가하고
+  Condition.notify_all 한 번으로 모든 구독자를 깨움 → 발행 비용이 구독자 수와 무관
+  구독자는 자기 위치(마지막 이벤트 id)만 기억하고 링 버퍼에서 이어 읽음
+  (구독자별 큐 없음, Last-Event-ID 재연결 시 놓친 이벤트 재전송)
+- StreamUpdater: MarketDataStore.changes_since로 바뀐 종목만 확인하고, 종목별 TickerStream이
+  새 bar만 반영한 delta(새 가격, 갱신된 통계, CAPM 베타)를 발행
+
+구독자 하나는 대기 중인 제너레이터 하나입니다. 스레드 서버(app.run)에서는 스레드 하나,
+gevent 워커(gunicorn -k gevent, threading 몽키패치)에서는 greenlet 하나로 동작하므로
+한 프로세스에서 수백 ~ 수천 개의 연결을 유지할 수 있습니다.
+"""
+
+import os
+import sys
+import json
+import itertools
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+
+# 증분 통계(02_Financial_Analysis), 계측(01_Data_Engineering) 모듈
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (os.path.join(PROJECT_ROOT, '01_Data_Engineering'), os.path.join(PROJECT_ROOT, '02_Financial_Analysis')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+from streaming_stats import TickerStream
+from instrumentation import metrics, ENABLED as METRICS_ENABLED
+
+HEARTBEAT_INTERVAL = 15.0   # 유휴 연결 유지용 주석 라인 간격 (초), 프록시 타임아웃보다 짧게
+RETRY_MS = 3000             # 연결이 끊겼을 때 브라우저 EventSource의 재연결 대기 시간
+
+
+def format_event(event, data, event_id=None):
+    """SSE 메시지 직렬화 (data는 한 줄 JSON)"""
+    head = f"id: {event_id}\n" if event_id is not None else ''
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n".encode('utf-8')
+
+
+class StreamBroker:
+    """
+    링 버퍼 기반 SSE 팬아웃
+
+    Args:
+        history: 링 버퍼에 보관할 최근 이벤트 수 (재연결/느린 구독자가 따라잡을 수 있는 범위)
+        heartbeat: 이벤트가 없을 때 keep-alive 주석을 보내는 간격 (초)
+    """
+
+    def __init__(self, history=1024, heartbeat=HEARTBEAT_INTERVAL):
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=history)   # (id, ticker, SSE 바이트)
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self.subscribers = 0
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def publish(self, event, data, ticker=None):
+        """이벤트 발행 → 이벤트 id"""
+        with self._condition:
+            self._last_id += 1
+            self._events.append((self._last_id, ticker, format_event(event, data, self._last_id)))
+            self._condition.notify_all()
+        if METRICS_ENABLED:
+            metrics.inc('sse_events_total', event=event)
+        return self._last_id
+
+    def close(self):
+        """모든 구독 종료 (서버 종료 시)"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _pending(self, after):
+        """after 이후 이벤트 (잘려 나간 구간이 있으면 None)"""
+        if not self._events or self._last_id <= after:
+            return []
+        first_id = self._events[0][0]
+        if after + 1 < first_id:
+            return None
+        return list(itertools.islice(self._events, after + 1 - first_id, None))
+
+    def subscribe(self, tickers=None, last_event_id=None):
+        """
+        SSE 응답 본문 제너레이터
+        :param tickers: 이 종목의 이벤트만 전달 (None이면 전체, 종목과 무관한 이벤트는 항상 전달)
+        :param last_event_id: 재연결 시 브라우저가 보내는 Last-Event-ID → 이후 이벤트부터 재전송
+        """
+        tickers = set(tickers) if tickers else None
+        with self._condition:
+            position = self._last_id if last_event_id is None else min(last_event_id, self._last_id)
+            self.subscribers += 1
+            self._report_subscribers()
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode('utf-8')
+            yield format_event('hello', {'last_event_id': position, 'timestamp': datetime.now().isoformat()})
+            while True:
+                with self._condition:
+                    events = self._pending(position)
+                    if not events and events is not None and not self._closed:
+                        self._condition.wait(self.heartbeat)
+                        events = self._pending(position)
+                    closed = self._closed
+                    last_id = self._last_id
+                if events is None:
+                    # 구독자가 링 버퍼보다 뒤처짐 → 클라이언트가 전체 데이터를 다시 받도록 알림
+                    position = last_id
+                    yield format_event('reset', {'reason': 'lagged', 'last_event_id': position}, position)
+                    continue
+                if not events:
+                    if closed:
+                        return
+                    yield b": keep-alive\n\n"
+                    continue
+                for event_id, ticker, payload in events:
+                    if tickers is None or ticker is None or ticker in tickers:
+                        yield payload
+                position = events[-1][0]
+        finally:
+            with self._condition:
+                self.subscribers -= 1
+                self._report_subscribers()
+
+    def _report_subscribers(self):
+        if METRICS_ENABLED:
+            metrics.set('sse_subscribers', self.subscribers)
+
+
+class StreamUpdater:
+    """
+    DB 변경을 주기적으로 확인하여 바뀐 종목의 delta만 발행하는 백그라운드 스레드
+
+    Args:
+        market_store: MarketDataStore
+        broker: StreamBroker
+        interval: 변경 확인 주기 (초) — PRAGMA data_version 조회 한 번이라 짧게 두어도 부담이 없음
+        market_ticker: CAPM 회귀의 시장 종목
+    """
+
+    def __init__(self, market_store, broker, interval=2.0, market_ticker='SPY'):
+        self.market_store = market_store
+        self.broker = broker
+        self.interval = interval
+        self.market_ticker = market_ticker
+        self.streams = {}     # {ticker: TickerStream}
+        self.version = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='stream-updater', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        # 초기화: 전체 이력으로 누적값을 만들고 (발행하지 않음) 이후 변경분만 발행
+        self.version, _ = self.market_store.changes_since(0)
+        self.update(self.market_store.tickers(), publish=False)
+        while not self._stop.wait(self.interval):
+            try:
+                self.version, changed = self.market_store.changes_since(self.version)
+                if changed:
+                    self.update(changed)
+            except Exception as e:
+                print(f"스트림 갱신 오류: {e}")
+                traceback.print_exc()
+
+    def update(self, tickers, publish=True):
+        """
+        종목들의 새 bar 반영 → 발행한 delta 수
+        시장 종목이 바뀌면 모든 종목의 CAPM이 새 관측치를 얻으므로 전 종목을 진행
+        """
+        current = set(self.market_store.tickers())
+        removed = sorted(t for t in tickers if t not in current and t in self.streams)
+        for ticker in removed:
+            del self.streams[ticker]
+            if publish:
+                self.broker.publish('removed', {'ticker': ticker}, ticker=ticker)
+
+        market_df = self.market_store.get(self.market_ticker)
+        targets = set(tickers) & current
+        if self.market_ticker in targets:
+            market_stream = self.streams.get(self.market_ticker)
+            if market_stream is not None and market_df is not None and market_stream.history_rewritten(market_df['Close']):
+                for stream in self.streams.values():
+                    stream.reset_capm()
+            targets = current
+
+        published = 0
+        for ticker in sorted(targets):
+            df = self.market_store.get(ticker)
+            if df is None or df.empty:
+                continue
+            stream = self.streams.get(ticker)
+            is_new = stream is None
+            if is_new:
+                stream = self.streams[ticker] = TickerStream(ticker)
+            delta = stream.advance(df, market_df)
+            if delta is None or not publish:
+                continue
+            delta['added'] = is_new
+            delta['data_version'] = self.version
+            self.broker.publish('delta', delta, ticker=ticker)
+            published += 1
+        if publish and published:
+            print(f"[스트림] {published}개 종목 delta 발행 (data version {self.version}, 구독자 {self.broker.subscribers})")
+        return published
@@ -0,0 +1,179 @@
+"""
+벡터화 OHLCV 리샘플러 + 관측 빈도 유틸리티
+========================================
+분봉(1m)을 임의 간격(5m, 1h, 1d …)의 봉으로 여러 종목을 한 번에 집계합니다.
+
+방식 (종목별 pandas groupby/resample 없음):
+    1) 모든 종목의 분봉을 (종목 코드, 시각) 순으로 정렬된 한 벌의 배열로 둠
+    2) 구간 번호 = (거래소 현지 시각 - offset) // 간격
+    3) 종목 코드 또는 구간 번호가 바뀌는 위치 = 구간 시작 인덱스 (np.flatnonzero 한 번)
+    4) 구간 시작 인덱스로 구간 축약 (segment reduction)
+           Open  = open[starts]                  High   = np.maximum.reduceat(high, starts)
+           Close = close[ends]                   Low    = np.minimum.reduceat(low, starts)
+           Volume = np.add.reduceat(volume, starts)
+    → 전체 비용은 행 수에 선형, 종목 수와 무관하게 numpy 호출 몇 번
+
+빈도:
+    periods_per_year('5m') → 연율화 계수 (정규장 390분 × 252일 기준)
+    infer_periods_per_year(index) → 시각 간격의 중앙값으로 빈도를 추정 (일봉이면 252)
+    → 팩터 모델, 변동성, 백테스트가 252를 가정하지 않고 데이터 빈도에 맞춰 연율화
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+SESSION_MINUTES = 390          # 미국 정규장 09:30~16:00
+MARKET_TZ = 'America/New_York'
+DAY_SECONDS = 86400
+
+OHLCV = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+_INTERVAL_PATTERN = re.compile(r'^(\d+)\s*(m|min|h|d|wk|mo)$')
+_UNIT_SECONDS = {'m': 60, 'min': 60, 'h': 3600, 'd': DAY_SECONDS, 'wk': 7 * DAY_SECONDS, 'mo': 30 * DAY_SECONDS}
+
+
+def parse_interval(interval):
+    """'5m', '1h', '1d', '1wk', '1mo' (yfinance 표기) 또는 초 단위 정수 → 초"""
+    if isinstance(interval, (int, np.integer)):
+        seconds = int(interval)
+    else:
+        match = _INTERVAL_PATTERN.match(str(interval).strip().lower())
+        if match is None:
+            raise ValueError(f"Unknown interval: {interval}")
+        seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError(f"Interval must be positive: {interval}")
+    return seconds
+
+
+def periods_per_year(interval):
+    """
+    간격의 연율화 계수 (연간 관측 수)
+    - 장중: 하루 정규장 분 수 기준 (1m: 98,280, 5m: 19,656, 1h: 1,638)
+    - 1일 이상 4일 미만: 거래일 기준 252 / 일 수
+    - 그 이상(주봉/월봉): 달력 기준 365.25 / 일 수 (1wk: 52.2, 1mo: 12.2)
+    """
+    seconds = parse_interval(interval)
+    if seconds < DAY_SECONDS:
+        return TRADING_DAYS * SESSION_MINUTES * 60 / seconds
+    days = seconds / DAY_SECONDS
+    return TRADING_DAYS / days if days < 4 else 365.25 / days
+
+
+def infer_interval(index):
+    """
+    시각 배열(DatetimeIndex, Series, datetime64 배열)에서 관측 간격(초) 추정, 관측치가 2개 미만이면 None
+    연속한 양의 간격의 중앙값 → 장 마감/주말/휴일로 생기는 긴 간격에 영향받지 않음
+    """
+    values = pd.DatetimeIndex(index).as_unit('s').asi8   # 단위가 [us]/[ns]로 달라도 초로 통일
+    if len(values) < 2:
+        return None
+    steps = np.diff(np.sort(values))
+    steps = steps[steps > 0]
+    if len(steps) == 0:
+        return None
+    return max(int(round(np.median(steps))), 1)
+
+
+def infer_periods_per_year(index, default=TRADING_DAYS):
+    """데이터 빈도에 맞는 연율화 계수 (추정할 수 없으면 default, 일봉이면 252)"""
+    seconds = infer_interval(index)
+    return default if seconds is None else periods_per_year(seconds)
+
+
+def is_intraday(index):
+    """장중 봉(간격 1일 미만)이면 True"""
+    seconds = infer_interval(index)
+    return seconds is not None and seconds < DAY_SECONDS
+
+
+def date_format(index):
+    """API/차트용 날짜 문자열 형식 (장중이면 시:분 포함)"""
+    return '%Y-%m-%d %H:%M' if is_intraday(index) else '%Y-%m-%d'
+
+
+def epoch_seconds(values):
+    """datetime 계열(naive면 UTC로 간주) 또는 정수 epoch 초 → int64 epoch 초 배열"""
+    if pd.api.types.is_integer_dtype(getattr(values, 'dtype', None)):
+        return np.asarray(values, dtype=np.int64)
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('s').asi8
+
+
+def _local_seconds(ts, tz):
+    """UTC epoch 초 → 거래소 현지 벽시계 epoch 초 (일광절약시간 반영, 벡터화)"""
+    if tz is None:
+        return ts
+    local = pd.DatetimeIndex(ts.astype('M8[s]')).tz_localize('UTC').tz_convert(tz).tz_localize(None)
+    return local.as_unit('s').asi8
+
+
+def resample_bars(bars, interval, tz=MARKET_TZ, offset=0):
+    """
+    여러 종목의 분봉을 한 번에 interval 봉으로 집계
+
+    Args:
+        bars: 긴 형식 DataFrame (columns: ticker, ts(UTC epoch 초 또는 datetime), Open, High, Low, Close, Volume)
+              (종목, 시각) 순이면 정렬을 생략 (IntradayStore.read 형식)
+        interval: 하루를 나누어떨어지는 간격 ('5m', '15m', '1h', '1d' …)
+        tz: 구간을 나눌 현지 시간대 (1d 봉 = 현지 거래일, None이면 UTC)
+        offset: 구간 시작 기준 (초 또는 '30m' 형식, 예: 1h 봉을 09:30 정각에 맞추려면 '30m')
+
+    Returns:
+        DataFrame (columns: ticker, Date(현지 구간 시작 시각, naive), Open, High, Low, Close, Volume, bars)
+        (종목, Date) 순 정렬, bars는 구간에 포함된 분봉 수
+    """
+    step = parse_interval(interval)
+    if step > DAY_SECONDS or DAY_SECONDS % step:
+        raise ValueError(f"Interval must divide a day: {interval}")
+    offset = parse_interval(offset) if offset else 0
+    columns = ['ticker', 'Date', *OHLCV, 'bars']
+
+    # 가격이 비어 있는 분봉은 축약 결과를 NaN으로 만들므로 제외 (거래량 결측은 0)
+    bars = bars.dropna(subset=['Open', 'High', 'Low', 'Close'])
+    if bars.empty:
+        return pd.DataFrame(columns=columns)
+    codes, tickers = pd.factorize(bars['ticker'], sort=True)
+    ts = epoch_seconds(bars['ts'])
+    arrays = [bars[column].to_numpy(dtype=float) for column in OHLCV]
+    arrays[4] = np.nan_to_num(arrays[4])
+
+    ordered = ((codes[1:] > codes[:-1]) | ((codes[1:] == codes[:-1]) & (ts[1:] >= ts[:-1]))).all()
+    if not ordered:
+        order = np.lexsort((ts, codes))
+        codes, ts = codes[order], ts[order]
+        arrays = [a[order] for a in arrays]
+    open_, high, low, close, volume = arrays
+
+    bucket = (_local_seconds(ts, tz) - offset) // step
+    boundary = (codes[1:] != codes[:-1]) | (bucket[1:] != bucket[:-1])
+    starts = np.concatenate(([0], np.flatnonzero(boundary) + 1))
+    ends = np.concatenate((starts[1:], [len(ts)])) - 1
+
+    return pd.DataFrame({
+        'ticker': tickers[codes[starts]],
+        'Date': (bucket[starts] * step + offset).astype('M8[s]'),
+        'Open': open_[starts],
+        'High': np.maximum.reduceat(high, starts),
+        'Low': np.minimum.reduceat(low, starts),
+        'Close': close[ends],
+        'Volume': np.add.reduceat(volume, starts),
+        'bars': ends - starts + 1,
+    }, columns=columns)
+
+
+def split_frames(resampled):
+    """
+    resample_bars 결과 → {ticker: OHLCV DataFrame (Date 인덱스)} (MarketDataStore.frames 형식)
+    결과가 종목순으로 연속이므로 경계 위치로 잘라냄 (종목별 필터링/groupby 없음)
+    """
+    if resampled.empty:
+        return {}
+    tickers = resampled['ticker'].to_numpy()
+    starts = np.concatenate(([0], np.flatnonzero(tickers[1:] != tickers[:-1]) + 1, [len(tickers)]))
+    body = resampled.set_index('Date')[list(OHLCV)]
+    return {tickers[lo]: body.iloc[lo:hi] for lo, hi in zip(starts[:-1], starts[1:])}
@@ -4,6 +4,7 @@ import os
 import time
 import logging
 from database_manager import DatabaseManager # 수정: DatabaseManager 임포트
+from instrumentation import stage, metrics
 
 # 1. Settings (설정)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,7 +27,8 @@ def fetch_stock_data(ticker, start, end):
     
     # Download data (데이터 다운로드)
     # progress=False: Hide the default progress bar of yfinance (yfinance 기본 진행바 숨기기)
-    df = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False)
+    with stage('collector_fetch'):
+        df = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False)
 
     if df.empty:
         logging.warning(f"No data downloaded for {ticker}. It might be delisted or the ticker is incorrect.")
@@ -48,6 +50,32 @@ def fetch_stock_data(ticker, start, end):
     logging.info(f"Successfully fetched and cleaned data for {ticker}.")
     return df
 
+def fetch_intraday_bars(ticker, interval='1m', period='7d'):
+    """
+    티커의 장중 봉 다운로드 → 긴 형식 DataFrame (ticker, ts(UTC epoch 초), Open, High, Low, Close, Volume)
+    yfinance 제한: 1m은 최근 7일, 5m~30m은 최근 60일까지만 제공
+    결측 봉은 채우지 않고 제외 (빈 분봉을 앞 값으로 채우면 리샘플 시 거래량/고저가가 왜곡됨)
+    """
+    logging.info(f"Fetching {interval} bars for {ticker} (period {period})...")
+    with stage('collector_fetch'):
+        df = yf.download(ticker, period=period, interval=interval, auto_adjust=True, progress=False)
+
+    if df.empty:
+        logging.warning(f"No {interval} bars downloaded for {ticker}.")
+        return None
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    df = df.dropna(subset=['Open', 'High', 'Low', 'Close'])
+    index = df.index.tz_convert('UTC') if df.index.tz is not None else df.index.tz_localize('UTC')
+    bars = pd.DataFrame({
+        'ticker': ticker,
+        'ts': index.tz_localize(None).as_unit('s').asi8,
+        **{column: df[column].to_numpy(dtype=float) for column in ['Open', 'High', 'Low', 'Close', 'Volume']},
+    })
+    logging.info(f"Successfully fetched {len(bars)} {interval} bars for {ticker}.")
+    return bars
+
 if __name__=="__main__":
     logging.info("--- Starting Batch Data Collection ---")
     logging.info(f"Target Tickers: {TICKERS}")
@@ -63,7 +91,7 @@ if __name__=="__main__":
             # 2. Save (저장)
             table_name = f"{ticker}_daily"
             try:
-                with db_manager as db:
+                with stage('collector_write'), db_manager as db:
                     db.save_dataframe(data, table_name)
             except Exception as e:
                 logging.error(f"Failed to process and save data for {ticker}: {e}")
@@ -73,3 +101,5 @@ if __name__=="__main__":
         time.sleep(1) 
 
     logging.info("--- All tasks completed! ---")
+    # 단계별 소요 시간 요약 (Prometheus 텍스트 형식)
+    logging.info("Collector timings:\n" + metrics.render())
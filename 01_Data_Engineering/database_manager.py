@@ -1,6 +1,8 @@
 import sqlite3
+import json
 import pandas as pd
 import logging
+from instrumentation import stage
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -22,7 +24,8 @@ class DatabaseManager:
         'with' 구문 사용 시 데이터베이스 연결을 엽니다.
         """
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            with stage('db_connect'):
+                self.conn = sqlite3.connect(self.db_path)
             logging.info(f"Database connection opened to {self.db_path}")
             return self
         except sqlite3.Error as e:
@@ -50,26 +53,144 @@ class DatabaseManager:
             return
 
         try:
-            df.to_sql(table_name, self.conn, if_exists='replace', index=False)
+            with stage('db_write'):
+                df.to_sql(table_name, self.conn, if_exists='replace', index=False)
             logging.info(f"Successfully saved {len(df)} rows to table '{table_name}'.")
         except Exception as e:
             logging.error(f"Error saving dataframe to table '{table_name}': {e}")
 
-    def read_dataframe(self, table_name: str):
+    def read_dataframe(self, table_name: str, columns=None, start: str = None, end: str = None):
         """
         데이터베이스 테이블을 DataFrame으로 읽어옵니다.
+        columns/start/end를 주면 SQL에서 바로 열과 기간을 걸러 필요한 행만 읽습니다.
 
         :param table_name: 읽을 테이블의 이름
+        :param columns: 읽을 컬럼 리스트 (기본값: 전체)
+        :param start: 시작 날짜 'YYYY-MM-DD' (포함, Date 컬럼 기준)
+        :param end: 종료 날짜 'YYYY-MM-DD' (포함, Date 컬럼 기준)
         :return: 읽어온 DataFrame, 테이블이 없으면 None
         """
         if self.conn is None:
             logging.error("Database connection is not open. Use 'with' statement.")
             return None
 
+        select = ', '.join(f'"{c}"' for c in columns) if columns else '*'
+        conditions, params = [], []
+        if start is not None:
+            conditions.append('Date >= ?')
+            params.append(start)
+        if end is not None:
+            # Date가 'YYYY-MM-DD HH:MM:SS' 형식이어도 종료일 전체가 포함되도록 다음 날 미만으로 비교
+            conditions.append('Date < date(?, \'+1 day\')')
+            params.append(end)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
         try:
-            df = pd.read_sql_query(f"SELECT * FROM {table_name}", self.conn)
+            with stage('db_read'):
+                df = pd.read_sql_query(f'SELECT {select} FROM "{table_name}"{where} ORDER BY Date' if where
+                                       else f"SELECT {select} FROM {table_name}", self.conn, params=params or None)
             logging.info(f"Successfully read {len(df)} rows from table '{table_name}'.")
             return df
         except Exception as e:
             logging.error(f"Error reading table '{table_name}': {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def list_tickers(self, suffix: str = '_daily'):
+        """
+        지정된 접미사를 가진 테이블에서 종목 리스트를 추출합니다.
+
+        :param suffix: 테이블 이름 접미사 (기본값: '_daily')
+        :return: 종목 리스트 (정렬됨), 연결이 없으면 빈 리스트
+        """
+        if self.conn is None:
+            logging.error("Database connection is not open. Use 'with' statement.")
+            return []
+
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?", (f'%{suffix}',))
+        return sorted(name[:-len(suffix)] for (name,) in cursor.fetchall() if name.endswith(suffix))
+
+    def read_price_panel(self, tickers, column: str = 'Close', suffix: str = '_daily'):
+        """
+        여러 종목의 가격 컬럼을 날짜 기준으로 정렬된 하나의 패널(dates × tickers)로 읽어옵니다.
+        모든 종목에 데이터가 있는 날짜만 남깁니다 (정렬된 공통 구간).
+
+        :param tickers: 종목 리스트
+        :param column: 읽어올 가격 컬럼 (기본값: 'Close')
+        :param suffix: 테이블 이름 접미사 (기본값: '_daily')
+        :return: DatetimeIndex를 가진 DataFrame, 읽을 수 있는 종목이 없으면 None
+        """
+        if self.conn is None:
+            logging.error("Database connection is not open. Use 'with' statement.")
+            return None
+
+        series = {}
+        for ticker in tickers:
+            table_name = f"{ticker}{suffix}"
+            try:
+                with stage('db_read'):
+                    df = pd.read_sql_query(f'SELECT Date, "{column}" FROM "{table_name}"', self.conn)
+            except Exception as e:
+                logging.error(f"Error reading table '{table_name}': {e}")
+                continue
+            with stage('date_parse'):
+                df['Date'] = pd.to_datetime(df['Date'])
+            series[ticker] = df.set_index('Date')[column]
+
+        if not series:
+            return None
+
+        panel = pd.concat(series, axis=1).sort_index().dropna()
+        logging.info(f"Successfully read price panel: {panel.shape[0]} dates x {panel.shape[1]} tickers.")
+        return panel
+
+    def save_matrix_snapshot(self, table_name: str, key: str, date: str, labels, payload: bytes, meta=None):
+        """
+        행렬 스냅샷(직렬화된 bytes)을 (key, date) 기준으로 저장합니다. 같은 키/날짜는 교체합니다.
+
+        :param table_name: 스냅샷 테이블 이름
+        :param key: 스냅샷 구분자 (예: 'ewma_0.94')
+        :param date: 기준 날짜 문자열 (YYYY-MM-DD)
+        :param labels: 행/열 라벨 리스트 (예: 종목 리스트)
+        :param payload: 직렬화된 행렬 데이터
+        :param meta: 추가 정보 dict (JSON으로 저장)
+        """
+        if self.conn is None:
+            logging.error("Database connection is not open. Use 'with' statement.")
+            return
+
+        self.conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table_name}" ('
+            'key TEXT NOT NULL, date TEXT NOT NULL, labels TEXT NOT NULL, meta TEXT, data BLOB NOT NULL, '
+            'PRIMARY KEY (key, date))'
+        )
+        self.conn.execute(
+            f'INSERT OR REPLACE INTO "{table_name}" (key, date, labels, meta, data) VALUES (?, ?, ?, ?, ?)',
+            (key, date, json.dumps(list(labels)), json.dumps(meta or {}), sqlite3.Binary(payload))
+        )
+        self.conn.commit()
+        logging.info(f"Saved snapshot '{key}' ({date}, {len(payload)} bytes) to '{table_name}'.")
+
+    def load_matrix_snapshot(self, table_name: str, key: str, date: str = None):
+        """
+        저장된 행렬 스냅샷을 읽어옵니다.
+
+        :param date: 기준 날짜 (생략 시 가장 최근 스냅샷, 지정 시 그 날짜 이전의 가장 최근 스냅샷)
+        :return: {'date', 'labels', 'meta', 'data'} dict, 없으면 None
+        """
+        if self.conn is None:
+            logging.error("Database connection is not open. Use 'with' statement.")
+            return None
+
+        query = f'SELECT date, labels, meta, data FROM "{table_name}" WHERE key = ?'
+        params = [key]
+        if date is not None:
+            query += ' AND date <= ?'
+            params.append(date)
+        try:
+            row = self.conn.execute(query + ' ORDER BY date DESC LIMIT 1', params).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if row is None:
+            return None
+        return {'date': row[0], 'labels': json.loads(row[1]), 'meta': json.loads(row[2] or '{}'), 'data': row[3]}
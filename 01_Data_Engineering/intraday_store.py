@@ -0,0 +1,225 @@
+"""
+장중 봉 저장소 (월별 파티션)
+========================================
+분봉은 일봉의 약 400배 행이므로 종목별 테이블 하나에 계속 쌓지 않고 월 단위 테이블로 나눕니다.
+
+    bars_{interval}_{YYYYMM}  (ticker, ts, Open, High, Low, Close, Volume)  PRIMARY KEY (ticker, ts) WITHOUT ROWID
+        ts: UTC epoch 초 (정수 → 날짜 문자열 파싱 없이 읽음, 월 구분도 UTC 기준)
+
+- 기간 조회는 겹치는 파티션만 읽고, 파티션 안에서는 기본키 (ticker, ts) 범위 검색
+- 같은 (ticker, ts)를 다시 수집하면 덮어씀 (INSERT OR REPLACE) → 겹치는 기간을 반복 수집해도 중복 없음
+- 오래된 기간은 파티션 테이블을 통째로 DROP하여 정리 (행 단위 DELETE 없음)
+- materialize: 리샘플한 봉을 {ticker}_{interval} 테이블로 기록 → MarketDataStore(db, suffix='_5m')로
+  일봉과 같은 분석 경로에 연결 (일봉 리샘플은 수집기의 {ticker}_daily와 구분되도록 {ticker}_1d)
+
+사용:
+    python 01_Data_Engineering/intraday_store.py collect --tickers AAPL SPY --interval 1m --period 7d
+    python 01_Data_Engineering/intraday_store.py resample --to 5m 1h 1d
+    python 01_Data_Engineering/intraday_store.py info
+"""
+
+import os
+import re
+import time
+import sqlite3
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+
+from bar_resampler import OHLCV, MARKET_TZ, epoch_seconds, parse_interval, resample_bars, split_frames
+from instrumentation import stage, metrics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'market_data.db')
+
+PARTITION_PATTERN = re.compile(r'^bars_(\w+?)_(\d{6})$')
+
+
+class IntradayStore:
+    """
+    월별 파티션 장중 봉 저장소
+
+    Example:
+        store = IntradayStore(DB_PATH)
+        store.write(bars)                                   # 긴 형식 분봉 (ticker, ts, OHLCV)
+        bars = store.read(['AAPL', 'SPY'], start='2024-01-02')
+        frames = store.materialize('5m')                     # {ticker}_5m 테이블 기록
+    """
+
+    def __init__(self, db_path=DB_PATH, interval='1m'):
+        parse_interval(interval)
+        self.db_path = db_path
+        self.interval = interval
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def partition(self, month):
+        """'YYYYMM' → 파티션 테이블 이름"""
+        return f'bars_{self.interval}_{month}'
+
+    def partitions(self, conn=None):
+        """이 간격의 파티션 {YYYYMM: 테이블 이름} (월순)"""
+        own = conn is None
+        conn = conn or self._connect()
+        try:
+            names = [name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'bars_%'")]
+        finally:
+            if own:
+                conn.close()
+        found = {}
+        for name in names:
+            match = PARTITION_PATTERN.match(name)
+            if match and match.group(1) == self.interval:
+                found[match.group(2)] = name
+        return dict(sorted(found.items()))
+
+    def write(self, bars):
+        """
+        긴 형식 분봉 기록 (ticker, ts(UTC epoch 초 또는 datetime), Open, High, Low, Close, Volume)
+        월별로 나누어 해당 파티션에 INSERT OR REPLACE (한 트랜잭션) → 기록한 행 수
+        """
+        if bars is None or bars.empty:
+            return 0
+        ts = epoch_seconds(bars['ts'])
+        months = ts.astype('M8[s]').astype('M8[M]').astype(np.int64)   # 1970-01 기준 경과 월
+        months = (months // 12 + 1970) * 100 + months % 12 + 1          # YYYYMM 정수
+        records = pd.DataFrame({'ticker': bars['ticker'].to_numpy(), 'ts': ts,
+                                **{column: bars[column].to_numpy(dtype=float) for column in OHLCV}})
+        conn = self._connect()
+        try:
+            with stage('intraday_write'), conn:
+                for month in np.unique(months):
+                    table = self.partition(str(month))
+                    conn.execute(
+                        f'CREATE TABLE IF NOT EXISTS "{table}" (ticker TEXT NOT NULL, ts INTEGER NOT NULL, '
+                        'Open REAL, High REAL, Low REAL, Close REAL, Volume REAL, '
+                        'PRIMARY KEY (ticker, ts)) WITHOUT ROWID')
+                    rows = records[months == month]
+                    conn.executemany(f'INSERT OR REPLACE INTO "{table}" VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                     rows.itertuples(index=False, name=None))
+        finally:
+            conn.close()
+        logging.info(f"Stored {len(records)} {self.interval} bars in {len(np.unique(months))} partition(s).")
+        return len(records)
+
+    def read(self, tickers=None, start=None, end=None):
+        """
+        기간과 겹치는 파티션만 읽어 (ticker, ts) 순 긴 형식 DataFrame 반환 (resample_bars 입력 형식)
+        start/end: datetime 문자열 또는 Timestamp (naive면 UTC, end는 포함)
+        """
+        lo = None if start is None else int(epoch_seconds([pd.Timestamp(start)])[0])
+        hi = None if end is None else int(epoch_seconds([pd.Timestamp(end)])[0])
+        conditions, params = [], []
+        if tickers:
+            conditions.append(f"ticker IN ({', '.join('?' * len(tickers))})")
+            params.extend(tickers)
+        if lo is not None:
+            conditions.append('ts >= ?')
+            params.append(lo)
+        if hi is not None:
+            conditions.append('ts <= ?')
+            params.append(hi)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        first = None if lo is None else pd.Timestamp(lo, unit='s').strftime('%Y%m')
+        last = None if hi is None else pd.Timestamp(hi, unit='s').strftime('%Y%m')
+
+        conn = self._connect()
+        try:
+            chunks = []
+            with stage('intraday_read'):
+                for month, table in self.partitions(conn).items():
+                    if (first is not None and month < first) or (last is not None and month > last):
+                        continue
+                    chunks.append(pd.read_sql_query(
+                        f'SELECT ticker, ts, Open, High, Low, Close, Volume FROM "{table}"{where} ORDER BY ticker, ts',
+                        conn, params=params or None))
+        finally:
+            conn.close()
+        if not chunks:
+            return pd.DataFrame(columns=['ticker', 'ts', *OHLCV])
+        bars = pd.concat(chunks, ignore_index=True)
+        if len(chunks) > 1:
+            # 파티션은 월순 → 종목 코드로 안정 정렬하면 (ticker, ts) 순
+            bars = bars.iloc[np.argsort(pd.factorize(bars['ticker'], sort=True)[0], kind='stable')]
+        return bars.reset_index(drop=True)
+
+    def drop_before(self, month):
+        """'YYYYMM' 이전 파티션 삭제 → 삭제한 테이블 수"""
+        conn = self._connect()
+        try:
+            with conn:
+                dropped = [table for m, table in self.partitions(conn).items() if m < month]
+                for table in dropped:
+                    conn.execute(f'DROP TABLE "{table}"')
+        finally:
+            conn.close()
+        return len(dropped)
+
+    def materialize(self, interval, tickers=None, start=None, end=None, tz=MARKET_TZ, offset=0):
+        """
+        분봉을 interval 봉으로 리샘플하여 {ticker}_{interval} 테이블로 교체 기록
+        Date는 현지 구간 시작 시각 문자열 (1d: 'YYYY-MM-DD', 장중: 'YYYY-MM-DD HH:MM:SS')
+        :return: {ticker: 봉 수}
+        """
+        with stage('intraday_resample'):
+            resampled = resample_bars(self.read(tickers, start, end), interval, tz=tz, offset=offset)
+        if resampled.empty:
+            return {}
+        fmt = '%Y-%m-%d' if parse_interval(interval) >= 86400 else '%Y-%m-%d %H:%M:%S'
+        resampled['Date'] = resampled['Date'].dt.strftime(fmt)
+        suffix = f'_{interval}'
+        counts = {}
+        conn = self._connect()
+        try:
+            with stage('intraday_write'), conn:
+                for ticker, frame in split_frames(resampled).items():
+                    frame.to_sql(f'{ticker}{suffix}', conn, if_exists='replace', index=True, index_label='Date')
+                    counts[ticker] = len(frame)
+        finally:
+            conn.close()
+        logging.info(f"Materialized {len(resampled)} {interval} bars for {len(counts)} tickers ({suffix} tables).")
+        return counts
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='월별 파티션 장중 봉 저장소')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite DB 경로')
+    parser.add_argument('--interval', default='1m', help='저장 간격 (기본 1m)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    collect_parser = sub.add_parser('collect', help='yfinance 장중 봉 수집 → 월별 파티션')
+    collect_parser.add_argument('--tickers', nargs='+', required=True)
+    collect_parser.add_argument('--period', default='7d', help='수집 기간 (1m은 최대 7d)')
+    resample_parser = sub.add_parser('resample', help='{ticker}_{간격} 테이블로 리샘플')
+    resample_parser.add_argument('--to', nargs='+', required=True, help='목표 간격 (예: 5m 1h 1d)')
+    resample_parser.add_argument('--tickers', nargs='*', help='대상 종목 (기본: 전체)')
+    resample_parser.add_argument('--start', help='시작 시각 (UTC)')
+    resample_parser.add_argument('--end', help='종료 시각 (UTC, 포함)')
+    resample_parser.add_argument('--offset', default='0', help="구간 기준 이동 (예: 1h 봉을 09:30에 맞추려면 30m)")
+    sub.add_parser('info', help='파티션별 행 수')
+    args = parser.parse_args()
+
+    store = IntradayStore(args.db, args.interval)
+    if args.command == 'collect':
+        from data_collector import fetch_intraday_bars  # yfinance는 수집할 때만 필요
+        for ticker in args.tickers:
+            bars = fetch_intraday_bars(ticker, args.interval, args.period)
+            if bars is not None:
+                store.write(bars)
+            time.sleep(1)
+    elif args.command == 'resample':
+        offset = int(args.offset) if args.offset.isdigit() else args.offset
+        for interval in args.to:
+            started = time.perf_counter()
+            counts = store.materialize(interval, args.tickers or None, args.start, args.end, offset=offset)
+            print(f"{interval}: {sum(counts.values())} bars, {len(counts)} tickers ({time.perf_counter() - started:.2f}s)")
+    else:
+        conn = sqlite3.connect(args.db)
+        for month, table in store.partitions(conn).items():
+            rows, tickers = conn.execute(f'SELECT COUNT(*), COUNT(DISTINCT ticker) FROM "{table}"').fetchone()
+            print(f"{table}: {rows} rows, {tickers} tickers")
+        conn.close()
+    logging.info("Intraday timings:\n" + metrics.render())
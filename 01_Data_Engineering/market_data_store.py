@@ -0,0 +1,278 @@
+"""
+프로세스 공용 인메모리 시장 데이터 저장소
+========================================
+종목별 일봉 테이블을 한 번만 읽어 (Date 인덱스, 정렬 완료) 메모리에 보관하고,
+DB가 바뀐 경우에만 바뀐 종목을 다시 읽습니다.
+
+변경 감지 (2단계):
+    1) refresh: PRAGMA data_version(다른 연결이 커밋하면 바뀜, 이 저장소의 연결은 읽기 전용)과
+       파일 스탬프(inode, mtime, 크기 — 파일 자체가 교체된 경우)만 확인 → 요청마다 호출해도 쿼리 한 번
+       바뀌었으면 종목 목록만 다시 읽고, 종목별 스탬프는 '미검증'으로 표시 (세대 번호 증가)
+    2) 종목 스탬프 검증: 그 종목을 읽을 때(get/stamp) 해당 종목만, changes_since는 전 종목을
+       세대마다 한 번씩 비교 → 커밋이 연달아 들어와도 요청마다 전 종목 테이블을 다시 훑지 않음
+    종목 스탬프 = (행 수, 마지막 날짜, 컬럼별 값 합, 컬럼별 rowid 가중 합)
+       → 시가/고가/저가/거래량 수정, 합이 같은 종가 수정(값 맞바꿈 등)도 감지
+
+반환되는 DataFrame:
+    pandas Copy-on-Write가 켜져 있으면 (pandas 3은 항상) 캐시의 얕은 복사본 — 호출자가 수정하면
+    그때 복사되므로 캐시는 바뀌지 않음. Copy-on-Write가 꺼진 pandas 2.x에서는 깊은 복사본을 반환
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+import pandas as pd
+from instrumentation import stage, count_cache
+
+# changes_since가 추적하는 최근 변경 기록 수
+CHANGE_LOG_SIZE = 256
+
+
+def _copy_on_write():
+    """pandas Copy-on-Write 활성 여부 (pandas 3은 항상, 2.x는 mode.copy_on_write=True일 때만 — 'warn'은 아님)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except Exception:
+        return False  # 옵션이 없는 pandas 1.x
+
+
+class MarketDataStore:
+    """
+    종목별 OHLCV DataFrame 캐시
+
+    Example:
+        store = MarketDataStore(DB_PATH)
+        spy = store.get('SPY')                      # 첫 호출만 DB 조회
+        frames = store.frames(['AAPL', 'SPY'])      # FamaFrenchAnalyzer 입력
+        version, changed = store.changes_since(0)   # 이후 변경 추적 기준
+    """
+
+    def __init__(self, db_path, suffix='_daily'):
+        self.db_path = db_path
+        self.suffix = suffix
+        self.version = 0          # 캐시 내용이 바뀔 때마다 증가
+        self.updated_at = None    # 마지막으로 종목 변경을 감지한 시각 (time.time())
+        self.data_changed_at = None   # 마지막으로 DB 커밋(어느 테이블이든)을 감지한 시각
+        self._conn = None
+        self._file_stamp = None
+        self._data_version = None
+        self._tickers = None
+        self._frames = {}
+        self._stamps = {}         # 종목 → 마지막으로 검증한 테이블 스탬프 (캐시되지 않은 종목 포함)
+        self._epoch = 0           # DB 커밋을 감지할 때마다 증가
+        self._checked = {}        # 종목 → 스탬프를 검증한 세대
+        self._change_log = []     # [(version, 바뀐 종목 집합)] → changes_since
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        """서버 스레드들이 공유하는 지속 연결 (접근은 self._lock으로 직렬화)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            logging.info(f"Market data store connected to {self.db_path}")
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _table_stamp(self, ticker):
+        """
+        종목 테이블 요약 (행 수, 마지막 날짜, 컬럼별 합, 컬럼별 rowid 가중 합) → 내용 변경 감지용
+        테이블이 없으면 None
+        """
+        table = f'{ticker}{self.suffix}'
+        try:
+            conn = self._connect()
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+            if not columns:
+                return None
+            sums = []
+            for column in columns:
+                value = 'julianday("Date")' if column == 'Date' else f'"{column}"'
+                sums.append(f'TOTAL({value}), TOTAL({value} * rowid)')
+            return conn.execute(f'SELECT COUNT(*), MAX(Date), {", ".join(sums)} FROM "{table}"').fetchone()
+        except sqlite3.Error:
+            return None
+
+    def refresh(self):
+        """
+        DB 커밋 여부만 확인 (PRAGMA data_version + 파일 스탬프)
+        바뀌었으면 종목 목록을 다시 읽고 종목 스탬프를 미검증으로 표시 (추가/삭제된 종목은 바로 변경으로 기록)
+        :return: 마지막 확인 이후 커밋이 있었으면 True
+        """
+        with self._lock:
+            file_stamp = self._stat()
+            if file_stamp is not None and self._file_stamp is not None and file_stamp[0] != self._file_stamp[0]:
+                # 파일이 교체됨 → 기존 연결은 옛 파일을 가리키므로 다시 연결
+                self.close()
+            data_version = self._connect().execute('PRAGMA data_version').fetchone()[0]
+            if (file_stamp, data_version) == (self._file_stamp, self._data_version) and self._tickers is not None:
+                return False
+
+            first = self._file_stamp is None
+            previous = set(self._tickers or [])
+            cursor = self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?", (f'%{self.suffix}',)
+            )
+            self._tickers = sorted(name[:-len(self.suffix)] for (name,) in cursor.fetchall()
+                                   if name.endswith(self.suffix))
+            self._epoch += 1
+            self._file_stamp, self._data_version = file_stamp, data_version
+            self.data_changed_at = time.time()
+            if first:
+                self.updated_at = time.time()
+                return True
+
+            removed = previous - set(self._tickers)
+            for ticker in removed:
+                self._forget(ticker)
+            self._record(removed | (set(self._tickers) - previous))
+            return True
+
+    def data_token(self):
+        """
+        DB 커밋 토큰 (파일 스탬프 + PRAGMA data_version) — 어느 테이블이든 커밋되면 바뀜 (HTTP ETag용)
+        :return: (토큰 문자열, 마지막으로 커밋을 감지한 시각 time.time())
+        """
+        with self._lock:
+            self.refresh()
+            ino, mtime_ns, size = self._file_stamp or (0, 0, 0)
+            return f'{ino:x}.{mtime_ns:x}.{size:x}.{self._data_version}', self.data_changed_at
+
+    def _forget(self, ticker):
+        self._frames.pop(ticker, None)
+        self._stamps.pop(ticker, None)
+        self._checked.pop(ticker, None)
+
+    def _record(self, changed):
+        """바뀐 종목을 새 version으로 기록"""
+        if not changed:
+            return
+        self.updated_at = time.time()
+        self.version += 1
+        self._change_log.append((self.version, frozenset(changed)))
+        del self._change_log[:-CHANGE_LOG_SIZE]
+        logging.info(f"Market data changed: {len(changed)} tickers invalidated (version {self.version}).")
+
+    def _verify(self, ticker):
+        """
+        (잠금 안, refresh 이후) 이번 세대에 아직 검증하지 않은 종목의 스탬프를 비교
+        :return: 이전에 검증한 스탬프와 달라졌으면 True (캐시 무효화, 변경 기록은 호출자가 _record)
+        """
+        if self._checked.get(ticker) == self._epoch:
+            return False
+        stamp = self._table_stamp(ticker)
+        known = ticker in self._stamps
+        changed = known and stamp != self._stamps[ticker]
+        if changed:
+            self._frames.pop(ticker, None)
+        if stamp is None:
+            self._stamps.pop(ticker, None)
+        else:
+            self._stamps[ticker] = stamp
+        self._checked[ticker] = self._epoch
+        return changed
+
+    def changes_since(self, version):
+        """
+        version 이후 바뀐 종목 (요청 처리 중 get/stamp가 먼저 감지한 변경도 놓치지 않도록 기록에서 조회)
+        커밋이 있었으면 전 종목 스탬프를 이번 세대에 한 번 검증 (처음 호출하면 비교 기준만 기록)
+        :return: (현재 version, 바뀐 종목 집합)
+        """
+        with self._lock:
+            self.refresh()
+            self._record({ticker for ticker in self._tickers if self._verify(ticker)})
+            if self._change_log and self._change_log[0][0] > version + 1:
+                # 기록이 잘려 나간 구간 → 전체 종목을 바뀐 것으로 간주
+                return self.version, set(self._tickers)
+            changed = set()
+            for logged_version, tickers in self._change_log:
+                if logged_version > version:
+                    changed |= tickers
+            return self.version, changed
+
+    def tickers(self):
+        """DB에 있는 종목 리스트 (정렬됨)"""
+        with self._lock:
+            self.refresh()
+            return list(self._tickers)
+
+    def stamp(self, ticker):
+        """
+        종목 테이블의 현재 스탬프, 테이블이 없으면 None
+        이번 세대에 검증한 종목은 저장된 값을 그대로 쓰고, 나머지는 집계 쿼리 한 번 (DataFrame은 읽지 않음)
+        """
+        with self._lock:
+            self.refresh()
+            if self._verify(ticker):
+                self._record({ticker})
+            return self._stamps.get(ticker)
+
+    def _load(self, ticker):
+        stamp = self._stamps.get(ticker)
+        if stamp is None:
+            return None
+        with stage('db_read'):
+            df = pd.read_sql_query(f'SELECT * FROM "{ticker}{self.suffix}"', self._connect())
+        if df.empty:
+            return None
+        with stage('date_parse'):
+            df['Date'] = pd.to_datetime(df['Date'])
+        df = df.sort_values('Date').set_index('Date')
+        self._frames[ticker] = df
+        return df
+
+    def _get(self, ticker, deep):
+        """(잠금 안, refresh 이후) 검증된 캐시 또는 DB에서 읽은 DataFrame의 복사본"""
+        if self._verify(ticker):
+            self._record({ticker})
+        df = self._frames.get(ticker)
+        count_cache('market_store', 'miss' if df is None else 'hit')
+        if df is None:
+            df = self._load(ticker)
+        return None if df is None else df.copy(deep=deep)
+
+    def get(self, ticker):
+        """
+        종목의 OHLCV DataFrame (DatetimeIndex, 날짜순)
+        :return: 캐시의 복사본 (Copy-on-Write면 얕은 복사), 종목이 없으면 None
+        """
+        with self._lock:
+            self.refresh()
+            return self._get(ticker, deep=not _copy_on_write())
+
+    def frames(self, tickers=None):
+        """{ticker: DataFrame} (FamaFrenchAnalyzer의 market_data_dict 형식), 없는 종목은 제외"""
+        deep = not _copy_on_write()
+        with self._lock:
+            self.refresh()
+            tickers = list(self._tickers) if tickers is None else tickers
+            result = {}
+            for ticker in tickers:
+                df = self._get(ticker, deep)
+                if df is not None:
+                    result[ticker] = df
+            return result
+
+    def panel(self, tickers=None, column='Close'):
+        """
+        모든 종목에 데이터가 있는 날짜로 정렬된 가격 패널 (dates × tickers)
+        DatabaseManager.read_price_panel과 같은 형식, 읽을 수 있는 종목이 없으면 None
+        """
+        frames = self.frames(tickers)
+        if not frames:
+            return None
+        return pd.concat({ticker: df[column] for ticker, df in frames.items()}, axis=1).sort_index().dropna()
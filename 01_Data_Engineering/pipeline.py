@@ -0,0 +1,640 @@
+"""
+분석 파이프라인: 수집 → 검증 → 수익률 → 시계열 통계 / 팩터 회귀 / 포트폴리오 → 결과 테이블
+========================================
+단계(Stage)의 의존 관계로 DAG를 구성하고 선행 단계가 끝난 단계부터 실행합니다.
+서로 독립인 단계(statistics, factors, portfolio)는 동시에 진행되고, 단계 안의 종목별 작업은
+단계에 지정된 실행기(메인 스레드 / 스레드 풀 / 프로세스 풀)에서 병렬로 처리됩니다.
+
+    collect ─► validate ─► returns ─┬─► statistics
+                                    ├─► factors
+                                    └─► portfolio
+
+증분 실행과 재개:
+    - 작업(단계, 키)마다 입력 지문 = (단계 버전, 옵션, 입력 테이블 스탬프)을 pipeline_state에 기록
+      → 다음 실행에서 지문이 같고 완료된 작업은 건너뜀 (입력이 바뀐 종목만 다시 계산)
+    - 테이블 스탬프는 MarketDataStore.stamp (행 수, 마지막 날짜, 컬럼별 합과 rowid 가중 합)
+    - 작업 결과와 상태 행은 한 트랜잭션으로 커밋 → 중간에 실패/중단해도 완료된 작업은 남고,
+      다시 실행하면 실패했거나 남은 작업만 이어서 진행
+    - 선행 작업이 실패한 종목의 후속 작업은 실행하지 않음 (blocked)
+    - statistics는 직전 결과에 기록된 종목별 GARCH 추정치에서 최적화를 시작 (warm start)
+
+결과 테이블 (이름이 _daily로 끝나지 않으므로 종목 목록에 섞이지 않음):
+    analytics_returns(ticker, Date, return)              일일 단순 수익률
+    analytics_results(section, key, source, data, computed_at)
+        section: validation | tickers | factors | portfolio, data: API 응답과 같은 JSON
+        source: 입력 테이블 스탬프 지문 → 서버(MaterializedResults)는 현재 DB와 같을 때만 사용
+    pipeline_state(stage, key, fingerprint, status, error, duration, updated_at)
+
+사용:
+    python 01_Data_Engineering/pipeline.py run                        # DB의 전 종목 (수집 제외)
+    python 01_Data_Engineering/pipeline.py run --collect              # yfinance 수집부터
+    python 01_Data_Engineering/pipeline.py run --stages factors       # factors와 선행 단계만
+    python 01_Data_Engineering/pipeline.py run --force statistics     # 지문과 무관하게 다시 계산
+    python 01_Data_Engineering/pipeline.py status
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from market_data_store import MarketDataStore
+from instrumentation import metrics, stage, count_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYSIS_PATH = os.path.join(os.path.dirname(BASE_DIR), '02_Financial_Analysis')
+if ANALYSIS_PATH not in sys.path:
+    sys.path.insert(0, ANALYSIS_PATH)
+
+DB_PATH = os.path.join(BASE_DIR, 'market_data.db')
+MARKET_TICKER = 'SPY'
+RISK_FREE_RATE = 0.05
+PORTFOLIO_KEY = 'equal_weight'
+
+STATE_TABLE = 'pipeline_state'
+RESULTS_TABLE = 'analytics_results'
+RETURNS_TABLE = 'analytics_returns'
+
+REQUIRED_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+SCHEMA = (
+    f'CREATE TABLE IF NOT EXISTS "{STATE_TABLE}" ('
+    'stage TEXT NOT NULL, key TEXT NOT NULL, fingerprint TEXT NOT NULL, status TEXT NOT NULL, '
+    'error TEXT, duration REAL, updated_at TEXT NOT NULL, PRIMARY KEY (stage, key))',
+    f'CREATE TABLE IF NOT EXISTS "{RESULTS_TABLE}" ('
+    'section TEXT NOT NULL, key TEXT NOT NULL, source TEXT NOT NULL, data TEXT NOT NULL, '
+    'computed_at TEXT NOT NULL, PRIMARY KEY (section, key))',
+    f'CREATE TABLE IF NOT EXISTS "{RETURNS_TABLE}" ('
+    'ticker TEXT NOT NULL, Date TEXT NOT NULL, "return" REAL NOT NULL, PRIMARY KEY (ticker, Date)) WITHOUT ROWID',
+)
+
+
+def source_fingerprint(stamps):
+    """[(종목, 테이블 스탬프)] → 지문 (파이프라인과 서버가 같은 방식으로 계산)"""
+    payload = json.dumps([[ticker, list(stamp) if stamp else None] for ticker, stamp in stamps],
+                         separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class Stage:
+    """
+    파이프라인 단계
+
+    Args:
+        name: 단계 이름 (pipeline_state.stage)
+        deps: 선행 단계 이름
+        executor: 작업 실행 위치 — 'inline'(메인 스레드, 가벼운 DB 작업), 'thread'(I/O), 'process'(CPU)
+        version: 계산 로직/결과 형식이 바뀌면 올림 → 이 단계의 모든 작업 지문이 바뀌어 다시 계산
+    """
+
+    def __init__(self, name, deps, executor, version=1):
+        self.name = name
+        self.deps = tuple(deps)
+        self.executor = executor
+        self.version = version
+
+
+STAGES = {stage_.name: stage_ for stage_ in (
+    Stage('collect', (), 'thread'),                 # yfinance 일봉 수집 → {ticker}_daily
+    Stage('validate', ('collect',), 'inline'),      # 스키마/날짜/가격 검증 → validation
+    Stage('returns', ('validate',), 'inline'),      # 일일 수익률 → analytics_returns
+    Stage('statistics', ('returns',), 'process'),   # analyze_ticker 전체 분석 → tickers
+    Stage('factors', ('returns',), 'process'),      # Fama-French 회귀 → factors
+    Stage('portfolio', ('returns',), 'process'),    # 등가중 포트폴리오 회귀 → portfolio
+)}
+
+
+# ---------------------------------------------------------------------------
+# 작업 함수 (프로세스 풀로 보낼 수 있도록 모듈 수준 함수, 인자는 pickle 가능한 값만)
+# ---------------------------------------------------------------------------
+
+_stores = {}
+
+
+def _store(db_path):
+    """프로세스별 MarketDataStore (워커는 첫 작업에서 생성 → 시장 종목 DataFrame을 작업 간 재사용)"""
+    store = _stores.get(db_path)
+    if store is None:
+        store = _stores[db_path] = MarketDataStore(db_path)
+    return store
+
+
+def _execute(func, args, drain):
+    """작업 실행 → (결과, 워커 계측값, 소요 시간) — 프로세스 워커의 계측값은 부모에서 merge"""
+    started = time.perf_counter()
+    with stage(f'pipeline_{func.__name__}'):
+        result = func(*args)
+    return result, metrics.drain() if drain else None, time.perf_counter() - started
+
+
+def collect_task(ticker, start, end):
+    from data_collector import fetch_stock_data  # yfinance는 수집 단계에서만 필요
+    df = fetch_stock_data(ticker, start, end)
+    if df is None:
+        raise ValueError(f'No data downloaded for {ticker}')
+    return df
+
+
+def validate_task(db_path, ticker):
+    """검증 보고서 {ticker, rows, start, end, max_gap_days, errors, warnings, valid}"""
+    df = _store(db_path).get(ticker)
+    if df is None or df.empty:
+        return {'ticker': ticker, 'rows': 0, 'start': None, 'end': None, 'max_gap_days': None,
+                'errors': ['table is empty'], 'warnings': [], 'valid': False}
+    errors, warnings = [], []
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        errors.append(f"missing columns: {', '.join(missing)}")
+    if df.index.hasnans:
+        errors.append('unparseable dates')
+    duplicated = int(df.index.duplicated().sum())
+    if duplicated:
+        errors.append(f'{duplicated} duplicated dates')
+    if 'Close' in df.columns:
+        close = df['Close'].to_numpy(dtype=float)
+        bad = int((~np.isfinite(close) | (close <= 0)).sum())
+        if bad:
+            errors.append(f'{bad} missing or non-positive closes')
+    present = [column for column in REQUIRED_COLUMNS if column in df.columns and column != 'Close']
+    nans = int(df[present].isna().sum().sum()) if present else 0
+    if nans:
+        warnings.append(f'{nans} missing values in {", ".join(present)}')
+    if 'High' in df.columns and 'Low' in df.columns:
+        inverted = int((df['High'] < df['Low']).sum())
+        if inverted:
+            warnings.append(f'{inverted} rows with High < Low')
+    gaps = df.index.to_series().diff().dt.days
+    max_gap = int(gaps.max()) if len(df) > 1 else 0
+    if max_gap > 7:
+        warnings.append(f'{max_gap}-day gap in dates')
+    return {
+        'ticker': ticker,
+        'rows': len(df),
+        'start': df.index[0].strftime('%Y-%m-%d'),
+        'end': df.index[-1].strftime('%Y-%m-%d'),
+        'max_gap_days': max_gap,
+        'errors': errors,
+        'warnings': warnings,
+        'valid': not errors,
+    }
+
+
+def returns_task(db_path, ticker):
+    """[(ticker, Date, return)] — 첫 행과 종가 결측 구간은 제외"""
+    close = _store(db_path).get(ticker)['Close']
+    returns = close.pct_change().dropna()
+    return list(zip([ticker] * len(returns), returns.index.strftime('%Y-%m-%d'), returns.to_numpy(dtype=float).tolist()))
+
+
+def statistics_task(db_path, ticker, previous=None):
+    """
+    서버 get_ticker_data(ticker)와 같은 기본 옵션의 analyze_ticker 결과
+    previous: 직전 결과의 GARCH 추정치 {'model', 'params'} → warm start (결과 지문에는 포함하지 않음)
+    """
+    from analyzer_engine import TimeSeriesAnalyzer
+    df = _store(db_path).get(ticker)
+    result = TimeSeriesAnalyzer.analyze_ticker(df.reset_index(), ticker=ticker, previous=previous)
+    if result is None:
+        raise ValueError(f'Analysis failed for {ticker}')
+    return result
+
+
+def factor_task(db_path, ticker, market_ticker, risk_free_rate):
+    """서버 compute_factor_analysis(ticker)와 같은 응답"""
+    from factor_model import FamaFrenchAnalyzer
+    frames = _store(db_path).frames([ticker, market_ticker])
+    result = FamaFrenchAnalyzer(frames, risk_free_rate_annual=risk_free_rate).analyze_asset(ticker, market_ticker=market_ticker)
+    if 'error' in result:
+        raise ValueError(result['error'])
+    return {'ticker': ticker, **FamaFrenchAnalyzer.summarize(result)}
+
+
+def portfolio_task(db_path, tickers, market_ticker, risk_free_rate):
+    """서버 compute_portfolio_analysis()와 같은 응답 (등가중)"""
+    from factor_model import FamaFrenchAnalyzer
+    if len(tickers) < 2:
+        raise ValueError('Need at least 2 tickers for portfolio analysis')
+    frames = _store(db_path).frames(list(tickers) + [market_ticker])
+    result = FamaFrenchAnalyzer(frames, risk_free_rate_annual=risk_free_rate).analyze_portfolio(list(tickers), market_ticker=market_ticker)
+    if 'error' in result:
+        raise ValueError(result['error'])
+    return {'portfolio': result['portfolio'], 'weights': result['weights'], **FamaFrenchAnalyzer.summarize(result)}
+
+
+# ---------------------------------------------------------------------------
+# 실행기
+# ---------------------------------------------------------------------------
+
+class Pipeline:
+    """
+    DAG 실행기
+
+    Args:
+        db_path: SQLite DB (입력 종목 테이블과 결과 테이블을 같은 파일에 둠)
+        tickers: 대상 종목 (None이면 DB의 전 종목, 시장 종목은 항상 포함)
+        collect: True면 collect 단계 실행 (start/end 기간, 종목 기본값은 data_collector.TICKERS)
+        workers: 프로세스 풀 크기 (statistics/factors/portfolio)
+        collect_workers: 수집 스레드 수 (API 서버 부하를 고려해 작게)
+
+    Example:
+        summary = Pipeline(DB_PATH).run()                   # 바뀐 종목만 다시 계산
+        summary = Pipeline(DB_PATH).run(['factors'])        # factors와 선행 단계만
+    """
+
+    def __init__(self, db_path=DB_PATH, tickers=None, collect=False, start=None, end=None,
+                 market_ticker=MARKET_TICKER, risk_free_rate=RISK_FREE_RATE, workers=None, collect_workers=2):
+        self.db_path = db_path
+        self.tickers = sorted(set(tickers)) if tickers else None
+        self.collect = collect
+        self.start = start
+        self.end = end
+        self.market_ticker = market_ticker
+        self.risk_free_rate = risk_free_rate
+        self.workers = workers or os.cpu_count() or 1
+        self.collect_workers = collect_workers
+        self.store = _store(db_path)
+        self.ok = set()               # 이번 실행에서 완료(또는 최신이라 건너뛴) (단계, 키)
+        self._conn = sqlite3.connect(db_path, timeout=60, check_same_thread=False)
+        self._write_lock = threading.Lock()
+        self._pools = {}
+        self._pool_lock = threading.Lock()
+        with self._write_lock:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+        self._pools.clear()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # ---- 실행 계획 ----
+
+    def stages(self, targets=None):
+        """실행할 단계 (targets와 그 선행 단계, 정의 순서), collect는 collect=True일 때만"""
+        targets = list(STAGES) if not targets else list(targets)
+        unknown = [name for name in targets if name not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stages: {unknown} (choose from {list(STAGES)})")
+        selected, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected.add(name)
+                stack.extend(STAGES[name].deps)
+        if not self.collect:
+            selected.discard('collect')
+        return [name for name in STAGES if name in selected]
+
+    def universe(self):
+        """대상 종목 (DB에 있는 종목 중 tickers, 시장 종목 포함)"""
+        available = self.store.tickers()
+        if self.tickers is None:
+            return available
+        return [ticker for ticker in available if ticker in set(self.tickers) | {self.market_ticker}]
+
+    def _task(self, key, func, args, sources=(), requires=(), params=None):
+        return {'key': key, 'func': func, 'args': args, 'sources': list(sources),
+                'requires': list(requires), 'params': params or {}}
+
+    def _requires(self, name, key):
+        """key 작업이 기다려야 하는 선행 작업 (이번 실행에 포함된 선행 단계만)"""
+        return [(dep, key) for dep in STAGES[name].deps if dep != 'collect' or self.collect]
+
+    def plan(self, name):
+        """단계의 작업 목록 (선행 단계가 끝난 뒤 호출 → 수집/갱신된 테이블 스탬프를 반영)"""
+        if name == 'collect':
+            from data_collector import TICKERS, START_DATE, END_DATE
+            start, end = self.start or START_DATE, self.end or END_DATE
+            return [self._task(ticker, collect_task, (ticker, start, end), params={'start': start, 'end': end})
+                    for ticker in self.tickers or TICKERS]
+
+        tickers = self.universe()
+        if name == 'validate':
+            if self.tickers is None:
+                self._prune(tickers)
+            return [self._task(t, validate_task, (self.db_path, t), [t], self._requires(name, t)) for t in tickers]
+        if name == 'returns':
+            return [self._task(t, returns_task, (self.db_path, t), [t], self._requires(name, t)) for t in tickers]
+        if name == 'statistics':
+            previous = self._volatility_params()
+            return [self._task(t, statistics_task, (self.db_path, t, previous.get(t)), [t], self._requires(name, t))
+                    for t in tickers]
+
+        params = {'market': self.market_ticker, 'risk_free_rate': self.risk_free_rate}
+        if name == 'factors':
+            return [self._task(t, factor_task, (self.db_path, t, self.market_ticker, self.risk_free_rate),
+                               [t, self.market_ticker], [('returns', t), ('returns', self.market_ticker)], params)
+                    for t in tickers]
+        if name == 'portfolio':
+            members = [t for t in tickers if t != self.market_ticker and ('returns', t) in self.ok]
+            sources = members + [self.market_ticker]
+            return [self._task(PORTFOLIO_KEY, portfolio_task, (self.db_path, members, self.market_ticker, self.risk_free_rate),
+                               sources, [('returns', self.market_ticker)], params)]
+        raise ValueError(f'Unknown stage: {name}')
+
+    def _volatility_params(self):
+        """직전 statistics 결과의 GARCH 추정치 {ticker: {'model', 'params'}} (변동성 시계열은 읽지 않음)"""
+        try:
+            rows = self._conn_read(
+                f"SELECT key, json_extract(data, '$.volatility.model'), json_extract(data, '$.volatility.params') "
+                f'FROM "{RESULTS_TABLE}" WHERE section = ?', ('tickers',))
+        except sqlite3.Error:
+            return {}  # JSON1 확장이 없는 SQLite → warm start 없이 계산
+        return {key: {'model': model, 'params': json.loads(params)} for key, model, params in rows if params}
+
+    def _prune(self, tickers):
+        """DB에서 사라진 종목의 결과/상태 삭제 (전 종목 실행일 때만)"""
+        current = set(tickers)
+        with self._write_lock:
+            stale = [key for (key,) in self._conn.execute(
+                f'SELECT DISTINCT key FROM "{STATE_TABLE}" WHERE stage NOT IN (?, ?)', ('collect', 'portfolio'))
+                if key not in current]
+            for key in stale:
+                self._conn.execute(f'DELETE FROM "{STATE_TABLE}" WHERE key = ? AND stage != ?', (key, 'collect'))
+                self._conn.execute(f'DELETE FROM "{RESULTS_TABLE}" WHERE key = ? AND section != ?', (key, 'portfolio'))
+                self._conn.execute(f'DELETE FROM "{RETURNS_TABLE}" WHERE ticker = ?', (key,))
+            self._conn.commit()
+        if stale:
+            logging.info(f"Pruned results for {len(stale)} removed tickers: {', '.join(stale)}")
+
+    def fingerprint(self, name, task):
+        """작업 입력 지문 → (작업 지문, 입력 테이블 지문)"""
+        source = source_fingerprint([(ticker, self.store.stamp(ticker)) for ticker in task['sources']])
+        payload = json.dumps([name, STAGES[name].version, task['params'], source], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest(), source
+
+    # ---- 실행 ----
+
+    def run(self, targets=None, force=()):
+        """
+        DAG 실행 → {단계: {'done', 'skipped', 'failed', 'blocked', 'elapsed'}}
+        :param targets: 실행할 단계 (선행 단계 포함, 기본값: 전체)
+        :param force: 지문과 무관하게 다시 실행할 단계 ('all'이면 전체)
+        """
+        names = self.stages(targets)
+        force = set(names) if 'all' in force else set(force)
+        summary, finished, pending, running = {}, set(), list(names), {}
+        # 단계마다 스레드 하나: 작업은 공유 스레드/프로세스 풀로 보내고 결과 기록만 담당
+        with ThreadPoolExecutor(max_workers=len(names) or 1, thread_name_prefix='pipeline-stage') as stage_pool:
+            while pending or running:
+                ready = [name for name in pending if all(dep in finished or dep not in names for dep in STAGES[name].deps)]
+                for name in ready:
+                    pending.remove(name)
+                    running[stage_pool.submit(self._run_stage, name, name in force)] = name
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    name = running.pop(future)
+                    summary[name] = future.result()
+                    finished.add(name)
+        return {name: summary[name] for name in names}
+
+    def _pool(self, kind):
+        with self._pool_lock:
+            pool = self._pools.get(kind)
+            if pool is None:
+                if kind == 'process':
+                    # 단계 스레드들이 잠금을 쥔 채로 fork되면 워커가 멈출 수 있으므로 spawn으로 시작
+                    pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+                else:
+                    pool = ThreadPoolExecutor(max_workers=self.collect_workers, thread_name_prefix='pipeline-io')
+                self._pools[kind] = pool
+            return pool
+
+    def _run_stage(self, name, force=False):
+        started = time.perf_counter()
+        counts = {'done': 0, 'skipped': 0, 'failed': 0, 'blocked': 0}
+        state = {key: (fingerprint, status) for key, fingerprint, status in self._conn_read(
+            f'SELECT key, fingerprint, status FROM "{STATE_TABLE}" WHERE stage = ?', (name,))}
+
+        submitted = []
+        for task in self.plan(name):
+            key = task['key']
+            if any(required not in self.ok for required in task['requires']):
+                counts['blocked'] += 1
+                continue
+            fingerprint, source = self.fingerprint(name, task)
+            if not force and state.get(key) == (fingerprint, 'done'):
+                counts['skipped'] += 1
+                self.ok.add((name, key))
+                continue
+            submitted.append((task, fingerprint, source))
+
+        executor = STAGES[name].executor
+        logging.info(f"[{name}] {len(submitted)} tasks to run ({counts['skipped']} up to date, {counts['blocked']} blocked)")
+        if executor == 'inline':
+            outcomes = ((item, self._inline(item[0])) for item in submitted)
+        else:
+            pool = self._pool(executor)
+            futures = {pool.submit(_execute, item[0]['func'], item[0]['args'], executor == 'process'): item
+                       for item in submitted}
+            outcomes = ((futures[future], future) for future in _as_completed(futures))
+
+        for (task, fingerprint, source), future in outcomes:
+            try:
+                result, worker_metrics, duration = future.result()
+                metrics.merge(worker_metrics)
+                error = self._write(name, task['key'], result, source)
+            except Exception as e:
+                error, duration = f'{type(e).__name__}: {e}', None
+            self._record(name, task['key'], fingerprint, error, duration)
+            if error:
+                counts['failed'] += 1
+                logging.warning(f"[{name}] {task['key']} failed: {error}")
+            else:
+                counts['done'] += 1
+                self.ok.add((name, task['key']))
+
+        counts['elapsed'] = round(time.perf_counter() - started, 3)
+        logging.info(f"[{name}] finished: {counts}")
+        return counts
+
+    def _inline(self, task):
+        """inline 단계 작업을 즉시 실행하고 Future와 같은 인터페이스로 반환"""
+        future = _Done()
+        try:
+            future.value = _execute(task['func'], task['args'], False)
+        except Exception as e:
+            future.error = e
+        return future
+
+    def _conn_read(self, query, params=()):
+        with self._write_lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def _write(self, name, key, result, source):
+        """작업 결과 기록 (상태 행과 같은 트랜잭션, _record에서 커밋) → 실패 사유 또는 None"""
+        now = datetime.now().isoformat()
+        with self._write_lock:
+            if name == 'collect':
+                result.to_sql(f'{key}_daily', self._conn, if_exists='replace', index=False)
+            elif name == 'returns':
+                self._conn.execute(f'DELETE FROM "{RETURNS_TABLE}" WHERE ticker = ?', (key,))
+                self._conn.executemany(f'INSERT INTO "{RETURNS_TABLE}" (ticker, Date, "return") VALUES (?, ?, ?)', result)
+            else:
+                section = {'validate': 'validation', 'statistics': 'tickers'}.get(name, name)
+                self._conn.execute(
+                    f'INSERT OR REPLACE INTO "{RESULTS_TABLE}" (section, key, source, data, computed_at) VALUES (?, ?, ?, ?, ?)',
+                    (section, key, source, json.dumps(result, ensure_ascii=False), now))
+        if name == 'validate' and not result['valid']:
+            return '; '.join(result['errors'])
+        return None
+
+    def _record(self, name, key, fingerprint, error, duration):
+        with self._write_lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO "{STATE_TABLE}" (stage, key, fingerprint, status, error, duration, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (name, key, fingerprint, 'failed' if error else 'done', error, duration, datetime.now().isoformat()))
+            self._conn.commit()
+
+    def status(self):
+        """단계별 상태 요약 → {단계: {'done': n, 'failed': n, 'updated_at': ISO, 'errors': {키: 사유}}}"""
+        summary = {}
+        for name, status, count, updated_at in self._conn_read(
+                f'SELECT stage, status, COUNT(*), MAX(updated_at) FROM "{STATE_TABLE}" GROUP BY stage, status'):
+            entry = summary.setdefault(name, {'done': 0, 'failed': 0, 'updated_at': None, 'errors': {}})
+            entry[status] = count
+            entry['updated_at'] = max(filter(None, (entry['updated_at'], updated_at)))
+        for name, key, error in self._conn_read(
+                f'SELECT stage, key, error FROM "{STATE_TABLE}" WHERE status = ? ORDER BY stage, key', ('failed',)):
+            summary[name]['errors'][key] = error
+        return {name: summary[name] for name in STAGES if name in summary}
+
+
+class _Done:
+    """inline 실행 결과 (Future.result와 같은 방식으로 값을 돌려주거나 예외를 다시 발생)"""
+    value = None
+    error = None
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _as_completed(futures):
+    """완료되는 순서대로 (실패한 Future도 포함) — 결과 기록은 호출한 단계 스레드에서"""
+    remaining = set(futures)
+    while remaining:
+        completed, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+        yield from completed
+
+
+# ---------------------------------------------------------------------------
+# 서버용 조회
+# ---------------------------------------------------------------------------
+
+class MaterializedResults:
+    """
+    파이프라인이 기록한 analytics_results 조회 (기본키 조회 한 번 + 입력 테이블 스탬프 비교)
+    행의 source 지문이 현재 DB 스탬프와 같을 때만 결과를 반환 → 파이프라인 이후 DB가 바뀌었으면 None
+
+    Example:
+        materialized = MaterializedResults(DB_PATH, market_store)
+        data = materialized.get('tickers', 'AAPL', ['AAPL'])
+        factor = materialized.get('factors', 'AAPL', ['AAPL', 'SPY'])
+    """
+
+    def __init__(self, db_path, market_store):
+        self.db_path = db_path
+        self.market_store = market_store
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def lookup(self, section, key, sources):
+        """
+        :param section: 'tickers' | 'factors' | 'portfolio' | 'validation'
+        :param sources: 결과가 의존하는 종목 (파이프라인 작업과 같은 순서)
+        :return: (저장된 응답 dict, 계산 시각 ISO), 없거나 오래되었으면 None
+        """
+        with self._lock:
+            try:
+                if self._conn is None:
+                    self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                row = self._conn.execute(f'SELECT source, data, computed_at FROM "{RESULTS_TABLE}" '
+                                         'WHERE section = ? AND key = ?', (section, key)).fetchone()
+            except sqlite3.Error:
+                row = None  # 파이프라인을 실행한 적 없는 DB (결과 테이블 없음)
+        if row is None or row[0] != source_fingerprint([(t, self.market_store.stamp(t)) for t in sources]):
+            count_cache('materialized', 'miss')
+            return None
+        count_cache('materialized', 'hit')
+        return json.loads(row[1]), row[2]
+
+    def get(self, section, key, sources):
+        """lookup의 응답 dict만 (없거나 오래되었으면 None)"""
+        found = self.lookup(section, key, sources)
+        return None if found is None else found[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _print_summary(summary):
+    print(f"\n{'stage':<12}{'done':>8}{'skipped':>9}{'failed':>8}{'blocked':>9}{'elapsed':>10}")
+    for name, counts in summary.items():
+        print(f"{name:<12}{counts['done']:>8}{counts['skipped']:>9}{counts['failed']:>8}{counts['blocked']:>9}"
+              f"{counts['elapsed']:>9.2f}s")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='수집 → 검증 → 수익률 → 통계/팩터 회귀 → 결과 테이블 파이프라인')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite DB 경로')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='파이프라인 실행 (입력이 바뀐 작업만)')
+    run_parser.add_argument('--stages', help=f"실행할 단계 (쉼표 구분, 선행 단계 포함) — {', '.join(STAGES)}")
+    run_parser.add_argument('--tickers', help='대상 종목 (쉼표 구분, 기본값: DB의 전 종목)')
+    run_parser.add_argument('--collect', action='store_true', help='yfinance 수집 단계 포함')
+    run_parser.add_argument('--start', help='수집 시작일 (기본값: data_collector.START_DATE)')
+    run_parser.add_argument('--end', help='수집 종료일 (기본값: data_collector.END_DATE)')
+    run_parser.add_argument('--force', action='append', default=[], help="지문과 무관하게 다시 실행할 단계 (반복 가능, 'all')")
+    run_parser.add_argument('--workers', type=int, help='프로세스 풀 크기 (기본값: CPU 수)')
+    run_parser.add_argument('--collect-workers', type=int, default=2, help='수집 스레드 수')
+
+    sub.add_parser('status', help='단계별 완료/실패 작업 수')
+    args = parser.parse_args()
+
+    if args.command == 'status':
+        with Pipeline(args.db) as pipeline:
+            status = pipeline.status()
+        if not status:
+            print('No pipeline runs recorded.')
+        for name, entry in status.items():
+            print(f"{name:<12} done {entry['done']:>5}  failed {entry['failed']:>5}  updated {entry['updated_at']}")
+            for key, error in entry['errors'].items():
+                print(f"    ✗ {key}: {error}")
+        sys.exit(0)
+
+    tickers = [t for t in args.tickers.split(',') if t] if args.tickers else None
+    targets = [s for s in args.stages.split(',') if s] if args.stages else None
+    with Pipeline(args.db, tickers=tickers, collect=args.collect, start=args.start, end=args.end,
+                  workers=args.workers, collect_workers=args.collect_workers) as pipeline:
+        try:
+            summary = pipeline.run(targets, force=args.force)
+        except ValueError as e:
+            parser.error(str(e))
+    _print_summary(summary)
+    sys.exit(1 if any(counts['failed'] for counts in summary.values()) else 0)
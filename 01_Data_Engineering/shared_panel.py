@@ -0,0 +1,461 @@
+"""
+공유 메모리 가격 패널 (여러 서버 워커가 한 벌의 데이터를 공유)
+========================================
+gunicorn 워커마다 MarketDataStore를 두면 같은 가격 데이터가 워커 수만큼 메모리에 올라가고,
+워커마다 DB를 다시 읽습니다. 이 모듈은 로더 프로세스 하나가 정렬된 종가 패널과 파생 배열을
+multiprocessing.shared_memory에 게시하고, 워커는 복사 없이(zero-copy) numpy 뷰로 붙습니다.
+
+세그먼트 구성:
+    {name}            제어 세그먼트 (int64 × 8): [시퀀스, 현재 세대 번호, 세대가 최신임을 확인한 DB 파일 스탬프 × 6]
+                      — 워커는 요청마다 이 값과 DB 파일 스탬프만 비교
+    {name}_{세대}      데이터 세그먼트: [헤더 길이][JSON 헤더][배열 …] (배열은 64바이트 정렬)
+        헤더: 종목 → 행 번호 인덱스, 종목별 유효 구간, 배열 오프셋/shape, 게시 시점 DB 파일 스탬프
+        dates    (T,)   int64          모든 종목 날짜의 합집합 (정렬, 단위는 헤더의 date_unit)
+        close    (N, T) float64        종목별 종가 (종목마다 연속된 행 → pandas 내부 블록과 같은 배치)
+        returns  (N, T) float64        일일 단순 수익률 (전일 또는 당일 값이 없으면 NaN)
+        stats    (N, K) float64        STAT_FIELDS 순서의 종목별 수익률 통계
+
+세대 교체:
+    새 세대 세그먼트를 모두 쓴 뒤 제어 세그먼트의 세대 번호를 바꾸고 이전 세대 이름을 unlink합니다.
+    이미 붙어 있는 워커의 매핑은 unlink 후에도 유효하므로 읽는 도중 데이터가 바뀌지 않고,
+    다음 요청에서 새 세대로 갈아탑니다 (이전 세대 매핑은 참조하는 배열이 없어지면 해제).
+
+최신 여부:
+    로더는 주기마다 종목 테이블 변경(MarketDataStore.changes_since)을 확인하여
+    - 바뀐 종목이 있으면 새 세대를 게시하고
+    - 종목 외 테이블만 바뀌었으면 (파이프라인 결과, 장중 파티션 등) 세대는 그대로 두고 제어 세그먼트의
+      DB 스탬프만 갱신 → 워커는 다음 요청부터 다시 공유 패널을 사용
+    제어 세그먼트는 시퀀스 잠금(seqlock)으로 기록: 로더가 시퀀스를 홀수로 올리고 값을 쓴 뒤 짝수로 올림,
+    워커는 시퀀스가 짝수이고 읽기 전후가 같을 때만 (세대, 스탬프)를 사용 → 세대와 스탬프가 섞여 읽히지 않음
+
+사용:
+    python 01_Data_Engineering/shared_panel.py serve --interval 5    # 로더: 게시 후 DB 변경 시 재게시
+    SHARED_PANEL=qfl_panel gunicorn -w 4 --chdir 00_visualization server:app
+    python 01_Data_Engineering/shared_panel.py info                  # 현재 세대 요약
+"""
+
+import os
+import json
+import logging
+import argparse
+import threading
+from datetime import datetime
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+import pandas as pd
+
+from market_data_store import MarketDataStore
+
+DEFAULT_NAME = 'qfl_panel'
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'market_data.db')
+
+ALIGNMENT = 64
+HEADER_PREFIX = 8        # 헤더 길이 (uint64)
+CONTROL_SIZE = 64        # [시퀀스, 세대 번호, DB 파일 스탬프 × 6] (int64)
+STAMP_FIELDS = 6
+
+# calculate_statistics와 같은 정의 (모표준편차, 편향 왜도/초과 첨도) + 관측치 수
+STAT_FIELDS = ('count', 'mean', 'std', 'min', 'max', 'skewness', 'kurtosis')
+
+
+def file_stamp(path):
+    """
+    DB 파일 변경 스탬프 [inode, mtime_ns, 크기, 변경 카운터, WAL mtime_ns, WAL 크기], 파일이 없으면 None
+    - 변경 카운터: SQLite 헤더 24~27바이트, 롤백 저널 모드에서 커밋마다 증가 (mtime 해상도 안의 연속 커밋도 구분)
+    - WAL 모드의 커밋은 -wal 파일에 기록되므로 그 mtime/크기도 포함
+    """
+    try:
+        st = os.stat(path)
+        with open(path, 'rb') as f:
+            header = f.read(28)
+    except OSError:
+        return None
+    counter = int.from_bytes(header[24:28], 'big') if len(header) == 28 else -1
+    try:
+        wal = os.stat(path + '-wal')
+        wal_stamp = [wal.st_mtime_ns, wal.st_size]
+    except OSError:
+        wal_stamp = [0, 0]
+    return [st.st_ino, st.st_mtime_ns, st.st_size, counter] + wal_stamp
+
+
+class _Segment(shared_memory.SharedMemory):
+    """워커 쪽 세그먼트: 종료 시점에 뷰가 남아 있어 close가 거부되면 매핑을 프로세스 종료에 맡김"""
+
+    def __del__(self):
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+_created = set()   # 이 프로세스가 만든 세그먼트 (resource_tracker 등록을 유지해야 하는 이름)
+
+
+def _attach(name):
+    """
+    기존 세그먼트에 붙기 (resource_tracker에 등록하지 않음)
+    등록되면 워커 종료 시 트래커가 로더의 세그먼트를 unlink하므로 Python 3.13 미만에서는 등록을 취소
+    (로더와 같은 프로세스에서 붙는 경우는 로더의 등록이므로 그대로 둠)
+    """
+    try:
+        return _Segment(name=name, track=False)
+    except TypeError:
+        shm = _Segment(name=name)
+        if name not in _created:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+def _create(name, size):
+    shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+    _created.add(name)
+    return shm
+
+
+def _unlink(shm, name):
+    shm.close()
+    shm.unlink()
+    _created.discard(name)
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _layout(n_tickers, n_dates, header_size):
+    """배열 이름 → (오프셋, shape), 전체 크기"""
+    shapes = {'dates': (n_dates,), 'close': (n_tickers, n_dates), 'returns': (n_tickers, n_dates),
+              'stats': (n_tickers, len(STAT_FIELDS))}
+    offset, layout = _aligned(HEADER_PREFIX + header_size), {}
+    for name, shape in shapes.items():
+        layout[name] = {'offset': offset, 'shape': list(shape)}
+        offset = _aligned(offset + 8 * int(np.prod(shape)))
+    return layout, max(offset, 1)
+
+
+def _view(shm, spec, dtype, writeable):
+    """
+    세그먼트 위의 numpy 뷰
+    np.frombuffer는 버퍼 export를 유지하므로, 뷰(또는 그 슬라이스)가 남아 있는 동안
+    shm.close()가 BufferError로 거부됨 → 해제된 매핑을 읽는 일이 없음
+    (np.ndarray(buffer=...)는 export를 유지하지 않아 close 후 접근 시 segfault)
+    """
+    count = int(np.prod(spec['shape']))
+    array = np.frombuffer(shm.buf, dtype=dtype, count=count, offset=spec['offset']).reshape(spec['shape'])
+    array.flags.writeable = writeable
+    return array
+
+
+def return_statistics(returns):
+    """(N, T) 수익률 행렬 → (N, K) 통계 (NaN 제외, 종목별 관측치 수가 달라도 한 번에 계산)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        valid = np.isfinite(returns)
+        count = valid.sum(axis=1)
+        filled = np.where(valid, returns, 0.0)
+        mean = filled.sum(axis=1) / count
+        d = np.where(valid, returns - mean[:, None], 0.0)
+        d2 = d * d
+        m2 = d2.sum(axis=1) / count
+        m3 = (d2 * d).sum(axis=1) / count
+        m4 = (d2 * d2).sum(axis=1) / count
+        skewness = np.where(m2 > 0, m3 / m2 ** 1.5, 0.0)
+        kurtosis = np.where(m2 > 0, m4 / (m2 * m2) - 3.0, 0.0)
+        minimum = np.where(valid, returns, np.inf).min(axis=1)
+        maximum = np.where(valid, returns, -np.inf).max(axis=1)
+    empty = count == 0
+    minimum[empty] = maximum[empty] = np.nan
+    return np.column_stack([count, mean, np.sqrt(m2), minimum, maximum, skewness, kurtosis])
+
+
+class SharedPanelPublisher:
+    """
+    로더: MarketDataStore의 전 종목을 한 세대로 게시하고, DB가 바뀌면 새 세대로 교체
+
+    Example:
+        publisher = SharedPanelPublisher(DB_PATH)
+        publisher.publish()             # 세대 1 게시
+        publisher.run(interval=5)       # DB 변경을 확인하며 재게시 (Ctrl-C까지)
+    """
+
+    def __init__(self, db_path=DB_PATH, name=DEFAULT_NAME, market_store=None):
+        self.db_path = db_path
+        self.name = name
+        self.store = market_store or MarketDataStore(db_path)
+        self.generation = 0
+        self.db_stamp = None      # 현재 세대가 최신임을 마지막으로 확인한 DB 파일 스탬프
+        self._segment = None
+        try:
+            self._control = _create(name, CONTROL_SIZE)
+        except FileExistsError:
+            # 이전 로더가 남긴 제어 세그먼트 → 세대 번호를 이어서 사용 (워커가 같은 번호를 재사용하지 않도록)
+            self._control = _attach(name)
+        self._slots = _view(self._control, {'offset': 0, 'shape': [CONTROL_SIZE // 8]}, np.int64, True)
+        self.generation = int(self._slots[1])
+        self._write_control(self.generation, None)   # 이 로더가 게시하기 전까지 워커는 사용하지 않음
+
+    def _write_control(self, generation, stamp):
+        """(세대, DB 스탬프) 기록 — 시퀀스를 홀수로 올린 동안 기록하고 짝수로 마침 (로더 하나만 기록)"""
+        self._slots[0] |= 1        # 홀수: 기록 중 (이전 로더가 기록 도중 종료했어도 홀수로 시작)
+        self._slots[1] = generation
+        self._slots[2:2 + STAMP_FIELDS] = stamp if stamp is not None else [-1] * STAMP_FIELDS
+        self._slots[0] += 1
+        self.db_stamp = stamp
+
+    def publish(self):
+        """현재 DB 내용을 새 세대로 게시 → 세대 번호"""
+        stamp = file_stamp(self.db_path)   # 읽기 전에 기록 → 읽는 도중 DB가 바뀌면 워커가 오래된 세대로 판단
+        frames = self.store.frames()
+        tickers = sorted(frames)
+        dates = pd.DatetimeIndex([], dtype=next(iter(frames.values())).index.dtype) if frames else pd.DatetimeIndex([])
+        for df in frames.values():
+            dates = dates.union(df.index)
+        n_tickers, n_dates = len(tickers), len(dates)
+
+        positions, ranges = [], []
+        for ticker in tickers:
+            close = frames[ticker]['Close'].to_numpy(dtype=float)
+            pos = dates.get_indexer(frames[ticker].index)
+            valid = pos[np.isfinite(close)]
+            first, last = (int(valid.min()), int(valid.max())) if len(valid) else (0, -1)
+            positions.append((pos, close))
+            ranges.append([first, last, bool(len(valid) == last - first + 1)])
+
+        generation = self.generation + 1
+        header = {
+            'generation': generation,
+            'created_at': datetime.now().isoformat(),
+            'db_stamp': stamp,
+            'date_unit': dates.unit,
+            'tickers': tickers,
+            'ranges': ranges,       # [첫 유효 열, 마지막 유효 열, 구간 내 결측 없음]
+            'stat_fields': list(STAT_FIELDS),
+        }
+        # 헤더에 배열 오프셋이 들어가므로 길이가 정해질 때까지 여유를 두고 배치
+        header_size = len(json.dumps(header).encode('utf-8')) + 512
+        layout, size = _layout(n_tickers, n_dates, header_size)
+        header['arrays'] = layout
+        encoded = json.dumps(header).encode('utf-8')
+
+        segment = _create(f'{self.name}_{generation}', size)
+        segment.buf[:HEADER_PREFIX] = len(encoded).to_bytes(HEADER_PREFIX, 'little')
+        segment.buf[HEADER_PREFIX:HEADER_PREFIX + len(encoded)] = encoded
+
+        # 공유 메모리에 바로 기록 (중간 행렬을 만든 뒤 복사하지 않음)
+        _view(segment, layout['dates'], np.int64, True)[:] = dates.asi8
+        close = _view(segment, layout['close'], np.float64, True)
+        close.fill(np.nan)
+        for i, (pos, values) in enumerate(positions):
+            close[i, pos] = values
+        returns = _view(segment, layout['returns'], np.float64, True)
+        returns[:, 0] = np.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            np.divide(close[:, 1:], close[:, :-1], out=returns[:, 1:])
+        returns[:, 1:] -= 1.0
+        _view(segment, layout['stats'], np.float64, True)[:] = return_statistics(returns)
+        del close, returns
+
+        # 세대 교체: 번호를 바꾼 뒤 이전 세대 이름 삭제 (붙어 있는 워커의 매핑은 유지됨)
+        self._write_control(generation, stamp)
+        previous, self._segment, self.generation = self._segment, segment, generation
+        if previous is not None:
+            _unlink(previous, f'{self.name}_{generation - 1}')
+        logging.info(f"Published shared panel '{self.name}' generation {generation}: "
+                     f"{n_tickers} tickers x {n_dates} dates ({size / 1e6:.1f} MB)")
+        return generation
+
+    def run(self, interval=5.0, stop=None):
+        """게시 후 DB 변경을 interval초마다 확인하여 재게시 (stop: threading.Event)"""
+        stop = stop or threading.Event()
+        self.store.changes_since(0)
+        self.publish()
+        version = self.store.version   # 게시 중 감지한 변경은 이미 이 세대에 반영됨
+        while not stop.wait(interval):
+            self.check(version)
+            version = self.store.version
+
+    def check(self, version):
+        """
+        version 이후 바뀐 종목이 있으면 새 세대 게시 → True
+        종목 외 테이블만 바뀌었으면 현재 세대를 유지하고 DB 스탬프만 갱신 (워커가 계속 공유 패널 사용) → False
+        """
+        stamp = file_stamp(self.db_path)   # 확인 전에 기록 → 확인 도중 커밋되면 스탬프가 달라 다음 주기에 다시 확인
+        _, changed = self.store.changes_since(version)
+        if changed:
+            self.publish()
+            return True
+        if stamp != self.db_stamp:
+            self._write_control(self.generation, stamp)
+            logging.info(f"Shared panel '{self.name}' generation {self.generation} re-stamped (no ticker changes)")
+        return False
+
+    def close(self):
+        """게시 중단: 세그먼트 이름 삭제 (워커는 다음 요청부터 프로세스 로컬 캐시로 전환)"""
+        if self._segment is not None:
+            _unlink(self._segment, f'{self.name}_{self.generation}')
+            self._segment = None
+        del self._slots
+        _unlink(self._control, self.name)
+
+
+class PanelSnapshot:
+    """한 세대에 붙은 읽기 전용 뷰 (배열은 공유 메모리를 직접 가리킴, writeable=False)"""
+
+    def __init__(self, segment):
+        self.segment = segment
+        length = int.from_bytes(bytes(segment.buf[:HEADER_PREFIX]), 'little')
+        header = json.loads(bytes(segment.buf[HEADER_PREFIX:HEADER_PREFIX + length]))
+        self.generation = header['generation']
+        self.created_at = header['created_at']
+        self.db_stamp = header['db_stamp']
+        self.tickers = header['tickers']
+        self.ranges = header['ranges']
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        arrays = header['arrays']
+        dates = _view(segment, arrays['dates'], np.int64, False).view(f"M8[{header['date_unit']}]")
+        self.dates = pd.DatetimeIndex(dates, name='Date')
+        self.close_matrix = _view(segment, arrays['close'], np.float64, False)
+        self.returns_matrix = _view(segment, arrays['returns'], np.float64, False)
+        self.stats_matrix = _view(segment, arrays['stats'], np.float64, False)
+
+    def panel(self, tickers=None, column='Close'):
+        """
+        MarketDataStore.panel과 같은 형식 (모든 종목에 값이 있는 날짜만), 없는 종목은 제외
+        전 종목을 요청하면 공유 행렬을 그대로 감싼 DataFrame (복사 없음)
+        """
+        if column != 'Close':
+            raise ValueError('Shared panel only holds Close prices')
+        rows = list(range(len(self.tickers))) if tickers is None else [self.index[t] for t in tickers if t in self.index]
+        if not rows:
+            return None
+        values = self.close_matrix if rows == list(range(len(self.tickers))) else self.close_matrix[rows]
+        # (종목, 날짜) 행렬의 전치 → pandas 블록 배치와 같아 copy=False면 뷰로 감쌈
+        df = pd.DataFrame(values.T, index=self.dates, columns=[self.tickers[i] for i in rows], copy=False)
+        return df.dropna()
+
+    def close(self, ticker):
+        """종목 종가 Series (유효 구간 슬라이스 → 결측이 없으면 복사 없음), 없으면 None"""
+        i = self.index.get(ticker)
+        if i is None:
+            return None
+        first, last, complete = self.ranges[i]
+        series = pd.Series(self.close_matrix[i, first:last + 1], index=self.dates[first:last + 1], name='Close', copy=False)
+        return series if complete else series.dropna()
+
+    def frames(self, tickers):
+        """{ticker: Close만 가진 DataFrame} — FamaFrenchAnalyzer 입력 (MarketDataStore.frames 대체)"""
+        return {ticker: self.close(ticker).to_frame() for ticker in tickers if ticker in self.index}
+
+    def returns(self, ticker):
+        """종목 일일 수익률 Series (유효 구간, NaN 제외)"""
+        i = self.index.get(ticker)
+        if i is None:
+            return None
+        first, last, _ = self.ranges[i]
+        return pd.Series(self.returns_matrix[i, first:last + 1], index=self.dates[first:last + 1], copy=False).dropna()
+
+    def statistics(self):
+        """종목별 수익률 통계 DataFrame (행: 종목, 열: STAT_FIELDS)"""
+        return pd.DataFrame(self.stats_matrix, index=self.tickers, columns=STAT_FIELDS, copy=False)
+
+    def release(self):
+        """매핑 해제 → 이 스냅샷에서 만든 배열/Series가 남아 있으면 False (나중에 다시 시도)"""
+        self.close_matrix = self.returns_matrix = self.stats_matrix = self.dates = None
+        try:
+            self.segment.close()
+        except BufferError:
+            return False
+        return True
+
+
+class SharedPanelReader:
+    """
+    워커 쪽: 제어 세그먼트의 세대 번호를 확인하고 바뀌었을 때만 새 세대에 붙음
+
+    Example:
+        reader = SharedPanelReader('qfl_panel')
+        snapshot = reader.current(DB_PATH)   # 게시된 세대가 없거나 DB가 로더의 확인 이후 바뀌었으면 None
+        if snapshot is not None:
+            panel = snapshot.panel(['AAPL', 'SPY'])
+    """
+
+    def __init__(self, name=DEFAULT_NAME):
+        self.name = name
+        self._control = None
+        self._slots = None
+        self._snapshot = None
+        self._retired = []
+        self._lock = threading.Lock()
+
+    def _read_control(self, retries=100):
+        """(세대 번호, DB 스탬프) 일관된 한 쌍 — 제어 세그먼트가 없거나 로더가 계속 기록 중이면 (None, None)"""
+        if self._control is None:
+            try:
+                self._control = _attach(self.name)
+            except FileNotFoundError:
+                return None, None
+            self._slots = _view(self._control, {'offset': 0, 'shape': [CONTROL_SIZE // 8]}, np.int64, False)
+        for _ in range(retries):
+            sequence = int(self._slots[0])
+            if sequence % 2 == 0:
+                values = self._slots[1:2 + STAMP_FIELDS].tolist()
+                if int(self._slots[0]) == sequence:
+                    stamp = values[1:] if values[1] >= 0 else None
+                    return values[0], stamp
+        return None, None
+
+    def current(self, db_path=None):
+        """
+        최신 세대 스냅샷 (게시된 세대가 없으면 None)
+        db_path: 지정하면 로더가 최신임을 확인한 DB 스탬프와 현재 파일이 다를 때 None (로더가 따라잡을 때까지)
+        """
+        with self._lock:
+            generation, stamp = self._read_control()
+            if not generation:
+                return None
+            if db_path is not None and (stamp is None or file_stamp(db_path) != stamp):
+                return None
+            if self._snapshot is None or self._snapshot.generation != generation:
+                try:
+                    snapshot = PanelSnapshot(_attach(f'{self.name}_{generation}'))
+                except FileNotFoundError:
+                    # 세대 번호를 읽은 직후 다음 세대로 교체됨 → 이전 세대는 최신이 아니므로 이번 요청은 대체 경로로
+                    return None if db_path is not None else self._snapshot
+                if self._snapshot is not None:
+                    self._retired.append(self._snapshot)
+                self._snapshot = snapshot
+                # 이전 세대: 요청들이 쓰던 배열이 모두 해제된 것부터 매핑 해제
+                self._retired = [old for old in self._retired if not old.release()]
+            return self._snapshot
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='공유 메모리 가격 패널 로더')
+    parser.add_argument('--name', default=DEFAULT_NAME, help='세그먼트 이름 (서버의 SHARED_PANEL과 같게)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve_parser = sub.add_parser('serve', help='게시 후 DB 변경 시 새 세대로 교체 (Ctrl-C로 종료하면 세그먼트 삭제)')
+    serve_parser.add_argument('--db', default=DB_PATH, help='SQLite DB 경로')
+    serve_parser.add_argument('--interval', type=float, default=5.0, help='DB 변경 확인 주기 (초)')
+    sub.add_parser('info', help='현재 세대 요약')
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        snapshot = SharedPanelReader(args.name).current()
+        if snapshot is None:
+            raise SystemExit(f"No shared panel published under '{args.name}'")
+        print(f"generation {snapshot.generation} (created {snapshot.created_at}), "
+              f"{len(snapshot.tickers)} tickers x {len(snapshot.dates)} dates, {snapshot.segment.size / 1e6:.1f} MB")
+        print(snapshot.statistics().head(10).to_string())
+        raise SystemExit(0)
+
+    publisher = SharedPanelPublisher(args.db, args.name)
+    try:
+        publisher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+        print(f"Shared panel '{args.name}' removed")
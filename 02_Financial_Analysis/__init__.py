@@ -1,7 +1,28 @@
 """
 Financial Analysis Module
+
+하위 모듈은 속성에 처음 접근할 때 임포트합니다 (PEP 562 모듈 __getattr__).
+`import 02_Financial_Analysis` 자체는 statsmodels/scipy를 로드하지 않습니다.
 """
-from .analyzer_engine import TimeSeriesAnalyzer
-from .factor_model import FamaFrenchAnalyzer, FamaFrenchRegression, FamaFrenchFactorBuilder
+import importlib
+
+_LAZY_ATTRS = {
+    'TimeSeriesAnalyzer': 'analyzer_engine',
+    'FamaFrenchAnalyzer': 'factor_model',
+    'FamaFrenchRegression': 'factor_model',
+    'FamaFrenchFactorBuilder': 'factor_model',
+}
 
 __all__ = ['TimeSeriesAnalyzer', 'FamaFrenchAnalyzer', 'FamaFrenchRegression', 'FamaFrenchFactorBuilder']
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_LAZY_ATTRS[name]}', __name__), name)
+    globals()[name] = value  # 이후 접근은 일반 속성 조회
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,7 +1,21 @@
+import os
+import sys
+import logging
 import numpy as np
 import pandas as pd
-from scipy import stats
-from statsmodels.tsa.stattools import acf
+
+# 계측 모듈 (01_Data_Engineering/instrumentation.py)
+DATA_ENG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '01_Data_Engineering')
+if DATA_ENG_PATH not in sys.path:
+    sys.path.insert(0, DATA_ENG_PATH)
+from instrumentation import timed, stage
+from bar_resampler import TRADING_DAYS, infer_periods_per_year, date_format
+
+# scipy.stats(~1s), statsmodels, volatility_model(scipy.optimize)은 처음 사용하는 함수 안에서 임포트
+# → 서버/CLI/워커의 기동 시간에 포함되지 않음 (두 번째 호출부터는 sys.modules 조회만 발생)
+
+# analyze_ticker가 반환할 수 있는 항목 (fields로 일부만 선택)
+ANALYSIS_FIELDS = ('price_history', 'statistics', 'histogram', 'qq_plot', 'acf', 'volatility')
 
 class InsightGenerator:
     """
@@ -29,12 +43,19 @@ class InsightGenerator:
             return "가는 꼬리 (극단값 드물게 발생) → 예측 가능한 수익률"
     
     @staticmethod
+    @timed('jarque_bera')
     def jarque_bera_test(returns):
         """
         Jarque-Bera 정규성 검정
         Returns: {p_value, is_normal, interpretation}
         """
+        from scipy import stats
         jb_stat, p_value = stats.jarque_bera(returns)
+        return InsightGenerator.normality_result(jb_stat, p_value)
+
+    @staticmethod
+    def normality_result(jb_stat, p_value):
+        """Jarque-Bera 통계량/p-value → 검정 결과 dict (증분 통계에서도 같은 형식으로 사용)"""
         is_normal = bool(p_value > 0.05)  # 유의수준 5%
         
         # p-value가 충분히 작으면 과학적 표기법 사용
@@ -80,8 +101,10 @@ class TimeSeriesAnalyzer:
     """
     
     @staticmethod
+    @timed('calculate_statistics')
     def calculate_statistics(returns):
         """일일 수익률의 기본 통계"""
+        from scipy import stats
         return {
             'mean': float(np.mean(returns)),
             'std': float(np.std(returns)),
@@ -92,6 +115,41 @@ class TimeSeriesAnalyzer:
         }
 
     @staticmethod
+    def describe_returns(returns):
+        """
+        기본 통계 + 정규성 검정 + 왜도/첨도 해석 + 위험도 지표
+        (종목 수익률, 전략 수익률 모두 같은 형식으로 해석)
+        """
+        # 기본 통계
+        statistics = TimeSeriesAnalyzer.calculate_statistics(returns)
+        
+        # 정규성 검정 및 인사이트 추가
+        statistics['normalcy_test'] = InsightGenerator.jarque_bera_test(returns)
+        
+        # 왜도/첨도 해석 추가
+        statistics['skewness_interpretation'] = InsightGenerator.interpret_skewness(statistics['skewness'])
+        statistics['kurtosis_interpretation'] = InsightGenerator.interpret_kurtosis(statistics['kurtosis'])
+        
+        # 위험도 지표 추가
+        statistics['risk'] = InsightGenerator.portfolio_risk_insights(returns, statistics['mean'], statistics['std'])
+        return statistics
+
+    @staticmethod
+    def calculate_annualized_volatility(returns, periods_per_year=TRADING_DAYS, window=None):
+        """
+        연율화 역사적 변동성 σ = std(r) · √periods_per_year
+        returns: 수익률 배열 (2차원이면 열(종목)별로 계산), window: 최근 N개 관측치만 사용
+        """
+        returns = np.asarray(returns, dtype=float)
+        if window is not None:
+            returns = returns[-window:]
+        if len(returns) < 2:
+            raise ValueError("At least 2 returns are required.")
+        vol = np.std(returns, axis=0, ddof=1) * np.sqrt(periods_per_year)
+        return float(vol) if np.ndim(vol) == 0 else vol
+
+    @staticmethod
+    @timed('histogram')
     def calculate_histogram(returns, bins=20):
         """수익률 분포 (히스토그램 데이터)"""
         counts, bin_edges = np.histogram(returns, bins=bins)
@@ -102,11 +160,22 @@ class TimeSeriesAnalyzer:
         }
 
     @staticmethod
-    def calculate_qq_plot(returns):
-        """Q-Q Plot 데이터 (정규성 검정)"""
+    def downsample_indices(n, max_points=None):
+        """길이 n인 시계열에서 처음/끝을 포함해 균등 간격으로 최대 max_points개 인덱스 선택"""
+        if max_points is None or n <= max_points:
+            return np.arange(n)
+        return np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+
+    @staticmethod
+    @timed('qq_plot')
+    def calculate_qq_plot(returns, max_points=None):
+        """Q-Q Plot 데이터 (정규성 검정), max_points: 표본 분위수를 균등 간격으로 추려 반환"""
+        from scipy import stats
         sorted_returns = np.sort(returns)
         N = len(sorted_returns)
-        theoretical_quantiles = stats.norm.ppf(np.arange(1, N+1) / (N+1))
+        ranks = TimeSeriesAnalyzer.downsample_indices(N, max_points)
+        sorted_returns = sorted_returns[ranks]
+        theoretical_quantiles = stats.norm.ppf((ranks + 1) / (N+1))
         
         return {
             'theoretical': [float(x) for x in theoretical_quantiles],
@@ -116,58 +185,108 @@ class TimeSeriesAnalyzer:
     @staticmethod
     def calculate_acf(returns, nlags=30):
         """자기상관 분석 (ACF)"""
-        acf_values = acf(returns, nlags=nlags, fft=False)
-        return [float(x) for x in acf_values]
+        return TimeSeriesAnalyzer.calculate_acf_batch([returns], nlags=nlags)[0]
 
     @staticmethod
-    def analyze_ticker(df):
+    @timed('acf')
+    def calculate_acf_batch(returns_list, nlags=30):
+        """
+        여러 종목의 자기상관 (ACF)을 FFT 한 번으로 계산 (statsmodels acf와 같은 값: 평균 차감, 표본 자기공분산 / 분산)
+        길이가 다른 수익률은 0으로 채워 같은 FFT 길이(≥ 2 × 최대 길이)로 맞추므로 순환 상관이 섞이지 않음
+        :return: 종목별 [ρ_0, ..., ρ_nlags] 리스트 (관측치 수보다 큰 시차는 0)
+        """
+        if len(returns_list) == 0:
+            return []
+        lengths = [len(r) for r in returns_list]
+        nfft = 1 << (2 * max(lengths) - 1).bit_length()
+        centered = np.zeros((len(returns_list), nfft))
+        for row, returns in zip(centered, returns_list):
+            values = np.asarray(returns, dtype=float)
+            row[:len(values)] = values - values.mean()
+        spectrum = np.fft.rfft(centered, axis=1)
+        acov = np.fft.irfft(spectrum * spectrum.conj(), n=nfft, axis=1)[:, :nlags + 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acf_values = acov / acov[:, :1]
+        return [[float(x) for x in row] for row in acf_values]
+
+    @staticmethod
+    @timed('conditional_volatility')
+    def calculate_conditional_volatility(returns, dates, model='garch', horizon=10, periods_per_year=None,
+                                         ticker=None, previous=None):
+        """
+        GARCH 계열 조건부 변동성 (변동성 군집 반영)
+        returns: 수익률 배열, dates: 수익률에 대응하는 시각
+        periods_per_year: 연율화 계수 (기본값: dates 간격으로 추정, 일봉이면 252)
+        ticker: 지정하면 프로세스의 종목별 직전 추정치(param_cache)에서 warm start
+        previous: 직전 결과의 변동성 요약 {'model', 'params'} (파이프라인/스케줄러가 보관한 추정치, param_cache보다 우선)
+        """
+        try:
+            try:
+                from .volatility_model import GarchVolatilityModel, param_cache
+            except ImportError:  # 스크립트 실행 (02_Financial_Analysis가 sys.path에 있음)
+                from volatility_model import GarchVolatilityModel, param_cache
+            series = pd.Series(returns, index=pd.DatetimeIndex(dates), name=ticker or 'returns')
+            periods_per_year = periods_per_year or infer_periods_per_year(series.index)
+            start_params = None
+            if previous and previous.get('model') == model and previous.get('params'):
+                start_params = pd.DataFrame([previous['params']], index=[series.name])
+            fitted = GarchVolatilityModel(model, periods_per_year).fit(
+                series, start_params=start_params, param_cache=param_cache if ticker else None)
+            return fitted.summary(series.name, horizon=horizon)
+        except Exception as e:
+            logging.warning(f"Conditional volatility estimation failed: {e}")
+            return None
+
+    @staticmethod
+    @timed('analyze_ticker')
+    def analyze_ticker(df, fields=None, bins=20, nlags=30, max_points=None, ticker=None, previous=None):
         """
         공통 분석 파이프라인
-        df: Date, Close 컬럼을 포함한 DataFrame
-        Returns: 모든 분석 결과를 담은 dict
+        df: Date, Close 컬럼을 포함한 DataFrame (일봉 또는 장중 봉 — 간격에서 연율화 계수와 날짜 형식을 정함)
+        fields: 계산할 항목 (ANALYSIS_FIELDS의 부분집합, 기본값: 전체) → 요청하지 않은 항목은 계산하지 않음
+        bins: 히스토그램 구간 수, nlags: ACF 시차 수
+        max_points: 가격 이력/Q-Q/조건부 변동성 시계열의 최대 점 개수 (차트 해상도)
+        ticker, previous: 조건부 변동성 warm start (calculate_conditional_volatility 참고)
+        Returns: 요청한 분석 결과를 담은 dict
         """
         if df is None or df.empty or 'Close' not in df.columns:
             return None
+        fields = ANALYSIS_FIELDS if fields is None else fields
         
         # 날짜 정렬
-        df['Date'] = pd.to_datetime(df['Date'])
-        df = df.sort_values('Date')
+        with stage('date_parse'):
+            df['Date'] = pd.to_datetime(df['Date'])
+            df = df.sort_values('Date')
         
-        # 일일 수익률 계산
-        returns = df['Close'].pct_change().dropna().values
+        # 봉 간격 수익률 계산
+        return_series = df['Close'].pct_change().dropna()
+        returns = return_series.values
         
         if len(returns) == 0:
             return None
         
-        # 가격 이력
-        price_history = {
-            'dates': df['Date'].dt.strftime('%Y-%m-%d').tolist(),
-            'prices': df['Close'].tolist()
-        }
-        
-        # 기본 통계
-        statistics = TimeSeriesAnalyzer.calculate_statistics(returns)
-        
-        # 정규성 검정 및 인사이트 추가
-        jb_test = InsightGenerator.jarque_bera_test(returns)
-        statistics['normalcy_test'] = jb_test
-        
-        # 왜도/첨도 해석 추가
-        skewness_interpretation = InsightGenerator.interpret_skewness(statistics['skewness'])
-        kurtosis_interpretation = InsightGenerator.interpret_kurtosis(statistics['kurtosis'])
-        
-        statistics['skewness_interpretation'] = skewness_interpretation
-        statistics['kurtosis_interpretation'] = kurtosis_interpretation
-        
-        # 위험도 지표 추가
-        risk_insights = InsightGenerator.portfolio_risk_insights(returns, statistics['mean'], statistics['std'])
-        statistics['risk'] = risk_insights
-        
-        # 모든 분석 수행
-        return {
-            'price_history': price_history,
-            'statistics': statistics,
-            'histogram': TimeSeriesAnalyzer.calculate_histogram(returns),
-            'qq_plot': TimeSeriesAnalyzer.calculate_qq_plot(returns),
-            'acf': TimeSeriesAnalyzer.calculate_acf(returns)
-        }
+        result = {}
+        if 'price_history' in fields:
+            # 가격 이력
+            points = df.iloc[TimeSeriesAnalyzer.downsample_indices(len(df), max_points)]
+            result['price_history'] = {
+                'dates': points['Date'].dt.strftime(date_format(df['Date'])).tolist(),
+                'prices': points['Close'].tolist()
+            }
+        if 'statistics' in fields:
+            result['statistics'] = TimeSeriesAnalyzer.describe_returns(returns)
+        if 'histogram' in fields:
+            result['histogram'] = TimeSeriesAnalyzer.calculate_histogram(returns, bins=bins)
+        if 'qq_plot' in fields:
+            result['qq_plot'] = TimeSeriesAnalyzer.calculate_qq_plot(returns, max_points=max_points)
+        if 'acf' in fields:
+            result['acf'] = TimeSeriesAnalyzer.calculate_acf(returns, nlags=min(nlags, len(returns) - 1))
+        if 'volatility' in fields:
+            volatility = TimeSeriesAnalyzer.calculate_conditional_volatility(
+                returns, df.loc[return_series.index, 'Date'], ticker=ticker, previous=previous)
+            if volatility and max_points:
+                keep = TimeSeriesAnalyzer.downsample_indices(len(volatility['dates']), max_points)
+                volatility['dates'] = [volatility['dates'][i] for i in keep]
+                volatility['conditional_volatility'] = [volatility['conditional_volatility'][i] for i in keep]
+            result['volatility'] = volatility
+        return result
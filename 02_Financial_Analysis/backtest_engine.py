@@ -0,0 +1,449 @@
+"""
+벡터화 백테스팅 엔진
+========================================
+(날짜 × 종목) 가격 패널 전체에 대해 시그널 → 포지션 → 손익을 반복문 없이 계산
+
+흐름:
+1. 시그널: 전략 함수가 날짜별 목표 비중 W*(t) 생성 (t일 종가까지의 정보만 사용)
+2. 리밸런싱: 일정(D/W/M/Q 또는 N일)에 해당하는 날 종가에 W*(t)로 교체, t+1일부터 보유
+3. 보유 구간: 비중은 종목 수익률에 따라 표류(drift)
+   V(t) / V(t_s) = Σ_i w_i·exp(L_i(t) - L_i(t_s)) + w_cash·(1 + r_f)^(t - t_s)
+   (L = 누적 로그수익률, t_s = 직전 리밸런싱일 → 구간별 누적곱을 누적합 차이로 계산)
+4. 비용: 리밸런싱일 회전율 Σ|W*(t) - 표류 비중(t)| × (거래비용 + 슬리피지) bps
+5. 현금: 1 - Σw 는 무위험 이자율로 운용
+
+파라미터 스윕: 파라미터 조합(수천 개)을 청크로 나누어 프로세스 풀에서 평가,
+각 워커는 가격 패널과 이동평균 등 공통 중간 결과를 한 번만 준비하여 재사용
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# 같은 디렉터리의 analyzer_engine, 01_Data_Engineering 모듈 (패키지로 임포트해도 동작)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_ENG_PATH = os.path.join(PROJECT_ROOT, '01_Data_Engineering')
+ANALYSIS_PATH = os.path.join(PROJECT_ROOT, '02_Financial_Analysis')
+if DATA_ENG_PATH not in sys.path:
+    sys.path.insert(0, DATA_ENG_PATH)
+if ANALYSIS_PATH not in sys.path:
+    sys.path.insert(0, ANALYSIS_PATH)
+
+from analyzer_engine import TimeSeriesAnalyzer
+from bar_resampler import infer_periods_per_year
+
+REBALANCE_RULES = ('D', 'W', 'M', 'Q')
+SWEEP_COLUMNS = ['total_return', 'cagr', 'annual_volatility', 'sharpe_ratio', 'sortino_ratio',
+                 'max_drawdown', 'calmar_ratio', 'hit_rate', 'annual_turnover', 'total_cost']
+
+
+def _top_quantile_weights(ctx, score_key, quantile, top_n, largest=True):
+    """점수 상위(또는 하위) 종목 동일가중 (점수가 NaN인 종목/날짜는 제외)"""
+    ranks, valid, n_valid = ctx.cross_sectional_ranks(score_key, largest)
+    k = np.full(len(n_valid), top_n) if top_n else np.maximum(1, np.round(quantile * n_valid)).astype(int)
+    k = np.minimum(k, n_valid)
+    selected = (ranks < k[:, None]) & valid
+    return np.divide(selected, k[:, None], out=np.zeros(selected.shape), where=k[:, None] > 0)
+
+
+def momentum(ctx, lookback=126, skip=21, quantile=0.2, top_n=None):
+    """횡단면 모멘텀: 최근 skip일을 제외한 lookback일 수익률 상위 종목 매수"""
+    return _top_quantile_weights(ctx, ('ret', lookback, skip), quantile, top_n, largest=True)
+
+
+def mean_reversion(ctx, lookback=5, quantile=0.2, top_n=None):
+    """단기 역추세: 최근 lookback일 수익률 하위 종목 매수"""
+    return _top_quantile_weights(ctx, ('ret', lookback, 0), quantile, top_n, largest=False)
+
+
+def ma_crossover(ctx, fast=20, slow=100):
+    """이동평균 교차: 단기 이평 > 장기 이평인 종목을 신호 종목 간 동일가중으로 보유"""
+    if fast >= slow:
+        raise ValueError("fast window must be shorter than slow window")
+    fast_ma, slow_ma = ctx.moving_average(fast), ctx.moving_average(slow)
+    # 상장 전 / 이력 부족 구간(이평 NaN)은 신호 없음
+    signal = np.isfinite(fast_ma) & np.isfinite(slow_ma) & (np.nan_to_num(fast_ma) > np.nan_to_num(slow_ma))
+    n_active = signal.sum(axis=1, keepdims=True)
+    return np.divide(signal, n_active, out=np.zeros(signal.shape), where=n_active > 0)
+
+
+def buy_and_hold(ctx):
+    """동일가중 보유 (리밸런싱 일정에 따라 동일가중으로 복원)"""
+    return np.full(ctx.returns.shape, 1.0 / ctx.returns.shape[1])
+
+
+STRATEGIES = {
+    'momentum': momentum,
+    'mean_reversion': mean_reversion,
+    'ma_crossover': ma_crossover,
+    'buy_and_hold': buy_and_hold,
+}
+
+
+class BacktestEngine:
+    """
+    가격 패널 기반 벡터화 백테스트
+
+    Example:
+        with DatabaseManager(DB_PATH) as db:
+            prices = db.read_price_panel(db.list_tickers())
+        engine = BacktestEngine(prices, transaction_cost_bps=5, slippage_bps=5)
+        result = engine.run('momentum', rebalance='M', lookback=126, skip=21, quantile=0.2)
+    """
+
+    def __init__(self, prices, risk_free_rate=0.05, transaction_cost_bps=5.0, slippage_bps=5.0,
+                 periods_per_year=None):
+        """
+        Args:
+            prices: 종가 DataFrame (dates × tickers)
+            risk_free_rate: 연간 무위험 이자율 (현금 수익률 및 Sharpe 기준)
+            transaction_cost_bps: 거래대금 대비 수수료 (bp)
+            slippage_bps: 거래대금 대비 슬리피지 (bp)
+            periods_per_year: 연율화 계수 (기본값: 가격 인덱스 간격으로 추정, 일봉이면 252)
+        """
+        if prices is None or prices.shape[0] < 2 or prices.shape[1] < 1:
+            raise ValueError("Price panel must contain at least 2 dates and 1 ticker.")
+        self.prices = prices.sort_index()
+        self.dates = pd.DatetimeIndex(pd.to_datetime(self.prices.index))
+        self.tickers = list(self.prices.columns)
+        self.periods_per_year = periods_per_year or infer_periods_per_year(self.dates)
+        self.risk_free_rate = risk_free_rate
+        self.rf_period = (1 + risk_free_rate) ** (1 / self.periods_per_year) - 1
+        self.cost_rate = (transaction_cost_bps + slippage_bps) / 1e4
+
+        values = self.prices.to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.log_prices = np.log(values)
+        log_returns = np.diff(self.log_prices, axis=0, prepend=self.log_prices[:1])
+        log_returns[~np.isfinite(log_returns)] = 0.0
+        self.returns = np.expm1(log_returns)
+        # 누적 로그수익률 L(t): 구간 성장률 = exp(L(t) - L(t_s))
+        self.cum_log_returns = np.cumsum(log_returns, axis=0)
+        self._cache = {}
+
+    # ---- 전략이 공유하는 중간 결과 (스윕 시 변형 간 재사용) ----
+
+    def moving_average(self, window):
+        """종가 window일 단순 이동평균 (초기 window-1일과 결측 가격(상장 전 등)이 섞인 구간은 NaN)"""
+        key = ('ma', window)
+        if key not in self._cache:
+            if 'price_cumsum' not in self._cache:
+                values = self.prices.to_numpy(dtype=float)
+                missing = ~np.isfinite(values)
+                zeros = np.zeros((1, values.shape[1]))
+                self._cache['price_cumsum'] = (
+                    np.vstack([zeros, np.cumsum(np.where(missing, 0.0, values), axis=0)]),
+                    np.vstack([zeros, np.cumsum(missing, axis=0)]),
+                )
+            csum, missing_count = self._cache['price_cumsum']
+            ma = np.full(self.returns.shape, np.nan)
+            window_sum = (csum[window:] - csum[:-window]) / window
+            complete = missing_count[window:] == missing_count[:-window]
+            ma[window - 1:] = np.where(complete, window_sum, np.nan)
+            self._cache[key] = ma
+        return self._cache[key]
+
+    def trailing_log_return(self, lookback, skip=0):
+        """t-skip-lookback일 → t-skip일 로그수익률 (이력 부족 구간은 NaN)"""
+        key = ('ret', lookback, skip)
+        if key not in self._cache:
+            score = np.full(self.returns.shape, np.nan)
+            start = lookback + skip
+            if start < len(score):
+                score[start:] = self.log_prices[lookback:len(score) - skip] - self.log_prices[:len(score) - start]
+            self._cache[key] = score
+        return self._cache[key]
+
+    def cross_sectional_ranks(self, score_key, largest=True):
+        """
+        날짜별 횡단면 순위 (0 = 가장 유리한 종목), quantile/top_n만 다른 변형 간 재사용
+
+        Returns:
+            tuple: (순위 T × N, 유효 여부 T × N, 날짜별 유효 종목 수 T)
+        """
+        key = ('rank', score_key, largest)
+        if key not in self._cache:
+            _, lookback, skip = score_key
+            score = self.trailing_log_return(lookback, skip)
+            valid = np.isfinite(score)
+            # 유효하지 않은 점수는 정렬 시 맨 뒤로 보냄
+            filled = np.where(valid, score if largest else -score, -np.inf)
+            order = np.argsort(-filled, axis=1, kind='stable')
+            ranks = np.empty_like(order)
+            np.put_along_axis(ranks, order, np.broadcast_to(np.arange(score.shape[1]), score.shape), axis=1)
+            self._cache[key] = (ranks, valid, valid.sum(axis=1))
+        return self._cache[key]
+
+    def rebalance_mask(self, rule='M'):
+        """
+        리밸런싱일 (해당 기간의 마지막 거래일)
+        rule: 'D', 'W', 'M', 'Q' 또는 N (N 거래일마다)
+        """
+        n = len(self.dates)
+        if isinstance(rule, (int, np.integer)) or str(rule).isdigit():
+            step = int(rule)
+            if step < 1:
+                raise ValueError("Rebalance interval must be >= 1")
+            mask = np.zeros(n, dtype=bool)
+            mask[::step] = True
+            return mask
+        if rule not in REBALANCE_RULES:
+            raise ValueError(f"Unknown rebalance rule: {rule} (choose from {REBALANCE_RULES} or an integer)")
+        if rule == 'D':
+            return np.ones(n, dtype=bool)
+        if rule == 'W':
+            period = self.dates.to_period('W').asi8
+        elif rule == 'M':
+            period = self.dates.year * 12 + self.dates.month
+        else:
+            period = self.dates.year * 4 + (self.dates.month - 1) // 3
+        period = np.asarray(period)
+        mask = np.append(period[1:] != period[:-1], True)
+        return mask
+
+    # ---- 시뮬레이션 ----
+
+    def simulate(self, targets, rebalance):
+        """
+        목표 비중과 리밸런싱일로부터 일별 포트폴리오 수익률 계산
+
+        Args:
+            targets: 목표 비중 (T × N), 행 합 <= 1 (나머지는 현금)
+            rebalance: 리밸런싱일 bool 마스크 (T,)
+
+        Returns:
+            dict: returns, turnover, costs (T,), weights (T × N, 당일 종가 기준 보유 비중)
+        """
+        T, N = targets.shape
+        targets = np.nan_to_num(targets)
+        # 목표 비중이 모두 0인 초기 구간(이력 부족)도 리밸런싱일로 유지하여 현금 보유
+        reb_idx = np.flatnonzero(rebalance)
+        if reb_idx.size == 0:
+            raise ValueError("No rebalance dates in sample")
+
+        # seg[t]: t일 수익률에 적용되는 보유 비중을 정한 리밸런싱일 (t보다 앞선 마지막 리밸런싱일, 없으면 -1)
+        seg = np.full(T, -1)
+        seg[reb_idx[reb_idx < T - 1] + 1] = reb_idx[reb_idx < T - 1]
+        seg = np.maximum.accumulate(seg)
+        held = seg >= 0
+        anchor = np.where(held, seg, 0)
+
+        w = np.where(held[:, None], targets[anchor], 0.0)
+        w_cash = np.where(held, 1.0 - w.sum(axis=1), 1.0)
+        elapsed = np.where(held, np.arange(T) - anchor, 0)
+
+        # 구간 시작 대비 종목/현금 성장률 (당일, 전일)
+        growth = np.exp(self.cum_log_returns - self.cum_log_returns[anchor])
+        prev_log = np.vstack([self.cum_log_returns[:1], self.cum_log_returns[:-1]])
+        growth_prev = np.exp(prev_log - self.cum_log_returns[anchor])
+        cash_growth = (1 + self.rf_period) ** elapsed
+        cash_growth_prev = (1 + self.rf_period) ** np.maximum(elapsed - 1, 0)
+
+        value = (w * growth).sum(axis=1) + w_cash * cash_growth
+        value_prev = (w * growth_prev).sum(axis=1) + w_cash * cash_growth_prev
+        gross = value / value_prev - 1.0
+
+        # 리밸런싱일 회전율: 표류된 보유 비중 → 목표 비중
+        drifted = w * growth / value[:, None]
+        turnover = np.zeros(T)
+        turnover[reb_idx] = np.abs(targets[reb_idx] - drifted[reb_idx]).sum(axis=1)
+        costs = turnover * self.cost_rate
+        net = (1.0 + gross) * (1.0 - costs) - 1.0
+
+        return {'returns': net, 'turnover': turnover, 'costs': costs, 'weights': drifted}
+
+    def run(self, strategy='momentum', rebalance='M', include_weights=False, describe=True, **params):
+        """
+        전략 백테스트
+
+        Args:
+            strategy: STRATEGIES의 키 또는 callable(engine, **params) → 목표 비중 (T × N)
+            rebalance: 리밸런싱 일정
+            include_weights: 일별 보유 비중 DataFrame 포함 여부
+            describe: InsightGenerator 해석(정규성 검정 등) 포함 여부 (스윕에서는 생략)
+            **params: 전략 파라미터
+
+        Returns:
+            dict: equity_curve, returns, turnover, statistics, performance 등
+        """
+        fn = STRATEGIES[strategy] if isinstance(strategy, str) else strategy
+        targets = fn(self, **params)
+        sim = self.simulate(targets, self.rebalance_mask(rebalance))
+
+        # 첫 매매일 이전(현금만 보유, 비용 없음)은 성과 평가에서 제외
+        traded = sim['turnover'] > 0
+        first = int(np.argmax(traded)) if traded.any() else 0
+        returns = pd.Series(sim['returns'][first:], index=self.dates[first:], name='returns')
+        equity = (1.0 + returns).cumprod()
+
+        result = {
+            'strategy': strategy if isinstance(strategy, str) else getattr(strategy, '__name__', 'custom'),
+            'params': params,
+            'rebalance': rebalance,
+            'returns': returns,
+            'equity_curve': equity,
+            'turnover': pd.Series(sim['turnover'][first:], index=returns.index, name='turnover'),
+            'performance': self.performance_statistics(returns, sim['turnover'][first:], sim['costs'][first:]),
+            'statistics': (TimeSeriesAnalyzer.describe_returns(returns.to_numpy())
+                           if describe and len(returns) > 2 else None),
+        }
+        if include_weights:
+            result['weights'] = pd.DataFrame(sim['weights'][first:], index=returns.index, columns=self.tickers)
+        return result
+
+    def performance_statistics(self, returns, turnover=None, costs=None):
+        """연율화 성과 지표 (CAGR, 변동성, Sharpe, Sortino, 최대낙폭, Calmar, 적중률, 회전율)"""
+        r = np.asarray(returns, dtype=float)
+        P = self.periods_per_year
+        if len(r) == 0:
+            return {key: None for key in SWEEP_COLUMNS}
+        equity = np.cumprod(1.0 + r)
+        years = len(r) / P
+        total_return = equity[-1] - 1.0
+        cagr = equity[-1] ** (1 / years) - 1.0 if equity[-1] > 0 else -1.0
+        vol = r.std(ddof=1) * np.sqrt(P) if len(r) > 1 else 0.0
+        excess = r - self.rf_period
+        downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2)) * np.sqrt(P)
+        drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0)) - 1.0
+        max_drawdown = float(drawdown.min())
+        sharpe = excess.mean() * P / vol if vol > 0 else 0.0
+        return {
+            'total_return': float(total_return),
+            'cagr': float(cagr),
+            'annual_volatility': float(vol),
+            'sharpe_ratio': float(sharpe),
+            'sortino_ratio': float(excess.mean() * P / downside) if downside > 0 else 0.0,
+            'max_drawdown': max_drawdown,
+            'calmar_ratio': float(cagr / -max_drawdown) if max_drawdown < 0 else 0.0,
+            'hit_rate': float(np.mean(r > 0)),
+            'annual_turnover': float(np.sum(turnover) / years) if turnover is not None else None,
+            'total_cost': float(np.sum(costs)) if costs is not None else None,
+        }
+
+
+# ---- 파라미터 스윕 ----
+
+_WORKER_ENGINE = None
+
+
+def _init_sweep_worker(prices, engine_kwargs):
+    """워커마다 가격 패널을 한 번만 받아 엔진(및 중간 결과 캐시)을 준비"""
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = BacktestEngine(prices, **engine_kwargs)
+
+
+def _run_variants(strategy, rebalance, variants):
+    """파라미터 조합 청크 평가 → 성과 지표 행 목록"""
+    rows = []
+    for params in variants:
+        try:
+            performance = _WORKER_ENGINE.run(strategy, rebalance=rebalance, describe=False, **params)['performance']
+        except ValueError as e:
+            logging.warning(f"Variant {params} skipped: {e}")
+            continue
+        rows.append({**params, **performance})
+    return rows
+
+
+def parameter_grid(grid):
+    """{'lookback': [63, 126], 'skip': [0, 21]} → 모든 조합의 dict 목록"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def sweep(prices, strategy, grid, rebalance='M', max_workers=None, chunk_size=None, sort_by='sharpe_ratio',
+          **engine_kwargs):
+    """
+    파라미터 조합 전체를 병렬로 백테스트
+
+    Args:
+        prices: 종가 DataFrame (dates × tickers)
+        strategy: STRATEGIES의 키 (워커로 전달되므로 모듈 수준 함수여야 함)
+        grid: 파라미터 이름 → 후보 값 목록
+        rebalance: 리밸런싱 일정
+        max_workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        chunk_size: 작업 하나당 조합 수 (기본: 워커당 약 4개 작업)
+        sort_by: 정렬 기준 지표 (내림차순)
+        **engine_kwargs: BacktestEngine 인자 (비용, 무위험 이자율 등)
+
+    Returns:
+        pd.DataFrame: 조합별 파라미터 + 성과 지표
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy} (choose from {list(STRATEGIES)})")
+    variants = parameter_grid(grid)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, int(np.ceil(len(variants) / (max_workers * 4))))
+    chunks = [variants[i:i + chunk_size] for i in range(0, len(variants), chunk_size)]
+
+    if max_workers == 1:
+        _init_sweep_worker(prices, engine_kwargs)
+        rows = [row for chunk in chunks for row in _run_variants(strategy, rebalance, chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_sweep_worker,
+                                 initargs=(prices, engine_kwargs)) as executor:
+            futures = [executor.submit(_run_variants, strategy, rebalance, chunk) for chunk in chunks]
+            rows = [row for future in futures for row in future.result()]
+
+    table = pd.DataFrame(rows, columns=list(grid) + SWEEP_COLUMNS)
+    if sort_by in table.columns:
+        table = table.sort_values(sort_by, ascending=False).reset_index(drop=True)
+    return table
+
+
+def _parse_grid(items):
+    """CLI 인자 'lookback=63,126' → {'lookback': [63, 126]}"""
+    grid = {}
+    for item in items:
+        name, _, values = item.partition('=')
+        grid[name] = [float(v) if '.' in v else int(v) for v in values.split(',')]
+    return grid
+
+
+if __name__ == '__main__':
+    from database_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description='Vectorized backtest over the stored price panel')
+    parser.add_argument('--strategy', choices=list(STRATEGIES), default='momentum')
+    parser.add_argument('--rebalance', default='M', help="D, W, M, Q 또는 N (N 거래일마다)")
+    parser.add_argument('--tickers', nargs='+', help='대상 종목 (생략 시 DB의 모든 종목)')
+    parser.add_argument('--param', nargs='*', default=[], help='전략 파라미터 (예: lookback=126 skip=21)')
+    parser.add_argument('--sweep', nargs='*', help='스윕 그리드 (예: lookback=63,126,252 skip=0,21)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cost-bps', type=float, default=5.0)
+    parser.add_argument('--slippage-bps', type=float, default=5.0)
+    parser.add_argument('--risk-free-rate', type=float, default=0.05)
+    args = parser.parse_args()
+
+    db_path = os.path.join(DATA_ENG_PATH, 'market_data.db')
+    with DatabaseManager(db_path) as db:
+        prices = db.read_price_panel(args.tickers or db.list_tickers())
+    engine_kwargs = dict(risk_free_rate=args.risk_free_rate, transaction_cost_bps=args.cost_bps,
+                         slippage_bps=args.slippage_bps)
+    rebalance = int(args.rebalance) if args.rebalance.isdigit() else args.rebalance
+
+    if args.sweep:
+        grid = _parse_grid(args.sweep)
+        start = time.perf_counter()
+        table = sweep(prices, args.strategy, grid, rebalance=rebalance, max_workers=args.workers, **engine_kwargs)
+        elapsed = time.perf_counter() - start
+        print(f"{len(table)} variants × {prices.shape[1]} tickers × {prices.shape[0]} days "
+              f"in {elapsed:.2f}s ({len(table) / elapsed:.1f} variants/sec)")
+        print(table.head(10).to_string(float_format=lambda x: f"{x:.4f}"))
+    else:
+        params = {k: v[0] for k, v in _parse_grid(args.param).items()}
+        result = BacktestEngine(prices, **engine_kwargs).run(args.strategy, rebalance=rebalance, **params)
+        for key, value in result['performance'].items():
+            print(f"{key:>18}: {value:.4f}")
+        stats = result['statistics']
+        if stats:
+            print(f"\n왜도: {stats['skewness_interpretation']}")
+            print(f"첨도: {stats['kurtosis_interpretation']}")
+            print(f"정규성: {stats['normalcy_test']['interpretation']}")
+            print(stats['risk']['var_interpretation'])
@@ -13,13 +13,19 @@ E[R_i - R_f] = α + β_mkt·E[R_m - R_f] + β_smb·E[SMB] + β_hml·E[HML]
 - HML (High Minus Low): 가치주 vs 성장주의 초과 수익
 """
 
+import os
+import sys
 import numpy as np
 import pandas as pd
-from scipy import stats
-from statsmodels.regression.linear_model import OLS
-from statsmodels.tools.tools import add_constant
 import warnings
 
+# 계측 모듈 (01_Data_Engineering/instrumentation.py)
+DATA_ENG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '01_Data_Engineering')
+if DATA_ENG_PATH not in sys.path:
+    sys.path.insert(0, DATA_ENG_PATH)
+from instrumentation import timed
+from bar_resampler import infer_periods_per_year, TRADING_DAYS
+
 warnings.filterwarnings('ignore')
 
 
@@ -29,26 +35,29 @@ class FamaFrenchFactorBuilder:
     
     Attributes:
         market_returns: 시장 수익률 (SPY)
-        risk_free_rate: 무위험 이자율 (연 기준 → 일일로 변환)
+        periods_per_year: 수익률 관측 빈도의 연간 관측 수 (일봉: 252, 5분봉: 19,656)
+        risk_free_rate_period: 무위험 이자율 (연 기준 → 관측 기간 하나로 변환)
     """
     
-    def __init__(self, market_returns, risk_free_rate_annual=0.05):
+    def __init__(self, market_returns, risk_free_rate_annual=0.05, periods_per_year=None):
         """
         Args:
-            market_returns: 시장 수익률 pd.Series (일일)
+            market_returns: 시장 수익률 pd.Series (일봉 또는 장중 봉)
             risk_free_rate_annual: 연간 무위험 이자율 (기본값: 5%)
+            periods_per_year: 연간 관측 수 (기본값: 수익률 인덱스의 간격으로 추정, 일봉이면 252)
         """
         self.market_returns = market_returns.dropna()
-        # 연간 이자율을 일일로 변환: (1 + annual_rate)^(1/252) - 1
-        self.risk_free_rate_daily = (1 + risk_free_rate_annual) ** (1/252) - 1
+        self.periods_per_year = periods_per_year or infer_periods_per_year(self.market_returns.index)
+        # 연간 이자율을 관측 기간 하나로 변환: (1 + annual_rate)^(1/periods_per_year) - 1
+        self.risk_free_rate_period = (1 + risk_free_rate_annual) ** (1 / self.periods_per_year) - 1
         
     def calculate_market_excess_returns(self):
         """
         시장 초과 수익률 (MKT): R_m - R_f
         Returns:
-            pd.Series: 일일 시장 초과 수익률
+            pd.Series: 기간별 시장 초과 수익률
         """
-        return self.market_returns - self.risk_free_rate_daily
+        return self.market_returns - self.risk_free_rate_period
     
     def calculate_smb_factor(self, market_cap_df):
         """
@@ -72,10 +81,10 @@ class FamaFrenchFactorBuilder:
         # 실제로는 6개 포트폴리오의 가중 평균을 사용해야 함
         # 이 버전은 교육용 단순화 구현
         
-        # 플레이스홀더: 평균 0, 표준편차 0.01인 일일 팩터 반환
+        # 플레이스홀더: 평균 0, 일일 표준편차 0.01에 해당하는 기간별 팩터 반환
         # (실제 구현에서는 각 종목의 시가총액 데이터 필요)
         return pd.Series(
-            np.random.normal(0, 0.01, len(self.market_returns)),
+            np.random.normal(0, self._placeholder_scale(), len(self.market_returns)),
             index=self.market_returns.index
         )
     
@@ -94,12 +103,16 @@ class FamaFrenchFactorBuilder:
         Returns:
             pd.Series: 일일 HML 팩터
         """
-        # 플레이스홀더: 평균 0, 표준편차 0.01인 일일 팩터 반환
+        # 플레이스홀더: 평균 0, 일일 표준편차 0.01에 해당하는 기간별 팩터 반환
         return pd.Series(
-            np.random.normal(0, 0.01, len(self.market_returns)),
+            np.random.normal(0, self._placeholder_scale(), len(self.market_returns)),
             index=self.market_returns.index
         )
 
+    def _placeholder_scale(self):
+        """일일 표준편차 0.01을 관측 빈도로 환산 (분산이 시간에 비례: 0.01·√(252/periods_per_year))"""
+        return 0.01 * np.sqrt(TRADING_DAYS / self.periods_per_year)
+
 
 class FamaFrenchRegression:
     """
@@ -128,6 +141,7 @@ class FamaFrenchRegression:
         self.asset_returns = self.asset_returns.loc[common_idx]
         self.factors = self.factors.loc[common_idx]
     
+    @timed('regression')
     def run_regression(self):
         """
         OLS 회귀분석 실행
@@ -143,6 +157,10 @@ class FamaFrenchRegression:
                 'summary': 회귀분석 요약 (statsmodels)
             }
         """
+        # statsmodels는 임포트에 수백 ms가 걸리므로 회귀를 실행할 때 로드
+        from statsmodels.regression.linear_model import OLS
+        from statsmodels.tools.tools import add_constant
+
         # 상수항(절편) 추가
         X = add_constant(self.factors)
         y = self.asset_returns
@@ -248,16 +266,19 @@ class FamaFrenchAnalyzer:
     여러 자산에 대해 Fama-French 분석을 수행합니다.
     """
     
-    def __init__(self, market_data_dict, risk_free_rate_annual=0.05):
+    def __init__(self, market_data_dict, risk_free_rate_annual=0.05, periods_per_year=None):
         """
         Args:
-            market_data_dict: {ticker: DataFrame with 'Close' column}
+            market_data_dict: {ticker: DataFrame with 'Close' column} (일봉 또는 같은 간격의 장중 봉)
             risk_free_rate_annual: 연간 무위험 이자율
+            periods_per_year: 연간 관측 수 (기본값: 데이터 간격으로 추정)
         """
         self.market_data = market_data_dict
         self.rf_rate = risk_free_rate_annual
+        self.periods_per_year = periods_per_year
         self.results = {}
     
+    @timed('factor_analysis')
     def analyze_asset(self, ticker, market_ticker='SPY'):
         """
         개별 자산의 Fama-French 분석 수행
@@ -288,12 +309,11 @@ class FamaFrenchAnalyzer:
         asset_returns = asset_returns.loc[common_idx]
         market_returns = market_returns.loc[common_idx]
         
-        # 초과 수익률 계산
-        rf_daily = (1 + self.rf_rate) ** (1/252) - 1
-        asset_excess = asset_returns - rf_daily
+        # 팩터 빌더 (관측 빈도에 맞춘 기간별 무위험 이자율)
+        builder = FamaFrenchFactorBuilder(market_returns, self.rf_rate, self.periods_per_year)
         
-        # 팩터 빌더
-        builder = FamaFrenchFactorBuilder(market_returns, self.rf_rate)
+        # 초과 수익률 계산
+        asset_excess = asset_returns - builder.risk_free_rate_period
         mkt_excess = builder.calculate_market_excess_returns()
         
         # 임시 팩터 데이터 (SMB, HML는 단순화)
@@ -319,6 +339,7 @@ class FamaFrenchAnalyzer:
             'interpretation': interpretation
         }
     
+    @timed('portfolio_factor_analysis')
     def analyze_portfolio(self, tickers, weights=None, market_ticker='SPY'):
         """
         포트폴리오의 Fama-French 분석
@@ -367,12 +388,11 @@ class FamaFrenchAnalyzer:
         portfolio_returns = portfolio_returns.loc[common_idx]
         market_returns = market_returns.loc[common_idx]
         
-        # 초과 수익률
-        rf_daily = (1 + self.rf_rate) ** (1/252) - 1
-        portfolio_excess = portfolio_returns - rf_daily
+        # 팩터 빌더 (관측 빈도에 맞춘 기간별 무위험 이자율)
+        builder = FamaFrenchFactorBuilder(market_returns, self.rf_rate, self.periods_per_year)
         
-        # 팩터 빌더
-        builder = FamaFrenchFactorBuilder(market_returns, self.rf_rate)
+        # 초과 수익률
+        portfolio_excess = portfolio_returns - builder.risk_free_rate_period
         mkt_excess = builder.calculate_market_excess_returns()
         
         factors_df = pd.DataFrame({
@@ -393,6 +413,19 @@ class FamaFrenchAnalyzer:
             'interpretation': interpretation
         }
 
+    @staticmethod
+    def summarize(result):
+        """analyze_asset/analyze_portfolio 결과 → API 응답 필드 (JSON 직렬화 가능한 float만)"""
+        regression = result['results']
+        return {
+            'alpha': float(regression['alpha']),
+            'betas': {factor: float(regression['betas'][factor]) for factor in ('MKT', 'SMB', 'HML')},
+            'p_values': {name: float(regression['p_values'][name]) for name in ('alpha', 'MKT', 'SMB', 'HML')},
+            'r_squared': float(regression['r_squared']),
+            'adj_r_squared': float(regression['adj_r_squared']),
+            'interpretation': result['interpretation'],
+        }
+
 
 if __name__ == '__main__':
     """
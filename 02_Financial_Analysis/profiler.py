@@ -0,0 +1,235 @@
+"""
+요청/함수 단위 프로파일링
+========================================
+- sample (기본): 별도 스레드가 대상 스레드의 스택을 주기적으로 샘플링
+  → speedscope JSON (https://www.speedscope.app) + collapsed stacks (flamegraph.pl 형식)
+- cprofile: cProfile 결정적 프로파일 → .prof (pstats) + 누적 시간 상위 함수 요약
+
+Flask 서버에서는 PROFILING_ENABLED=1 일 때만 X-Profile 헤더 또는 ?profile=1 요청을 프로파일링하고,
+결과 파일 경로를 응답 헤더(X-Profile)로 알려 줍니다.
+
+CLI:
+    python profiler.py analyze_ticker --ticker AAPL --repeat 5
+    python profiler.py factor --ticker AAPL --mode cprofile
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import argparse
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+MODES = ('sample', 'cprofile')
+DEFAULT_INTERVAL = 0.001
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+
+class SamplingProfiler:
+    """
+    대상 스레드의 호출 스택을 interval 초마다 샘플링 (대상 코드는 수정하지 않음)
+    GIL 전환 주기 때문에 실제 샘플 간격은 interval보다 길 수 있으며, 각 샘플에는
+    직전 샘플 이후 실제 경과 시간을 가중치로 부여합니다.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.weights = defaultdict(float)   # {(frame, ...) 루트→리프: 누적 시간}
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def start(self):
+        self.thread_id = self.thread_id or threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+        return self
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.weights[tuple(reversed(stack))] += now - last
+            last = now
+
+    def collapsed(self):
+        """collapsed stacks: 'root;child;leaf <μs>' (flamegraph.pl / speedscope 입력)"""
+        lines = []
+        for stack, weight in sorted(self.weights.items(), key=lambda item: -item[1]):
+            names = ';'.join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+            lines.append(f"{names} {max(1, round(weight * 1e6))}")
+        return '\n'.join(lines) + '\n'
+
+    def speedscope(self, name='profile'):
+        """speedscope 'sampled' 프로파일 JSON"""
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, weight in self.weights.items():
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({'name': frame[0], 'file': frame[1], 'line': frame[2]})
+                ids.append(index[frame])
+            samples.append(ids)
+            weights.append(weight)
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'profiler.py',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled', 'name': name, 'unit': 'seconds',
+                'startValue': 0, 'endValue': sum(weights),
+                'samples': samples, 'weights': weights,
+            }],
+        }
+
+    def save(self, directory, name):
+        """<name>.speedscope.json, <name>.collapsed.txt 저장 → 저장한 경로 리스트"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, name)
+        with open(f"{base}.speedscope.json", 'w') as f:
+            json.dump(self.speedscope(name), f)
+        with open(f"{base}.collapsed.txt", 'w') as f:
+            f.write(self.collapsed())
+        return [f"{base}.speedscope.json", f"{base}.collapsed.txt"]
+
+    def summary(self, limit=15):
+        """자체 시간(leaf) 기준 상위 함수"""
+        self_time = defaultdict(float)
+        for stack, weight in self.weights.items():
+            self_time[stack[-1]] += weight
+        lines = [f"sampled {self.elapsed:.3f}s, {len(self.weights)} distinct stacks"]
+        for (name, filename, line), weight in sorted(self_time.items(), key=lambda item: -item[1])[:limit]:
+            lines.append(f"{weight * 1e3:10.2f} ms  {name} ({os.path.basename(filename)}:{line})")
+        return '\n'.join(lines)
+
+
+class CProfileProfiler:
+    """cProfile 래퍼 (SamplingProfiler와 같은 start/stop/save/summary 인터페이스)"""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.elapsed = 0.0
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def stop(self):
+        self.profile.disable()
+        self.elapsed = time.perf_counter() - self._started
+        return self
+
+    def summary(self, limit=15):
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    def save(self, directory, name):
+        """<name>.prof (pstats, snakeviz 등으로 열람), <name>.txt 요약 저장"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, name)
+        self.profile.dump_stats(f"{base}.prof")
+        with open(f"{base}.txt", 'w') as f:
+            f.write(self.summary(limit=50))
+        return [f"{base}.prof", f"{base}.txt"]
+
+
+def create_profiler(mode='sample', interval=DEFAULT_INTERVAL):
+    if mode not in MODES:
+        raise ValueError(f"Unknown profiling mode: {mode} (choose from {MODES})")
+    return SamplingProfiler(interval) if mode == 'sample' else CProfileProfiler()
+
+
+def profile_call(func, *args, mode='sample', interval=DEFAULT_INTERVAL, repeat=1, **kwargs):
+    """func(*args, **kwargs)를 repeat번 실행하며 프로파일링 → (마지막 결과, 프로파일러)"""
+    profiler = create_profiler(mode, interval).start()
+    try:
+        for _ in range(repeat):
+            result = func(*args, **kwargs)
+    finally:
+        profiler.stop()
+    return result, profiler
+
+
+def profile_name(label):
+    """파일 이름용: 시각_라벨 (경로 문자는 '_'로)"""
+    safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in label).strip('_') or 'profile'
+    return f"{datetime.now():%Y%m%d_%H%M%S_%f}_{safe}"
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    DATA_ENG_PATH = os.path.join(PROJECT_ROOT, '01_Data_Engineering')
+    if DATA_ENG_PATH not in sys.path:
+        sys.path.insert(0, DATA_ENG_PATH)
+    import pandas as pd
+    from database_manager import DatabaseManager
+    from analyzer_engine import TimeSeriesAnalyzer
+    from factor_model import FamaFrenchAnalyzer
+
+    parser = argparse.ArgumentParser(description='분석 엔진 프로파일링 (speedscope / cProfile)')
+    parser.add_argument('target', choices=['analyze_ticker', 'factor'],
+                        help='analyze_ticker: TimeSeriesAnalyzer.analyze_ticker, factor: FamaFrenchAnalyzer.analyze_asset')
+    parser.add_argument('--ticker', default='AAPL')
+    parser.add_argument('--market', default='SPY', help='팩터 분석의 시장 종목')
+    parser.add_argument('--db', default=os.path.join(DATA_ENG_PATH, 'market_data.db'), help='데이터셋 (SQLite DB 경로)')
+    parser.add_argument('--mode', choices=MODES, default='sample')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='샘플링 간격 (초)')
+    parser.add_argument('--repeat', type=int, default=1, help='반복 실행 횟수 (짧은 함수의 샘플 확보용)')
+    parser.add_argument('--output', default='profiles', help='결과 저장 디렉토리')
+    args = parser.parse_args()
+
+    with DatabaseManager(args.db) as db:
+        frames = {t: db.read_dataframe(f'{t}_daily') for t in {args.ticker, args.market}}
+    if frames[args.ticker] is None:
+        sys.exit(f"Ticker not found: {args.ticker}")
+
+    if args.target == 'analyze_ticker':
+        df = frames[args.ticker]
+        _, profiler = profile_call(lambda: TimeSeriesAnalyzer.analyze_ticker(df.copy()),
+                                   mode=args.mode, interval=args.interval, repeat=args.repeat)
+    else:
+        market_data = {}
+        for t, df in frames.items():
+            df = df.copy()
+            df['Date'] = pd.to_datetime(df['Date'])
+            market_data[t] = df.sort_values('Date').set_index('Date')
+        analyzer = FamaFrenchAnalyzer(market_data)
+        _, profiler = profile_call(analyzer.analyze_asset, args.ticker, market_ticker=args.market,
+                                   mode=args.mode, interval=args.interval, repeat=args.repeat)
+
+    paths = profiler.save(args.output, profile_name(f"{args.target}_{args.ticker}"))
+    print(profiler.summary())
+    print("\n저장된 파일:")
+    for path in paths:
+        print(f"  {path}")
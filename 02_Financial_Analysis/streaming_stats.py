@@ -0,0 +1,268 @@
+"""
+증분(스트리밍) 통계
+========================================
+새 bar가 들어올 때 전체 이력을 다시 계산하지 않고 누적 모멘트만 갱신
+
+- RunningMoments: 평균, 분산, 왜도, 첨도 (Pébay 2008 병합 공식, 새 bar 묶음을 한 번에 병합)
+  → calculate_statistics와 같은 정의 (모표준편차, 편향 왜도/초과 첨도)
+  → Jarque-Bera 통계량 JB = n/6·(S² + K²/4), p = exp(-JB/2) (자유도 2 카이제곱)
+- RunningRegression: 단순 회귀 y = α + β·x 의 공적률(co-moment) 누적 → CAPM 베타/알파/R²
+- TickerStream: 종목 하나의 가격 이력 소비 위치와 위 두 누적값을 관리하고, 새 bar마다 delta 생성
+
+갱신 비용은 새 bar 수 k에 대해 O(k) (이력 길이와 무관)
+"""
+
+import math
+import numpy as np
+
+try:
+    from .analyzer_engine import InsightGenerator
+except ImportError:  # 스크립트 실행 (02_Financial_Analysis가 sys.path에 있음)
+    from analyzer_engine import InsightGenerator
+from bar_resampler import infer_periods_per_year, date_format
+
+
+class RunningMoments:
+    """1~4차 중심 적률 누적 (n, 평균, M2, M3, M4, 최소, 최대)"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """관측치 묶음 병합 (묶음 자체의 적률을 numpy로 구한 뒤 기존 누적값과 합침)"""
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        n_b = len(values)
+        if n_b == 0:
+            return self
+        mean_b = float(values.mean())
+        d = values - mean_b
+        d2 = d * d
+        m2_b, m3_b, m4_b = float(d2.sum()), float((d2 * d).sum()), float((d2 * d2).sum())
+
+        n_a = self.n
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        m2_a, m3_a = self.m2, self.m3
+        self.m4 += (m4_b + delta ** 4 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b) / n ** 3
+                    + 6 * delta ** 2 * (n_a * n_a * m2_b + n_b * n_b * m2_a) / n ** 2
+                    + 4 * delta * (n_a * m3_b - n_b * m3_a) / n)
+        self.m3 += (m3_b + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                    + 3 * delta * (n_a * m2_b - n_b * m2_a) / n)
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self.mean += delta * n_b / n
+        self.n = n
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / self.n) if self.n else float('nan')
+
+    @property
+    def skewness(self):
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5 if self.m2 > 0 else 0.0
+
+    @property
+    def kurtosis(self):
+        return self.n * self.m4 / (self.m2 * self.m2) - 3.0 if self.m2 > 0 else 0.0
+
+    def statistics(self):
+        """describe_returns에서 순서 통계량(VaR)을 제외한 항목 (같은 키/형식)"""
+        if self.n == 0:
+            return None
+        skewness, kurtosis = self.skewness, self.kurtosis
+        jb_stat = self.n / 6.0 * (skewness ** 2 + kurtosis ** 2 / 4.0)
+        std = self.std
+        return {
+            'count': self.n,
+            'mean': self.mean,
+            'std': std,
+            'min': self.min,
+            'max': self.max,
+            'skewness': skewness,
+            'kurtosis': kurtosis,
+            'normalcy_test': InsightGenerator.normality_result(jb_stat, math.exp(-jb_stat / 2.0)),
+            'skewness_interpretation': InsightGenerator.interpret_skewness(skewness),
+            'kurtosis_interpretation': InsightGenerator.interpret_kurtosis(kurtosis),
+            'risk': {'sharpe_ratio': self.mean / std if std else 0.0},
+        }
+
+
+class RunningRegression:
+    """단순 회귀 y = α + β·x 의 누적 공적률 (n, 평균, Sxx, Syy, Sxy)"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0
+        self.syy = 0.0
+        self.sxy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        keep = np.isfinite(x) & np.isfinite(y)
+        x, y = x[keep], y[keep]
+        n_b = len(x)
+        if n_b == 0:
+            return self
+        mx, my = float(x.mean()), float(y.mean())
+        dx, dy = x - mx, y - my
+        n_a = self.n
+        n = n_a + n_b
+        delta_x, delta_y = mx - self.mean_x, my - self.mean_y
+        correction = n_a * n_b / n
+        self.sxx += float(dx @ dx) + delta_x * delta_x * correction
+        self.syy += float(dy @ dy) + delta_y * delta_y * correction
+        self.sxy += float(dx @ dy) + delta_x * delta_y * correction
+        self.mean_x += delta_x * n_b / n
+        self.mean_y += delta_y * n_b / n
+        self.n = n
+        return self
+
+    def result(self):
+        """{alpha, beta, r_squared, correlation, n_obs} (관측치가 부족하면 None)"""
+        if self.n < 3 or self.sxx <= 0:
+            return None
+        beta = self.sxy / self.sxx
+        r_squared = self.sxy * self.sxy / (self.sxx * self.syy) if self.syy > 0 else 0.0
+        return {
+            'alpha': self.mean_y - beta * self.mean_x,
+            'beta': beta,
+            'r_squared': r_squared,
+            'correlation': math.copysign(math.sqrt(r_squared), beta),
+            'n_obs': self.n,
+        }
+
+
+class TickerStream:
+    """
+    종목 하나의 증분 상태: 소비한 가격 이력의 마지막 날짜/종가/행 수, 수익률 적률, CAPM 회귀
+
+    Example:
+        stream = TickerStream('AAPL')
+        stream.advance(aapl_df, spy_df)   # 최초: 전체 이력으로 초기화 (reset=True)
+        delta = stream.advance(aapl_df, spy_df)  # 이후: 새 bar만 반영, 변화가 없으면 None
+    """
+
+    def __init__(self, ticker, risk_free_rate_annual=0.05, periods_per_year=None):
+        self.ticker = ticker
+        self.risk_free_rate_annual = risk_free_rate_annual
+        self.periods_per_year = periods_per_year   # None이면 첫 이력의 봉 간격으로 추정
+        self.rf_period = None
+        self.date_format = '%Y-%m-%d'
+        self._reset()
+
+    def _reset(self):
+        self.moments = RunningMoments()
+        self.capm = RunningRegression()
+        self.price_through = None     # 소비한 마지막 가격 날짜
+        self.capm_through = None      # 회귀에 반영한 마지막 수익률 날짜
+        self.last_close = None
+        self.rows = 0
+        self.close_sum = 0.0
+        self.weighted_sum = 0.0       # Σ 종가 × 행 번호 (합이 같은 수정·값 맞바꿈 감지)
+
+    def history_rewritten(self, close):
+        """
+        이미 소비한 구간이 바뀌었으면(과거 행 수정/삭제, 테이블 교체) True
+        MarketDataStore의 변경 스탬프처럼 (행 수, 마지막 종가, 종가 합, 행 번호 가중 합) 비교
+        """
+        if self.price_through is None:
+            return False
+        consumed = close.to_numpy()[:close.index.searchsorted(self.price_through, side='right')]
+        if len(consumed) != self.rows or consumed[-1] != self.last_close:
+            return True
+        weighted = float(consumed @ np.arange(1, len(consumed) + 1))
+        return not (math.isclose(consumed.sum(), self.close_sum, rel_tol=1e-12)
+                    and math.isclose(weighted, self.weighted_sum, rel_tol=1e-12))
+
+    def advance(self, df, market_df=None):
+        """
+        새 bar를 반영하고 delta를 반환
+        :param df: 종목 OHLCV DataFrame (DatetimeIndex, 날짜순 — MarketDataStore.get 형식)
+        :param market_df: 시장 종목 DataFrame (없으면 CAPM 생략)
+        :return: {'ticker', 'reset', 'prices', 'statistics', 'capm', 'as_of'} 또는 변화가 없으면 None
+                 reset=True이면 누적값을 전체 이력으로 다시 만든 것 (클라이언트는 전체 데이터를 다시 받아야 함)
+        """
+        close = df['Close']
+        reset = self.price_through is None or self.history_rewritten(close)
+        if reset:
+            self._reset()
+            new = close
+        else:
+            new = close.iloc[close.index.searchsorted(self.price_through, side='right'):]
+
+        if self.rf_period is None:
+            # FamaFrenchAnalyzer와 같은 기간별 무위험 이자율 (알파에만 영향), 장중 봉이면 시:분까지 표시
+            periods = self.periods_per_year or infer_periods_per_year(close.index)
+            self.rf_period = (1 + self.risk_free_rate_annual) ** (1 / periods) - 1
+            self.date_format = date_format(close.index)
+
+        capm_changed = self._advance_capm(close, market_df)
+        if new.empty and not capm_changed and not reset:
+            return None
+
+        if not new.empty:
+            previous = [] if self.last_close is None else [self.last_close]
+            prices = np.concatenate([previous, new.to_numpy(dtype=float)])
+            self.moments.update(prices[1:] / prices[:-1] - 1)
+            self.price_through = new.index[-1]
+            self.last_close = float(new.iloc[-1])
+            self.weighted_sum += float(new.to_numpy() @ np.arange(self.rows + 1, self.rows + len(new) + 1))
+            self.rows += len(new)
+            self.close_sum += float(new.sum())
+
+        capm = self.capm.result()
+        return {
+            'ticker': self.ticker,
+            'reset': reset,
+            'prices': {
+                'dates': [] if reset else new.index.strftime(self.date_format).tolist(),
+                'prices': [] if reset else [float(p) for p in new],
+            },
+            'statistics': self.moments.statistics(),
+            'capm': capm,
+            'as_of': None if self.price_through is None else self.price_through.strftime(self.date_format),
+        }
+
+    def reset_capm(self):
+        """시장 종목 이력이 바뀐 경우: 다음 advance에서 회귀를 전체 이력으로 다시 누적"""
+        self.capm = RunningRegression()
+        self.capm_through = None
+
+    def _advance_capm(self, close, market_df):
+        """종목/시장 모두 값이 있는 날짜의 수익률 중 아직 반영하지 않은 구간만 회귀에 추가 → 추가 여부"""
+        if market_df is None:
+            return False
+        asset_dates, asset_returns = _returns_after(close, self.capm_through)
+        market_dates, market_returns = _returns_after(market_df['Close'], self.capm_through)
+        common, ia, im = np.intersect1d(asset_dates, market_dates, assume_unique=True, return_indices=True)
+        if len(common) == 0:
+            return False
+        self.capm.update(market_returns[im] - self.rf_period, asset_returns[ia] - self.rf_period)
+        self.capm_through = common[-1]
+        return True
+
+
+def _returns_after(close, after):
+    """
+    after 이후 날짜의 단순 수익률 → (날짜 배열, 수익률 배열)
+    직전 행 하나만 더 잘라 numpy로 계산 → 이력 길이와 무관한 비용 (pandas 인덱싱 오버헤드도 없음)
+    """
+    start = 0 if after is None else close.index.searchsorted(after, side='right')
+    lo = max(start - 1, 0)
+    values = close.to_numpy(dtype=float)[lo:]
+    returns = values[1:] / values[:-1] - 1
+    dates = close.index.to_numpy()[lo + 1:]
+    keep = np.isfinite(returns)
+    return dates[keep], returns[keep]
@@ -1,9 +1,12 @@
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 import logging
 import os
-from scipy import stats
-import statsmodels.api as sm
+import html
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+# matplotlib / scipy.stats / statsmodels.api는 그림을 그리는 함수 안에서 임포트
+# (리포트 모드의 부모 프로세스와 DB 조회만 하는 호출은 로드하지 않음)
 
 # Import from other modules
 import sys
@@ -18,7 +21,7 @@ if ANALYSIS_PATH not in sys.path:
     sys.path.insert(0, ANALYSIS_PATH)
 
 from database_manager import DatabaseManager
-from analyzer_engine import TimeSeriesAnalyzer
+from analyzer_engine import TimeSeriesAnalyzer, InsightGenerator
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,19 +30,28 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "..", "01_Data_Engineering", "market_data.db")
 
-def load_data_from_db(ticker: str) -> pd.DataFrame:
+def load_data_from_db(ticker: str, db: DatabaseManager = None) -> pd.DataFrame:
     """
-    SQLite 데이터베이스에서 특정 티커의 일별 데이터를 로드합니다.
+    SQLite 데이터베이스에서 특정 티커의 일별 데이터를 날짜순으로 로드합니다.
+
+    :param db: 열려 있는 DatabaseManager (여러 종목을 읽을 때 연결 하나를 재사용, 생략 시 새로 연결)
     """
+    if db is None:
+        try:
+            with DatabaseManager(DB_PATH) as db:
+                return load_data_from_db(ticker, db)
+        except Exception as e:
+            logging.error(f"Error loading data for {ticker} from database: {e}")
+            return pd.DataFrame()
+
     table_name = f"{ticker}_daily"
     df = pd.DataFrame()
     try:
-        with DatabaseManager(DB_PATH) as db:
-            # SQL 쿼리를 직접 실행하여 DataFrame으로 로드
-            df = pd.read_sql_query(f"SELECT Date, Close FROM {table_name}", db.conn)
-            df['Date'] = pd.to_datetime(df['Date'])
-            df.set_index('Date', inplace=True)
-            logging.info(f"Successfully loaded {len(df)} rows for {ticker} from database.")
+        # SQL 쿼리를 직접 실행하여 DataFrame으로 로드 (수집 순서와 무관하게 날짜순)
+        df = pd.read_sql_query(f'SELECT Date, Close FROM "{table_name}"', db.conn)
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.set_index('Date').sort_index()
+        logging.info(f"Successfully loaded {len(df)} rows for {ticker} from database.")
     except Exception as e:
         logging.error(f"Error loading data for {ticker} from database: {e}")
     return df
@@ -71,6 +83,10 @@ def analyze_returns_multi(tickers: list, data_dict: dict):
         logging.warning("No valid returns data.")
         return
 
+    import matplotlib.pyplot as plt
+    import statsmodels.api as sm
+    from scipy import stats
+
     # 2. 하나의 figure에 모든 그래프를 배치 (각 티커마다 3개 subplot: histogram, Q-Q, ACF)
     num_tickers = len(returns_dict)
     fig, axes = plt.subplots(num_tickers, 3, figsize=(16, 4.5 * num_tickers))
@@ -107,17 +123,244 @@ def analyze_returns_multi(tickers: list, data_dict: dict):
     plt.subplots_adjust(hspace=0.4, wspace=0.35, left=0.08, right=0.95, top=0.95, bottom=0.08)
     plt.show()
 
+# ===== 헤드리스 배치 리포트 (Agg 백엔드 + 프로세스 풀) =====
+REPORT_FIGSIZE = (12, 3.5)
+
+# 워커 프로세스마다 하나의 figure와 아티스트를 만들어 모든 종목에 재사용
+_report_fig = None
+_report_artists = None
+
+
+def _init_report_worker(bins, nlags):
+    """
+    리포트 워커 초기화: Agg 백엔드로 전환하고 재사용할 figure/아티스트를 생성합니다.
+    종목마다 ax.cla()로 축을 다시 만드는 대신 아티스트의 데이터만 교체합니다.
+    """
+    global _report_fig, _report_artists
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+    fig, axes = plt.subplots(1, 3, figsize=REPORT_FIGSIZE)
+    fig.subplots_adjust(wspace=0.35, left=0.06, right=0.98, top=0.88, bottom=0.15)
+
+    # 0열: 수익률 분포 (히스토그램)
+    bars = axes[0].bar(np.arange(bins, dtype=float), np.zeros(bins), width=1.0, edgecolor='black', alpha=0.7)
+    axes[0].set_xlabel('Daily Return', fontsize=9)
+    axes[0].set_ylabel('Frequency', fontsize=9)
+
+    # 1열: Q-Q 플롯 (표본 분위수 + 평균/표준편차 기준선)
+    qq_points, = axes[1].plot([], [], 'o', markersize=2, alpha=0.7)
+    qq_line, = axes[1].plot([], [], 'r-', linewidth=1)
+    axes[1].set_xlabel('Theoretical Quantiles', fontsize=9)
+
+    # 2열: ACF (95% 신뢰구간 포함)
+    lags = np.arange(nlags + 1)
+    acf_stems = axes[2].vlines(lags, 0, np.zeros(nlags + 1), linewidth=1)
+    acf_markers, = axes[2].plot(lags, np.zeros(nlags + 1), 'o', markersize=3)
+    conf_upper = axes[2].axhline(0, color='gray', linestyle='--', linewidth=0.8)
+    conf_lower = axes[2].axhline(0, color='gray', linestyle='--', linewidth=0.8)
+    axes[2].axhline(0, color='black', linewidth=0.5)
+
+    for ax in axes:
+        ax.tick_params(labelsize=8)
+        ax.grid(alpha=0.3)
+
+    _report_fig = fig
+    _report_artists = {
+        'axes': axes, 'bars': bars, 'qq_points': qq_points, 'qq_line': qq_line,
+        'lags': lags, 'acf_stems': acf_stems, 'acf_markers': acf_markers,
+        'conf_upper': conf_upper, 'conf_lower': conf_lower
+    }
+
+
+def _draw_ticker_panel(artists, ticker, histogram, qq_plot, acf_values, n_obs):
+    """
+    분석 엔진이 계산한 데이터(히스토그램, Q-Q, ACF)로 한 종목의 패널을 갱신합니다.
+    stats.probplot / plot_acf를 다시 호출하지 않고 이미 계산된 값을 그대로 사용합니다.
+    """
+    axes = artists['axes']
+
+    # 0열: 히스토그램 막대 위치/높이 교체
+    centers = np.asarray(histogram['bin_labels'])
+    width = float(centers[1] - centers[0]) if len(centers) > 1 else 0.01
+    for rect, center, count in zip(artists['bars'], centers, histogram['counts']):
+        rect.set_x(center - width / 2)
+        rect.set_width(width)
+        rect.set_height(count)
+    axes[0].set_title(f'{ticker} Daily Returns', fontsize=10)
+
+    # 1열: Q-Q 플롯
+    theoretical = np.asarray(qq_plot['theoretical'])
+    sample = np.asarray(qq_plot['sample'])
+    artists['qq_points'].set_data(theoretical, sample)
+    artists['qq_line'].set_data(theoretical, sample.mean() + sample.std() * theoretical)
+    axes[1].set_title(f'{ticker} Q-Q Plot', fontsize=10)
+
+    # 2열: ACF
+    lags = artists['lags']
+    artists['acf_stems'].set_segments([[(lag, 0), (lag, value)] for lag, value in zip(lags, acf_values)])
+    artists['acf_markers'].set_ydata(acf_values)
+    conf = 1.96 / np.sqrt(n_obs)
+    artists['conf_upper'].set_ydata([conf, conf])
+    artists['conf_lower'].set_ydata([-conf, -conf])
+    axes[2].set_title(f'{ticker} ACF', fontsize=10)
+
+    for ax in axes:
+        ax.relim()
+        ax.autoscale_view()
+
+
+def _render_ticker_chunk(tickers, output_dir, fmt, bins, nlags):
+    """
+    워커에서 실행: 종목 묶음을 연결 하나로 로드하고, 묶음 전체의 ACF를 FFT 한 번으로 계산한 뒤 패널 이미지를 저장합니다.
+    Returns: 종목별 요약 dict 리스트 (인덱스 페이지용)
+    """
+    series = {}
+    with DatabaseManager(DB_PATH) as db:
+        for ticker in tickers:
+            df = load_data_from_db(ticker, db)
+            if df.empty or 'Close' not in df.columns:
+                logging.warning(f"Skipping {ticker}: no data.")
+                continue
+
+            returns = df['Close'].pct_change().dropna().values
+            if len(returns) <= nlags:
+                logging.warning(f"Skipping {ticker}: not enough observations ({len(returns)}).")
+                continue
+            series[ticker] = returns
+
+    acf_values = TimeSeriesAnalyzer.calculate_acf_batch(list(series.values()), nlags=nlags)
+    summaries = []
+    for (ticker, returns), ticker_acf in zip(series.items(), acf_values):
+        statistics = TimeSeriesAnalyzer.calculate_statistics(returns)
+        jb_test = InsightGenerator.jarque_bera_test(returns)
+
+        _draw_ticker_panel(
+            _report_artists, ticker,
+            TimeSeriesAnalyzer.calculate_histogram(returns, bins=bins),
+            TimeSeriesAnalyzer.calculate_qq_plot(returns),
+            ticker_acf,
+            len(returns)
+        )
+        file_name = f"{ticker}.{fmt}"
+        _report_fig.savefig(os.path.join(output_dir, file_name), format=fmt, dpi=80)
+
+        summaries.append({
+            'ticker': ticker,
+            'file': file_name,
+            'n_obs': len(returns),
+            'statistics': statistics,
+            'jb_p_value_str': jb_test['p_value_str'],
+            'is_normal': jb_test['is_normal']
+        })
+    return summaries
+
+
+def _write_report_index(output_dir, summaries):
+    """모든 종목 패널을 모아 보여주는 index.html을 작성합니다."""
+    rows = []
+    for item in summaries:
+        st = item['statistics']
+        ticker = html.escape(item['ticker'])
+        rows.append(
+            f"<tr id=\"{ticker}\"><td><b>{ticker}</b><br>"
+            f"N={item['n_obs']}<br>"
+            f"평균 {st['mean'] * 100:.3f}%<br>"
+            f"변동성 {st['std'] * 100:.3f}%<br>"
+            f"왜도 {st['skewness']:.3f}<br>"
+            f"첨도 {st['kurtosis']:.3f}<br>"
+            f"JB p={html.escape(item['jb_p_value_str'])} {'✓' if item['is_normal'] else '✗'}</td>"
+            f"<td><img src=\"{html.escape(item['file'])}\" loading=\"lazy\"></td></tr>"
+        )
+
+    page = (
+        "<!DOCTYPE html>\n<html lang=\"ko\">\n<head>\n<meta charset=\"UTF-8\">\n"
+        "<title>시계열 분석 리포트</title>\n"
+        "<style>body{font-family:Arial,sans-serif;font-size:12px}"
+        "td{vertical-align:top;padding:4px;border-bottom:1px solid #ddd}</style>\n"
+        "</head>\n<body>\n"
+        f"<h1>시계열 분석 리포트 ({len(summaries)}개 종목)</h1>\n"
+        "<table>\n" + "\n".join(rows) + "\n</table>\n</body>\n</html>\n"
+    )
+    index_path = os.path.join(output_dir, 'index.html')
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return index_path
+
+
+def render_reports(tickers: list, output_dir: str, fmt: str = 'png', max_workers=None,
+                   chunk_size=None, bins: int = 40, nlags: int = 30):
+    """
+    헤드리스(Agg) 배치 리포트 생성.
+    종목별 패널(히스토그램, Q-Q, ACF)을 프로세스 풀에서 병렬로 렌더링하고 index.html을 작성합니다.
+
+    :param tickers: 리포트를 생성할 종목 리스트
+    :param output_dir: 이미지와 index.html을 저장할 디렉토리
+    :param fmt: 'png' 또는 'svg'
+    :param max_workers: 워커 프로세스 수 (기본값: CPU 수)
+    :param chunk_size: 워커당 한 번에 처리할 종목 수 (기본값: 자동)
+    :return: index.html 경로
+    """
+    if fmt not in ('png', 'svg'):
+        raise ValueError(f"Unsupported report format: {fmt}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # 워커당 약 4개의 작업 → 부하 분산과 작업 전달 비용의 균형
+        chunk_size = max(1, len(tickers) // (max_workers * 4))
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+    logging.info(f"Rendering {len(tickers)} tickers in {len(chunks)} chunks with {max_workers} workers.")
+
+    summaries = []
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_report_worker, initargs=(bins, nlags)) as executor:
+        futures = [executor.submit(_render_ticker_chunk, chunk, output_dir, fmt, bins, nlags) for chunk in chunks]
+        for future in as_completed(futures):
+            try:
+                summaries.extend(future.result())
+            except Exception as e:
+                logging.error(f"Report chunk failed: {e}")
+
+    summaries.sort(key=lambda item: item['ticker'])
+    index_path = _write_report_index(output_dir, summaries)
+    logging.info(f"Report written to {index_path} ({len(summaries)} tickers).")
+    return index_path
+
+
+def list_db_tickers() -> list:
+    """DB에 저장된 모든 일별 종목을 조회합니다."""
+    try:
+        with DatabaseManager(DB_PATH) as db:
+            return db.list_tickers()
+    except Exception as e:
+        logging.error(f"Error listing tickers: {e}")
+        return []
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시계열 분석 시각화 (인터랙티브 또는 헤드리스 배치 리포트)")
+    parser.add_argument('--report', metavar='OUTPUT_DIR', help="헤드리스 리포트 모드: 패널 이미지와 index.html 저장 위치")
+    parser.add_argument('--tickers', nargs='+', help="분석할 종목 (리포트 모드 기본값: DB의 모든 종목)")
+    parser.add_argument('--format', choices=['png', 'svg'], default='png', help="패널 이미지 형식")
+    parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수")
+    args = parser.parse_args()
+
+    if args.report:
+        report_tickers = args.tickers or list_db_tickers()
+        render_reports(report_tickers, args.report, fmt=args.format, max_workers=args.workers)
+        raise SystemExit(0)
+
     # 분석할 종목 리스트
-    target_tickers = ["AAPL", "MSFT", "TSLA", "SPY"]
+    target_tickers = args.tickers or ["AAPL", "MSFT", "TSLA", "SPY"]
     
     logging.info(f"--- Starting Time Series Analysis for {target_tickers} ---")
 
-    # 1. 데이터 로드
-    data_dict = {}
-    for ticker in target_tickers:
-        stock_data = load_data_from_db(ticker)
-        data_dict[ticker] = stock_data
+    # 1. 데이터 로드 (연결 하나로 모든 종목)
+    with DatabaseManager(DB_PATH) as db:
+        data_dict = {ticker: load_data_from_db(ticker, db) for ticker in target_tickers}
 
     # 2. 수익률 분석 및 시각화 (함께 표시)
     analyze_returns_multi(target_tickers, data_dict)
@@ -0,0 +1,360 @@
+"""
+조건부 변동성 모델 (GARCH 계열)
+========================================
+수익률의 변동성 군집(Volatility Clustering)을 최우추정(MLE)으로 모델링
+
+모델:
+GARCH(1,1):  σ²_t = ω + α·ε²_{t-1} + β·σ²_{t-1}
+GJR-GARCH:   σ²_t = ω + (α + γ·1[ε_{t-1} < 0])·ε²_{t-1} + β·σ²_{t-1}
+EGARCH(1,1): ln σ²_t = ω + α·(|z_{t-1}| - E|z|) + γ·z_{t-1} + β·ln σ²_{t-1}
+
+- ε_t = r_t - μ: 평균을 차감한 수익률, z_t = ε_t / σ_t
+- 여러 종목을 한 번에 추정: 종목별 우도는 서로 독립이므로
+  (종목 × 파라미터) 전체를 하나의 L-BFGS-B 문제로 풀고,
+  그래디언트는 파라미터 하나를 모든 종목에 동시에 흔드는 유한차분으로 계산
+- 분산 재귀식은 시간 축 루프를 (종목 × 흔든 점) 축으로 벡터화 → 종목 수와 무관하게 T번의 numpy 연산
+  (GARCH/GJR는 충격항을 미리 한 번에 계산하고 루프에서는 σ²_{t+1} = x_t + β·σ²_t 제자리 갱신만 수행)
+- param_cache: 종목별 직전 추정치 → 같은 종목을 다시 추정할 때 warm start (반복 횟수 감소)
+- scipy.optimize는 추정 시점에 임포트 (서버 기동 시간에서 제외)
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# 관측 빈도 상수 (01_Data_Engineering/bar_resampler.py)
+DATA_ENG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '01_Data_Engineering')
+if DATA_ENG_PATH not in sys.path:
+    sys.path.insert(0, DATA_ENG_PATH)
+from bar_resampler import TRADING_DAYS
+
+# 수익률을 % 단위로 변환하여 최적화의 수치 안정성 확보
+RETURN_SCALE = 100.0
+EXPECTED_ABS_Z = np.sqrt(2.0 / np.pi)  # 표준정규분포의 E|z|
+MAX_PERSISTENCE = 0.9999
+
+PARAM_NAMES = {
+    'garch': ['omega', 'alpha', 'beta'],
+    'gjr': ['omega', 'alpha', 'gamma', 'beta'],
+    'egarch': ['omega', 'alpha', 'gamma', 'beta'],
+}
+
+
+def _initial_params(model, sample_var):
+    """모델별 기본 초기값 (종목 수 N에 대해 (k, N) 배열)"""
+    n = len(sample_var)
+    if model == 'garch':
+        rows = [sample_var * 0.05, np.full(n, 0.05), np.full(n, 0.90)]
+    elif model == 'gjr':
+        rows = [sample_var * 0.05, np.full(n, 0.03), np.full(n, 0.06), np.full(n, 0.90)]
+    else:  # egarch
+        rows = [np.log(sample_var) * 0.05, np.full(n, 0.10), np.full(n, -0.05), np.full(n, 0.95)]
+    return np.vstack(rows)
+
+
+def _param_bounds(model, sample_var):
+    """모델별 파라미터 경계 (k개의 (lower, upper) 배열 쌍)"""
+    n = len(sample_var)
+    if model == 'garch':
+        return [(np.full(n, 1e-8), sample_var * 10), (np.zeros(n), np.ones(n)), (np.zeros(n), np.ones(n))]
+    if model == 'gjr':
+        # γ >= 0 (레버리지 효과) → α, γ >= 0 이므로 분산이 항상 양수
+        return [(np.full(n, 1e-8), sample_var * 10), (np.zeros(n), np.ones(n)),
+                (np.zeros(n), np.ones(n)), (np.zeros(n), np.ones(n))]
+    return [(np.full(n, -10.0), np.full(n, 10.0)), (np.full(n, -1.0), np.full(n, 2.0)),
+            (np.full(n, -1.0), np.ones(n)), (np.zeros(n), np.full(n, MAX_PERSISTENCE))]
+
+
+def _persistence(model, params):
+    """분산 지속성: GARCH α+β, GJR α+γ/2+β, EGARCH β"""
+    if model == 'garch':
+        return params[1] + params[2]
+    if model == 'gjr':
+        return params[1] + 0.5 * params[2] + params[3]
+    return params[3]
+
+
+def _variance_path(model, params, eps, valid, init_var):
+    """
+    조건부 분산 경로 계산
+
+    Args:
+        params: (k, N) 파라미터
+        eps: (T, N) 평균 차감 수익률 (결측치는 0)
+        valid: (T, N) 관측치 존재 여부
+        init_var: (N,) 초기 분산 (표본 분산)
+
+    Returns:
+        np.ndarray: (T + 1, N) 분산 경로, 마지막 행은 1기 후 예측 분산 σ²_{T+1}
+    """
+    T, N = eps.shape
+    sigma2 = np.empty((T + 1, N))
+
+    if model in ('garch', 'gjr'):
+        omega, alpha = params[0], params[1]
+        beta = params[-1]
+        e2 = eps * eps
+        shock = alpha * e2
+        if model == 'gjr':
+            shock += params[2] * e2 * (eps < 0)
+        # 첫 관측 이전(상장 전) 구간은 x_t = (1-β)·σ²_0 → 재귀식이 초기 분산을 그대로 유지
+        started = np.maximum.accumulate(valid, axis=0)
+        x = np.where(started, omega + shock, (1.0 - beta) * init_var)
+        # σ²_{t+1} = x_t + β·σ²_t: 행 단위 제자리 갱신 (종목 축 벡터화, 임시 배열 없음)
+        sigma2[0] = init_var
+        for t in range(T):
+            np.multiply(beta, sigma2[t], out=sigma2[t + 1])
+            sigma2[t + 1] += x[t]
+        return sigma2
+
+    # EGARCH: 시간 축 루프, 종목 축 벡터화
+    omega, alpha, gamma, beta = params
+    started = np.maximum.accumulate(valid, axis=0)
+    log_h = np.log(init_var)
+    sigma2[0] = init_var
+    for t in range(T):
+        z = eps[t] / np.sqrt(sigma2[t])
+        next_log_h = omega + alpha * (np.abs(z) - EXPECTED_ABS_Z) + gamma * z + beta * log_h
+        # 첫 관측 이전(상장 전) 구간은 초기 분산 유지
+        log_h = np.where(started[t], np.clip(next_log_h, -30.0, 30.0), log_h)
+        sigma2[t + 1] = np.exp(log_h)
+    return sigma2
+
+
+def _negative_log_likelihood(model, params, eps, valid, init_var):
+    """종목별 정규분포 음의 로그우도 (N,)"""
+    sigma2 = np.maximum(_variance_path(model, params, eps, valid, init_var)[:-1], 1e-12)
+    terms = np.log(2 * np.pi) + np.log(sigma2) + eps * eps / sigma2
+    nll = 0.5 * np.where(valid, terms, 0.0).sum(axis=0)
+    # 비정상(non-stationary) 영역 페널티
+    excess = np.maximum(_persistence(model, params) - MAX_PERSISTENCE, 0.0)
+    return nll + 1e4 * excess ** 2
+
+
+class ParamCache:
+    """
+    종목별 최근 추정 파라미터 (warm start용, 스레드 안전, 오래 쓰지 않은 종목부터 제거)
+
+    Example:
+        GarchVolatilityModel('garch').fit(returns, param_cache=param_cache)   # 있으면 직전 추정치에서 시작
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._params = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model, tickers):
+        """저장된 종목만 담은 초기 파라미터 DataFrame (index: ticker), 없으면 None"""
+        with self._lock:
+            found = {}
+            for ticker in tickers:
+                values = self._params.get((model, ticker))
+                if values is not None:
+                    self._params.move_to_end((model, ticker))
+                    found[ticker] = values
+        if not found:
+            return None
+        return pd.DataFrame.from_dict(found, orient='index', columns=PARAM_NAMES[model])
+
+    def update(self, model, params):
+        """추정 결과 params_ (index: ticker) 기록 — 유한한 값만"""
+        values = params[PARAM_NAMES[model]].to_numpy(dtype=float)
+        with self._lock:
+            for ticker, row in zip(params.index, values):
+                if np.isfinite(row).all():
+                    self._params[(model, ticker)] = row
+                    self._params.move_to_end((model, ticker))
+            while len(self._params) > self.max_entries:
+                self._params.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._params.clear()
+
+
+# 프로세스 공용 캐시 (서버 스레드, 분석 워커 프로세스마다 하나)
+param_cache = ParamCache()
+
+
+class GarchVolatilityModel:
+    """
+    GARCH(1,1) / GJR-GARCH / EGARCH 조건부 변동성 모델.
+    여러 종목을 동시에 추정하며, 이전 추정치로 warm start 할 수 있습니다.
+
+    Attributes:
+        params_: 종목별 추정 파라미터 DataFrame (index: ticker)
+        conditional_volatility_: 조건부 변동성 DataFrame (수익률 단위, dates × tickers)
+        log_likelihood_: 종목별 로그우도 pd.Series
+        converged_: 최적화 수렴 여부
+    """
+
+    def __init__(self, model='garch', periods_per_year=TRADING_DAYS):
+        """
+        Args:
+            model: 'garch', 'gjr', 'egarch'
+            periods_per_year: 연율화에 사용할 연간 관측 수 (일별: 252, 5분봉: 19,656 — bar_resampler.periods_per_year)
+        """
+        if model not in PARAM_NAMES:
+            raise ValueError(f"Unknown volatility model: {model}")
+        self.model = model
+        self.periods_per_year = periods_per_year
+        self.params_ = None
+        self.conditional_volatility_ = None
+        self.log_likelihood_ = None
+        self.converged_ = False
+        self._mu = None
+        self._next_var = None
+
+    def fit(self, returns, start_params=None, warm_start=False, maxiter=500, param_cache=None):
+        """
+        최우추정으로 파라미터를 추정합니다.
+
+        Args:
+            returns: 수익률 pd.DataFrame (dates × tickers) 또는 pd.Series
+            start_params: 초기 파라미터 DataFrame (index: ticker, columns: 파라미터 이름)
+            warm_start: True이면 직전 fit()의 params_를 초기값으로 사용
+            maxiter: 최대 반복 횟수
+            param_cache: ParamCache — start_params가 없으면 저장된 종목별 추정치에서 시작하고, 추정 후 결과를 기록
+
+        Returns:
+            self
+        """
+        from scipy.optimize import minimize
+        if isinstance(returns, pd.Series):
+            returns = returns.to_frame(returns.name or 'asset')
+
+        tickers = list(returns.columns)
+        raw = returns.to_numpy(dtype=float) * RETURN_SCALE
+        valid = ~np.isnan(raw)
+        counts = valid.sum(axis=0)
+        if (counts < 10).any():
+            short = [t for t, c in zip(tickers, counts) if c < 10]
+            raise ValueError(f"Not enough observations for: {short}")
+
+        self._mu = np.nanmean(raw, axis=0)
+        eps = np.where(valid, raw - self._mu, 0.0)
+        init_var = np.nanvar(raw, axis=0)
+
+        names = PARAM_NAMES[self.model]
+        k, n = len(names), len(tickers)
+        x0 = _initial_params(self.model, init_var)
+
+        # warm start: 이전 추정치(또는 지정 초기값)가 있는 종목만 덮어쓰기
+        if warm_start and start_params is None and self.params_ is not None:
+            start_params = self.params_
+        if start_params is None and param_cache is not None:
+            start_params = param_cache.get(self.model, tickers)
+        if start_params is not None:
+            known = [t for t in tickers if t in start_params.index]
+            cols = [tickers.index(t) for t in known]
+            if known:
+                x0[:, cols] = start_params.loc[known, names].to_numpy(dtype=float).T
+
+        bounds = _param_bounds(self.model, init_var)
+        lower = np.vstack([b[0] for b in bounds])
+        upper = np.vstack([b[1] for b in bounds])
+        x0 = np.clip(x0, lower, upper)
+        step = 1e-6
+
+        # 기준점과 k개의 흔든 점을 종목 축으로 쌓아 한 번의 재귀로 우도와 그래디언트를 함께 계산
+        eps_all = np.tile(eps, (1, k + 1))
+        valid_all = np.tile(valid, (1, k + 1))
+        init_all = np.tile(init_var, k + 1)
+
+        def objective(x):
+            params = x.reshape(k, n)
+            shifts = np.where(params + step > upper, -step, step)
+            stacked = np.tile(params, (1, k + 1))
+            for j in range(k):
+                stacked[j, (j + 1) * n:(j + 2) * n] += shifts[j]
+            nll = _negative_log_likelihood(self.model, stacked, eps_all, valid_all, init_all).reshape(k + 1, n)
+            grad = (nll[1:] - nll[0]) / shifts
+            return nll[0].sum(), grad.ravel()
+
+        result = minimize(
+            objective, x0.ravel(), jac=True, method='L-BFGS-B',
+            bounds=list(zip(lower.ravel(), upper.ravel())),
+            options={'maxiter': maxiter, 'ftol': 1e-12, 'gtol': 1e-6}
+        )
+        params = result.x.reshape(k, n)
+        self.converged_ = bool(result.success)
+
+        sigma2 = _variance_path(self.model, params, eps, valid, init_var)
+        self._next_var = sigma2[-1]
+        vol = np.sqrt(sigma2[:-1]) / RETURN_SCALE
+        self.conditional_volatility_ = pd.DataFrame(np.where(valid, vol, np.nan), index=returns.index, columns=tickers)
+        self.params_ = pd.DataFrame(params.T, index=tickers, columns=names)
+        self.log_likelihood_ = pd.Series(
+            -_negative_log_likelihood(self.model, params, eps, valid, init_var), index=tickers
+        )
+        if param_cache is not None:
+            param_cache.update(self.model, self.params_)
+        return self
+
+    def persistence(self):
+        """종목별 분산 지속성 pd.Series"""
+        self._check_fitted()
+        params = self.params_.to_numpy().T
+        return pd.Series(_persistence(self.model, params), index=self.params_.index)
+
+    def forecast(self, horizon=10):
+        """
+        h-기간 조건부 변동성 예측
+
+        GARCH/GJR: E[σ²_{T+h}] = σ̄² + p^{h-1}·(σ²_{T+1} - σ̄²),  σ̄² = ω / (1 - p)
+        EGARCH:    ln σ²_{T+h} ≈ m + β^{h-1}·(ln σ²_{T+1} - m),   m = ω / (1 - β)
+
+        Returns:
+            pd.DataFrame: (horizon × tickers) 기간별 변동성 (수익률 단위)
+        """
+        self._check_fitted()
+        params = self.params_.to_numpy().T
+        p = np.minimum(_persistence(self.model, params), MAX_PERSISTENCE)
+        steps = np.arange(horizon)[:, None]
+
+        if self.model == 'egarch':
+            long_run = params[0] / (1 - p)
+            log_var = long_run + p ** steps * (np.log(self._next_var) - long_run)
+            var = np.exp(log_var)
+        else:
+            long_run = params[0] / (1 - p)
+            var = long_run + p ** steps * (self._next_var - long_run)
+
+        return pd.DataFrame(
+            np.sqrt(var) / RETURN_SCALE,
+            index=pd.RangeIndex(1, horizon + 1, name='horizon'),
+            columns=self.params_.index
+        )
+
+    def summary(self, ticker, horizon=10):
+        """
+        단일 종목 결과를 JSON 직렬화 가능한 dict로 정리 (대시보드/API용)
+        """
+        self._check_fitted()
+        vol = self.conditional_volatility_[ticker].dropna()
+        annualize = np.sqrt(self.periods_per_year)
+        # 장중 봉(연간 관측 수가 일봉보다 많음)은 시:분까지 표시
+        date_format = '%Y-%m-%d %H:%M' if self.periods_per_year > TRADING_DAYS else '%Y-%m-%d'
+        forecast = self.forecast(horizon)[ticker]
+        return {
+            'model': self.model,
+            'params': {name: float(v) for name, v in self.params_.loc[ticker].items()},
+            'persistence': float(self.persistence()[ticker]),
+            'log_likelihood': float(self.log_likelihood_[ticker]),
+            'converged': int(self.converged_),
+            'dates': [d.strftime(date_format) if hasattr(d, 'strftime') else str(d) for d in vol.index],
+            'conditional_volatility': [float(x) for x in vol.values],
+            'current_volatility': float(vol.iloc[-1]),
+            'current_volatility_annual': float(vol.iloc[-1] * annualize),
+            'forecast': [float(x) for x in forecast.values],
+            'forecast_annual': [float(x * annualize) for x in forecast.values],
+        }
+
+    def _check_fitted(self):
+        if self.params_ is None:
+            raise RuntimeError("Model is not fitted yet. Call fit() first.")
@@ -0,0 +1,8 @@
+"""
+Portfolio Management Module
+"""
+from .covariance import CovarianceEstimator
+from .covariance_engine import IncrementalCovariance
+from .optimizer import PortfolioOptimizer
+
+__all__ = ['CovarianceEstimator', 'IncrementalCovariance', 'PortfolioOptimizer']
@@ -0,0 +1,111 @@
+"""
+공분산 행렬 추정기
+========================================
+포트폴리오 최적화의 입력이 되는 기대수익률과 공분산 행렬을 추정
+
+- sample: 표본 공분산 (종목 수가 관측 수에 가까우면 추정 오차가 큼)
+- ledoit_wolf: Ledoit-Wolf(2004) 축소 추정 → (1 - δ)·S + δ·μ·I
+- ewma: RiskMetrics 지수가중 공분산 (최근 관측치에 큰 가중치, 기본 λ = 0.94)
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# 관측 빈도 유틸리티 (01_Data_Engineering/bar_resampler.py)
+DATA_ENG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '01_Data_Engineering')
+if DATA_ENG_PATH not in sys.path:
+    sys.path.insert(0, DATA_ENG_PATH)
+from bar_resampler import infer_periods_per_year
+
+ESTIMATORS = ('sample', 'ledoit_wolf', 'ewma')
+
+
+class CovarianceEstimator:
+    """
+    수익률 패널(dates × tickers)에서 연율화된 기대수익률과 공분산 행렬을 추정합니다.
+    """
+
+    @staticmethod
+    def sample(returns):
+        """표본 공분산 (N × N)"""
+        X = returns - returns.mean(axis=0)
+        return X.T @ X / (len(X) - 1)
+
+    @staticmethod
+    def ledoit_wolf(returns):
+        """
+        Ledoit-Wolf 축소 공분산 (축소 목표: 평균 분산 × 단위행렬)
+
+        Returns:
+            tuple: (공분산 행렬, 축소 강도 δ ∈ [0, 1])
+        """
+        X = returns - returns.mean(axis=0)
+        n_samples, n_features = X.shape
+        S = X.T @ X / n_samples
+
+        X2 = X ** 2
+        emp_cov_trace = X2.sum(axis=0) / n_samples
+        mu = emp_cov_trace.sum() / n_features
+
+        delta = (S ** 2).sum()
+        beta = 1.0 / (n_features * n_samples) * ((X2.T @ X2).sum() / n_samples - delta)
+        delta = (delta - 2.0 * mu * emp_cov_trace.sum() + n_features * mu ** 2) / n_features
+        beta = min(beta, delta)
+        shrinkage = 0.0 if beta == 0 else beta / delta
+
+        shrunk = (1.0 - shrinkage) * S
+        shrunk.flat[::n_features + 1] += shrinkage * mu
+        return shrunk, float(shrinkage)
+
+    @staticmethod
+    def ewma(returns, decay=0.94):
+        """
+        지수가중 이동평균(EWMA) 공분산
+        가중치 w_t ∝ λ^(T-1-t), 합이 1이 되도록 정규화
+        """
+        n = len(returns)
+        weights = decay ** np.arange(n - 1, -1, -1, dtype=float)
+        weights /= weights.sum()
+        mean = weights @ returns
+        X = returns - mean
+        return (X * weights[:, None]).T @ X
+
+    @staticmethod
+    def estimate(returns_df, method='ledoit_wolf', periods_per_year=None, decay=0.94):
+        """
+        연율화된 기대수익률과 공분산 행렬 추정
+
+        Args:
+            returns_df: 수익률 DataFrame (dates × tickers), 결측치 없음
+            method: 'sample', 'ledoit_wolf', 'ewma'
+            periods_per_year: 연율화 계수 (기본값: 수익률 인덱스의 간격으로 추정, 일봉이면 252)
+            decay: EWMA 감쇠계수 λ
+
+        Returns:
+            dict: {'expected_returns': pd.Series, 'cov': pd.DataFrame, 'method', 'shrinkage'}
+        """
+        if method not in ESTIMATORS:
+            raise ValueError(f"Unknown covariance estimator: {method}")
+
+        returns = returns_df.to_numpy(dtype=float)
+        if len(returns) < 2:
+            raise ValueError("At least 2 observations are required.")
+
+        periods_per_year = periods_per_year or infer_periods_per_year(returns_df.index)
+        shrinkage = None
+        if method == 'sample':
+            cov = CovarianceEstimator.sample(returns)
+        elif method == 'ledoit_wolf':
+            cov, shrinkage = CovarianceEstimator.ledoit_wolf(returns)
+        else:
+            cov = CovarianceEstimator.ewma(returns, decay)
+
+        tickers = returns_df.columns
+        return {
+            'expected_returns': pd.Series(returns.mean(axis=0) * periods_per_year, index=tickers),
+            'cov': pd.DataFrame(cov * periods_per_year, index=tickers, columns=tickers),
+            'method': method,
+            'shrinkage': shrinkage
+        }
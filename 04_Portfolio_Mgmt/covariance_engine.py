@@ -0,0 +1,381 @@
+"""
+증분 공분산/상관 엔진
+========================================
+전체 종목의 EWMA·이동창(rolling) 공분산 행렬을 유지하고, 새 관측치(bar)마다
+재계산 대신 rank-one 갱신만 수행
+
+EWMA (평균 차감, λ = decay):
+    d = x - m_{t-1},  m_t = λ·m_{t-1} + (1-λ)·x
+    C_t = λ·C_{t-1} + λ(1-λ)·d·dᵀ
+    → 저장 행렬 A와 배율 s로 C = s·A 를 표현하면 λ 곱셈은 s *= λ (O(1)),
+      d·dᵀ 항은 BLAS dsyr로 상삼각만 갱신 (O(N²/2), 3,000종목 기준 수 ms)
+
+Rolling (창 크기 W):
+    S1 = Σx,  S2 = Σx·xᵀ  →  새 관측치 x 추가와 W일 전 관측치 y 제거를
+    x·xᵀ - y·yᵀ = ½[(x+y)(x-y)ᵀ + (x-y)(x+y)ᵀ] 로 묶어 dsyr2 한 번에 갱신
+    (누적 반올림 오차를 막기 위해 W번마다 버퍼로부터 재계산)
+    결측치(상장 전 등)가 창 안에 있으면 쌍별 관측치만 사용 (pandas DataFrame.cov와 동일):
+        n_ij = Σ m_i·m_j,  A_ij = Σ x_i·m_j,  Q_ij = Σ x_i²·m_j  (m = 관측 여부, 결측 x = 0)
+        C_ij = (S2_ij - A_ij·A_ji / n_ij) / (n_ij - 1)
+        상관계수는 같은 쌍별 관측치의 분산 (Q_ij - A_ij² / n_ij) / (n_ij - 1) 으로 정규화
+    → A, Q, n은 창에 결측치가 있는 동안만 유지 (결측치가 없으면 기존 rank-2 갱신만)
+
+스냅샷: 상삼각(대각 포함)만 float32로 직렬화 → N(N+1)/2 × 4 bytes (3,000종목 ≈ 18MB)
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+
+METHODS = ('ewma', 'rolling')
+SNAPSHOT_TABLE = 'covariance_snapshots'
+# 배율 s가 이 값보다 작아지면 저장 행렬에 반영하여 언더플로 방지
+MIN_SCALE = 1e-150
+
+
+class IncrementalCovariance:
+    """
+    종목 전체의 공분산 행렬을 관측치 단위로 갱신
+
+    Example:
+        engine = IncrementalCovariance(tickers, method='ewma', decay=0.94)
+        engine.fit(returns_df)               # 과거 이력
+        engine.update(new_returns, date)     # 새 bar: rank-one 갱신
+        engine.correlation()
+    """
+
+    def __init__(self, tickers, method='ewma', decay=0.94, window=252):
+        """
+        Args:
+            tickers: 종목 리스트 (행렬의 행/열 순서)
+            method: 'ewma' 또는 'rolling'
+            decay: EWMA 감쇠계수 λ
+            window: rolling 창 크기 (관측치 수)
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method: {method} (choose from {METHODS})")
+        self.tickers = list(tickers)
+        self.method = method
+        self.decay = float(decay)
+        self.window = int(window)
+        n = len(self.tickers)
+
+        # 상삼각만 유효한 Fortran 순서 행렬 (BLAS 제자리 갱신)
+        self._matrix = np.zeros((n, n), order='F')
+        self._scale = 1.0
+        self._mean = np.zeros(n)
+        self._sum = np.zeros(n)
+        self._buffer = np.zeros((self.window, n)) if method == 'rolling' else None
+        self._pairwise = None     # rolling: 창에 결측치가 있을 때만 (A, Q, n_ij)
+        self._since_recompute = 0
+        self.n_obs = 0
+        self.last_date = None
+
+    @property
+    def key(self):
+        """스냅샷 구분자"""
+        return f"ewma_{self.decay:g}" if self.method == 'ewma' else f"rolling_{self.window}"
+
+    # ---- 갱신 ----
+
+    def update(self, x, date=None):
+        """
+        새 관측치(수익률 벡터 하나) 반영
+
+        결측치(NaN)는 EWMA에서는 현재 평균으로(해당 종목 정보 없음) 대체하고,
+        rolling에서는 해당 종목이 포함된 쌍의 관측치 수에서 제외합니다.
+        """
+        from scipy.linalg.blas import dsyr, dsyr2  # scipy.linalg 임포트를 첫 갱신 시점으로 미룸
+        x = np.asarray(x, dtype=float)
+        if x.shape != (len(self.tickers),):
+            raise ValueError(f"Expected {len(self.tickers)} returns, got shape {x.shape}")
+        missing = ~np.isfinite(x)
+
+        if self.method == 'ewma':
+            if missing.any():
+                x = np.where(missing, self._mean, x)
+            if self.n_obs == 0:
+                self._mean[:] = x
+            else:
+                lam = self.decay
+                d = x - self._mean
+                self._mean *= lam
+                self._mean += (1.0 - lam) * x
+                self._scale *= lam
+                dsyr(lam * (1.0 - lam) / self._scale, d, a=self._matrix, lower=0, overwrite_a=True)
+                if self._scale < MIN_SCALE:
+                    self._matrix *= self._scale
+                    self._scale = 1.0
+        else:
+            filled = np.where(missing, 0.0, x)
+            slot = self.n_obs % self.window
+            old = self._buffer[slot] if self.n_obs >= self.window else None
+            if old is None:
+                dsyr(1.0, filled, a=self._matrix, lower=0, overwrite_a=True)
+                self._sum += filled
+            else:
+                old_filled = np.nan_to_num(old)
+                # x·xᵀ - y·yᵀ 을 대칭 rank-2 갱신 한 번으로
+                dsyr2(0.5, filled + old_filled, filled - old_filled, a=self._matrix, lower=0, overwrite_a=True)
+                self._sum += filled - old_filled
+            if self._pairwise is not None:
+                self._update_pairwise(filled, ~missing, old)
+            self._buffer[slot] = x
+            self._since_recompute += 1
+            if self._since_recompute >= self.window:
+                self._recompute_rolling(min(self.n_obs + 1, self.window))
+            elif self._pairwise is None and missing.any():
+                self._pairwise = self._pairwise_sums(self._buffer[:min(self.n_obs + 1, self.window)])
+
+        self.n_obs += 1
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+        return self
+
+    @staticmethod
+    def _pairwise_sums(rows):
+        """창 관측치(결측 NaN)의 쌍별 합 A_ij = Σ x_i·m_j, Q_ij = Σ x_i²·m_j 와 관측치 수 n_ij = Σ m_i·m_j"""
+        observed = np.isfinite(rows).astype(float)
+        filled = np.where(observed > 0, rows, 0.0)
+        return filled.T @ observed, (filled ** 2).T @ observed, observed.T @ observed
+
+    def _update_pairwise(self, filled, observed, old):
+        """새 관측치 추가 (old가 있으면 창에서 제거)를 쌍별 합/관측치 수에 반영"""
+        cross, squares, count = self._pairwise
+        old_filled = np.nan_to_num(old) if old is not None else np.zeros_like(filled)
+        old_observed = np.isfinite(old) if old is not None else None
+        if observed.all() and (old is None or old_observed.all()):
+            # 결측치 없는 관측치끼리의 교체: 행 방향 더하기만 (n_ij는 추가 시에만 1 증가)
+            cross += (filled - old_filled)[:, None]
+            squares += (filled ** 2 - old_filled ** 2)[:, None]
+            if old is None:
+                count += 1.0
+            return
+        mask = observed.astype(float)
+        cross += np.outer(filled, mask)
+        squares += np.outer(filled ** 2, mask)
+        count += np.outer(mask, mask)
+        if old is not None:
+            old_mask = old_observed.astype(float)
+            cross -= np.outer(old_filled, old_mask)
+            squares -= np.outer(old_filled ** 2, old_mask)
+            count -= np.outer(old_mask, old_mask)
+
+    def _recompute_rolling(self, n_rows):
+        """버퍼의 처음 n_rows개 관측치로 S1, S2 (창에 결측치가 있으면 쌍별 합까지) 다시 계산 (누적 반올림 오차 제거)"""
+        rows = self._buffer[:n_rows]
+        filled = np.nan_to_num(rows)
+        self._matrix[:] = np.asfortranarray(filled.T @ filled)
+        self._sum = filled.sum(axis=0)
+        self._pairwise = self._pairwise_sums(rows) if not np.isfinite(rows).all() else None
+        self._since_recompute = 0
+
+    def fit(self, returns_df, min_periods=20):
+        """
+        과거 수익률 이력으로 초기화한 뒤 이후 관측치를 순차 갱신
+
+        - EWMA: 처음 min_periods개 관측치의 표본 평균/공분산으로 시작
+        - rolling: 마지막 window개 관측치로 S1, S2를 한 번에 계산
+        """
+        returns_df = returns_df[self.tickers]
+        values = returns_df.to_numpy(dtype=float)
+        dates = returns_df.index
+        if len(values) == 0:
+            return self
+
+        if self.method == 'rolling':
+            tail = values[-self.window:]
+            self._buffer[:len(tail)] = tail
+            self.n_obs = len(tail)
+            self._recompute_rolling(len(tail))
+            self.last_date = pd.Timestamp(dates[-1])
+            return self
+
+        seed = min(min_periods, len(values))
+        head = np.nan_to_num(values[:seed])
+        self._mean = head.mean(axis=0)
+        centered = head - self._mean
+        self._matrix[:] = np.asfortranarray(centered.T @ centered / max(seed - 1, 1))
+        self._scale = 1.0
+        self.n_obs = seed
+        self.last_date = pd.Timestamp(dates[seed - 1])
+        for row, date in zip(values[seed:], dates[seed:]):
+            self.update(row, date)
+        return self
+
+    # ---- 조회 ----
+
+    def _upper(self):
+        """현재 공분산의 상삼각 (다른 부분은 무의미)"""
+        if self.method == 'ewma':
+            return self._matrix * self._scale
+        if self._pairwise is not None:
+            cross, _, count = self._pairwise
+            with np.errstate(divide='ignore', invalid='ignore'):
+                upper = (self._matrix - cross * cross.T / count) / (count - 1)
+            return np.where(count >= 2, upper, np.nan)
+        n = min(self.n_obs, self.window)
+        if n < 2:
+            return np.full(self._matrix.shape, np.nan)
+        return (self._matrix - np.outer(self._sum, self._sum) / n) / (n - 1)
+
+    def covariance(self, periods_per_year=1):
+        """대칭 공분산 행렬 (periods_per_year=252이면 연율화)"""
+        upper = np.triu(self._upper())
+        return (upper + np.triu(upper, 1).T) * periods_per_year
+
+    def volatility(self, periods_per_year=1):
+        """종목별 변동성 (공분산 대각의 제곱근)"""
+        return np.sqrt(np.clip(np.diag(self._upper()), 0.0, None) * periods_per_year)
+
+    def correlation(self):
+        """상관계수 행렬 D^{-1/2}·C·D^{-1/2} (분산 0인 종목은 NaN, 창에 결측치가 있으면 쌍별 관측치의 분산으로 정규화)"""
+        cov = self.covariance()
+        if self._pairwise is not None:
+            cross, squares, count = self._pairwise
+            with np.errstate(divide='ignore', invalid='ignore'):
+                variance = np.clip((squares - cross ** 2 / count) / (count - 1), 0.0, None)
+                corr = cov / np.sqrt(variance * variance.T)
+            corr[~(variance * variance.T > 0) | (count < 2)] = np.nan
+            np.clip(corr, -1.0, 1.0, out=corr)
+            np.fill_diagonal(corr, np.where(np.diag(variance) > 0, 1.0, np.nan))
+            return corr
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv = np.where(std > 0, 1.0 / std, np.nan)
+        corr = cov * inv[:, None] * inv[None, :]
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return corr
+
+    # ---- 스냅샷 ----
+
+    @staticmethod
+    def pack(matrix, dtype=np.float32):
+        """대칭 행렬 → 상삼각(대각 포함) 1차원 배열"""
+        return matrix[np.triu_indices(matrix.shape[0])].astype(dtype)
+
+    @staticmethod
+    def unpack(packed, n):
+        """상삼각 1차원 배열 → 대칭 행렬 (float64)"""
+        matrix = np.zeros((n, n))
+        rows, cols = np.triu_indices(n)
+        matrix[rows, cols] = packed
+        matrix[cols, rows] = packed
+        return matrix
+
+    def save_snapshot(self, db, table_name=SNAPSHOT_TABLE):
+        """현재 공분산(float32 상삼각)과 EWMA 평균을 DB에 저장"""
+        if self.last_date is None:
+            raise ValueError("Nothing to save: no observations with dates")
+        db.save_matrix_snapshot(
+            table_name, self.key, self.last_date.strftime('%Y-%m-%d'), self.tickers,
+            self.pack(self.covariance()).tobytes(),
+            meta={'method': self.method, 'decay': self.decay, 'window': self.window,
+                  'n_obs': self.n_obs, 'mean': self._mean.tolist() if self.method == 'ewma' else None}
+        )
+
+    @classmethod
+    def from_snapshot(cls, db, method='ewma', decay=0.94, window=252, date=None, table_name=SNAPSHOT_TABLE):
+        """
+        저장된 스냅샷으로 엔진 복원 (EWMA는 이후 update로 이어서 갱신 가능)
+        rolling은 창 버퍼가 없으므로 조회 전용이며, 갱신하려면 fit으로 다시 초기화합니다.
+        """
+        key = cls([], method, decay, window).key
+        snapshot = db.load_matrix_snapshot(table_name, key, date)
+        if snapshot is None:
+            return None
+        engine = cls(snapshot['labels'], method, decay, window)
+        n = len(engine.tickers)
+        cov = cls.unpack(np.frombuffer(snapshot['data'], dtype=np.float32), n)
+        meta = snapshot['meta']
+        engine.n_obs = meta.get('n_obs', 0)
+        engine.last_date = pd.Timestamp(snapshot['date'])
+        if method == 'ewma':
+            engine._matrix[:] = cov
+            engine._mean = np.asarray(meta.get('mean') or np.zeros(n), dtype=float)
+        else:
+            # S2 = (n-1)·C + S1·S1ᵀ/n 에서 S1 = 0 으로 두고 공분산만 복원
+            n_window = min(engine.n_obs, window)
+            engine._matrix[:] = cov * (n_window - 1)
+        return engine
+
+
+def cluster_order(corr, method='average'):
+    """
+    계층적 군집(거리 √(½(1-ρ)))의 덴드로그램 잎 순서 → 비슷한 종목이 인접하도록 정렬
+    scipy.cluster가 없으면 원래 순서를 반환
+    """
+    try:
+        from scipy.cluster.hierarchy import linkage, leaves_list, optimal_leaf_ordering
+        from scipy.spatial.distance import squareform
+    except ImportError:
+        logging.warning("scipy.cluster unavailable; returning original order")
+        return np.arange(len(corr))
+
+    n = len(corr)
+    if n < 3:
+        return np.arange(n)
+    dist = np.sqrt(np.clip(0.5 * (1.0 - np.nan_to_num(corr)), 0.0, 1.0))
+    np.fill_diagonal(dist, 0.0)
+    condensed = squareform(dist, checks=False)
+    tree = linkage(condensed, method=method)
+    if n <= 500:
+        tree = optimal_leaf_ordering(tree, condensed)
+    return leaves_list(tree)
+
+
+def benchmark(n_assets=3000, n_updates=20, seed=0):
+    """n_assets 종목 행렬의 관측치 1개 갱신 평균 시간 (ms)"""
+    rng = np.random.default_rng(seed)
+    results = {}
+    for method in METHODS:
+        engine = IncrementalCovariance([f"A{i}" for i in range(n_assets)], method=method, window=60)
+        warmup = rng.standard_normal((engine.window + 1, n_assets)) * 0.01
+        for row in warmup:
+            engine.update(row)
+        bars = rng.standard_normal((n_updates, n_assets)) * 0.01
+        start = time.perf_counter()
+        for row in bars:
+            engine.update(row)
+        results[method] = (time.perf_counter() - start) / n_updates * 1e3
+    return results
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    DATA_ENG_PATH = os.path.join(PROJECT_ROOT, '01_Data_Engineering')
+    if DATA_ENG_PATH not in sys.path:
+        sys.path.insert(0, DATA_ENG_PATH)
+    from database_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description='Incremental covariance engine')
+    parser.add_argument('--update', action='store_true',
+                        help='최근 EWMA 스냅샷 이후의 bar만 반영하여 새 스냅샷 저장 (없으면 전체 이력으로 생성)')
+    parser.add_argument('--decay', type=float, default=0.94)
+    parser.add_argument('--benchmark', type=int, metavar='N_ASSETS', help='N 종목 갱신 시간 측정')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for method, ms in benchmark(args.benchmark).items():
+            print(f"{method:>8}: {ms:.2f} ms per update ({args.benchmark:,} assets)")
+
+    if args.update:
+        db_path = os.path.join(DATA_ENG_PATH, 'market_data.db')
+        with DatabaseManager(db_path) as db:
+            prices = db.read_price_panel(db.list_tickers())
+            returns = prices.pct_change().iloc[1:]
+            engine = IncrementalCovariance.from_snapshot(db, 'ewma', args.decay)
+            if engine is None or list(engine.tickers) != list(returns.columns):
+                engine = IncrementalCovariance(returns.columns, 'ewma', args.decay).fit(returns)
+            else:
+                new = returns[returns.index > engine.last_date]
+                for date, row in new.iterrows():
+                    engine.update(row.to_numpy(), date)
+            engine.save_snapshot(db)
+        print(f"EWMA snapshot saved: {len(engine.tickers)} tickers as of {engine.last_date:%Y-%m-%d}")
@@ -0,0 +1,631 @@
+"""
+마코위츠 평균-분산 최적화
+========================================
+효율적 투자선(Efficient Frontier)과 대표 포트폴리오 계산
+
+문제 (λ ≥ 0: 위험 허용도):
+    min  ½·wᵀΣw - λ·μᵀw
+    s.t. 1ᵀw = 1,  lower ≤ w ≤ upper,  ‖w - w_prev‖₁ ≤ τ (회전율 제약, 선택)
+
+- 박스 제약만 있으면 primal-dual active set: 자유 종목에 대한 축소 KKT 선형계를 정확히 풂
+- 회전율 제약이 있으면 primal active set: 종목마다 직전 비중 대비 증가/감소 방향을 상태로 두면
+  |w - w_prev|가 자유 종목에서 선형이 되므로 회전율 승수까지 포함한 축소 KKT 선형계를 정확히 풂
+  (축소 행렬의 역행렬은 자유 종목이 하나씩 바뀔 때마다 랭크 1 갱신)
+- active set이 실패하면 ADMM으로 대체: w-단계(등식 제약 KKT 선형계)와 z-단계(박스 ∩ 회전율 L1-볼로의
+  정렬 기반 정확 투영), (Σ + ρI)의 고유분해는 한 번만 계산하여 모든 λ와 ρ 조정에서 재사용
+- 효율적 투자선은 λ를 증가시키며 직전 해(활성 집합 또는 w, z, u)로 warm start 하는 QP 수열
+- 어느 풀이기도 수렴하지 못하면 RuntimeError (수렴하지 않은 근사해를 결과로 반환하지 않음)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ADMMQPSolver:
+    """
+    min ½·xᵀPx - qᵀx  s.t. aᵀx = b,  x ∈ C (박스 ∩ 회전율 L1-볼)
+    P는 고정, q와 b만 바뀌는 문제들을 warm start로 연속해서 풉니다.
+    """
+
+    def __init__(self, P, a, lower, upper, prev_weights=None, max_turnover=None, rho=None):
+        self.n = P.shape[0]
+        self.a = a
+        self.lower = lower
+        self.upper = upper
+        self.prev = prev_weights
+        self.max_turnover = max_turnover
+        self.rho = rho if rho is not None else max(np.trace(P) / self.n, 1e-8)
+
+        # (P + ρI)^(-1) = Q·diag(1 / (λ_i + ρ))·Qᵀ → ρ를 바꿔도 재분해 없이 대각만 갱신
+        eigvals, self.Q = np.linalg.eigh(P)
+        self.eigvals = np.maximum(eigvals, 0.0)
+        self._set_rho(self.rho)
+
+        self.x = None
+        self.z = None
+        self.u = None
+        self.iterations = 0
+
+    def _set_rho(self, rho):
+        self.rho = rho
+        self.inv_diag = 1.0 / (self.eigvals + rho)
+        self.inv_a = self._solve(self.a)
+        self.a_inv_a = self.a @ self.inv_a
+
+    def _solve(self, rhs):
+        return self.Q @ ((self.Q.T @ rhs) * self.inv_diag)
+
+    def _project(self, v):
+        """
+        박스 제약과 회전율 L1-볼의 교집합으로 정확히 투영
+        z(θ) = clip(w_prev + soft(v - w_prev, θ))의 종목별 회전율은 θ에 대해 구간별 선형
+        (상한 c_i까지 일정 → 기울기 -1 → 하한 e_i에서 일정) → 꺾이는 점 2N개를 정렬해 Σ = τ 인 θ를 직접 계산
+        """
+        z = np.clip(v, self.lower, self.upper)
+        if self.max_turnover is None or np.abs(z - self.prev).sum() <= self.max_turnover:
+            return z
+
+        d = v - self.prev
+        dist = np.abs(d)
+        floor = np.maximum(np.maximum(self.lower - self.prev, self.prev - self.upper), 0.0)  # 박스 밖 직전 비중
+        cap = np.maximum(np.where(d > 0, self.upper - self.prev, self.prev - self.lower), floor)
+        points = np.concatenate([np.maximum(dist - cap, 0.0), np.maximum(dist - floor, 0.0)])
+        order = np.argsort(points, kind='stable')
+        points = points[order]
+        slopes = np.cumsum(np.where(order < self.n, 1.0, -1.0))  # 각 꺾이는 점 이후 기울기의 크기
+        values = np.minimum(np.maximum(dist, floor), cap).sum() - np.concatenate(
+            [[0.0], np.cumsum(slopes[:-1] * np.diff(points))])
+        j = int(np.searchsorted(-values, -self.max_turnover))  # 회전율이 처음으로 τ 이하가 되는 점
+        if j == 0:
+            theta = 0.0
+        elif j == len(points):
+            theta = points[-1]  # 박스 밖 직전 비중 때문에 τ를 만족할 수 없음 → 가장 가까운 점
+        else:
+            theta = points[j - 1] + (values[j - 1] - self.max_turnover) / slopes[j - 1]
+        return np.clip(self.prev + np.sign(d) * np.maximum(dist - theta, 0.0), self.lower, self.upper)
+
+    def solve(self, q, b=1.0, max_iter=5000, eps_abs=1e-8, eps_rel=1e-6, relax=1.6, adapt_every=10):
+        """
+        ADMM 반복 (이전 해에서 warm start)
+        adapt_every 반복마다 primal/dual 잔차 비율로 ρ를 조정 (OSQP 방식 잔차 균형)
+
+        Returns:
+            np.ndarray: 최적해 x, max_iter 안에 수렴하지 못하면 None
+        """
+        if self.z is None:
+            start = self.prev if self.prev is not None else self.a * (b / (self.a @ self.a))
+            self.x = start.copy()
+            self.z = self._project(start)
+            self.u = np.zeros(self.n)
+
+        x, z, u, rho = self.x, self.z, self.u, self.rho
+        converged = False
+        for k in range(1, max_iter + 1):
+            # w-단계: (P + ρI)x + νa = q + ρ(z - u),  aᵀx = b
+            y = self._solve(q + rho * (z - u))
+            x = y - (self.a @ y - b) / self.a_inv_a * self.inv_a
+
+            # z-단계 (over-relaxation)
+            x_hat = relax * x + (1 - relax) * z
+            z_prev = z
+            z = self._project(x_hat + u)
+            u = u + x_hat - z
+
+            primal = np.abs(x - z).max()
+            dual = rho * np.abs(z - z_prev).max()
+            scale = max(np.abs(x).max(), np.abs(z).max())
+            dual_scale = rho * np.abs(u).max()
+            if primal <= eps_abs + eps_rel * scale and dual <= eps_abs + eps_rel * dual_scale:
+                converged = True
+                break
+
+            if k % adapt_every == 0:
+                ratio = np.sqrt((primal / (scale + 1e-16)) / (dual / (dual_scale + 1e-16) + 1e-16))
+                if ratio > 5.0 or ratio < 0.2:
+                    new_rho = float(np.clip(rho * ratio, 1e-8, 1e8))
+                    u = u * (rho / new_rho)  # 스케일된 쌍대변수 보정
+                    self._set_rho(new_rho)
+                    rho = new_rho
+
+        self.x, self.z, self.u = x, z, u
+        self.iterations = k
+        return z if converged else None
+
+
+class ActiveSetQPSolver:
+    """
+    min ½·xᵀPx - qᵀx  s.t. aᵀx = b,  lower ≤ x ≤ upper
+    Primal-dual active set(PDAS) 방법: 현재 활성 집합(하한/상한에 묶인 종목)을 고정하고
+    자유 종목에 대한 축소 KKT 선형계를 정확히 푼 뒤, 라그랑주 승수 부호로 활성 집합을 갱신합니다.
+    효율적 투자선에서는 인접한 λ의 활성 집합이 거의 같으므로 warm start 시 1~3회 반복으로 수렴합니다.
+    """
+
+    def __init__(self, P, a, lower, upper):
+        self.P = P
+        self.a = a
+        self.lower = lower
+        self.upper = upper
+        self.n = P.shape[0]
+        self.at_lower = np.zeros(self.n, dtype=bool)
+        self.at_upper = np.zeros(self.n, dtype=bool)
+        self.iterations = 0
+
+    def solve(self, q, b=1.0, max_iter=500, cycle_after=10, tol=1e-12):
+        """
+        cycle_after 회 이후에는 한 번에 한 종목씩만 활성 집합을 바꿔 순환을 막습니다.
+
+        Returns:
+            np.ndarray: 최적해 x, max_iter 안에 수렴하지 못하면 None
+        """
+        P, a = self.P, self.a
+        L, U = self.at_lower.copy(), self.at_upper.copy()
+        for k in range(1, max_iter + 1):
+            free = ~(L | U)
+            x = np.where(L, self.lower, np.where(U, self.upper, 0.0))
+
+            if free.any():
+                # 축소 KKT: P_FF·x_F + ν·a_F = q_F - P_F,fixed·x_fixed,  a_Fᵀx_F = b - a_fixedᵀx_fixed
+                P_ff = P[np.ix_(free, free)]
+                rhs = q[free] - P[free] @ x
+                budget = b - a[~free] @ x[~free]
+                chol = _cholesky(P_ff)
+                y1 = _cho_solve(chol, rhs)
+                y2 = _cho_solve(chol, a[free])
+                nu = (a[free] @ y1 - budget) / (a[free] @ y2)
+                x[free] = y1 - nu * y2
+                r = P @ x - q
+            else:
+                # 모든 종목이 경계에 묶인 퇴화(degenerate) 상태: ν는 승수 부호 조건을 만족하는 구간의 중점
+                r = P @ x - q
+                ratio = -r / a
+                nu_lo = ratio[L].max() if L.any() else -np.inf
+                nu_hi = ratio[U].min() if U.any() else np.inf
+                nu = 0.5 * (nu_lo + nu_hi) if np.isfinite(nu_lo + nu_hi) else (nu_lo if np.isfinite(nu_lo) else nu_hi)
+                gap = a @ x - b
+                if abs(gap) > tol:
+                    # 등식 제약 위반 → 가장 움직이고 싶어하는 종목 하나를 자유 종목으로
+                    if gap < 0:
+                        L[np.flatnonzero(L)[np.argmax(ratio[L])]] = False
+                    else:
+                        U[np.flatnonzero(U)[np.argmin(ratio[U])]] = False
+                    continue
+
+            # 고정 종목의 라그랑주 승수 (하한: g ≥ 0, 상한: g ≤ 0 이어야 최적)
+            g = r + nu * a
+            scale = tol * (1.0 + np.abs(g).max())
+            new_L = (L & (g > -scale)) | (free & (x < self.lower - tol))
+            new_U = (U & (g < scale)) | (free & (x > self.upper + tol))
+            if np.array_equal(new_L, L) and np.array_equal(new_U, U):
+                self.at_lower, self.at_upper = L, U
+                self.iterations = k
+                return np.clip(x, self.lower, self.upper)
+
+            if k > cycle_after:
+                # 순환 방지: 가장 크게 위반한 종목 하나만 활성 집합에서 넣거나 뺌
+                violation = np.zeros(self.n)
+                violation[free] = np.maximum(self.lower - x, x - self.upper)[free]
+                violation[L] = -g[L]
+                violation[U] = g[U]
+                i = int(np.argmax(violation))
+                new_L, new_U = L.copy(), U.copy()
+                new_L[i] = bool(free[i] and x[i] < self.lower[i])
+                new_U[i] = bool(free[i] and x[i] > self.upper[i])
+            L, U = new_L, new_U
+
+        self.iterations = max_iter
+        return None
+
+
+# 회전율 active set의 종목 상태: 하한/상한/직전 비중에 고정, 직전 비중보다 작은/큰 쪽에서 자유
+_LOWER, _UPPER, _AT_PREV, _DOWN, _UP = range(5)
+
+
+class TurnoverActiveSetQPSolver:
+    """
+    min ½·xᵀPx - qᵀx  s.t. aᵀx = b,  lower ≤ x ≤ upper,  ‖x - x_prev‖₁ ≤ τ
+    자유 종목을 직전 비중보다 큰 쪽(s = +1)/작은 쪽(s = -1)으로 나누고 직전 비중에 묶인 상태를 추가하면
+    회전율이 Σ s_i·(x_i - x_prev,i) + (고정 종목 몫)으로 선형이 되어, 승수 ν(예산), κ(회전율)를 포함한
+    축소 KKT 선형계를 정확히 풀 수 있습니다.
+    회전율 승수가 다른 종목과 얽혀 PDAS는 순환하기 쉬우므로, 실행 가능한 점에서 출발해 한 번에 제약 하나만
+    바꾸는 primal active set 방법을 씁니다 (목적함수 단조 감소). 제약은 λ와 무관하므로 직전 해가 그대로
+    다음 λ의 실행 가능한 시작점 → 효율적 투자선에서는 인접 지점 사이에 바뀌는 제약 수만큼만 반복합니다.
+    최적 조건 (r = Px - q + ν·a): 자유 종목 r_i + κ·s_i = 0, 직전 비중 종목 |r_i| ≤ κ,
+    경계 종목은 경계에서 벗어나는 방향의 방향 미분(회전율 증감 ±κ 포함) ≥ 0, κ ≥ 0
+    """
+
+    def __init__(self, P, a, lower, upper, prev_weights, max_turnover):
+        self.P = P
+        self.a = a
+        self.lower = lower
+        self.upper = upper
+        self.prev = prev_weights
+        self.max_turnover = max_turnover
+        self.n = P.shape[0]
+        self.x = None
+        self.state = None
+        self.binding = False
+        self.iterations = 0
+
+    def _start(self, q, b, tol):
+        """
+        실행 가능한 시작점: 직전 비중을 박스로 자르고 남거나 모자란 예산을 여유가 있는 종목에 배분한 점(회전율 최소)에서
+        회전율 제약을 뺀 박스 문제의 해 쪽으로 회전율이 τ가 될 때까지 이동 (목적함수는 이 선분에서 단조 감소)
+        → 자유 종목을 하나씩 추가하는 대신 최적해에 가까운 작업 집합에서 출발
+        (회전율 제약을 만족하는 점이 없으면 ValueError)
+        """
+        a, lower, upper, prev, tau = self.a, self.lower, self.upper, self.prev, self.max_turnover
+        x = np.clip(prev, lower, upper)
+        gap = b - a @ x
+        if abs(gap) > tol:
+            room = (upper - x if gap > 0 else x - lower) * a  # 종목별로 흡수할 수 있는 예산
+            order = np.argsort(-a, kind='stable')
+            before = np.concatenate([[0.0], np.cumsum(room[order])[:-1]])
+            take = np.clip(abs(gap) - before, 0.0, room[order])
+            x[order] += np.sign(gap) * take / a[order]
+        needed = np.abs(x - prev).sum()
+        if abs(b - a @ x) > 1e-9 or needed > tau + 1e-9:
+            raise ValueError(f"max_turnover is infeasible: the weight bounds require a turnover of at least {needed:.4f}.")
+
+        target = ActiveSetQPSolver(self.P, a, lower, upper).solve(q, b)
+        if target is not None:
+            direction = target - x
+            lo, hi = 0.0, 1.0
+            if np.abs(target - prev).sum() > tau:
+                for _ in range(60):  # 회전율은 t에 대해 볼록 → 이분법
+                    t = 0.5 * (lo + hi)
+                    lo, hi = (t, hi) if np.abs(x + t * direction - prev).sum() <= tau else (lo, t)
+            else:
+                lo = 1.0
+            x = x + lo * direction
+
+        x = np.where(np.abs(x - lower) <= tol, lower, np.where(np.abs(x - upper) <= tol, upper, x))
+        self.state = np.where(x == lower, _LOWER, np.where(x == upper, _UPPER, np.where(
+            np.abs(x - prev) <= tol, _AT_PREV, np.where(x > prev, _UP, _DOWN))))
+        x[self.state == _AT_PREV] = prev[self.state == _AT_PREV]
+        if not ((self.state == _UP) | (self.state == _DOWN)).any():
+            # 예산 등식을 맞출 자유 종목이 하나는 필요 → 움직일 수 있는 종목 하나를 현재 위치에서 자유로 (영역의 경계에 있어도 됨)
+            movable = np.flatnonzero(lower < upper)
+            if len(movable) == 0:
+                raise ValueError("Weight bounds leave no free weight.")
+            i = movable[np.argmax(np.abs(self.P[movable] @ x - q[movable]))]
+            self.state[i] = _UP if x[i] > prev[i] or (x[i] == prev[i] and prev[i] < upper[i]) else _DOWN
+        self.x = x
+        self.binding = False
+
+    def _factor(self, free):
+        """자유 종목 순서와 (P_FF)^(-1)을 새로 계산"""
+        self.order = np.flatnonzero(free)
+        chol = _cholesky(self.P[np.ix_(self.order, self.order)])
+        self.inverse = _cho_solve(chol, np.eye(len(self.order)))
+        self.updates = 0
+
+    def _add(self, j):
+        """자유 종목 j 추가: 블록 역행렬(슈어 보수) 갱신 O(m²)"""
+        column = self.P[self.order, j]
+        u = self.inverse @ column
+        d = self.P[j, j] - column @ u
+        if d <= 1e-12 * self.P[j, j]:
+            free = np.zeros(self.n, dtype=bool)
+            free[np.append(self.order, j)] = True
+            self._factor(free)
+            return
+        m = len(self.order)
+        inverse = np.empty((m + 1, m + 1))
+        inverse[:m, :m] = self.inverse + np.outer(u, u) / d
+        inverse[:m, m] = inverse[m, :m] = -u / d
+        inverse[m, m] = 1.0 / d
+        self.order, self.inverse = np.append(self.order, j), inverse
+        self.updates += 1
+
+    def _remove(self, j):
+        """자유 종목 j 제거: B⁻¹ = A - c·cᵀ / e (A: 역행렬에서 j의 행·열을 뺀 부분) O(m²)"""
+        k = int(np.flatnonzero(self.order == j)[0])
+        keep = np.arange(len(self.order)) != k
+        column = self.inverse[keep, k]
+        self.inverse = self.inverse[np.ix_(keep, keep)] - np.outer(column, column) / self.inverse[k, k]
+        self.order = self.order[keep]
+        self.updates += 1
+
+    def solve(self, q, b=1.0, max_iter=None, tol=1e-12, refactor_every=100):
+        """
+        직전 해(실행 가능한 점)와 작업 집합에서 warm start
+        자유 종목이 하나씩 바뀌므로 축소 KKT 행렬의 역행렬은 랭크 1 갱신으로 유지 (refactor_every회마다 재계산)
+
+        Returns:
+            np.ndarray: 최적해 x, max_iter(기본 2N + 100) 안에 수렴하지 못하면 None
+        """
+        if self.x is None:
+            self._start(q, b, tol)
+        P, a, prev, tau = self.P, self.a, self.prev, self.max_turnover
+        lower, upper = self.lower, self.upper
+        x, state, binding = self.x.copy(), self.state.copy(), self.binding
+        self._factor((state == _UP) | (state == _DOWN))
+        max_iter = max_iter or 2 * self.n + 100
+        for k in range(1, max_iter + 1):
+            if self.updates >= refactor_every:
+                self._factor((state == _UP) | (state == _DOWN))
+            free = self.order
+            fixed = np.ones(self.n, dtype=bool)
+            fixed[free] = False
+            s = np.where(state == _UP, 1.0, np.where(state == _DOWN, -1.0, 0.0))
+            a_f, s_f = a[free], s[free]
+
+            # 등식 제약 부분문제의 이동 방향: P_FF·p + ν·a_F + κ·s_F = -(Px - q)_F,
+            # a_Fᵀp = b - aᵀx (예산), s_Fᵀp = τ - 회전율(x) (회전율 제약이 작업 집합에 있을 때)
+            g = P @ x - q
+            z = self.inverse @ np.column_stack([g[free], a_f, s_f])
+            budget = -(a_f @ z[:, 0]) - (b - a @ x)
+            kappa = 0.0
+            if binding:
+                system = np.array([[a_f @ z[:, 1], a_f @ z[:, 2]], [s_f @ z[:, 1], s_f @ z[:, 2]]])
+                if abs(np.linalg.det(system)) <= 1e-10 * abs(system[0, 0] * system[1, 1]):
+                    # 자유 종목이 모두 같은 방향 → 회전율 등식이 예산 등식과 평행 (예산을 지키는 이동에서 회전율은 일정)
+                    # → 작업 집합에서 빼고, 다시 늘어나면 아래의 비율 검사에서 추가
+                    binding = False
+                else:
+                    turnover = -(s_f @ z[:, 0]) - (tau - np.abs(x - prev).sum())
+                    nu, kappa = np.linalg.solve(system, [budget, turnover])
+            if not binding:
+                nu = budget / (a_f @ z[:, 1])
+            step = -z[:, 0] - nu * z[:, 1] - kappa * z[:, 2]
+
+            if np.abs(step).max() > tol * (1.0 + np.abs(x).max()):
+                # 비율 검사: 자유 종목이 영역(직전 비중 ~ 경계)을 벗어나거나 회전율이 τ를 넘기 직전까지만 이동
+                up = s_f > 0
+                high = np.where(up, upper[free], np.minimum(prev[free], upper[free]))
+                low = np.where(up, np.maximum(prev[free], lower[free]), lower[free])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    limits = np.where(step > 0, (high - x[free]) / step, np.where(step < 0, (low - x[free]) / step, np.inf))
+                i = int(np.argmin(limits))
+                alpha = max(limits[i], 0.0)
+                slope = s_f @ step
+                turnover_limit = np.inf
+                if not binding and slope > 0:
+                    turnover_limit = max((tau - np.abs(x - prev).sum()) / slope, 0.0)
+                if min(alpha, turnover_limit) < 1.0:
+                    if turnover_limit <= alpha:
+                        x[free] += turnover_limit * step
+                        binding = True
+                    elif len(free) > 1:
+                        x[free] += alpha * step
+                        j, hit_high = free[i], step[i] > 0
+                        bound = upper[j] if hit_high else lower[j]
+                        if (high[i] if hit_high else low[i]) == bound:
+                            state[j], x[j] = (_UPPER if hit_high else _LOWER), bound
+                        else:
+                            state[j], x[j] = _AT_PREV, prev[j]
+                        self._remove(j)
+                    else:
+                        # 마지막 자유 종목은 예산을 위해 남기고 직전 비중을 지나 반대쪽 영역으로
+                        x[free] += alpha * step
+                        state[free[0]] = _DOWN if state[free[0]] == _UP else _UP
+                    continue
+                x[free] += step
+
+            # 승수 검사: 고정 종목이 풀려날 방향의 방향 미분, 회전율 승수 κ ≥ 0
+            r = P @ x - q + nu * a
+            scale = tol * (1.0 + np.abs(r).max())
+            at_prev = fixed & (state == _AT_PREV)
+            movable = fixed & (lower < upper)
+            best, change = -scale, None
+            for mask, cost, target_state in (
+                    (at_prev & (prev < upper), r + kappa, _UP),
+                    (at_prev & (prev > lower), kappa - r, _DOWN),
+                    (state == _LOWER, np.where(lower < prev, r - kappa, r + kappa), np.where(lower < prev, _DOWN, _UP)),
+                    (state == _UPPER, np.where(upper > prev, -r - kappa, kappa - r), np.where(upper > prev, _UP, _DOWN))):
+                candidates = np.where(mask & movable, cost, np.inf)
+                j = int(np.argmin(candidates))
+                if candidates[j] < best:
+                    best, change = candidates[j], (j, np.broadcast_to(target_state, (self.n,))[j])
+            if binding and kappa < best:
+                best, change = kappa, None
+                binding = False
+                continue
+            if change is None:
+                self.x, self.state, self.binding = x, state, binding
+                self.iterations = k
+                return x.copy()
+            state[change[0]] = change[1]
+            self._add(change[0])
+
+        self.iterations = max_iter
+        return None
+
+
+def _cholesky(matrix):
+    """Cholesky 인자 (수치적으로 양의 정부호가 아니면 대각에 작은 값을 더해 재시도)"""
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        return np.linalg.cholesky(matrix + 1e-10 * np.trace(matrix) * np.eye(matrix.shape[0]))
+
+
+def _cho_solve(chol, rhs):
+    """하삼각 Cholesky 인자로 선형계 풀기"""
+    from scipy.linalg import solve_triangular  # scipy.linalg 임포트를 최적화 시점으로 미룸
+    return solve_triangular(chol.T, solve_triangular(chol, rhs, lower=True), lower=False)
+
+
+class QPSolver:
+    """
+    포트폴리오 QP 풀이기: active set(회전율 제약이 있으면 그 확장)을 먼저 쓰고, 실패하면 ADMM
+    두 풀이기 모두 직전 해/활성 집합을 보존하므로 연속된 solve() 호출은 warm start 됩니다.
+    """
+
+    def __init__(self, P, a, lower, upper, prev_weights=None, max_turnover=None):
+        self._args = (P, a, lower, upper, prev_weights, max_turnover)
+        if max_turnover is None:
+            self.active = ActiveSetQPSolver(P, a, lower, upper)
+        else:
+            self.active = TurnoverActiveSetQPSolver(P, a, lower, upper, prev_weights, max_turnover)
+        self.admm = None
+        self.iterations = 0
+
+    def solve(self, q, b=1.0):
+        x = self.active.solve(q, b)
+        if x is not None:
+            self.iterations = self.active.iterations
+            return x
+        if self.admm is None:
+            self.admm = ADMMQPSolver(*self._args)
+        x = self.admm.solve(q, b)
+        self.iterations = self.admm.iterations
+        if x is None:
+            raise RuntimeError(f"Portfolio optimization did not converge ({self.iterations} ADMM iterations).")
+        return x
+
+
+class PortfolioOptimizer:
+    """
+    평균-분산 포트폴리오 최적화기
+
+    Attributes:
+        tickers: 종목 리스트
+        mu: 연율화 기대수익률 (N,)
+        cov: 연율화 공분산 행렬 (N × N)
+    """
+
+    def __init__(self, expected_returns, cov_matrix, risk_free_rate=0.0,
+                 lower=0.0, upper=1.0, prev_weights=None, max_turnover=None):
+        """
+        Args:
+            expected_returns: 연율화 기대수익률 pd.Series (index: ticker)
+            cov_matrix: 연율화 공분산 pd.DataFrame
+            risk_free_rate: 연간 무위험 이자율 (Sharpe Ratio 계산용)
+            lower, upper: 종목별 비중 하한/상한 (기본값: long-only, 0 ≤ w ≤ 1)
+            prev_weights: 현재 보유 비중 (회전율 제약 기준), pd.Series 또는 배열
+            max_turnover: 최대 회전율 Σ|w - w_prev| (None이면 제약 없음)
+        """
+        self.tickers = list(expected_returns.index)
+        self.mu = expected_returns.to_numpy(dtype=float)
+        self.cov = cov_matrix.loc[self.tickers, self.tickers].to_numpy(dtype=float)
+        self.rf = risk_free_rate
+        n = len(self.tickers)
+
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), (n,)).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), (n,)).copy()
+        if self.lower.sum() > 1 + 1e-12 or self.upper.sum() < 1 - 1e-12:
+            raise ValueError("Weight bounds are infeasible: need sum(lower) <= 1 <= sum(upper).")
+
+        if prev_weights is not None:
+            if isinstance(prev_weights, pd.Series):
+                prev_weights = prev_weights.reindex(self.tickers).fillna(0.0).to_numpy()
+            prev_weights = np.asarray(prev_weights, dtype=float)
+        elif max_turnover is not None:
+            raise ValueError("max_turnover requires prev_weights.")
+        self.prev_weights = prev_weights
+        self.max_turnover = max_turnover
+
+    def _new_solver(self):
+        return QPSolver(self.cov, np.ones(len(self.tickers)), self.lower, self.upper,
+                        self.prev_weights, self.max_turnover)
+
+    def portfolio_stats(self, weights):
+        """비중 벡터의 기대수익률, 변동성, Sharpe Ratio"""
+        ret = float(self.mu @ weights)
+        vol = float(np.sqrt(max(weights @ self.cov @ weights, 0.0)))
+        sharpe = (ret - self.rf) / vol if vol > 0 else 0.0
+        return {'expected_return': ret, 'volatility': vol, 'sharpe_ratio': float(sharpe)}
+
+    def _result(self, weights, **extra):
+        result = self.portfolio_stats(weights)
+        result['weights'] = {t: float(w) for t, w in zip(self.tickers, weights)}
+        result.update(extra)
+        return result
+
+    def _lambda_grid(self, n_points):
+        """λ 격자: 0(최소분산)부터 기대수익률 항이 지배하는 구간까지 로그 간격"""
+        spread = np.ptp(self.mu)
+        scale = np.diag(self.cov).max() / spread if spread > 0 else 1.0
+        return np.concatenate([[0.0], scale * np.logspace(-3, 2, n_points - 1)])
+
+    def min_variance(self):
+        """최소분산 포트폴리오 (MVP)"""
+        solver = self._new_solver()
+        weights = solver.solve(np.zeros(len(self.tickers)))
+        return self._result(weights, iterations=solver.iterations)
+
+    def efficient_frontier(self, n_points=100, include_weights=False):
+        """
+        효율적 투자선: λ를 0부터 증가시키며 warm start된 QP 수열로 계산
+
+        Returns:
+            list: [{'expected_return', 'volatility', 'sharpe_ratio', 'risk_tolerance', ('weights')}, ...]
+        """
+        solver = self._new_solver()
+        points = []
+        for lam in self._lambda_grid(max(n_points, 2)):
+            weights = solver.solve(lam * self.mu)
+            point = self._result(weights) if include_weights else self.portfolio_stats(weights)
+            point['risk_tolerance'] = float(lam)
+            points.append(point)
+        return points
+
+    def max_sharpe(self, n_points=50):
+        """
+        최대 Sharpe Ratio (접점) 포트폴리오
+
+        - long-only, 상한/회전율 제약 없음: 동차 변환 min ½yᵀΣy s.t. (μ - r_f)ᵀy = 1, y ≥ 0 → w = y / 1ᵀy
+        - 그 외: 효율적 투자선에서 최대 Sharpe 지점을 찾은 뒤 λ에 대해 황금분할 탐색으로 정밀화
+        """
+        excess = self.mu - self.rf
+        homogeneous = (np.all(self.lower == 0) and np.all(self.upper >= 1) and self.max_turnover is None)
+        if homogeneous and excess.max() > 0:
+            solver = QPSolver(self.cov, excess, self.lower, np.full(len(self.tickers), np.inf))
+            y = solver.solve(np.zeros(len(self.tickers)), b=1.0)
+            return self._result(y / y.sum(), iterations=solver.iterations)
+
+        grid = self._lambda_grid(n_points)
+        solver = self._new_solver()
+        sharpes = [self.portfolio_stats(solver.solve(lam * self.mu))['sharpe_ratio'] for lam in grid]
+        best = int(np.argmax(sharpes))
+        lo, hi = grid[max(best - 1, 0)], grid[min(best + 1, len(grid) - 1)]
+
+        def sharpe_at(lam):
+            return self.portfolio_stats(solver.solve(lam * self.mu))['sharpe_ratio']
+
+        golden = (np.sqrt(5) - 1) / 2
+        c, d = hi - golden * (hi - lo), lo + golden * (hi - lo)
+        fc, fd = sharpe_at(c), sharpe_at(d)
+        for _ in range(30):
+            if fc > fd:
+                hi, d, fd = d, c, fc
+                c = hi - golden * (hi - lo)
+                fc = sharpe_at(c)
+            else:
+                lo, c, fc = c, d, fd
+                d = lo + golden * (hi - lo)
+                fd = sharpe_at(d)
+        weights = solver.solve(0.5 * (lo + hi) * self.mu)
+        return self._result(weights, risk_tolerance=float(0.5 * (lo + hi)))
+
+    def risk_parity(self, budgets=None, max_iter=500, tol=1e-10):
+        """
+        위험 균형(Risk Parity) 포트폴리오: 각 종목의 위험 기여도 w_i·(Σw)_i 를 예산 b_i에 맞춤
+        min ½yᵀΣy - Σ b_i·ln(y_i) 를 좌표 하강법으로 풀고 w = y / 1ᵀy (long-only, 박스/회전율 제약 미적용)
+        """
+        n = len(self.tickers)
+        b = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=float) / np.sum(budgets)
+        diag = np.diag(self.cov)
+        y = 1.0 / np.sqrt(diag)
+        sigma_y = self.cov @ y
+
+        for iteration in range(1, max_iter + 1):
+            max_change = 0.0
+            for i in range(n):
+                c = sigma_y[i] - diag[i] * y[i]
+                new = (-c + np.sqrt(c * c + 4.0 * diag[i] * b[i])) / (2.0 * diag[i])
+                change = new - y[i]
+                if change != 0.0:
+                    sigma_y += self.cov[:, i] * change
+                    y[i] = new
+                    max_change = max(max_change, abs(change) / new)
+            if max_change < tol:
+                break
+
+        weights = y / y.sum()
+        contributions = weights * (self.cov @ weights)
+        return self._result(
+            weights, iterations=iteration,
+            risk_contributions={t: float(c) for t, c in zip(self.tickers, contributions / contributions.sum())}
+        )
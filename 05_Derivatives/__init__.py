@@ -0,0 +1,9 @@
+"""
+Derivatives Pricing Module
+"""
+from .black_scholes import BlackScholesEngine
+from .implied_volatility import ImpliedVolatilitySolver
+from .monte_carlo import MonteCarloEngine, GBMModel, HestonModel, MertonJumpModel
+
+__all__ = ['BlackScholesEngine', 'ImpliedVolatilitySolver', 'MonteCarloEngine',
+           'GBMModel', 'HestonModel', 'MertonJumpModel']
@@ -0,0 +1,425 @@
+"""
+Black-Scholes-Merton 가격결정 및 Greeks 엔진
+========================================
+연속 배당수익률 q를 포함한 유럽형 콜/풋 옵션의 가격과 1·2차 Greeks를
+옵션 체인 전체(수백만 계약)에 대해 NumPy 배열로 한 번에 계산
+
+d1 = [ln(S/K) + (r - q + σ²/2)·T] / (σ√T),  d2 = d1 - σ√T
+V  = ω·[S·e^{-qT}·N(ω·d1) - K·e^{-rT}·N(ω·d2)]   (콜: ω = +1, 풋: ω = -1)
+
+- d1/d2, N(ω·d1), N(ω·d2), n(d1), e^{-qT}, e^{-rT}는 계약마다 한 번만 계산하여
+  가격과 모든 Greeks가 공유 (K·e^{-rT}·n(d2) = S·e^{-qT}·n(d1) 항등식으로 n(d2) 생략)
+- 풋은 패리티 차감 대신 ω 부호로 직접 계산 (깊은 내가격에서의 상쇄 오차 방지)
+- 입력을 CHUNK_SIZE 단위로 나누어 캐시에 들어가는 작업 버퍼를 재사용하고,
+  모든 ufunc 연산은 out= 으로 버퍼/출력 배열에 직접 기록 (임시 배열 할당 없음)
+- 정규분포 CDF는 scipy.special.ndtr (scipy.stats.norm 대비 오버헤드 없음)
+
+만기(T = 0)는 MIN_MATURITY로 올려 계산 → 가격은 내재가치, Greeks는 만기 직전의 한쪽 극한
+(내가격/외가격: theta = 보유비용 ω·(q·S - r·K)·1{내가격}, charm = ω·q·1{내가격}, 나머지 2차 Greeks 0,
+ 등가격: gamma·theta 등은 발산하는 극한 대신 큰 유한값)
+
+단위: theta·charm·veta는 -∂/∂T (연 단위 시간 경과에 따른 변화), vega·volga·vera는 σ 1.0당,
+rho·epsilon은 금리/배당률 1.0당 변화량 (1%p 당 값은 0.01을 곱함)
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import numpy as np
+from scipy.special import ndtr
+
+# 경로 설정
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_ENG_PATH = os.path.join(PROJECT_ROOT, '01_Data_Engineering')
+ANALYSIS_PATH = os.path.join(PROJECT_ROOT, '02_Financial_Analysis')
+DB_PATH = os.path.join(DATA_ENG_PATH, 'market_data.db')
+
+FIRST_ORDER_GREEKS = ('delta', 'vega', 'theta', 'rho', 'epsilon')
+SECOND_ORDER_GREEKS = ('gamma', 'vanna', 'volga', 'charm', 'veta', 'vera')
+OUTPUTS = ('price',) + FIRST_ORDER_GREEKS + SECOND_ORDER_GREEKS
+
+CHUNK_SIZE = 16384
+INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+# σ√T = 0 (무변동성) 에서 d1 = ±∞ 로 보내 내재가치로 수렴시키기 위한 하한
+MIN_VOL_SQRT_T = 1e-12
+# 잔존만기 하한 (연 단위, 약 3나노초): T = 0에서 theta·charm·veta의 1/√T, 1/T 항이 0/0(NaN)이 되지 않도록
+MIN_MATURITY = 1e-16
+
+_BUFFER_NAMES = ('maturity', 'sqrt_t', 'vol_sqrt_t', 'd1', 'd2', 'n_d1', 'cdf1', 'cdf2',
+                 'disc_q', 'disc_r', 's_disc', 'k_disc', 'omega', 'sp', 'ep', 'tmp', 'tmp2')
+
+
+def load_close_prices(ticker, db_path=DB_PATH, with_dates=False):
+    """DB에서 날짜순 종가 배열 조회 (with_dates=True면 (DatetimeIndex, 종가 배열))"""
+    if DATA_ENG_PATH not in sys.path:
+        sys.path.insert(0, DATA_ENG_PATH)
+    from database_manager import DatabaseManager
+
+    with DatabaseManager(db_path) as db:
+        df = db.read_dataframe(f"{ticker}_daily")
+    if df is None or df.empty:
+        raise ValueError(f"No price data for {ticker}")
+    df = df.sort_values('Date')
+    close = df['Close'].to_numpy(dtype=float)
+    if with_dates:
+        import pandas as pd
+        return pd.DatetimeIndex(pd.to_datetime(df['Date'])), close
+    return close
+
+
+def historical_volatility(ticker, window=252, periods_per_year=None, db_path=DB_PATH):
+    """
+    DB 종가로부터 연율화 역사적 변동성(로그수익률 기준)과 최근 종가 조회
+    periods_per_year: 연율화 계수 (기본값: 날짜 간격으로 추정, 일봉이면 252)
+
+    Returns:
+        tuple: (σ, 최근 종가)
+    """
+    if ANALYSIS_PATH not in sys.path:
+        sys.path.insert(0, ANALYSIS_PATH)
+    from analyzer_engine import TimeSeriesAnalyzer
+
+    from bar_resampler import infer_periods_per_year
+
+    dates, close = load_close_prices(ticker, db_path, with_dates=True)
+    periods_per_year = periods_per_year or infer_periods_per_year(dates)
+    log_returns = np.diff(np.log(close))
+    sigma = TimeSeriesAnalyzer.calculate_annualized_volatility(log_returns, periods_per_year, window)
+    return sigma, float(close[-1])
+
+
+class BlackScholesEngine:
+    """
+    벡터화된 Black-Scholes-Merton 가격/Greeks 계산기
+
+    작업 버퍼(chunk_size 길이)는 인스턴스에 보관되어 호출 간 재사용됩니다.
+    (인스턴스를 스레드 간 공유하지 마세요)
+    """
+
+    def __init__(self, sigma=None, spot=None, rate=0.0, dividend=0.0, chunk_size=CHUNK_SIZE):
+        """
+        Args:
+            sigma: 기본 변동성 (evaluate 호출 시 sigma를 생략하면 사용)
+            spot: 기본 기초자산 가격
+            rate: 기본 무위험 이자율 r (연속복리)
+            dividend: 기본 연속 배당수익률 q
+            chunk_size: 한 번에 처리할 계약 수
+        """
+        self.sigma = sigma
+        self.spot = spot
+        self.rate = rate
+        self.dividend = dividend
+        self.chunk_size = int(chunk_size)
+        self._buffers = {name: np.empty(self.chunk_size) for name in _BUFFER_NAMES}
+
+    @classmethod
+    def from_ticker(cls, ticker, window=252, rate=0.0, dividend=0.0, chunk_size=CHUNK_SIZE, db_path=DB_PATH):
+        """DB의 역사적 변동성과 최근 종가를 기본 σ, S로 사용하는 엔진 생성"""
+        sigma, spot = historical_volatility(ticker, window=window, db_path=db_path)
+        logging.info(f"{ticker}: historical volatility {sigma:.4f}, spot {spot:.2f}")
+        return cls(sigma=sigma, spot=spot, rate=rate, dividend=dividend, chunk_size=chunk_size)
+
+    def price(self, strike, maturity, spot=None, sigma=None, rate=None, dividend=None, is_call=True, out=None):
+        """옵션 가격 배열"""
+        buffers = None if out is None else {'price': out}
+        return self.evaluate(strike, maturity, spot, sigma, rate, dividend, is_call,
+                             outputs=('price',), out=buffers)['price']
+
+    def greeks(self, strike, maturity, spot=None, sigma=None, rate=None, dividend=None, is_call=True,
+               outputs=OUTPUTS, out=None):
+        """가격과 Greeks (dict: 이름 → 배열)"""
+        return self.evaluate(strike, maturity, spot, sigma, rate, dividend, is_call, outputs=outputs, out=out)
+
+    def evaluate(self, strike, maturity, spot=None, sigma=None, rate=None, dividend=None, is_call=True,
+                 outputs=OUTPUTS, out=None):
+        """
+        옵션 체인 평가 (모든 입력은 서로 브로드캐스트 가능한 스칼라/배열)
+
+        Args:
+            strike: 행사가 K
+            maturity: 잔존만기 T (연 단위)
+            spot, sigma, rate, dividend: 생략 시 엔진 기본값
+            is_call: True(콜) / False(풋) 또는 bool 배열
+            outputs: 계산할 항목 (OUTPUTS의 부분집합)
+            out: 미리 할당한 출력 배열 dict (이름 → C-연속 float64 배열, 크기 = 계약 수)
+
+        Returns:
+            dict: 이름 → 브로드캐스트된 입력 shape의 배열
+        """
+        spot = self.spot if spot is None else spot
+        sigma = self.sigma if sigma is None else sigma
+        rate = self.rate if rate is None else rate
+        dividend = self.dividend if dividend is None else dividend
+        if spot is None or sigma is None:
+            raise ValueError("spot and sigma are required (or use BlackScholesEngine.from_ticker).")
+
+        unknown = set(outputs) - set(OUTPUTS)
+        if unknown:
+            raise ValueError(f"Unknown outputs: {sorted(unknown)}")
+
+        inputs = [np.asarray(x) for x in (spot, strike, maturity, sigma, rate, dividend, is_call)]
+        shape = np.broadcast(*inputs).shape
+        n = int(np.prod(shape))
+        # 스칼라는 그대로 두고, 배열만 1차원으로 펼쳐 청크 슬라이싱
+        flat = [x.item() if x.ndim == 0 else np.broadcast_to(x, shape).ravel() for x in inputs]
+        flat[-1] = flat[-1] if np.ndim(flat[-1]) else bool(flat[-1])
+
+        out = {} if out is None else out
+        results = {}
+        for name in outputs:
+            if name in out:
+                buf = out[name]
+                if buf.size != n or buf.dtype != np.float64 or not buf.flags.c_contiguous:
+                    raise ValueError(f"out['{name}'] must be a C-contiguous float64 array of size {n}")
+                results[name] = buf.reshape(-1)
+            else:
+                results[name] = np.empty(n)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for start in range(0, n, self.chunk_size):
+                stop = min(start + self.chunk_size, n)
+                chunk = [x[start:stop] if np.ndim(x) else x for x in flat]
+                views = {name: res[start:stop] for name, res in results.items()}
+                self._evaluate_chunk(stop - start, *chunk, views)
+
+        return {name: res.reshape(shape) for name, res in results.items()}
+
+    def _evaluate_chunk(self, m, S, K, T, sigma, r, q, is_call, out):
+        """청크 하나를 작업 버퍼로 계산하여 out의 각 슬라이스에 기록"""
+        b = {name: buf[:m] for name, buf in self._buffers.items()}
+        sqrt_t, vs, d1, d2 = b['sqrt_t'], b['vol_sqrt_t'], b['d1'], b['d2']
+        tmp, tmp2 = b['tmp'], b['tmp2']
+
+        # 부호 ω: 콜 +1, 풋 -1
+        if np.ndim(is_call):
+            omega = b['omega']
+            np.multiply(is_call, 2.0, out=omega)
+            omega -= 1.0
+        else:
+            omega = 1.0 if is_call else -1.0
+
+        # T = max(T, MIN_MATURITY) (만기 계약은 만기 직전의 극한값)
+        if np.ndim(T):
+            T = np.maximum(T, MIN_MATURITY, out=b['maturity'])
+        else:
+            T = max(T, MIN_MATURITY)
+
+        # σ√T
+        np.sqrt(T, out=sqrt_t)
+        np.multiply(sigma, sqrt_t, out=vs)
+        np.maximum(vs, MIN_VOL_SQRT_T, out=vs)
+
+        # d1 = [ln(S/K) + (r - q + σ²/2)·T] / σ√T,  d2 = d1 - σ√T
+        np.divide(S, K, out=d1)
+        np.log(d1, out=d1)
+        np.multiply(sigma, sigma, out=tmp)
+        tmp *= 0.5
+        tmp += r
+        tmp -= q
+        tmp *= T
+        d1 += tmp
+        d1 /= vs
+        np.subtract(d1, vs, out=d2)
+
+        # 할인계수와 할인된 S, K
+        disc_q, disc_r, s_disc, k_disc = b['disc_q'], b['disc_r'], b['s_disc'], b['k_disc']
+        np.multiply(q, T, out=disc_q)
+        np.negative(disc_q, out=disc_q)
+        np.exp(disc_q, out=disc_q)
+        np.multiply(r, T, out=disc_r)
+        np.negative(disc_r, out=disc_r)
+        np.exp(disc_r, out=disc_r)
+        np.multiply(S, disc_q, out=s_disc)
+        np.multiply(K, disc_r, out=k_disc)
+
+        # N(ω·d1), N(ω·d2)
+        cdf1, cdf2 = b['cdf1'], b['cdf2']
+        np.multiply(d1, omega, out=cdf1)
+        ndtr(cdf1, out=cdf1)
+        np.multiply(d2, omega, out=cdf2)
+        ndtr(cdf2, out=cdf2)
+
+        # n(d1) 및 공통 항 S·e^{-qT}·n(d1), e^{-qT}·n(d1)
+        n_d1, sp, ep = b['n_d1'], b['sp'], b['ep']
+        np.multiply(d1, d1, out=n_d1)
+        n_d1 *= -0.5
+        np.exp(n_d1, out=n_d1)
+        n_d1 *= INV_SQRT_2PI
+        np.multiply(s_disc, n_d1, out=sp)
+        np.multiply(disc_q, n_d1, out=ep)
+
+        if 'price' in out:
+            o = out['price']
+            np.multiply(s_disc, cdf1, out=o)
+            np.multiply(k_disc, cdf2, out=tmp)
+            o -= tmp
+            o *= omega
+
+        if 'delta' in out:
+            o = out['delta']
+            np.multiply(disc_q, cdf1, out=o)
+            o *= omega
+
+        if 'gamma' in out:
+            # e^{-qT}·n(d1) / (S·σ√T)
+            o = out['gamma']
+            np.divide(ep, S, out=o)
+            o /= vs
+
+        if 'vega' in out:
+            # S·e^{-qT}·n(d1)·√T
+            np.multiply(sp, sqrt_t, out=out['vega'])
+
+        if 'theta' in out:
+            # -S·e^{-qT}·n(d1)·σ / (2√T) + ω·[q·S·e^{-qT}·N(ωd1) - r·K·e^{-rT}·N(ωd2)]
+            o = out['theta']
+            np.multiply(sp, sigma, out=o)
+            o /= sqrt_t
+            o *= -0.5
+            np.multiply(s_disc, cdf1, out=tmp)
+            tmp *= q
+            np.multiply(k_disc, cdf2, out=tmp2)
+            tmp2 *= r
+            tmp -= tmp2
+            tmp *= omega
+            o += tmp
+
+        if 'rho' in out:
+            # ω·T·K·e^{-rT}·N(ωd2)
+            o = out['rho']
+            np.multiply(k_disc, cdf2, out=o)
+            o *= T
+            o *= omega
+
+        if 'epsilon' in out:
+            # -ω·T·S·e^{-qT}·N(ωd1)
+            o = out['epsilon']
+            np.multiply(s_disc, cdf1, out=o)
+            o *= T
+            o *= omega
+            np.negative(o, out=o)
+
+        if 'vanna' in out:
+            # -e^{-qT}·n(d1)·d2 / σ
+            o = out['vanna']
+            np.multiply(ep, d2, out=o)
+            o /= sigma
+            np.negative(o, out=o)
+
+        if 'volga' in out:
+            # vega·d1·d2 / σ
+            o = out['volga']
+            np.multiply(sp, sqrt_t, out=o)
+            o *= d1
+            o *= d2
+            o /= sigma
+
+        if 'charm' in out:
+            # ω·q·e^{-qT}·N(ωd1) - e^{-qT}·n(d1)·[2(r - q)T - d2·σ√T] / (2T·σ√T)
+            o = out['charm']
+            np.multiply(T, 2.0 * (r - q), out=tmp)
+            np.multiply(d2, vs, out=tmp2)
+            tmp -= tmp2
+            np.multiply(T, vs, out=tmp2)
+            tmp2 *= 2.0
+            tmp /= tmp2
+            np.multiply(ep, tmp, out=o)
+            np.multiply(disc_q, cdf1, out=tmp)
+            tmp *= q
+            tmp *= omega
+            np.subtract(tmp, o, out=o)
+
+        if 'veta' in out:
+            # -∂vega/∂T = S·e^{-qT}·n(d1)·√T·[q + (r - q)·d1/σ√T - (1 + d1·d2)/(2T)]
+            o = out['veta']
+            np.multiply(d1, r - q, out=tmp)
+            tmp /= vs
+            tmp += q
+            np.multiply(d1, d2, out=tmp2)
+            tmp2 += 1.0
+            tmp2 /= T
+            tmp2 *= 0.5
+            tmp -= tmp2
+            np.multiply(sp, sqrt_t, out=o)
+            o *= tmp
+
+        if 'vera' in out:
+            # ∂ρ/∂σ = -T·K·e^{-rT}·n(d2)·d1/σ = -T·S·e^{-qT}·n(d1)·d1/σ
+            o = out['vera']
+            np.multiply(sp, d1, out=o)
+            o *= T
+            o /= sigma
+            np.negative(o, out=o)
+
+
+def _naive_price(S, K, T, sigma, r, q, is_call):
+    """비교용: 청크/버퍼 없이 한 줄 수식으로 계산하는 기준 구현"""
+    vs = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / vs
+    d2 = d1 - vs
+    omega = np.where(is_call, 1.0, -1.0)
+    return omega * (S * np.exp(-q * T) * ndtr(omega * d1) - K * np.exp(-r * T) * ndtr(omega * d2))
+
+
+def benchmark(n_contracts=1_000_000, chunk_size=CHUNK_SIZE, repeat=3, seed=0):
+    """
+    처리량 벤치마크 (contracts/sec)
+
+    Returns:
+        dict: 항목별 최고 기록 {'naive_price', 'price', 'price_greeks'}
+    """
+    rng = np.random.default_rng(seed)
+    S = 100.0
+    K = rng.uniform(50.0, 150.0, n_contracts)
+    T = rng.uniform(0.02, 2.0, n_contracts)
+    sigma = rng.uniform(0.1, 0.6, n_contracts)
+    is_call = rng.random(n_contracts) < 0.5
+    r, q = 0.04, 0.01
+
+    engine = BlackScholesEngine(spot=S, rate=r, dividend=q, chunk_size=chunk_size)
+    out = {name: np.empty(n_contracts) for name in OUTPUTS}
+
+    cases = {
+        'naive_price': lambda: _naive_price(S, K, T, sigma, r, q, is_call),
+        'price': lambda: engine.price(K, T, sigma=sigma, is_call=is_call, out=out['price']),
+        'price_greeks': lambda: engine.greeks(K, T, sigma=sigma, is_call=is_call, out=out),
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        fn()  # warm-up
+        best = min(_timeit(fn) for _ in range(repeat))
+        results[name] = n_contracts / best
+    return results
+
+
+def _timeit(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Black-Scholes pricing engine')
+    parser.add_argument('--contracts', type=int, default=1_000_000, help='벤치마크 계약 수')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='청크 크기')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최고 기록 사용)')
+    parser.add_argument('--ticker', help='DB 역사적 변동성으로 ATM 옵션 체인 예시 출력')
+    args = parser.parse_args()
+
+    if args.ticker:
+        engine = BlackScholesEngine.from_ticker(args.ticker, rate=0.04)
+        strikes = engine.spot * np.linspace(0.8, 1.2, 9)
+        chain = engine.greeks(strikes, 0.25)
+        print(f"{args.ticker}: S = {engine.spot:.2f}, σ = {engine.sigma:.4f}, T = 0.25")
+        print(f"{'strike':>10} {'price':>10} {'delta':>8} {'gamma':>8} {'vega':>8} {'theta':>9}")
+        for i, k in enumerate(strikes):
+            print(f"{k:10.2f} {chain['price'][i]:10.4f} {chain['delta'][i]:8.4f} "
+                  f"{chain['gamma'][i]:8.4f} {chain['vega'][i]:8.3f} {chain['theta'][i]:9.3f}")
+
+    print(f"\nBenchmark: {args.contracts:,} contracts, chunk size {args.chunk_size:,}")
+    for name, rate in benchmark(args.contracts, args.chunk_size, args.repeat).items():
+        print(f"  {name:<14} {rate:>14,.0f} contracts/sec")
@@ -0,0 +1,517 @@
+"""
+몬테카를로 옵션 가격결정 엔진
+========================================
+위험중립 측도에서 기초자산 경로를 시뮬레이션하여 유럽형/아시안 옵션 가격을 추정
+
+동역학 (DB 가격 이력으로 보정):
+- GBM:    dS/S = (r - q)dt + σ dW
+- Heston: dS/S = (r - q)dt + √v dW_S,  dv = κ(θ - v)dt + ξ√v dW_v,  corr(dW_S, dW_v) = ρ
+- Merton: dS/S = (r - q - λk)dt + σ dW + (J - 1)dN,  ln J ~ N(μ_J, σ_J²),  k = E[J] - 1
+
+구조:
+- 고정 크기 청크(chunk_size 경로) 단위로 시뮬레이션 → 메모리 사용량은 경로 수와 무관
+- 청크 i는 SeedSequence(seed).spawn()의 i번째 자식 시드를 사용하고, 결과를 인덱스 순서로
+  합산하므로 워커 수/완료 순서와 무관하게 같은 seed면 같은 결과
+- 청크별 충분통계량(Σy, Σy², Σx, Σx², Σxy)만 반환 → 누적 표준오차가 목표치에 도달하면 조기 종료
+
+분산 감소:
+- 대조변수(antithetic): Z와 -Z 경로 쌍의 평균을 하나의 표본으로 사용
+- 통제변수(control variate): 같은 가격 충격으로 움직이는 GBM 그림자 경로의 유럽형 옵션
+  (아시안이면 기하평균 아시안 옵션), 기댓값은 Black-Scholes 해석해
+  → ŷ = ȳ - β(x̄ - BS),  β = Cov(y, x) / Var(x)
+- Sobol 준난수: 청크마다 독립적으로 스크램블한 Sobol 점 → 청크 평균들이 i.i.d.이므로
+  표준오차는 청크 평균의 분산(batch means)으로 추정
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+try:
+    from .black_scholes import BlackScholesEngine, load_close_prices, DB_PATH, DATA_ENG_PATH
+except ImportError:  # 스크립트 실행 (python 05_Derivatives/monte_carlo.py)
+    from black_scholes import BlackScholesEngine, load_close_prices, DB_PATH, DATA_ENG_PATH
+
+# 관측 빈도 유틸리티 (01_Data_Engineering/bar_resampler.py)
+if DATA_ENG_PATH not in sys.path:
+    sys.path.insert(0, DATA_ENG_PATH)
+from bar_resampler import TRADING_DAYS, infer_periods_per_year
+
+PAYOFFS = ('european', 'asian')
+MODELS = ('gbm', 'heston', 'merton')
+CHUNK_SIZE = 2 ** 14
+# 점프 판별 임계값 (MAD 기반 강건 표준편차의 배수)
+JUMP_THRESHOLD = 4.0
+
+
+class GBMModel:
+    """기하 브라운 운동 (로그가격을 정확히 시뮬레이션하므로 이산화 오차 없음)"""
+
+    name = 'gbm'
+    n_factors = 1
+
+    def __init__(self, sigma):
+        self.sigma = float(sigma)
+
+    @classmethod
+    def calibrate(cls, log_returns, periods_per_year=TRADING_DAYS):
+        """σ = std(로그수익률)·√periods_per_year"""
+        return cls(np.std(log_returns, ddof=1) * np.sqrt(periods_per_year))
+
+    def params(self):
+        return {'sigma': self.sigma}
+
+    def control_volatility(self, maturity):
+        """통제변수 GBM 그림자 경로의 변동성"""
+        return self.sigma
+
+    def simulate(self, spot, rate, dividend, maturity, n_steps, normals, rng, antithetic=False):
+        """
+        Args:
+            normals: (n_factors, n_steps, m) 표준정규 난수
+            antithetic: True면 앞/뒤 절반이 (Z, -Z) 쌍
+
+        Returns:
+            tuple: (만기 가격, 관측 시점 평균 가격) 각각 (m,)
+        """
+        dt = maturity / n_steps
+        drift = (rate - dividend - 0.5 * self.sigma ** 2) * dt
+        vol = self.sigma * np.sqrt(dt)
+        log_s = np.full(normals.shape[-1], np.log(spot))
+        total = np.zeros(normals.shape[-1])
+        for z in normals[0]:
+            log_s += drift + vol * z
+            total += np.exp(log_s)
+        return np.exp(log_s), total / n_steps
+
+
+class HestonModel:
+    """Heston 확률변동성 모형 (분산은 full truncation Euler, 가격은 로그-Euler)"""
+
+    name = 'heston'
+    n_factors = 2
+
+    def __init__(self, v0, kappa, theta, xi, rho):
+        self.v0 = float(v0)
+        self.kappa = float(kappa)
+        self.theta = float(theta)
+        self.xi = float(xi)
+        self.rho = float(rho)
+
+    @classmethod
+    def calibrate(cls, log_returns, periods_per_year=TRADING_DAYS, window=21):
+        """
+        실현분산 시계열에 대한 적률 보정
+        - v_t: window일 이동 실현분산(연율화), v_{t+1} = a + b·v_t + e 를 OLS로 추정
+        - κ = -ln(b)·periods_per_year, θ = a / (1 - b)
+        - ξ = std(e / √v_t) / √Δt,  ρ = corr(r_t, Δv_t),  v0 = 최근 실현분산
+        """
+        r = np.asarray(log_returns, dtype=float)
+        if len(r) < 3 * window:
+            raise ValueError(f"At least {3 * window} returns are required for Heston calibration.")
+        dt = 1.0 / periods_per_year
+        sq = np.convolve(r ** 2, np.ones(window), mode='valid') / window
+        v = sq * periods_per_year
+        x, y = v[:-1], v[1:]
+        b = np.clip(np.cov(x, y, ddof=1)[0, 1] / np.var(x, ddof=1), 1e-4, 1.0 - 1e-4)
+        a = y.mean() - b * x.mean()
+        kappa = -np.log(b) / dt
+        theta = max(a / (1.0 - b), 1e-6)
+        resid = y - a - b * x
+        xi = np.std(resid / np.sqrt(np.maximum(x, 1e-12)), ddof=1) / np.sqrt(dt)
+        rho = np.corrcoef(r[window:], np.diff(v))[0, 1]
+        return cls(v0=v[-1], kappa=kappa, theta=theta, xi=xi, rho=np.clip(rho, -0.99, 0.99))
+
+    def params(self):
+        return {'v0': self.v0, 'kappa': self.kappa, 'theta': self.theta, 'xi': self.xi, 'rho': self.rho}
+
+    def control_volatility(self, maturity):
+        """만기까지 기대 평균분산의 제곱근 √(θ + (v0 - θ)(1 - e^{-κT}) / (κT))"""
+        kt = self.kappa * maturity
+        weight = (1.0 - np.exp(-kt)) / kt if kt > 1e-12 else 1.0
+        return float(np.sqrt(max(self.theta + (self.v0 - self.theta) * weight, 1e-12)))
+
+    def simulate(self, spot, rate, dividend, maturity, n_steps, normals, rng, antithetic=False):
+        dt = maturity / n_steps
+        sqrt_dt = np.sqrt(dt)
+        rho_c = np.sqrt(1.0 - self.rho ** 2)
+        m = normals.shape[-1]
+        log_s = np.full(m, np.log(spot))
+        v = np.full(m, self.v0)
+        total = np.zeros(m)
+        for z_s, z_2 in zip(normals[0], normals[1]):
+            v_pos = np.maximum(v, 0.0)
+            vol = np.sqrt(v_pos) * sqrt_dt
+            log_s += (rate - dividend - 0.5 * v_pos) * dt + vol * z_s
+            # 분산 충격: z_v = ρ·z_s + √(1-ρ²)·z_2 (가격 충격 z_s는 통제변수와 공유)
+            v += self.kappa * (self.theta - v_pos) * dt + self.xi * vol * (self.rho * z_s + rho_c * z_2)
+            total += np.exp(log_s)
+        return np.exp(log_s), total / n_steps
+
+
+class MertonJumpModel:
+    """Merton(1976) 점프-확산 모형 (로그가격 정확 시뮬레이션, 스텝별 Poisson 점프 수)"""
+
+    name = 'merton'
+    n_factors = 1
+
+    def __init__(self, sigma, lam, mu_j, sigma_j):
+        self.sigma = float(sigma)
+        self.lam = float(lam)
+        self.mu_j = float(mu_j)
+        self.sigma_j = float(sigma_j)
+
+    @classmethod
+    def calibrate(cls, log_returns, periods_per_year=TRADING_DAYS, threshold=JUMP_THRESHOLD):
+        """
+        임계값 기반 점프 분리
+        - |r - median| > threshold · 1.4826·MAD 인 수익률을 점프로 분류
+        - λ = 점프 수 / 기간(년), μ_J·σ_J = 점프 수익률의 평균·표준편차
+        - σ = 점프를 제외한 수익률의 표준편차·√periods_per_year
+        """
+        r = np.asarray(log_returns, dtype=float)
+        center = np.median(r)
+        robust_std = 1.4826 * np.median(np.abs(r - center))
+        jumps = np.abs(r - center) > threshold * robust_std
+        sigma = np.std(r[~jumps], ddof=1) * np.sqrt(periods_per_year)
+        n_jumps = int(jumps.sum())
+        lam = n_jumps / (len(r) / periods_per_year)
+        mu_j = float(r[jumps].mean()) if n_jumps else 0.0
+        sigma_j = float(r[jumps].std(ddof=1)) if n_jumps > 1 else 0.0
+        return cls(sigma=sigma, lam=lam, mu_j=mu_j, sigma_j=sigma_j)
+
+    def params(self):
+        return {'sigma': self.sigma, 'lam': self.lam, 'mu_j': self.mu_j, 'sigma_j': self.sigma_j}
+
+    def control_volatility(self, maturity):
+        return self.sigma
+
+    def simulate(self, spot, rate, dividend, maturity, n_steps, normals, rng, antithetic=False):
+        dt = maturity / n_steps
+        k = np.exp(self.mu_j + 0.5 * self.sigma_j ** 2) - 1.0
+        drift = (rate - dividend - self.lam * k - 0.5 * self.sigma ** 2) * dt
+        vol = self.sigma * np.sqrt(dt)
+        m = normals.shape[-1]
+        # 대조변수 쌍(앞/뒤 절반)은 같은 점프를 공유
+        n_draws = m // 2 if antithetic else m
+        log_s = np.full(m, np.log(spot))
+        total = np.zeros(m)
+        for z in normals[0]:
+            n_jumps = rng.poisson(self.lam * dt, n_draws)
+            jump = n_jumps * self.mu_j + np.sqrt(n_jumps) * self.sigma_j * rng.standard_normal(n_draws)
+            if antithetic:
+                jump = np.tile(jump, 2)
+            log_s += drift + vol * z + jump
+            total += np.exp(log_s)
+        return np.exp(log_s), total / n_steps
+
+
+MODEL_CLASSES = {'gbm': GBMModel, 'heston': HestonModel, 'merton': MertonJumpModel}
+
+
+def _standard_normals(rng, n_factors, n_steps, m, sobol):
+    """(n_factors, n_steps, m) 표준정규 난수 (Sobol이면 스크램블 Sobol 점의 역정규변환)"""
+    if not sobol:
+        return rng.standard_normal((n_factors, n_steps, m))
+    sampler = qmc.Sobol(d=n_factors * n_steps, scramble=True, seed=rng)
+    u = sampler.random(m)
+    np.clip(u, 1e-12, 1.0 - 1e-12, out=u)
+    return ndtri(u).T.reshape(n_factors, n_steps, m)
+
+
+def _geometric_weights(n_steps):
+    """관측 시점 로그가격 평균을 충격 Z_j의 가중합으로 표현할 때의 가중치 (n - j + 1) / n"""
+    return np.arange(n_steps, 0, -1) / n_steps
+
+
+def _shadow_underlying(shocks, spot, rate, dividend, maturity, sigma, payoff):
+    """
+    통제변수용 그림자 GBM 기초자산 값 (모형의 가격 충격 shocks = (n_steps, m) 공유)
+    - european: 만기 가격
+    - asian: 관측 시점 기하평균 가격 (해석해가 있는 기하 아시안 옵션)
+    """
+    n_steps = shocks.shape[0]
+    dt = maturity / n_steps
+    drift = rate - dividend - 0.5 * sigma ** 2
+    if payoff == 'european':
+        log_s = drift * maturity + sigma * np.sqrt(dt) * shocks.sum(axis=0)
+    else:
+        mean_time = maturity * (n_steps + 1) / (2.0 * n_steps)
+        log_s = drift * mean_time + sigma * np.sqrt(dt) * (_geometric_weights(n_steps) @ shocks)
+    return spot * np.exp(log_s)
+
+
+def control_variate_price(spot, strike, maturity, sigma, rate, dividend, is_call, payoff, n_steps):
+    """
+    그림자 GBM 통제변수의 Black-Scholes 기댓값
+    - european: BS(S, K, T, σ, r, q)
+    - asian: ln G ~ N(ln S + (r - q - σ²/2)·T(n+1)/(2n), σ²·T(n+1)(2n+1)/(6n²)) 이므로
+      σ_G, q_G 를 조정한 BS 공식 (forward = E[G] 가 되도록 q_G 선택)
+    """
+    engine = BlackScholesEngine()
+    if payoff == 'european':
+        return float(engine.price(strike, maturity, spot=spot, sigma=sigma, rate=rate, dividend=dividend,
+                                  is_call=is_call))
+    n = n_steps
+    sigma_g = sigma * np.sqrt((n + 1) * (2 * n + 1) / (6.0 * n ** 2))
+    log_forward = (rate - dividend - 0.5 * sigma ** 2) * maturity * (n + 1) / (2.0 * n) \
+        + 0.5 * sigma_g ** 2 * maturity
+    dividend_g = rate - log_forward / maturity
+    return float(engine.price(strike, maturity, spot=spot, sigma=sigma_g, rate=rate, dividend=dividend_g,
+                              is_call=is_call))
+
+
+def _simulate_chunk(model, spot, rate, dividend, strike, maturity, is_call, payoff, n_steps,
+                    chunk_size, antithetic, control_vol, sobol, seed_seq):
+    """
+    청크 하나를 시뮬레이션하고 충분통계량을 반환 (프로세스 풀 워커)
+
+    표본 단위: 대조변수를 쓰면 (Z, -Z) 경로 쌍의 평균, 아니면 경로 하나
+    y = 할인된 옵션 수익, x = 할인된 그림자 GBM 옵션 수익 (통제변수: 유럽형 또는 기하 아시안)
+    """
+    rng = np.random.default_rng(seed_seq)
+    m = chunk_size // 2 if antithetic else chunk_size
+    normals = _standard_normals(rng, model.n_factors, n_steps, m, sobol)
+    if antithetic:
+        normals = np.concatenate([normals, -normals], axis=-1)
+
+    terminal, average = model.simulate(spot, rate, dividend, maturity, n_steps, normals, rng, antithetic)
+    omega = 1.0 if is_call else -1.0
+    discount = np.exp(-rate * maturity)
+    underlying = terminal if payoff == 'european' else average
+    y = discount * np.maximum(omega * (underlying - strike), 0.0)
+
+    x = discount * np.maximum(omega * (_shadow_underlying(normals[0], spot, rate, dividend, maturity,
+                                                          control_vol, payoff) - strike), 0.0)
+
+    if antithetic:
+        y = 0.5 * (y[:m] + y[m:])
+        x = 0.5 * (x[:m] + x[m:])
+
+    return {
+        'n': len(y),
+        'sum_y': float(y.sum()), 'sum_y2': float(y @ y),
+        'sum_x': float(x.sum()), 'sum_x2': float(x @ x), 'sum_xy': float(x @ y),
+    }
+
+
+def _combine(stats, control_mean, use_control, batch_means):
+    """
+    청크 통계량을 합산하여 추정치와 표준오차 계산
+
+    batch_means=True (Sobol): 공통 β로 보정한 청크 평균들의 표본분산으로 표준오차 추정
+    """
+    n = sum(s['n'] for s in stats)
+    sy = sum(s['sum_y'] for s in stats)
+    sx = sum(s['sum_x'] for s in stats)
+    mean_y, mean_x = sy / n, sx / n
+    var_y = (sum(s['sum_y2'] for s in stats) - n * mean_y ** 2) / max(n - 1, 1)
+    var_x = (sum(s['sum_x2'] for s in stats) - n * mean_x ** 2) / max(n - 1, 1)
+    cov_xy = (sum(s['sum_xy'] for s in stats) - n * mean_x * mean_y) / max(n - 1, 1)
+
+    beta = cov_xy / var_x if use_control and var_x > 1e-300 else 0.0
+    estimate = mean_y - beta * (mean_x - control_mean)
+    var_adj = max(var_y - 2.0 * beta * cov_xy + beta ** 2 * var_x, 0.0)
+
+    if batch_means:
+        if len(stats) < 2:
+            std_error = np.inf
+        else:
+            chunk_means = np.array([(s['sum_y'] - beta * (s['sum_x'] - s['n'] * control_mean)) / s['n']
+                                    for s in stats])
+            std_error = float(np.std(chunk_means, ddof=1) / np.sqrt(len(stats)))
+    else:
+        std_error = float(np.sqrt(var_adj / n))
+
+    return {
+        'price': float(estimate),
+        'std_error': std_error,
+        'samples': n,
+        'control_beta': float(beta),
+        'variance_reduction': float(var_y / var_adj) if var_adj > 0 else None,
+    }
+
+
+class MonteCarloEngine:
+    """
+    청크 단위 멀티프로세스 몬테카를로 가격결정기
+
+    Example:
+        engine = MonteCarloEngine.from_ticker('AAPL', model='heston', rate=0.04)
+        result = engine.price(strike=engine.spot, maturity=0.5, payoff='asian', target_se=0.01)
+    """
+
+    def __init__(self, model, spot, rate=0.0, dividend=0.0, chunk_size=CHUNK_SIZE, antithetic=True,
+                 control_variate=True, sobol=False, max_workers=None, seed=None):
+        """
+        Args:
+            model: GBMModel / HestonModel / MertonJumpModel
+            spot: 현재 기초자산 가격
+            rate, dividend: 무위험 이자율 r, 연속 배당수익률 q
+            chunk_size: 청크당 경로 수 (Sobol이면 2의 거듭제곱으로 올림)
+            antithetic: 대조변수 사용 여부
+            control_variate: Black-Scholes 통제변수 사용 여부
+            sobol: 스크램블 Sobol 준난수 사용 여부
+            max_workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+            seed: 재현성을 위한 루트 시드
+        """
+        self.model = model
+        self.spot = float(spot)
+        self.rate = rate
+        self.dividend = dividend
+        if sobol:
+            chunk_size = 1 << int(np.ceil(np.log2(max(chunk_size, 2))))
+        self.chunk_size = int(chunk_size) + (int(chunk_size) % 2 if antithetic else 0)
+        self.antithetic = antithetic
+        self.control_variate = control_variate
+        self.sobol = sobol
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.seed = seed
+
+    @classmethod
+    def from_ticker(cls, ticker, model='gbm', lookback=None, db_path=DB_PATH, **kwargs):
+        """DB 종가 이력으로 모형을 보정하고 최근 종가를 현재가로 사용 (연율화 계수는 날짜 간격으로 추정)"""
+        if model not in MODEL_CLASSES:
+            raise ValueError(f"Unknown model: {model} (choose from {MODELS})")
+        dates, close = load_close_prices(ticker, db_path, with_dates=True)
+        log_returns = np.diff(np.log(close))
+        if lookback:
+            log_returns = log_returns[-lookback:]
+        calibrated = MODEL_CLASSES[model].calibrate(log_returns, periods_per_year=infer_periods_per_year(dates))
+        logging.info(f"{ticker}: calibrated {model} {calibrated.params()}")
+        return cls(calibrated, spot=close[-1], **kwargs)
+
+    def price(self, strike, maturity, is_call=True, payoff='european', n_steps=None,
+              target_se=None, max_paths=1_000_000, min_chunks=4):
+        """
+        옵션 가격 추정
+
+        Args:
+            strike, maturity: 행사가, 만기(년)
+            payoff: 'european' 또는 'asian'(관측 시점 산술평균 가격)
+            n_steps: 시간 스텝 수 (생략 시 GBM 유럽형은 1, 그 외 거래일 단위 — 보정 데이터 빈도와 무관한 이산화 간격)
+            target_se: 목표 표준오차 (도달 시 조기 종료, 생략 시 max_paths까지 실행)
+            max_paths: 최대 경로 수
+            min_chunks: 조기 종료 판단 전 최소 청크 수
+
+        Returns:
+            dict: 가격, 표준오차, 95% 신뢰구간, 경로 수, 처리량, 통제변수 진단 등
+        """
+        if payoff not in PAYOFFS:
+            raise ValueError(f"Unknown payoff: {payoff} (choose from {PAYOFFS})")
+        if n_steps is None:
+            exact = self.model.name == 'gbm' and payoff == 'european'
+            n_steps = 1 if exact else max(1, int(round(maturity * TRADING_DAYS)))
+
+        control_vol = self.model.control_volatility(maturity)
+        control_mean = control_variate_price(self.spot, strike, maturity, control_vol, self.rate,
+                                             self.dividend, is_call, payoff, n_steps)
+        args = (self.model, self.spot, self.rate, self.dividend, strike, maturity, is_call, payoff,
+                n_steps, self.chunk_size, self.antithetic, control_vol, self.sobol)
+
+        max_chunks = max(1, int(np.ceil(max_paths / self.chunk_size)))
+        root = np.random.SeedSequence(self.seed)
+        stats = []
+        summary = None
+        start = time.perf_counter()
+
+        def finished():
+            nonlocal summary
+            summary = _combine(stats, control_mean, self.control_variate, self.sobol)
+            return (target_se is not None and len(stats) >= min_chunks
+                    and summary['std_error'] <= target_se)
+
+        if self.max_workers == 1:
+            for _ in range(max_chunks):
+                stats.append(_simulate_chunk(*args, root.spawn(1)[0]))
+                if finished():
+                    break
+        else:
+            window = 2 * self.max_workers
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = {}
+                submitted = 0
+                while len(stats) < max_chunks:
+                    while submitted < max_chunks and len(pending) < window:
+                        pending[submitted] = executor.submit(_simulate_chunk, *args, root.spawn(1)[0])
+                        submitted += 1
+                    # 인덱스 순서대로 합산 → 완료 순서와 무관하게 재현 가능
+                    stats.append(pending.pop(len(stats)).result())
+                    if finished():
+                        break
+                for future in pending.values():
+                    future.cancel()
+
+        elapsed = time.perf_counter() - start
+        paths = len(stats) * self.chunk_size
+        if summary is None:
+            finished()
+        return {
+            'model': self.model.name,
+            'params': self.model.params(),
+            'payoff': payoff,
+            'option_type': 'call' if is_call else 'put',
+            'strike': float(strike),
+            'maturity': float(maturity),
+            'spot': self.spot,
+            'price': summary['price'],
+            'std_error': summary['std_error'],
+            'ci_95': [summary['price'] - 1.96 * summary['std_error'],
+                      summary['price'] + 1.96 * summary['std_error']],
+            'target_reached': bool(target_se is not None and summary['std_error'] <= target_se),
+            'paths': paths,
+            'chunks': len(stats),
+            'n_steps': n_steps,
+            'control_price': control_mean if self.control_variate else None,
+            'control_beta': summary['control_beta'] if self.control_variate else None,
+            'variance_reduction': summary['variance_reduction'] if self.control_variate else None,
+            'elapsed': elapsed,
+            'paths_per_sec': paths / elapsed if elapsed > 0 else None,
+        }
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Monte Carlo option pricing')
+    parser.add_argument('--ticker', help='DB 종가 이력으로 모형 보정 (생략 시 S=100, σ=0.2 GBM)')
+    parser.add_argument('--model', choices=MODELS, default='gbm')
+    parser.add_argument('--payoff', choices=PAYOFFS, default='european')
+    parser.add_argument('--strike', type=float, help='행사가 (생략 시 ATM)')
+    parser.add_argument('--maturity', type=float, default=1.0)
+    parser.add_argument('--put', action='store_true')
+    parser.add_argument('--rate', type=float, default=0.04)
+    parser.add_argument('--paths', type=int, default=1_000_000, help='최대 경로 수')
+    parser.add_argument('--target-se', type=float, help='목표 표준오차 (조기 종료)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--sobol', action='store_true')
+    parser.add_argument('--no-antithetic', action='store_true')
+    parser.add_argument('--no-control', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    options = dict(rate=args.rate, chunk_size=args.chunk_size, antithetic=not args.no_antithetic,
+                   control_variate=not args.no_control, sobol=args.sobol,
+                   max_workers=args.workers, seed=args.seed)
+    if args.ticker:
+        engine = MonteCarloEngine.from_ticker(args.ticker, model=args.model, **options)
+    elif args.model == 'gbm':
+        engine = MonteCarloEngine(GBMModel(0.2), spot=100.0, **options)
+    else:
+        parser.error('--ticker is required for heston/merton')
+
+    result = engine.price(args.strike or engine.spot, args.maturity, is_call=not args.put,
+                          payoff=args.payoff, target_se=args.target_se, max_paths=args.paths)
+    print(f"{result['model']} {result['payoff']} {result['option_type']}: "
+          f"{result['price']:.6f} ± {result['std_error']:.6f} "
+          f"({result['paths']:,} paths, {result['chunks']} chunks, {result['n_steps']} steps)")
+    if result['control_price'] is not None:
+        print(f"  control: BS {result['control_price']:.6f}, β = {result['control_beta']:.4f}, "
+              f"variance reduction ×{result['variance_reduction'] or float('inf'):.1f}")
+    print(f"  throughput: {result['paths_per_sec']:,.0f} paths/sec ({result['elapsed']:.2f}s)")
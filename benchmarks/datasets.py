@@ -0,0 +1,64 @@
+"""
+벤치마크용 합성 데이터셋 (seed 고정 → 실행마다 동일)
+========================================
+- ohlcv: 기하 브라운 운동 종가 기반 일봉 (Date, Open, High, Low, Close, Volume) — DB 스키마와 동일
+- build_database: n_tickers × n_bars 종목 테이블 + 시장 종목(SPY)을 가진 SQLite 파일
+"""
+
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+
+START_DATE = '1990-01-01'
+
+
+def ohlcv(n_bars, seed=0, drift=0.0003, volatility=0.015, start=START_DATE):
+    """GBM 종가 + 일중 변동으로 만든 일봉 DataFrame (Date는 DB와 같은 'YYYY-MM-DD' 문자열)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(drift, volatility, n_bars)
+    close = 100.0 * np.exp(np.cumsum(returns))
+    spread = np.abs(rng.normal(0, volatility / 2, n_bars)) * close
+    open_ = close * (1 + rng.normal(0, volatility / 4, n_bars))
+    dates = pd.bdate_range(start, periods=n_bars)
+    return pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 50_000_000, n_bars).astype(float),
+    })
+
+
+def ticker_names(n_tickers):
+    return [f"S{i:05d}" for i in range(n_tickers)]
+
+
+def build_database(path, n_tickers, n_bars, market_ticker='SPY'):
+    """
+    합성 종목 DB 생성 (이미 있으면 재사용)
+    :return: (DB 경로, 종목 리스트 — 시장 종목 제외)
+    """
+    tickers = ticker_names(n_tickers)
+    if os.path.exists(path):
+        return path, tickers
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        for i, ticker in enumerate(tickers + [market_ticker]):
+            ohlcv(n_bars, seed=i).to_sql(f"{ticker}_daily", conn, index=False)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return path, tickers
+
+
+def returns_frame(n_bars, seed=0):
+    """(Date 인덱스) 수익률 시계열 — 회귀 벤치마크 입력"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(START_DATE, periods=n_bars)
+    return pd.Series(rng.normal(0.0003, 0.015, n_bars), index=index)
@@ -0,0 +1,113 @@
+"""
+임포트 시간 예산 검사 (python -X importtime)
+========================================
+서버/CLI 진입 모듈을 새 인터프리터에서 임포트하며 누적 임포트 시간을 측정하고,
+예산(ms)을 넘거나 기동 시점에 로드되면 안 되는 무거운 의존성(scipy.stats, statsmodels,
+matplotlib 등)이 로드되면 실패(종료 코드 1)로 처리합니다.
+
+- 시간 예산은 머신마다 다르므로 --scale로 일괄 조정 (느린 CI: --scale 2)
+- 금지 모듈 검사는 머신과 무관하게 결정적 → 지연 임포트가 깨지면 바로 드러남
+
+사용:
+    python benchmarks/import_budget.py                 # 모든 대상 검사
+    python benchmarks/import_budget.py server --top 15 # 서버만, 가장 오래 걸린 모듈 15개 출력
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_DIRS = ['00_visualization', '01_Data_Engineering', '02_Financial_Analysis', '04_Portfolio_Mgmt', '05_Derivatives']
+
+# 기동 시점에 로드되면 안 되는 모듈 (분석 함수가 처음 호출될 때 로드)
+HEAVY_MODULES = ('scipy.stats', 'scipy.optimize', 'scipy.signal', 'scipy.linalg', 'statsmodels', 'matplotlib')
+
+# 대상: 임포트할 모듈, 예산 (ms), 금지 모듈
+# 예산은 1 CPU 개발 환경 기준 pandas(≈400ms) 임포트 + 여유분 (지연 임포트 이전 server는 약 2,000ms)
+TARGETS = {
+    'server': ('server', 1000, HEAVY_MODULES),
+    'analyzer_engine': ('analyzer_engine', 600, HEAVY_MODULES),
+    'factor_model': ('factor_model', 600, HEAVY_MODULES),
+    'volatility_model': ('volatility_model', 600, HEAVY_MODULES),
+    'time_series_analyzer': ('time_series_analyzer', 700, HEAVY_MODULES),
+    'backtest_engine': ('backtest_engine', 700, HEAVY_MODULES),
+    'database_manager': ('database_manager', 600, HEAVY_MODULES),
+    'market_data_store': ('market_data_store', 600, HEAVY_MODULES),
+    'pipeline': ('pipeline', 600, HEAVY_MODULES),
+    'shared_panel': ('shared_panel', 600, HEAVY_MODULES),
+    'intraday_store': ('intraday_store', 600, HEAVY_MODULES),
+    'financial_analysis_package': ('02_Financial_Analysis', 50, ('pandas',) + HEAVY_MODULES),
+}
+
+
+def measure_import(module, cwd=PROJECT_ROOT):
+    """
+    새 인터프리터에서 module을 임포트하고 -X importtime 출력 파싱
+    :return: (누적 임포트 시간 μs, {모듈: (자체 μs, 누적 μs)})
+    """
+    code = ("import sys, importlib; "
+            f"sys.path[:0] = {[os.path.join(PROJECT_ROOT, d) for d in MODULE_DIRS]!r}; "
+            f"importlib.import_module({module!r})")
+    env = dict(os.environ, DASHBOARD_PRECOMPUTE='0')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    # importlib.import_module 대상은 최상위 항목으로 기록됨 (패키지 경로명 그대로)
+    total = modules.get(module, (0, sum(self_us for self_us, _ in modules.values())))[1]
+    return total, modules
+
+
+def check(name, repeat=3, scale=1.0, top=0):
+    """대상 하나 검사 → 실패 사유 리스트 (빈 리스트면 통과)"""
+    module, budget_ms, forbidden = TARGETS[name]
+    # 첫 실행은 .pyc 생성/디스크 캐시 영향이 있으므로 repeat번 중 최솟값 사용
+    runs = [measure_import(module) for _ in range(repeat)]
+    total, modules = min(runs, key=lambda run: run[0])
+    elapsed_ms = total / 1000
+    limit_ms = budget_ms * scale
+
+    failures = []
+    if elapsed_ms > limit_ms:
+        failures.append(f"{elapsed_ms:.0f} ms > budget {limit_ms:.0f} ms")
+    loaded = [heavy for heavy in forbidden if any(m == heavy or m.startswith(heavy + '.') for m in modules)]
+    if loaded:
+        failures.append(f"loads {', '.join(loaded)}")
+
+    status = 'OK  ' if not failures else 'FAIL'
+    print(f"{status} {name:<28} {elapsed_ms:8.0f} ms / {limit_ms:5.0f} ms  {'; '.join(failures)}")
+    if top:
+        for mod, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][0])[:top]:
+            print(f"       {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {mod}")
+    return failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='-X importtime 기반 임포트 시간 예산 검사')
+    parser.add_argument('targets', nargs='*', help=f"검사할 대상 (기본: 전체) — {', '.join(TARGETS)}")
+    parser.add_argument('--repeat', type=int, default=3, help='대상마다 측정 횟수 (최솟값 사용)')
+    parser.add_argument('--scale', type=float, default=1.0, help='시간 예산 배율 (느린 머신/CI용)')
+    parser.add_argument('--top', type=int, default=0, help='자체 임포트 시간이 긴 모듈 N개 출력')
+    args = parser.parse_args()
+    unknown = [t for t in args.targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(unknown)}")
+
+    failed = 0
+    for target in args.targets or list(TARGETS):
+        try:
+            failed += bool(check(target, repeat=args.repeat, scale=args.scale, top=args.top))
+        except RuntimeError as e:
+            print(f"FAIL {target:<28} import error: {e}")
+            failed += 1
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,327 @@
+"""
+재현 가능한 성능 벤치마크
+========================================
+합성 데이터셋(10 ~ 10,000 종목, 1k ~ 1M bar)에서 주요 경로의 실행 시간을 측정하고
+결과를 benchmarks/results/<시각>_<커밋>.json 으로 누적 저장합니다.
+(측정값은 머신마다 다르므로 결과 디렉터리는 git에 포함하지 않음 — 같은 머신의 실행끼리 compare)
+
+측정 경로:
+    db.save_dataframe / db.read_dataframe      (bar 수)
+    analysis.analyze_ticker                     (bar 수)
+    factor.run_regression                       (bar 수)
+    factor.analyze_portfolio                    (종목 수)
+    api.*  (Flask test client, 응답 캐시를 비운 상태)  (종목 수)
+
+사용:
+    python benchmarks/run_benchmarks.py run                   # 빠른 크기만 (기본)
+    python benchmarks/run_benchmarks.py run --full            # 전체 크기 (수십 분)
+    python benchmarks/run_benchmarks.py run --filter factor   # 이름에 'factor'가 포함된 벤치마크만
+    python benchmarks/run_benchmarks.py compare               # 최근 두 실행 비교
+    python benchmarks/run_benchmarks.py compare BASE.json HEAD.json --threshold 0.1
+
+compare는 호출당 최소 시간(--stat으로 변경)이 threshold(기본 10%)보다 느려진 항목을 REGRESSION으로 표시하고 종료 코드 1을 반환합니다.
+"""
+
+import os
+import io
+import sys
+import json
+import glob
+import time
+import timeit
+import shutil
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+for sub in ('01_Data_Engineering', '02_Financial_Analysis', '04_Portfolio_Mgmt', '00_visualization'):
+    path = os.path.join(PROJECT_ROOT, sub)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+sys.path.insert(0, BENCH_DIR)
+
+import datasets
+
+BENCHMARKS = {}
+
+
+def benchmark(name, params, quick, unit):
+    """
+    벤치마크 등록 데코레이터
+    데코레이트된 함수는 (param, workdir)을 받아 준비(측정 제외)를 마친 뒤 측정할 callable을 반환
+    :param params: 전체 실행 시 크기 목록, quick: 기본(빠른) 실행 시 크기 목록, unit: 크기의 단위
+    """
+    def decorator(func):
+        BENCHMARKS[name] = {'setup': func, 'params': params, 'quick': quick, 'unit': unit}
+        return func
+    return decorator
+
+
+# ---- DB ----
+
+@benchmark('db.save_dataframe', params=[1_000, 10_000, 100_000, 1_000_000], quick=[1_000, 10_000], unit='bars')
+def bench_db_save(n_bars, workdir):
+    from database_manager import DatabaseManager
+    df = datasets.ohlcv(n_bars)
+    path = os.path.join(workdir, f'save_{n_bars}.db')
+
+    def run():
+        with DatabaseManager(path) as db:
+            db.save_dataframe(df, 'X_daily')
+    return run
+
+
+@benchmark('db.read_dataframe', params=[1_000, 10_000, 100_000, 1_000_000], quick=[1_000, 10_000], unit='bars')
+def bench_db_read(n_bars, workdir):
+    from database_manager import DatabaseManager
+    path = os.path.join(workdir, f'read_{n_bars}.db')
+    with DatabaseManager(path) as db:
+        db.save_dataframe(datasets.ohlcv(n_bars), 'X_daily')
+
+    def run():
+        with DatabaseManager(path) as db:
+            db.read_dataframe('X_daily')
+    return run
+
+
+# ---- 분석 ----
+
+@benchmark('analysis.analyze_ticker', params=[1_000, 10_000, 100_000], quick=[1_000], unit='bars')
+def bench_analyze_ticker(n_bars, workdir):
+    from analyzer_engine import TimeSeriesAnalyzer
+    df = datasets.ohlcv(n_bars)
+    return lambda: TimeSeriesAnalyzer.analyze_ticker(df.copy())
+
+
+@benchmark('factor.run_regression', params=[1_000, 10_000, 100_000, 1_000_000], quick=[1_000, 10_000], unit='bars')
+def bench_run_regression(n_bars, workdir):
+    import pandas as pd
+    from factor_model import FamaFrenchRegression
+    factors = pd.DataFrame({name: datasets.returns_frame(n_bars, seed=i) for i, name in enumerate(['MKT', 'SMB', 'HML'])})
+    asset = 0.9 * factors['MKT'] + datasets.returns_frame(n_bars, seed=9) * 0.5
+    regression = FamaFrenchRegression(asset, factors)
+    return regression.run_regression
+
+
+@benchmark('factor.analyze_portfolio', params=[10, 100, 1_000, 10_000], quick=[10, 100], unit='tickers')
+def bench_analyze_portfolio(n_tickers, workdir):
+    import pandas as pd
+    from factor_model import FamaFrenchAnalyzer
+    market_data = {}
+    for i, ticker in enumerate(datasets.ticker_names(n_tickers) + ['SPY']):
+        df = datasets.ohlcv(1_000, seed=i)
+        df['Date'] = pd.to_datetime(df['Date'])
+        market_data[ticker] = df.set_index('Date')
+    analyzer = FamaFrenchAnalyzer(market_data)
+    tickers = datasets.ticker_names(n_tickers)
+    return lambda: analyzer.analyze_portfolio(tickers, market_ticker='SPY')
+
+
+# ---- API (Flask test client) ----
+
+API_ENDPOINTS = {
+    'api.ticker': lambda tickers: f'/api/ticker/{tickers[0]}',
+    'api.data': lambda tickers: f"/api/data?tickers={','.join(tickers[:10])}",
+    'api.factor_analysis': lambda tickers: f'/api/factor-analysis/{tickers[0]}',
+    'api.portfolio_analysis': lambda tickers: '/api/portfolio-analysis',
+    'api.correlation': lambda tickers: '/api/correlation?order=cluster',
+    'api.backtest': lambda tickers: '/api/backtest?strategy=momentum',
+}
+
+
+def _api_setup(endpoint):
+    def setup(n_tickers, workdir):
+        os.environ['DASHBOARD_PRECOMPUTE'] = '0'
+        with contextlib.redirect_stdout(io.StringIO()):
+            import server
+            from market_data_store import MarketDataStore
+            from http_cache import response_cache
+        server.USE_MATERIALIZED = False  # 파이프라인 결과 조회가 아닌 분석 경로 측정
+        db_path, tickers = datasets.build_database(os.path.join(workdir, f'api_{n_tickers}.db'), n_tickers, 1_000)
+        # 같은 크기의 DB를 쓰는 동안에는 시장 데이터 캐시를 유지 (요청 간 재사용되는 실제 서버 상태와 동일)
+        if server.DB_PATH != db_path:
+            server.DB_PATH = db_path
+            server.market_store = MarketDataStore(db_path)
+            server._covariance_engines.clear()
+            if server._executor is not None:
+                server._executor.shutdown()
+                server._executor = None
+        client = server.app.test_client()
+        url = API_ENDPOINTS[endpoint](tickers)
+
+        def run():
+            response_cache.clear()  # HTTP 응답 캐시 적중이 아닌 실제 계산 시간 측정
+            with contextlib.redirect_stdout(io.StringIO()):
+                response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} -> {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return run
+    return setup
+
+
+for _endpoint in API_ENDPOINTS:
+    benchmark(_endpoint, params=[10, 100, 1_000, 10_000], quick=[10], unit='tickers')(_api_setup(_endpoint))
+
+
+# ---- 측정 / 저장 / 비교 ----
+
+def measure(func, repeat=5, min_time=0.2, max_number=1000):
+    """
+    timeit 방식: 1회 예열 후 한 반복이 min_time 이상 되도록 호출 수(number)를 정하고 repeat번 측정
+    :return: 호출당 초 단위 통계
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    number = max(1, min(max_number, int(min_time / max(first, 1e-9))))
+    samples = [timeit.timeit(func, number=number) / number for _ in range(repeat)]
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def environment():
+    """결과 해석에 필요한 실행 환경"""
+    import numpy
+    import pandas
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = 'unknown'
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+    }
+
+
+def run_suite(full=False, name_filter=None, repeat=5, workdir=None):
+    results = {}
+    workdir = workdir or os.path.join(BENCH_DIR, '.data')
+    os.makedirs(workdir, exist_ok=True)
+    for name, spec in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for param in spec['params'] if full else spec['quick']:
+            key = f"{name}[{param} {spec['unit']}]"
+            try:
+                stats = measure(spec['setup'](param, workdir), repeat=repeat)
+            except Exception as e:
+                print(f"  ✗ {key}: {e}")
+                results[key] = {'error': str(e)}
+                continue
+            results[key] = stats
+            print(f"  {key:<48} {format_seconds(stats['median']):>10}  (±{format_seconds(stats['stdev'])}, n={stats['number']}×{stats['repeat']})")
+    return results
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def save_results(results, env):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{env['commit']}.json")
+    with open(path, 'w') as f:
+        json.dump({'timestamp': datetime.now().isoformat(), 'environment': env, 'results': results}, f, indent=2)
+    return path
+
+
+def history():
+    """저장된 실행 결과 파일 (오래된 순)"""
+    return sorted(glob.glob(os.path.join(RESULTS_DIR, '*.json')))
+
+
+def compare(base_path, head_path, threshold=0.10, stat='min'):
+    """
+    두 실행의 통계값(stat) 비교 → (표시할 줄 목록, 회귀 항목 수)
+    ratio = head / base, ratio > 1 + threshold 이면 REGRESSION, < 1 / (1 + threshold) 이면 improved
+    기본 stat은 min: 다른 프로세스의 간섭은 시간을 늘리기만 하므로 공유 환경에서 가장 잡음이 적음
+    """
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+    lines = [f"base: {os.path.basename(base_path)} ({base['environment']['commit']})",
+             f"head: {os.path.basename(head_path)} ({head['environment']['commit']})"]
+    if base['environment'].get('machine') != head['environment'].get('machine') \
+            or base['environment'].get('cpu_count') != head['environment'].get('cpu_count'):
+        lines.append("⚠️  서로 다른 환경에서 측정된 결과입니다.")
+    regressions = 0
+    for key in sorted(set(base['results']) & set(head['results'])):
+        b, h = base['results'][key], head['results'][key]
+        if stat not in b or stat not in h:
+            continue
+        ratio = h[stat] / b[stat]
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            status = 'improved'
+        else:
+            status = ''
+        lines.append(f"  {key:<48} {format_seconds(b[stat]):>10} → {format_seconds(h[stat]):>10}  ×{ratio:.2f} {status}")
+    return lines, regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='성능 벤치마크 실행 및 비교')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run_parser = sub.add_parser('run', help='벤치마크 실행 후 결과 저장')
+    run_parser.add_argument('--full', action='store_true', help='전체 크기 (10~10,000 종목, 1k~1M bar)')
+    run_parser.add_argument('--filter', help='이름에 이 문자열이 포함된 벤치마크만 실행')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--no-save', action='store_true', help='결과를 저장하지 않음')
+    run_parser.add_argument('--clean', action='store_true', help='합성 데이터셋 캐시(.data) 삭제 후 실행')
+    compare_parser = sub.add_parser('compare', help='두 실행 결과 비교 (기본: 최근 두 실행)')
+    compare_parser.add_argument('base', nargs='?')
+    compare_parser.add_argument('head', nargs='?')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='회귀로 판단할 상대 지연 (기본 0.10 = 10%%)')
+    compare_parser.add_argument('--stat', choices=['min', 'median', 'mean'], default='min', help='비교할 통계값')
+    sub.add_parser('list', help='등록된 벤치마크 목록')
+    args = parser.parse_args()
+
+    # 각 모듈의 basicConfig(INFO)보다 먼저 설정해 측정 중 로그 출력을 막음
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.command == 'list':
+        for name, spec in BENCHMARKS.items():
+            print(f"{name:<28} quick={spec['quick']} full={spec['params']} ({spec['unit']})")
+    elif args.command == 'run':
+        if args.clean:
+            shutil.rmtree(os.path.join(BENCH_DIR, '.data'), ignore_errors=True)
+        env = environment()
+        print(f"벤치마크 실행 ({'full' if args.full else 'quick'}, commit {env['commit']}, {env['cpu_count']} CPU)")
+        results = run_suite(full=args.full, name_filter=args.filter, repeat=args.repeat)
+        if not args.no_save:
+            print(f"\n결과 저장: {save_results(results, env)}")
+    else:
+        runs = history()
+        base = args.base or (runs[-2] if len(runs) >= 2 else None)
+        head = args.head or (runs[-1] if runs else None)
+        if base is None or head is None:
+            sys.exit("비교할 실행 결과가 2개 이상 필요합니다. (benchmarks/results/*.json)")
+        lines, regressions = compare(base, head, args.threshold, args.stat)
+        print('\n'.join(lines))
+        print(f"\n회귀 {regressions}건 (threshold {args.threshold:.0%})")
+        sys.exit(1 if regressions else 0)
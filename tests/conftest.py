@@ -0,0 +1,74 @@
+"""
+테스트 공용 설정
+- 번호 디렉터리(00_visualization …)는 패키지 이름으로 임포트할 수 없으므로 각 모듈처럼 sys.path에 추가
+- market_db: 합성 일봉 테이블({ticker}_daily)을 담은 임시 SQLite DB
+"""
+
+import os
+import sys
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ('00_visualization', '01_Data_Engineering', '02_Financial_Analysis', '04_Portfolio_Mgmt', '05_Derivatives',
+                  'benchmarks'):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# 서버는 첫 요청에서 사전 계산 스케줄러를 시작하므로 테스트에서는 끄고 요청 시 계산 경로를 사용
+os.environ.setdefault('DASHBOARD_PRECOMPUTE', '0')
+
+TICKERS = ('AAA', 'BBB', 'SPY')
+
+
+def make_bars(n, seed=0, start='2022-01-03'):
+    """기하 브라운 운동 종가로 만든 OHLCV 일봉 (collector와 같은 Date 문자열 컬럼)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n)))
+    return pd.DataFrame({
+        'Date': pd.bdate_range(start, periods=n).strftime('%Y-%m-%d'),
+        'Open': close * (1 + rng.normal(0, 0.002, n)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1_000, 10_000, n).astype(float),
+    })
+
+
+def write_bars(db_path, ticker, bars, if_exists='replace'):
+    """replace는 임시 테이블에 쓴 뒤 한 트랜잭션에서 교체 (읽는 쪽이 테이블이 없는 중간 상태를 보지 않도록)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        if if_exists != 'replace':
+            bars.to_sql(f'{ticker}_daily', conn, if_exists=if_exists, index=False)
+            return
+        bars.to_sql(f'{ticker}_staging', conn, if_exists='replace', index=False)
+        conn.isolation_level = None       # DDL도 명시적 트랜잭션 안에서 실행
+        conn.execute('BEGIN')
+        conn.execute(f'DROP TABLE IF EXISTS "{ticker}_daily"')
+        conn.execute(f'ALTER TABLE "{ticker}_staging" RENAME TO "{ticker}_daily"')
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+
+def execute(db_path, sql, params=()):
+    """다른 프로세스의 기록처럼 별도 연결로 커밋"""
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            conn.execute(sql, params)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def market_db(tmp_path):
+    path = str(tmp_path / 'market_data.db')
+    for i, ticker in enumerate(TICKERS):
+        write_bars(path, ticker, make_bars(300, seed=i))
+    return path
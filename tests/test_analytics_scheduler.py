@@ -0,0 +1,166 @@
+"""
+사전 계산 스케줄러: 시작 시 전 종목 계산 후 warm, DB가 바뀌면 바뀐 종목만 다시 계산하여 게시
+"""
+
+import time
+
+import pytest
+
+from analytics_scheduler import AnalyticsScheduler, ResultsStore
+from conftest import TICKERS, execute, make_bars, write_bars
+from market_data_store import MarketDataStore
+
+
+def _wait(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('timed out')
+        time.sleep(0.02)
+
+
+class Recorder:
+    """스케줄러에 넘기는 계산 함수들 (호출 기록)"""
+
+    def __init__(self, store):
+        self.store = store
+        self.analyzed = []
+        self.factored = []
+
+    def analyze(self, tickers):
+        for ticker in tickers:
+            self.analyzed.append(ticker)
+            yield ticker, {'rows': len(self.store.get(ticker))}
+
+    def factor(self, ticker):
+        self.factored.append(ticker)
+        return {'ticker': ticker}
+
+    def portfolio(self):
+        return {'tickers': self.store.tickers()}
+
+
+@pytest.fixture
+def scheduled(market_db):
+    store = MarketDataStore(market_db)
+    results = ResultsStore()
+    recorder = Recorder(store)
+    scheduler = AnalyticsScheduler(store, results, recorder.analyze, recorder.factor, recorder.portfolio,
+                                   interval=0.05).start()
+    try:
+        yield store, results, recorder
+    finally:
+        scheduler.stop(timeout=5)
+        store.close()
+
+
+def test_results_store_publishes_new_snapshots():
+    store = ResultsStore()
+    first = store.snapshot()
+    store.publish('tickers', {'AAA': 1, 'BBB': 2})
+    store.publish('factors', {'AAA': 'f'}, portfolio={'p': 1}, data_version=3)
+    snapshot = store.snapshot()
+    assert first['tickers'] == {} and first['portfolio'] is None       # 이전 스냅샷은 그대로
+    assert snapshot['tickers'] == {'AAA': 1, 'BBB': 2} and snapshot['factors'] == {'AAA': 'f'}
+    assert snapshot['data_version'] == 3 and store.as_of('portfolio') is not None
+
+    store.publish(removed=['AAA'])
+    assert store.snapshot()['tickers'] == {'BBB': 2} and store.snapshot()['factors'] == {}
+    assert store.as_of('tickers', 'AAA') is None and store.as_of('tickers', 'BBB') is not None
+
+
+def test_startup_precompute_then_incremental_refresh(scheduled, market_db):
+    store, results, recorder = scheduled
+    _wait(lambda: results.snapshot()['warm'])
+    snapshot = results.snapshot()
+    assert sorted(snapshot['tickers']) == sorted(TICKERS)
+    assert sorted(snapshot['factors']) == sorted(TICKERS)
+    assert snapshot['portfolio'] == {'tickers': sorted(TICKERS)}
+
+    recorder.analyzed.clear()
+    recorder.factored.clear()
+    write_bars(market_db, 'BBB', make_bars(320, seed=1))
+    _wait(lambda: results.snapshot()['tickers']['BBB'] == {'rows': 320})
+    assert recorder.analyzed == ['BBB'] and recorder.factored == ['BBB']
+
+    # 시장 종목이 바뀌면 모든 종목의 팩터 분석을 다시 계산
+    recorder.factored.clear()
+    write_bars(market_db, 'SPY', make_bars(320, seed=2))
+    _wait(lambda: results.snapshot()['tickers']['SPY'] == {'rows': 320})
+    _wait(lambda: sorted(recorder.factored) == sorted(TICKERS))
+
+
+def test_dropped_ticker_is_removed(scheduled, market_db):
+    store, results, recorder = scheduled
+    _wait(lambda: results.snapshot()['warm'])
+    execute(market_db, 'DROP TABLE "AAA_daily"')
+    _wait(lambda: 'AAA' not in results.snapshot()['tickers'])
+    assert 'AAA' not in results.snapshot()['factors']
+
+
+class FlakyStore:
+    """처음 failures번은 changes_since가 실패하는 저장소 (시작 시 DB 잠금 등)"""
+
+    def __init__(self, store, failures):
+        self.store = store
+        self.failures = failures
+
+    def changes_since(self, version):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('database is locked')
+        return self.store.changes_since(version)
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+
+def test_startup_failure_is_retried(market_db):
+    store = MarketDataStore(market_db)
+    results = ResultsStore()
+    recorder = Recorder(store)
+    scheduler = AnalyticsScheduler(FlakyStore(store, failures=2), results, recorder.analyze, recorder.factor,
+                                   recorder.portfolio, interval=0.02).start()
+    try:
+        _wait(lambda: results.snapshot()['warm'])
+        assert sorted(results.snapshot()['tickers']) == sorted(TICKERS)
+    finally:
+        scheduler.stop(timeout=5)
+        store.close()
+
+
+def test_failed_ticker_is_recorded_and_retried_up_to_max_attempts(market_db):
+    class Failing(Recorder):
+        broken = True
+
+        def analyze(self, tickers):
+            for ticker, data in super().analyze(tickers):
+                yield ticker, None if ticker == 'BBB' and self.broken else data
+
+        def factor(self, ticker):
+            if ticker == 'BBB' and self.broken:
+                self.factored.append(ticker)
+                raise ValueError('not enough overlapping observations')
+            return super().factor(ticker)
+
+    store = MarketDataStore(market_db)
+    results = ResultsStore()
+    recorder = Failing(store)
+    scheduler = AnalyticsScheduler(store, results, recorder.analyze, recorder.factor, recorder.portfolio,
+                                   interval=0.02, max_attempts=3).start()
+    try:
+        _wait(lambda: (results.error('tickers', 'BBB') or {}).get('attempts') == 3)
+        time.sleep(0.2)
+        assert recorder.analyzed.count('BBB') == 3            # 최대 시도 후에는 데이터가 바뀔 때까지 재시도하지 않음
+        assert 'BBB' not in results.snapshot()['tickers']
+        assert results.error('factors', 'BBB')['error'] == 'not enough overlapping observations'
+        assert results.error('tickers', 'AAA') is None
+
+        # 데이터가 바뀌면 다시 계산, 성공하면 실패 기록 삭제
+        recorder.broken = False
+        write_bars(market_db, 'BBB', make_bars(320, seed=1))
+        _wait(lambda: 'BBB' in results.snapshot()['tickers'])
+        assert results.error('tickers', 'BBB') is None and results.error('factors', 'BBB') is None
+    finally:
+        scheduler.stop(timeout=5)
+        store.close()
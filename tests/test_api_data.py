@@ -0,0 +1,69 @@
+"""
+/api/data: 워커 풀에서 종목별로 분석하고 NDJSON으로 완료 순서대로 스트리밍, 부분집합/페이지네이션
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import TICKERS
+
+pytest.importorskip('flask')
+
+
+@pytest.fixture
+def client(market_db, monkeypatch):
+    import server
+    import http_cache
+    from market_data_store import MarketDataStore
+
+    store = MarketDataStore(market_db)
+    executor = ThreadPoolExecutor(max_workers=2)   # 워커 프로세스 대신 같은 분석 함수를 스레드에서 실행
+    monkeypatch.setattr(server, 'DB_PATH', market_db)
+    monkeypatch.setattr(server, 'market_store', store)
+    monkeypatch.setattr(server, '_executor', executor)
+    http_cache.response_cache.clear()
+    yield server.app.test_client()
+    http_cache.response_cache.clear()
+    executor.shutdown(wait=True)
+    store.close()
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_ndjson_streams_one_line_per_ticker(client):
+    response = client.get('/api/data?format=ndjson&tickers=BBB,AAA,ZZZ')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = _lines(response)
+
+    assert lines[0]['type'] == 'meta'
+    assert lines[0]['tickers'] == ['AAA', 'BBB', 'ZZZ'] and lines[0]['total'] == 3
+    assert lines[-1] == {**lines[-1], 'type': 'done', 'count': 2, 'failed': ['ZZZ']}
+    body = {line['ticker']: line for line in lines[1:-1]}
+    assert sorted(body) == ['AAA', 'BBB', 'ZZZ']
+    assert body['ZZZ']['type'] == 'error'
+    for ticker in ('AAA', 'BBB'):
+        assert body[ticker]['type'] == 'ticker'
+        assert len(body[ticker]['data']['price_history']['prices']) == 300
+
+
+def test_json_matches_ndjson_and_paginates(client):
+    page = client.get('/api/data?offset=1&limit=1').get_json()
+    assert page['total'] == len(TICKERS)
+    assert list(page['tickers']) == [sorted(TICKERS)[1]]
+    assert page['next_offset'] == 2
+
+    full = client.get('/api/data').get_json()
+    assert list(full['tickers']) == sorted(TICKERS) and full['next_offset'] is None
+    streamed = {line['ticker']: line['data'] for line in _lines(client.get('/api/data?format=ndjson'))
+                if line['type'] == 'ticker'}
+    assert streamed['AAA']['statistics'] == full['tickers']['AAA']['statistics']
+
+
+def test_invalid_page_is_rejected(client):
+    assert client.get('/api/data?limit=0').status_code == 400
+    assert client.get('/api/data?offset=-1').status_code == 400
@@ -0,0 +1,88 @@
+"""
+벡터화 백테스트 vs 날짜별 반복문 시뮬레이션, 파라미터 스윕 vs 개별 실행
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest_engine import BacktestEngine, STRATEGIES, sweep
+from conftest import make_bars
+
+TICKERS = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+
+
+def _prices(n=300):
+    closes = {ticker: make_bars(n, seed=i)['Close'].to_numpy() for i, ticker in enumerate(TICKERS)}
+    return pd.DataFrame(closes, index=pd.bdate_range('2022-01-03', periods=n))
+
+
+def _loop_simulate(engine, targets, rebalance):
+    """보유 금액을 하루씩 굴리는 기준 구현 (종목 수익률 → 리밸런싱 → 비용)"""
+    T, N = targets.shape
+    holdings, cash, value = np.zeros(N), 1.0, 1.0
+    invested = False
+    returns, turnover = np.zeros(T), np.zeros(T)
+    for t in range(T):
+        if invested:
+            holdings = holdings * (1.0 + engine.returns[t])
+            cash *= 1.0 + engine.rf_period
+        new_value = holdings.sum() + cash
+        if rebalance[t]:
+            turnover[t] = np.abs(targets[t] - holdings / new_value).sum()
+            new_value *= 1.0 - turnover[t] * engine.cost_rate
+            holdings = targets[t] * new_value
+            cash = new_value - holdings.sum()
+            invested = True
+        returns[t] = new_value / value - 1.0
+        value = new_value
+    return returns, turnover
+
+
+@pytest.mark.parametrize('strategy, params, rebalance', [
+    ('momentum', {'lookback': 60, 'skip': 5, 'quantile': 0.4}, 'M'),
+    ('mean_reversion', {'lookback': 5, 'top_n': 2}, 'W'),
+    ('ma_crossover', {'fast': 10, 'slow': 40}, 7),
+    ('buy_and_hold', {}, 'Q'),
+])
+def test_simulate_matches_loop(strategy, params, rebalance):
+    engine = BacktestEngine(_prices(), risk_free_rate=0.03, transaction_cost_bps=10, slippage_bps=5)
+    targets = STRATEGIES[strategy](engine, **params)
+    mask = engine.rebalance_mask(rebalance)
+    sim = engine.simulate(targets, mask)
+    expected_returns, expected_turnover = _loop_simulate(engine, np.nan_to_num(targets), mask)
+    np.testing.assert_allclose(sim['turnover'], expected_turnover, atol=1e-12)
+    np.testing.assert_allclose(sim['returns'], expected_returns, atol=1e-12)
+
+
+def test_sweep_matches_individual_runs():
+    prices = _prices(250)
+    grid = {'lookback': [20, 60], 'skip': [0, 5], 'quantile': [0.2, 0.6]}
+    serial = sweep(prices, 'momentum', grid, rebalance='M', max_workers=1, transaction_cost_bps=2)
+    parallel = sweep(prices, 'momentum', grid, rebalance='M', max_workers=2, transaction_cost_bps=2)
+    assert len(serial) == 8
+    pd.testing.assert_frame_equal(serial, parallel)
+
+    engine = BacktestEngine(prices, transaction_cost_bps=2)
+    for row in serial.to_dict('records'):
+        params = {key: row[key] for key in grid}
+        expected = engine.run('momentum', rebalance='M', describe=False, **params)['performance']
+        for key, value in expected.items():
+            assert row[key] == pytest.approx(value, rel=1e-12, abs=1e-15), (params, key)
+    assert serial['sharpe_ratio'].is_monotonic_decreasing
+
+
+def test_ma_crossover_ignores_pre_listing_prices():
+    prices = _prices()
+    prices.iloc[:120, 1] = np.nan                       # BBB는 120번째 날 상장
+    engine = BacktestEngine(prices)
+    fast, slow = engine.moving_average(10), engine.moving_average(40)
+    assert np.isnan(slow[:120 + 39, 1]).all() and np.isfinite(slow[120 + 39:, 1]).all()
+    expected = prices['BBB'].rolling(40).mean().to_numpy()
+    np.testing.assert_allclose(slow[:, 1], expected, rtol=1e-12)
+    np.testing.assert_allclose(fast[:, 0], prices['AAA'].rolling(10).mean().to_numpy(), rtol=1e-12)
+
+    weights = STRATEGIES['ma_crossover'](engine, fast=10, slow=40)
+    assert (weights[:120 + 39, 1] == 0).all()
+    active = (fast > slow) & np.isfinite(slow)
+    np.testing.assert_allclose(weights.sum(axis=1), active.any(axis=1).astype(float))
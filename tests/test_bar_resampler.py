@@ -0,0 +1,63 @@
+"""
+벡터화 리샘플러 vs pandas groupby/resample, 빈도 추정
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_resampler import MARKET_TZ, infer_periods_per_year, resample_bars, split_frames
+
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def _minute_bars(tickers=('MSFT', 'AAPL'), days=3, seed=0):
+    """정규장(09:30~16:00 현지) 분봉, 일부 분은 빠짐 (긴 형식, ts = UTC epoch 초)"""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range('2024-03-07', periods=days)   # 일광절약시간 전환(3/10) 포함
+    frames = []
+    for ticker in tickers:
+        local = pd.DatetimeIndex(np.concatenate([
+            pd.date_range(day + pd.Timedelta('9h30min'), periods=390, freq='min') for day in sessions]))
+        local = local[rng.random(len(local)) > 0.1]
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(local))))
+        frames.append(pd.DataFrame({
+            'ticker': ticker,
+            'ts': local.tz_localize(MARKET_TZ).tz_convert('UTC').tz_localize(None).as_unit('s').asi8,
+            'Open': close * (1 + rng.normal(0, 2e-4, len(local))),
+            'High': close * 1.001,
+            'Low': close * 0.999,
+            'Close': close,
+            'Volume': rng.integers(100, 1000, len(local)).astype(float),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _pandas_resample(bars, rule, offset=None):
+    expected = {}
+    for ticker, group in bars.groupby('ticker'):
+        local = pd.to_datetime(group['ts'], unit='s').dt.tz_localize('UTC').dt.tz_convert(MARKET_TZ).dt.tz_localize(None)
+        frame = group[list(AGG)].set_axis(pd.DatetimeIndex(local, name='Date'))
+        expected[ticker] = frame.resample(rule, offset=offset).agg(AGG).dropna(subset=['Open'])
+    return expected
+
+
+@pytest.mark.parametrize('interval, rule, offset', [('5m', '5min', None), ('1h', '1h', '30m'), ('1d', '1D', None)])
+def test_matches_pandas_resample(interval, rule, offset):
+    bars = _minute_bars()
+    expected = _pandas_resample(bars, rule, offset and offset.replace('m', 'min'))
+    # 입력 순서와 무관 (정렬되지 않은 입력은 내부에서 정렬)
+    shuffled = bars.sample(frac=1.0, random_state=0)
+    result = split_frames(resample_bars(shuffled, interval, offset=offset or 0))
+
+    assert sorted(result) == sorted(expected)
+    for ticker, frame in result.items():
+        pd.testing.assert_frame_equal(frame, expected[ticker], check_names=False, check_freq=False,
+                                      check_index_type=False)
+
+
+def test_infer_periods_per_year():
+    assert infer_periods_per_year(pd.bdate_range('2024-01-01', periods=50)) == 252
+    five_minutes = pd.date_range('2024-01-02 09:30', periods=200, freq='5min')
+    assert infer_periods_per_year(five_minutes) == pytest.approx(252 * 390 / 5)
+    assert infer_periods_per_year(pd.DatetimeIndex(['2024-01-02'])) == 252
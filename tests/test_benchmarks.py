@@ -0,0 +1,67 @@
+"""
+벤치마크 도구: 합성 데이터셋 재현성, 실행 결과 저장 형식, compare의 회귀 판정
+"""
+
+import json
+import sqlite3
+
+import pandas as pd
+
+import datasets
+import run_benchmarks
+
+
+def test_datasets_are_deterministic(tmp_path):
+    pd.testing.assert_frame_equal(datasets.ohlcv(500, seed=3), datasets.ohlcv(500, seed=3))
+    assert not datasets.ohlcv(500, seed=3)['Close'].equals(datasets.ohlcv(500, seed=4)['Close'])
+    bars = datasets.ohlcv(500)
+    assert (bars['High'] >= bars[['Open', 'Close']].max(axis=1)).all()
+    assert (bars['Low'] <= bars[['Open', 'Close']].min(axis=1)).all()
+
+    path, tickers = datasets.build_database(str(tmp_path / 'bench.db'), 3, 200)
+    conn = sqlite3.connect(path)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        stored = pd.read_sql_query(f'SELECT * FROM "{tickers[1]}_daily"', conn)
+    finally:
+        conn.close()
+    assert tables == {f'{t}_daily' for t in tickers + ['SPY']}
+    pd.testing.assert_frame_equal(stored, datasets.ohlcv(200, seed=1))
+
+
+def test_run_suite_and_save(tmp_path, monkeypatch):
+    results = run_benchmarks.run_suite(name_filter='db.read_dataframe', repeat=2, workdir=str(tmp_path))
+    assert set(results) == {'db.read_dataframe[1000 bars]', 'db.read_dataframe[10000 bars]'}
+    for stats in results.values():
+        assert 0 < stats['min'] <= stats['median'] and stats['repeat'] == 2
+
+    monkeypatch.setattr(run_benchmarks, 'RESULTS_DIR', str(tmp_path / 'results'))
+    path = run_benchmarks.save_results(results, {'commit': 'abc1234'})
+    assert run_benchmarks.history() == [path]
+    with open(path) as f:
+        assert json.load(f)['results'] == results
+
+
+def _write_run(path, results, machine='x86_64'):
+    with open(path, 'w') as f:
+        json.dump({'environment': {'commit': path.stem, 'machine': machine, 'cpu_count': 8},
+                   'results': results}, f)
+    return str(path)
+
+
+def test_compare_flags_regressions(tmp_path):
+    base = _write_run(tmp_path / 'base.json', {
+        'a': {'min': 1.0}, 'b': {'min': 1.0}, 'c': {'min': 1.0}, 'failed': {'error': 'boom'}, 'removed': {'min': 1.0}})
+    head = _write_run(tmp_path / 'head.json', {
+        'a': {'min': 1.05}, 'b': {'min': 1.5}, 'c': {'min': 0.5}, 'failed': {'min': 1.0}, 'added': {'min': 1.0}})
+
+    lines, regressions = run_benchmarks.compare(base, head, threshold=0.1)
+    assert regressions == 1
+    rows = {line.split()[0]: line for line in lines[2:]}
+    assert set(rows) == {'a', 'b', 'c'}
+    assert rows['b'].endswith('REGRESSION') and rows['c'].endswith('improved')
+    assert not rows['a'].rstrip().endswith(('REGRESSION', 'improved'))
+
+    other = _write_run(tmp_path / 'other.json', {'a': {'min': 1.0}}, machine='arm64')
+    lines, _ = run_benchmarks.compare(base, other)
+    assert any('서로 다른 환경' in line for line in lines)
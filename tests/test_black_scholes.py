@@ -0,0 +1,96 @@
+"""
+Black-Scholes 엔진: 해석적 Greeks vs 유한차분, 풋-콜 패리티, 청크 분할 평가, 만기(T = 0)의 극한값
+"""
+
+import numpy as np
+import pytest
+
+from black_scholes import BlackScholesEngine, OUTPUTS, _naive_price
+
+# 내가격/등가격/외가격 × 짧은/긴 만기, 콜과 풋
+STRIKES = np.array([80.0, 100.0, 125.0, 90.0, 110.0])
+MATURITIES = np.array([0.25, 1.0, 2.0, 0.5, 1.5])
+IS_CALL = np.array([True, True, False, False, True])
+BASE = dict(spot=100.0, sigma=0.25, rate=0.03, dividend=0.01)
+
+
+def _price(engine, **shift):
+    inputs = dict(BASE, strike=STRIKES, maturity=MATURITIES, is_call=IS_CALL)
+    inputs.update(shift)
+    return engine.price(**inputs)
+
+
+def _central(engine, name, h, output='price'):
+    """name 입력을 ±h 흔든 중앙차분 (output이 'delta'/'vega'면 그 Greek의 차분)"""
+    values = []
+    for sign in (1, -1):
+        inputs = dict(BASE, strike=STRIKES, maturity=MATURITIES, is_call=IS_CALL)
+        inputs[name] = inputs[name] + sign * h
+        values.append(engine.greeks(outputs=(output,), **inputs)[output])
+    return (values[0] - values[1]) / (2 * h)
+
+
+def test_greeks_match_finite_differences():
+    engine = BlackScholesEngine()
+    greeks = engine.greeks(strike=STRIKES, maturity=MATURITIES, is_call=IS_CALL, **BASE)
+
+    np.testing.assert_allclose(greeks['delta'], _central(engine, 'spot', 1e-3), rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(greeks['vega'], _central(engine, 'sigma', 1e-5), rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(greeks['rho'], _central(engine, 'rate', 1e-5), rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(greeks['epsilon'], _central(engine, 'dividend', 1e-5), rtol=1e-6, atol=1e-8)
+    # theta·charm은 -∂/∂T
+    np.testing.assert_allclose(greeks['theta'], -_central(engine, 'maturity', 1e-5), rtol=1e-5, atol=1e-7)
+    np.testing.assert_allclose(greeks['gamma'], _central(engine, 'spot', 1e-3, 'delta'), rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(greeks['vanna'], _central(engine, 'sigma', 1e-5, 'delta'), rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(greeks['volga'], _central(engine, 'sigma', 1e-5, 'vega'), rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(greeks['charm'], -_central(engine, 'maturity', 1e-5, 'delta'), rtol=1e-5, atol=1e-7)
+
+
+def test_put_call_parity():
+    engine = BlackScholesEngine()
+    call = _price(engine, is_call=True)
+    put = _price(engine, is_call=False)
+    forward = (BASE['spot'] * np.exp(-BASE['dividend'] * MATURITIES)
+               - STRIKES * np.exp(-BASE['rate'] * MATURITIES))
+    np.testing.assert_allclose(call - put, forward, atol=1e-10)
+
+
+def test_chunked_evaluation_matches_naive_formula():
+    rng = np.random.default_rng(1)
+    n = 1000
+    strike = rng.uniform(50, 150, n)
+    maturity = rng.uniform(0.01, 3.0, n)
+    sigma = rng.uniform(0.05, 0.8, n)
+    is_call = rng.random(n) < 0.5
+    # 청크 경계가 배열 중간에 오도록 작은 청크 크기 사용
+    engine = BlackScholesEngine(chunk_size=97)
+    price = engine.price(strike, maturity, spot=100.0, sigma=sigma, rate=0.03, dividend=0.01, is_call=is_call)
+    expected = _naive_price(100.0, strike, maturity, sigma, 0.03, 0.01, is_call)
+    np.testing.assert_allclose(price, expected, rtol=1e-10, atol=1e-10)
+
+
+def test_expiry_returns_limiting_values():
+    engine = BlackScholesEngine(**BASE)
+    S, r, q = BASE['spot'], BASE['rate'], BASE['dividend']
+    strike = np.array([80.0, 125.0, 125.0, 80.0, 100.0])
+    is_call = np.array([True, True, False, False, True])      # 내가격 콜, 외가격 콜, 내가격 풋, 외가격 풋, 등가격
+    omega = np.where(is_call, 1.0, -1.0)
+    in_the_money = omega * (S - strike) > 0
+
+    for maturity in (0.0, np.zeros(len(strike))):
+        greeks = engine.greeks(strike, maturity, is_call=is_call)
+        for name in OUTPUTS:
+            assert np.all(np.isfinite(greeks[name])), name
+        otm_or_itm = slice(0, 4)
+        np.testing.assert_allclose(greeks['price'], np.maximum(omega * (S - strike), 0.0), atol=1e-6)
+        np.testing.assert_allclose(greeks['delta'][otm_or_itm], (omega * in_the_money)[otm_or_itm])
+        np.testing.assert_allclose(greeks['theta'][otm_or_itm],
+                                   (omega * (q * S - r * strike) * in_the_money)[otm_or_itm], atol=1e-12)
+        np.testing.assert_allclose(greeks['charm'][otm_or_itm], (omega * q * in_the_money)[otm_or_itm], atol=1e-12)
+        for name in ('gamma', 'vega', 'vanna', 'volga', 'veta', 'vera'):
+            np.testing.assert_allclose(greeks[name][otm_or_itm], 0.0, atol=1e-12)
+        assert greeks['delta'][4] == pytest.approx(0.5) and greeks['theta'][4] < 0
+
+    # 만기 직전과 이어짐 (theta는 보유비용으로 수렴)
+    near = engine.greeks(strike[:4], 1e-6, is_call=is_call[:4])
+    np.testing.assert_allclose(near['theta'], (omega * (q * S - r * strike) * in_the_money)[:4], rtol=1e-4, atol=1e-9)
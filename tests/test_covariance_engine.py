@@ -0,0 +1,123 @@
+"""
+증분 공분산 엔진 vs 직접 계산 (EWMA 재귀, 이동창 표본 공분산, 결측치가 있으면 쌍별 관측치)
+/api/correlation 엔진 캐시: 종목 스탬프가 그대로면 재사용, 새 bar는 증분 갱신, 과거 수정은 재적합
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import TICKERS as DB_TICKERS, execute, make_bars, write_bars
+from covariance_engine import IncrementalCovariance
+
+TICKERS = ['A', 'B', 'C', 'D']
+
+
+def _returns(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    mixing = rng.normal(size=(len(TICKERS), len(TICKERS)))
+    values = rng.standard_normal((n, len(TICKERS))) @ mixing * 0.01
+    return pd.DataFrame(values, index=pd.bdate_range('2021-01-04', periods=n), columns=TICKERS)
+
+
+def _ewma_direct(values, decay, seed):
+    """IncrementalCovariance.fit과 같은 초기화(처음 seed개 표본 공분산) 후 전체 행렬로 재귀"""
+    head = values[:seed]
+    mean = head.mean(axis=0)
+    cov = np.cov(head, rowvar=False)
+    for x in values[seed:]:
+        d = x - mean
+        cov = decay * cov + decay * (1 - decay) * np.outer(d, d)
+        mean = decay * mean + (1 - decay) * x
+    return cov
+
+
+def test_ewma_matches_direct_recursion():
+    returns = _returns()
+    engine = IncrementalCovariance(TICKERS, method='ewma', decay=0.94).fit(returns.iloc[:300], min_periods=20)
+    for date, row in returns.iloc[300:].iterrows():
+        engine.update(row.to_numpy(), date)
+
+    expected = _ewma_direct(returns.to_numpy(), 0.94, 20)
+    np.testing.assert_allclose(engine.covariance(), expected, rtol=1e-10, atol=1e-16)
+    np.testing.assert_allclose(engine.volatility(252), np.sqrt(np.diag(expected) * 252), rtol=1e-10)
+    assert engine.n_obs == len(returns)
+    assert engine.last_date == returns.index[-1]
+
+
+def test_rolling_matches_window_sample_covariance():
+    returns = _returns(seed=1)
+    window = 60
+    engine = IncrementalCovariance(TICKERS, method='rolling', window=window).fit(returns.iloc[:100])
+    # 창 크기의 몇 배를 지나도록 갱신 (주기적 재계산 경계 포함)
+    for date, row in returns.iloc[100:].iterrows():
+        engine.update(row.to_numpy(), date)
+
+    tail = returns.iloc[-window:]
+    np.testing.assert_allclose(engine.covariance(), tail.cov().to_numpy(), rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(engine.correlation(), tail.corr().to_numpy(), atol=1e-9)
+
+
+def test_rolling_uses_pairwise_observations():
+    returns = _returns(seed=2)
+    returns.iloc[:150, 1] = np.nan           # B는 150번째 날 상장
+    returns.iloc[200:205, 2] = np.nan        # C는 며칠 결측
+    window = 60
+    engine = IncrementalCovariance(TICKERS, method='rolling', window=window).fit(returns.iloc[:120])
+    tail = returns.iloc[:120].iloc[-window:]
+    np.testing.assert_allclose(engine.covariance(), tail.cov().to_numpy(), rtol=1e-9, atol=1e-15)
+
+    for end, (date, row) in enumerate(returns.iloc[120:].iterrows(), start=121):
+        engine.update(row.to_numpy(), date)
+        if end in (151, 160, 205, 240, 266, 400):   # 상장 직후, 결측 구간, 결측치가 창을 벗어난 뒤
+            tail = returns.iloc[end - window:end]
+            expected = tail.cov().to_numpy()
+            np.testing.assert_array_equal(np.isnan(engine.covariance()), np.isnan(expected))
+            np.testing.assert_allclose(engine.covariance(), expected, rtol=1e-9, atol=1e-15)
+            np.testing.assert_allclose(engine.correlation(), tail.corr().to_numpy(), atol=1e-9)
+    assert engine._pairwise is None          # 창에 결측치가 없으면 쌍별 합을 버림
+
+
+def test_correlation_engine_cache_keyed_on_table_stamps(market_db, monkeypatch):
+    pytest.importorskip('flask')
+    import server
+    import http_cache
+    from market_data_store import MarketDataStore
+
+    store = MarketDataStore(market_db)
+    monkeypatch.setattr(server, 'market_store', store)
+    monkeypatch.setattr(server, 'scheduler', None)
+    monkeypatch.setattr(server, '_covariance_engines', OrderedDict())
+    client = server.app.test_client()
+
+    def correlation():
+        http_cache.response_cache.clear()
+        response = client.get('/api/correlation?order=none')
+        assert response.status_code == 200, response.get_json()
+        engine, = [entry[0] for entry in server._covariance_engines.values()]
+        return response.get_json(), engine
+
+    try:
+        body, engine = correlation()
+        history_digest = server._history_digest
+
+        def unexpected(returns):
+            raise AssertionError('history hashed although no ticker table changed')
+        monkeypatch.setattr(server, '_history_digest', unexpected)
+        execute(market_db, 'CREATE TABLE analytics_results (x)')      # 종목 외 커밋
+        assert correlation()[1] is engine
+
+        monkeypatch.setattr(server, '_history_digest', history_digest)
+        for i, ticker in enumerate(DB_TICKERS):                        # 새 bar 하나 → 증분 갱신
+            write_bars(market_db, ticker, make_bars(301, seed=i))
+        appended, same = correlation()
+        assert same is engine and appended['observations'] == body['observations'] + 1
+
+        execute(market_db, 'UPDATE "AAA_daily" SET Close = Close * 1.1 WHERE rowid = 290')  # 과거 수정 → 재적합
+        revised, refit = correlation()
+        assert refit is not engine and revised['matrix'] != appended['matrix']
+    finally:
+        http_cache.response_cache.clear()
+        store.close()
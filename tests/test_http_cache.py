@@ -0,0 +1,180 @@
+"""
+HTTP 캐싱: ETag/304, Last-Modified, 응답 본문 캐시와 압축본 재사용
+무효화: DB에 기록하면 다음 조건부 GET은 304가 아니라 새 본문이어야 함
+"""
+
+import gzip
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from conftest import execute, make_bars, write_bars
+
+flask = pytest.importorskip('flask')
+
+from http_cache import ResponseCache, cached_endpoint, negotiate_encoding  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    state = {'version': 'v1', 'calls': 0, 'size': 4000,
+             'modified': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+    cache = ResponseCache(max_entries=8)
+    app = flask.Flask(__name__)
+
+    @app.route('/data')
+    @cached_endpoint(lambda: (state['version'], state['modified']), cache=cache)
+    def data():
+        state['calls'] += 1
+        return flask.jsonify({'version': state['version'], 'payload': 'x' * state['size']})
+
+    @app.route('/missing')
+    @cached_endpoint(lambda: (state['version'], None), cache=cache)
+    def missing():
+        state['calls'] += 1
+        return flask.jsonify({'error': 'not found'}), 404
+
+    app.state = state
+    return app
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding('gzip, deflate') == 'gzip'
+    assert negotiate_encoding('gzip;q=0') is None
+    assert negotiate_encoding(None) is None
+
+
+def test_etag_round_trip_and_version_change(app):
+    client = app.test_client()
+    first = client.get('/data')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    revalidated = client.get('/data', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304 and revalidated.get_data() == b''
+    # 같은 요청의 200 응답은 캐시된 본문 (뷰 함수는 한 번만 실행)
+    assert client.get('/data').get_data() == first.get_data()
+    assert app.state['calls'] == 1
+
+    app.state['version'] = 'v2'
+    changed = client.get('/data', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert changed.get_json()['version'] == 'v2'
+    # 쿼리 파라미터 순서는 ETag에 영향 없음, 값은 영향 있음
+    assert client.get('/data?a=1&b=2').headers['ETag'] == client.get('/data?b=2&a=1').headers['ETag']
+    assert client.get('/data?a=1').headers['ETag'] != client.get('/data?a=2').headers['ETag']
+
+
+def test_if_modified_since(app):
+    client = app.test_client()
+    last_modified = client.get('/data').headers['Last-Modified']
+    assert client.get('/data', headers={'If-Modified-Since': last_modified}).status_code == 304
+
+
+def test_gzip_variant_is_cached_and_decodes_to_body(app):
+    client = app.test_client()
+    plain = client.get('/data').get_data()
+    encoded = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert encoded.headers['Content-Encoding'] == 'gzip'
+    assert encoded.headers['ETag'] != client.get('/data').headers['ETag']
+    assert gzip.decompress(encoded.get_data()) == plain
+    assert client.get('/data', headers={'Accept-Encoding': 'gzip'}).get_data() == encoded.get_data()
+    assert app.state['calls'] == 1
+
+
+def test_error_responses_are_not_cached(app):
+    client = app.test_client()
+    assert client.get('/missing').status_code == 404
+    assert client.get('/missing').status_code == 404
+    assert app.state['calls'] == 2
+
+
+def test_response_cache_evicts_by_bytes():
+    cache = ResponseCache(max_entries=10, max_bytes=250)
+    for key in 'abc':
+        cache.put(key, b'x' * 100, 'application/json')
+    assert cache.get('a') is None and cache.get('c') is not None
+    assert cache.size == 200
+
+
+
+@pytest.fixture
+def client(market_db, monkeypatch):
+    import server
+    import http_cache
+    from market_data_store import MarketDataStore
+
+    store = MarketDataStore(market_db)
+    monkeypatch.setattr(server, 'DB_PATH', market_db)
+    monkeypatch.setattr(server, 'market_store', store)
+    monkeypatch.setattr(server, 'USE_MATERIALIZED', False)
+    monkeypatch.setattr(server, 'scheduler', None)
+    http_cache.response_cache.clear()
+    yield server.app.test_client()
+    http_cache.response_cache.clear()
+    store.close()
+
+
+def _get(client, path, etag=None):
+    return client.get(path, headers={'If-None-Match': etag} if etag else {})
+
+
+def test_db_write_changes_ticker_etag(client, market_db):
+    path = '/api/ticker/AAA?fields=price_history'
+    first = _get(client, path)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert _get(client, path, etag).status_code == 304
+
+    # 같은 파일에 새 bar 기록 (DatabaseManager로 읽는 엔드포인트 — 저장소 캐시에 없던 종목)
+    bar = make_bars(301, seed=0).iloc[[-1]].assign(Close=123.45)
+    write_bars(market_db, 'AAA', bar, if_exists='append')
+
+    second = _get(client, path, etag)
+    assert second.status_code == 200
+    assert second.headers['ETag'] != etag
+    assert second.get_json()['data']['price_history']['prices'][-1] == 123.45
+
+
+def test_db_revision_changes_ticker_etag(client, market_db):
+    path = '/api/ticker/AAA?fields=price_history'
+    first = _get(client, path)
+    # 행 수/마지막 날짜/종가 합이 그대로인 수정 (과거 종가 두 개 맞바꿈)
+    execute(market_db, 'UPDATE "AAA_daily" SET Close = CASE rowid WHEN 10 THEN (SELECT Close FROM "AAA_daily" WHERE rowid = 11) '
+                       'ELSE (SELECT Close FROM "AAA_daily" WHERE rowid = 10) END WHERE rowid IN (10, 11)')
+    second = _get(client, path, first.headers['ETag'])
+    assert second.status_code == 200
+    assert second.get_json()['data']['price_history']['prices'] != first.get_json()['data']['price_history']['prices']
+
+
+def test_unrelated_commit_keeps_ticker_etag(client, market_db):
+    path = '/api/ticker/AAA?fields=price_history'
+    etag = _get(client, path).headers['ETag']
+    execute(market_db, 'CREATE TABLE analytics_results (x)')
+    write_bars(market_db, 'BBB', make_bars(10, seed=9), if_exists='replace')
+    assert _get(client, path, etag).status_code == 304
+
+
+def test_market_version_changes_on_any_commit(client, market_db):
+    path = '/api/correlation?order=none'
+    first = _get(client, path)
+    assert first.status_code == 200
+    assert _get(client, path, first.headers['ETag']).status_code == 304
+
+    write_bars(market_db, 'BBB', make_bars(300, seed=42))
+    second = _get(client, path, first.headers['ETag'])
+    assert second.status_code == 200
+    assert second.get_json()['matrix'] != first.get_json()['matrix']
+
+
+def test_cached_body_not_reused_after_write(client, market_db):
+    """If-None-Match 없이 다시 요청해도 응답 캐시의 옛 본문을 돌려주지 않음"""
+    path = '/api/volatility/AAA'
+    first = client.get(path).get_json()
+    bars = make_bars(300, seed=0)
+    bars.loc[bars.index[-20:], 'Close'] *= pd.Series([1.05, 0.95] * 10, index=bars.index[-20:])
+    write_bars(market_db, 'AAA', bars)
+    second = client.get(path).get_json()
+    assert second['volatility']['current_volatility'] != first['volatility']['current_volatility']
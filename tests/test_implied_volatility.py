@@ -0,0 +1,26 @@
+"""
+내재변동성 풀이기: 가격 → σ 왕복
+"""
+
+import numpy as np
+
+from black_scholes import BlackScholesEngine
+from implied_volatility import ImpliedVolatilitySolver, STATUS_CONVERGED
+
+
+def test_implied_volatility_round_trip():
+    rng = np.random.default_rng(0)
+    n = 2000
+    strike = rng.uniform(60, 150, n)
+    maturity = rng.uniform(0.05, 3.0, n)
+    sigma = rng.uniform(0.05, 1.2, n)
+    is_call = rng.random(n) < 0.5
+    engine = BlackScholesEngine()
+    price = engine.price(strike, maturity, spot=100.0, sigma=sigma, rate=0.02, dividend=0.01, is_call=is_call)
+
+    result = ImpliedVolatilitySolver(engine).solve(price, strike, maturity, 100.0, 0.02, 0.01, is_call)
+    # 시간가치가 부동소수점 정밀도보다 작은 계약은 σ를 복원할 수 없으므로 제외
+    vega = engine.greeks(strike, maturity, 100.0, sigma, 0.02, 0.01, is_call, outputs=('vega',))['vega']
+    identifiable = vega > 1e-6
+    assert (result['status'][identifiable] == STATUS_CONVERGED).all()
+    np.testing.assert_allclose(result['iv'][identifiable], sigma[identifiable], rtol=1e-6)
@@ -0,0 +1,20 @@
+"""
+지연 임포트: 진입 모듈을 새 인터프리터에서 임포트해도 무거운 의존성이 로드되지 않음
+(시간 예산은 머신마다 다르므로 여기서는 금지 모듈 검사만 — scale을 크게 잡음)
+"""
+
+import pytest
+
+import import_budget
+
+
+@pytest.mark.parametrize('target', sorted(import_budget.TARGETS))
+def test_no_heavy_modules_at_import(target):
+    assert import_budget.check(target, repeat=1, scale=100.0) == []
+
+
+def test_heavy_module_is_detected():
+    _, modules = import_budget.measure_import('scipy.stats')
+    assert any(name.startswith('scipy.stats.') for name in modules)
+    with pytest.raises(RuntimeError):
+        import_budget.measure_import('no_such_module_for_budget')
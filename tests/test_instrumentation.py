@@ -0,0 +1,55 @@
+"""
+계측: 히스토그램 버킷/합계, drain → merge 합산, Prometheus 텍스트 형식과 /metrics
+"""
+
+import pytest
+
+from instrumentation import MetricsRegistry, STAGE_METRIC, stage
+
+
+def _sample_lines(text, prefix):
+    return {line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+            for line in text.splitlines() if line.startswith(prefix) and not line.startswith('#')}
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 5.0):
+        registry.observe(STAGE_METRIC, seconds, stage='db_read')
+    lines = _sample_lines(registry.render(), STAGE_METRIC)
+
+    key = STAGE_METRIC + '_bucket{stage="db_read",le='
+    assert [lines[key + f'"{le}"}}'] for le in ('0.01', '0.1', '1.0', '+Inf')] == [1, 3, 4, 5]
+    assert lines[STAGE_METRIC + '_count{stage="db_read"}'] == 5
+    assert lines[STAGE_METRIC + '_sum{stage="db_read"}'] == pytest.approx(5.605)
+
+
+def test_drain_and_merge_add_up():
+    worker, parent = MetricsRegistry(), MetricsRegistry()
+    with stage('analyze', registry=worker):
+        pass
+    worker.inc('cache_requests_total', cache='http', result='hit')
+    parent.inc('cache_requests_total', cache='http', result='hit', value=2)
+
+    data = worker.drain()
+    assert worker.drain() == {'histograms': {}, 'counters': {}}
+    parent.merge(data)
+    parent.merge(None)
+
+    lines = _sample_lines(parent.render(), '')
+    assert lines['cache_requests_total{cache="http",result="hit"}'] == 3
+    assert lines[STAGE_METRIC + '_count{stage="analyze"}'] == 1
+
+
+def test_metrics_endpoint(market_db, monkeypatch):
+    pytest.importorskip('flask')
+    import server
+    monkeypatch.setattr(server, 'DB_PATH', market_db)
+
+    client = server.app.test_client()
+    client.get('/api/tickers')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in text
@@ -0,0 +1,61 @@
+"""
+공용 시장 데이터 저장소: 한 번 읽은 종목은 캐시, DB가 바뀌면 바뀐 종목만 다시 읽음
+"""
+
+import pandas as pd
+import pytest
+
+from conftest import TICKERS, execute, make_bars, write_bars
+from market_data_store import MarketDataStore
+
+
+@pytest.fixture
+def store(market_db):
+    store = MarketDataStore(market_db)
+    yield store
+    store.close()
+
+
+def test_get_returns_sorted_date_indexed_frame(store):
+    assert store.tickers() == sorted(TICKERS)
+    df = store.get('AAA')
+    assert isinstance(df.index, pd.DatetimeIndex) and df.index.is_monotonic_increasing
+    assert len(df) == 300
+    expected = make_bars(300, seed=0)
+    assert df['Close'].to_numpy().tolist() == pytest.approx(expected['Close'].tolist())
+    assert store.get('ZZZ') is None
+
+
+def test_unchanged_db_keeps_cache(store, market_db):
+    first = store.get('AAA')
+    version, _ = store.changes_since(0)
+    assert store.changes_since(version) == (version, set())
+    # 종목 테이블과 무관한 커밋은 캐시를 무효화하지 않음
+    execute(market_db, 'CREATE TABLE notes (x)')
+    assert store.changes_since(version) == (version, set())
+    assert store.get('AAA')['Close'].equals(first['Close'])
+
+
+def test_only_changed_ticker_is_reloaded(store, market_db):
+    store.frames()
+    version, _ = store.changes_since(0)
+    bars = make_bars(301, seed=1)
+    write_bars(market_db, 'BBB', bars)
+
+    assert store.changes_since(version) == (version + 1, {'BBB'})
+    assert len(store.get('BBB')) == 301
+    assert len(store.get('AAA')) == 300
+
+    write_bars(market_db, 'CCC', make_bars(50, seed=7))
+    execute(market_db, 'DROP TABLE "AAA_daily"')
+    assert store.changes_since(version + 1) == (version + 2, {'AAA', 'CCC'})
+    assert store.tickers() == ['BBB', 'CCC', 'SPY']
+    assert store.get('AAA') is None
+
+
+def test_panel_aligns_common_dates(store, market_db):
+    write_bars(market_db, 'CCC', make_bars(100, seed=7, start='2022-06-01'))
+    panel = store.panel(['AAA', 'CCC'])
+    assert list(panel.columns) == ['AAA', 'CCC']
+    assert len(panel) == panel.dropna().shape[0]
+    assert panel.index[0] == pd.Timestamp('2022-06-01')
@@ -0,0 +1,26 @@
+"""
+몬테카를로 엔진: GBM 가격 vs Black-Scholes 해석해, 시드 재현성
+"""
+
+import pytest
+
+from black_scholes import BlackScholesEngine
+from monte_carlo import GBMModel, MonteCarloEngine
+
+
+@pytest.mark.parametrize('n_steps, antithetic', [(1, True), (16, False)])
+def test_monte_carlo_gbm_matches_black_scholes(n_steps, antithetic):
+    spot, strike, maturity, rate, sigma = 100.0, 105.0, 1.0, 0.04, 0.2
+    exact = float(BlackScholesEngine().price(strike, maturity, spot=spot, sigma=sigma, rate=rate))
+    engine = MonteCarloEngine(GBMModel(sigma), spot=spot, rate=rate, antithetic=antithetic,
+                              control_variate=False, max_workers=1, seed=7)
+    result = engine.price(strike, maturity, n_steps=n_steps, max_paths=200_000)
+    assert abs(result['price'] - exact) < 4 * result['std_error']
+    assert result['std_error'] < 0.05
+
+
+def test_monte_carlo_seed_is_reproducible():
+    model = GBMModel(0.3)
+    first = MonteCarloEngine(model, spot=100.0, max_workers=1, seed=3).price(100.0, 0.5, payoff='asian', max_paths=50_000)
+    second = MonteCarloEngine(model, spot=100.0, max_workers=1, seed=3).price(100.0, 0.5, payoff='asian', max_paths=50_000)
+    assert first['price'] == second['price']
@@ -0,0 +1,230 @@
+"""
+평균-분산 최적화: 효율적 투자선 각 지점의 KKT 조건, 회전율 제약 해의 KKT 조건과 일반 QP 풀이(SLSQP) 비교,
+ADMM 대체 경로(정확 투영, 미수렴 시 None), /api/efficient-frontier 회전율 파라미터
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import TICKERS
+from optimizer import ADMMQPSolver, PortfolioOptimizer, QPSolver
+
+TOL = 1e-10
+
+
+def _problem(n=12, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers = [f'T{i:02d}' for i in range(n)]
+    loadings = rng.normal(size=(n, 3)) * 0.15
+    cov = loadings @ loadings.T + np.diag(rng.uniform(0.01, 0.06, n))
+    mu = rng.uniform(0.02, 0.15, n)
+    return pd.Series(mu, index=tickers), pd.DataFrame(cov, index=tickers, columns=tickers)
+
+
+def _weights(result, tickers):
+    return np.array([result['weights'][t] for t in tickers])
+
+
+def assert_kkt(P, q, lower, upper, x, tol=TOL):
+    """min ½xᵀPx - qᵀx s.t. 1ᵀx = 1, lower ≤ x ≤ upper 의 KKT 조건"""
+    assert abs(x.sum() - 1) < tol
+    assert np.all(x >= lower - tol) and np.all(x <= upper + tol)
+    g = P @ x - q
+    at_lower, at_upper = x <= lower + 1e-9, x >= upper - 1e-9
+    free = ~(at_lower | at_upper)
+    # 등식 제약 승수 ν: 자유 종목은 g_i + ν = 0, 하한 종목은 g_i + ν ≥ 0, 상한 종목은 g_i + ν ≤ 0
+    scale = tol * (1 + np.abs(g).max())
+    nu_lo = (-g[at_lower]).max() if at_lower.any() else -np.inf
+    nu_hi = (-g[at_upper]).min() if at_upper.any() else np.inf
+    if free.any():
+        nu = -g[free].mean()
+        np.testing.assert_allclose(g[free] + nu, 0.0, atol=scale)
+        nu_lo, nu_hi = min(nu_lo, nu), max(nu_hi, nu)
+        assert nu_lo <= nu + scale and nu <= nu_hi + scale
+    assert nu_lo <= nu_hi + scale
+
+
+@pytest.mark.parametrize('upper', [1.0, 0.2])
+def test_frontier_points_satisfy_kkt(upper):
+    mu, cov = _problem()
+    optimizer = PortfolioOptimizer(mu, cov, upper=upper)
+    frontier = optimizer.efficient_frontier(n_points=25, include_weights=True)
+    lower, upper_bounds = optimizer.lower, optimizer.upper
+    for point in frontier:
+        w = _weights(point, optimizer.tickers)
+        assert_kkt(optimizer.cov, point['risk_tolerance'] * optimizer.mu, lower, upper_bounds, w)
+
+    returns = [p['expected_return'] for p in frontier]
+    volatilities = [p['volatility'] for p in frontier]
+    assert np.all(np.diff(returns) >= -1e-10) and np.all(np.diff(volatilities) >= -1e-10)
+    assert frontier[0]['volatility'] == pytest.approx(optimizer.min_variance()['volatility'], rel=1e-9)
+
+
+def test_max_sharpe_beats_frontier():
+    mu, cov = _problem(seed=1)
+    optimizer = PortfolioOptimizer(mu, cov, risk_free_rate=0.02)
+    best = optimizer.max_sharpe()
+    assert sum(best['weights'].values()) == pytest.approx(1.0)
+    frontier = optimizer.efficient_frontier(n_points=200)
+    assert best['sharpe_ratio'] >= max(p['sharpe_ratio'] for p in frontier) - 1e-9
+
+
+def test_risk_parity_equalises_contributions():
+    mu, cov = _problem(seed=2)
+    result = PortfolioOptimizer(mu, cov).risk_parity()
+    contributions = np.array(list(result['risk_contributions'].values()))
+    np.testing.assert_allclose(contributions, 1.0 / len(contributions), atol=1e-8)
+
+
+def _reference_turnover_qp(P, q, upper, prev, max_turnover):
+    """w와 보조변수 t(|w - w_prev| ≤ t, Σt ≤ τ)로 선형 제약화한 같은 문제를 SLSQP로 풀기"""
+    optimize = pytest.importorskip('scipy.optimize')
+    n = len(q)
+
+    def objective(v):
+        w = v[:n]
+        return 0.5 * w @ P @ w - q @ w
+
+    def gradient(v):
+        return np.concatenate([P @ v[:n] - q, np.zeros(n)])
+
+    constraints = [
+        {'type': 'eq', 'fun': lambda v: v[:n].sum() - 1, 'jac': lambda v: np.r_[np.ones(n), np.zeros(n)]},
+        {'type': 'ineq', 'fun': lambda v: v[n:] - (v[:n] - prev), 'jac': lambda v: np.hstack([-np.eye(n), np.eye(n)])},
+        {'type': 'ineq', 'fun': lambda v: v[n:] + (v[:n] - prev), 'jac': lambda v: np.hstack([np.eye(n), np.eye(n)])},
+        {'type': 'ineq', 'fun': lambda v: max_turnover - v[n:].sum(), 'jac': lambda v: np.r_[np.zeros(n), -np.ones(n)]},
+    ]
+    start = np.concatenate([prev, np.zeros(n)])
+    result = optimize.minimize(objective, start, jac=gradient, method='SLSQP', constraints=constraints,
+                               bounds=[(0.0, upper)] * n + [(0.0, None)] * n,
+                               options={'ftol': 1e-14, 'maxiter': 1000})
+    w = result.x[:n]
+    assert abs(w.sum() - 1) < 1e-8 and np.abs(w - prev).sum() <= max_turnover + 1e-8
+    return w
+
+
+def assert_turnover_kkt(P, q, upper, prev, max_turnover, x, tol=1e-9):
+    """min ½xᵀPx - qᵀx s.t. 1ᵀx = 1, 0 ≤ x ≤ upper, ‖x - prev‖₁ ≤ τ 의 KKT 조건 (r = Px - q + ν)"""
+    assert abs(x.sum() - 1) < tol and np.all(x >= -tol) and np.all(x <= upper + tol)
+    turnover = np.abs(x - prev).sum()
+    assert turnover <= max_turnover + tol
+
+    g = P @ x - q
+    at_lower, at_upper, at_prev = x <= 1e-12, x >= upper - 1e-12, np.abs(x - prev) <= 1e-12
+    free = ~(at_lower | at_upper | at_prev)
+    s = np.sign(x - prev)
+    # 자유 종목: g_i + ν + κ·s_i = 0 → (ν, κ) 최소제곱
+    if abs(turnover - max_turnover) < tol:
+        basis = np.column_stack([np.ones(free.sum()), s[free]])
+        (nu, kappa), *_ = np.linalg.lstsq(basis, -g[free], rcond=None)
+    else:
+        nu, kappa = -g[free].mean(), 0.0
+    r = g + nu
+    scale = tol * (1 + np.abs(g).max())
+    assert kappa >= -scale
+    np.testing.assert_allclose(r[free] + kappa * s[free], 0.0, atol=scale)
+    assert np.all(np.abs(r[at_prev & ~at_lower & ~at_upper]) <= kappa + scale)
+    # 경계에서 벗어나는 방향의 방향 미분 ≥ 0 (직전 비중 쪽으로 움직이면 회전율 감소)
+    lower_only = at_lower & ~at_prev
+    assert np.all(r[lower_only] - kappa * (prev[lower_only] > 0) + kappa * (prev[lower_only] <= 0) >= -scale)
+    upper_only = at_upper & ~at_prev
+    assert np.all(-r[upper_only] - kappa >= -scale)
+
+
+@pytest.mark.parametrize('max_turnover', [0.1, 0.4])
+def test_turnover_constrained_frontier_matches_reference_qp(max_turnover):
+    mu, cov = _problem(n=8, seed=3)
+    prev = pd.Series(1.0 / len(mu), index=mu.index)
+    optimizer = PortfolioOptimizer(mu, cov, upper=0.5, prev_weights=prev, max_turnover=max_turnover)
+    frontier = optimizer.efficient_frontier(n_points=8, include_weights=True)
+
+    P, prev_w = optimizer.cov, prev.to_numpy()
+    for point in frontier:
+        q = point['risk_tolerance'] * optimizer.mu
+        w = _weights(point, optimizer.tickers)
+        assert_turnover_kkt(P, q, 0.5, prev_w, max_turnover, w)
+
+        reference = _reference_turnover_qp(P, q, 0.5, prev_w, max_turnover)
+        reference_objective = 0.5 * reference @ P @ reference - q @ reference
+        # SLSQP 참조해는 제약을 ~1e-12까지만 만족하므로 목적함수 비교는 그 오차만큼 여유
+        assert 0.5 * w @ P @ w - q @ w <= reference_objective + 1e-9 * (1 + abs(reference_objective))
+        np.testing.assert_allclose(w, reference, atol=1e-6)
+
+
+def test_turnover_frontier_is_exact_without_admm():
+    mu, cov = _problem(n=150, seed=5)
+    rng = np.random.default_rng(5)
+    prev = rng.dirichlet(np.ones(len(mu)))
+    optimizer = PortfolioOptimizer(mu, cov, upper=0.05, prev_weights=prev, max_turnover=0.3)
+    solver = optimizer._new_solver()
+    for lam in optimizer._lambda_grid(40):
+        w = solver.solve(lam * optimizer.mu)
+        assert_turnover_kkt(optimizer.cov, lam * optimizer.mu, 0.05, prev, 0.3, w)
+    assert solver.admm is None  # 모든 지점을 active set으로 정확히 풂 (느린 ADMM 대체 경로 없음)
+
+
+def test_admm_fallback_projection_and_convergence():
+    mu, cov = _problem(n=10, seed=4)
+    n = len(mu)
+    prev, lower, upper = np.full(n, 1.0 / n), np.zeros(n), np.full(n, 0.3)
+    admm = ADMMQPSolver(cov.to_numpy(), np.ones(n), lower, upper, prev, 0.2)
+
+    # 정렬 기반 투영: 볼록 집합 C로의 투영 z는 모든 y ∈ C에 대해 (v - z)ᵀ(y - z) ≤ 0
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        v = prev + rng.normal(0, 0.2, n)
+        z = admm._project(v)
+        assert np.all(z >= lower) and np.all(z <= upper) and np.abs(z - prev).sum() <= 0.2 + 1e-12
+        for _ in range(50):
+            y = np.clip(prev + rng.normal(0, 0.1, n), lower, upper)
+            y = prev + (y - prev) * min(1.0, 0.2 / max(np.abs(y - prev).sum(), 1e-12))
+            assert (v - z) @ (y - z) <= 1e-12
+
+    q = 0.5 * mu.to_numpy()
+    assert admm.solve(q, max_iter=3) is None  # 수렴하지 않은 근사해는 반환하지 않음
+    x = admm.solve(q, eps_abs=1e-12, eps_rel=1e-12, max_iter=100000)
+    exact = QPSolver(cov.to_numpy(), np.ones(n), lower, upper, prev, 0.2).solve(q)
+    np.testing.assert_allclose(x, exact, atol=1e-8)
+
+
+def test_infeasible_turnover_rejected():
+    mu, cov = _problem(n=4)
+    prev = pd.Series([0.7, 0.1, 0.1, 0.1], index=mu.index)
+    optimizer = PortfolioOptimizer(mu, cov, upper=0.5, prev_weights=prev, max_turnover=0.3)
+    with pytest.raises(ValueError, match='max_turnover'):
+        optimizer.min_variance()  # 상한 0.5 때문에 최소 회전율 0.4 필요
+
+
+def test_efficient_frontier_endpoint_turnover(market_db, monkeypatch):
+    pytest.importorskip('flask')
+    import server
+    import http_cache
+    from market_data_store import MarketDataStore
+    store = MarketDataStore(market_db)
+    monkeypatch.setattr(server, 'market_store', store)
+    http_cache.response_cache.clear()
+    client = server.app.test_client()
+
+    url = f"/api/efficient-frontier?points=10&include_weights=1&tickers={','.join(TICKERS)}"
+    response = client.get(url + '&prev_weights=AAA:0.5,BBB:0.5&max_turnover=0.2')
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    assert body['max_turnover'] == 0.2
+    prev = {'AAA': 0.5, 'BBB': 0.5, 'SPY': 0.0}
+    for point in body['frontier'] + [body['min_variance'], body['max_sharpe']]:
+        assert sum(abs(w - prev[t]) for t, w in point['weights'].items()) <= 0.2 + 1e-9
+
+    assert client.get(url + '&max_turnover=0.2').status_code == 400             # 기준 비중 없음
+    assert client.get(url + '&prev_weights=AAA=1&max_turnover=0.2').status_code == 400
+    assert client.get(url + '&prev_weights=AAA:1&max_turnover=-1').status_code == 400
+    http_cache.response_cache.clear()
+    store.close()
+
+
+def test_infeasible_bounds_rejected():
+    mu, cov = _problem(n=4)
+    with pytest.raises(ValueError):
+        PortfolioOptimizer(mu, cov, upper=0.2)
+    with pytest.raises(ValueError):
+        PortfolioOptimizer(mu, cov, max_turnover=0.1)
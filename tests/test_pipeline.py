@@ -0,0 +1,65 @@
+"""
+파이프라인 증분 실행과 재개: 최신 작업은 건너뛰고, 실패한 작업만 이어서 실행
+"""
+
+import sqlite3
+
+from conftest import TICKERS, make_bars, write_bars
+from pipeline import Pipeline, RETURNS_TABLE
+
+TARGETS = ['returns']   # validate → returns (inline 단계만, 프로세스 풀 없음)
+
+
+def _run(db_path, force=()):
+    with Pipeline(db_path) as pipeline:
+        return pipeline.run(TARGETS, force=force), pipeline.status()
+
+
+def _returns_rows(db_path, ticker):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM "{RETURNS_TABLE}" WHERE ticker = ?', (ticker,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_second_run_skips_up_to_date_tasks(market_db):
+    summary, _ = _run(market_db)
+    assert summary['validate']['done'] == len(TICKERS)
+    assert summary['returns']['done'] == len(TICKERS)
+
+    summary, _ = _run(market_db)
+    assert summary['validate'] == {**summary['validate'], 'done': 0, 'skipped': len(TICKERS)}
+    assert summary['returns'] == {**summary['returns'], 'done': 0, 'skipped': len(TICKERS)}
+
+    summary, _ = _run(market_db, force=('returns',))
+    assert summary['validate']['skipped'] == len(TICKERS)
+    assert summary['returns']['done'] == len(TICKERS)
+
+
+def test_changed_ticker_is_recomputed(market_db):
+    _run(market_db)
+    write_bars(market_db, 'BBB', make_bars(301, seed=1))
+    summary, _ = _run(market_db)
+    assert summary['returns']['done'] == 1
+    assert summary['returns']['skipped'] == len(TICKERS) - 1
+    assert _returns_rows(market_db, 'BBB') == 300
+
+
+def test_failed_task_resumes_after_fix(market_db):
+    broken = make_bars(300, seed=5)
+    broken.loc[10, 'Close'] = -1.0
+    write_bars(market_db, 'AAA', broken)
+
+    summary, status = _run(market_db)
+    assert summary['validate']['failed'] == 1
+    assert summary['returns']['blocked'] == 1
+    assert 'AAA' in status['validate']['errors']
+    assert _returns_rows(market_db, 'AAA') == 0
+
+    write_bars(market_db, 'AAA', make_bars(300, seed=5))
+    summary, status = _run(market_db)
+    assert summary['validate'] == {**summary['validate'], 'done': 1, 'skipped': len(TICKERS) - 1, 'failed': 0}
+    assert summary['returns'] == {**summary['returns'], 'done': 1, 'skipped': len(TICKERS) - 1}
+    assert status['validate']['errors'] == {}
+    assert _returns_rows(market_db, 'AAA') == 299
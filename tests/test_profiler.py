@@ -0,0 +1,51 @@
+"""
+프로파일러: 샘플링 결과의 collapsed/speedscope 형식, cProfile 저장, 잘못된 모드
+"""
+
+import json
+import time
+
+import pytest
+
+from profiler import profile_call, create_profiler, profile_name
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def test_sampling_profile_formats(tmp_path):
+    result, profiler = profile_call(_busy, 0.1, mode='sample', interval=0.002)
+    assert result > 0
+    assert profiler.weights, '샘플이 하나도 수집되지 않음'
+    assert profiler.elapsed >= 0.1
+
+    collapsed = profiler.collapsed().splitlines()
+    assert any('_busy (test_profiler.py' in line for line in collapsed)
+    assert all(int(line.rsplit(' ', 1)[1]) >= 1 for line in collapsed)
+
+    paths = profiler.save(str(tmp_path), profile_name('busy/loop'))
+    with open(paths[0]) as f:
+        document = json.load(f)
+    profile = document['profiles'][0]
+    assert profile['type'] == 'sampled'
+    assert len(profile['samples']) == len(profile['weights'])
+    frames = document['shared']['frames']
+    assert all(0 <= i < len(frames) for sample in profile['samples'] for i in sample)
+    assert '/' not in paths[0].rsplit('/', 1)[1]
+
+
+def test_cprofile_mode(tmp_path):
+    _, profiler = profile_call(_busy, 0.01, mode='cprofile', repeat=2)
+    assert '_busy' in profiler.summary()
+    paths = profiler.save(str(tmp_path), 'busy')
+    assert [p.rsplit('.', 1)[1] for p in paths] == ['prof', 'txt']
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        create_profiler('perf')
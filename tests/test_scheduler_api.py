@@ -0,0 +1,72 @@
+"""
+사전 계산 모드 API: 계산에 실패한 종목은 503(계산 중)이 아니라 실패 사유와 함께 오류, 첫 요청에서 스케줄러 시작
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip('flask')
+
+from analytics_scheduler import ResultsStore
+
+
+@pytest.fixture
+def server_module(market_db, monkeypatch):
+    import server
+    import http_cache
+    from market_data_store import MarketDataStore
+
+    store = MarketDataStore(market_db)
+    results = ResultsStore()
+    results.publish('tickers', {'AAA': {'statistics': {'mean': 0.1}}})
+    results.publish('tickers', failed={'BBB': 'Analysis failed for BBB'})
+    results.publish('factors', failed={'AAA': 'not enough overlapping observations'})
+    results.publish('portfolio', failed={None: 'no common dates'})
+    monkeypatch.setattr(server, 'market_store', store)
+    monkeypatch.setattr(server, 'results_store', results)
+    monkeypatch.setattr(server, 'scheduler', object())   # 사전 계산 모드 (게시된 결과만 읽음)
+    http_cache.response_cache.clear()
+    yield server
+    http_cache.response_cache.clear()
+    store.close()
+
+
+def test_failed_results_return_errors(server_module):
+    client = server_module.app.test_client()
+    assert client.get('/api/ticker/AAA').status_code == 200
+
+    failed = client.get('/api/ticker/BBB')
+    assert failed.status_code == 500
+    assert failed.get_json()['error'] == 'Analysis failed for BBB' and failed.get_json()['attempts'] == 1
+
+    pending = client.get('/api/ticker/SPY')
+    assert pending.status_code == 503 and pending.headers['Retry-After']
+    assert client.get('/api/ticker/ZZZ').status_code == 404
+
+    factor = client.get('/api/factor-analysis/AAA')
+    assert factor.status_code == 500 and 'overlapping' in factor.get_json()['error']
+    assert client.get('/api/portfolio-analysis').status_code == 500
+
+
+def test_data_endpoint_reports_failures(server_module):
+    client = server_module.app.test_client()
+    body = client.get('/api/data').get_json()
+    assert list(body['tickers']) == ['AAA']
+    assert body['errors'] == {'BBB': 'Analysis failed for BBB'}
+    assert body['pending'] == ['SPY']
+
+    lines = [json.loads(line) for line in client.get('/api/data?format=ndjson').get_data(as_text=True).splitlines()]
+    assert {'type': 'error', 'ticker': 'BBB', 'error': 'Analysis failed for BBB'} in lines
+    assert lines[-1]['failed'] == ['BBB']
+
+
+def test_scheduler_starts_on_first_request(market_db, monkeypatch):
+    import server
+    started = []
+    monkeypatch.setattr(server, 'PRECOMPUTE', True)
+    monkeypatch.setattr(server, 'scheduler', None)
+    monkeypatch.setattr(server, 'start_scheduler', lambda: started.append(True))
+    monkeypatch.setattr(server, 'DB_PATH', market_db)
+    server.app.test_client().get('/api/stream-status')
+    assert started == [True]
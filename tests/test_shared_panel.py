@@ -0,0 +1,102 @@
+"""
+공유 메모리 패널: 게시 → 워커 쪽 스냅샷이 MarketDataStore와 같은 값, 재게시 시 세대 교체
+최신 여부: 종목 외 테이블 커밋은 세대를 유지한 채 다시 일치, 종목 변경은 새 세대
+"""
+
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import TICKERS, execute, make_bars, write_bars
+from market_data_store import MarketDataStore
+from shared_panel import SharedPanelPublisher, SharedPanelReader, STAT_FIELDS
+
+
+@pytest.fixture
+def publisher(market_db):
+    publisher = SharedPanelPublisher(market_db, f'qfl_test_{os.getpid()}_{uuid.uuid4().hex[:8]}')
+    try:
+        yield publisher
+    finally:
+        publisher.close()
+
+
+def test_snapshot_matches_market_data_store(market_db, publisher):
+    assert publisher.publish() == 1
+    snapshot = SharedPanelReader(publisher.name).current(market_db)
+    assert snapshot is not None and snapshot.generation == 1
+    assert snapshot.tickers == sorted(TICKERS)
+
+    store = MarketDataStore(market_db)
+    try:
+        pd.testing.assert_frame_equal(snapshot.panel(['AAA', 'SPY']), store.panel(['AAA', 'SPY']), check_freq=False)
+        expected = store.get('BBB')['Close']
+        np.testing.assert_allclose(snapshot.close('BBB').to_numpy(), expected.to_numpy())
+        returns = expected.pct_change().dropna()
+        np.testing.assert_allclose(snapshot.returns('BBB').to_numpy(), returns.to_numpy())
+    finally:
+        store.close()
+
+    stats = snapshot.statistics().loc['BBB']
+    assert list(snapshot.statistics().columns) == list(STAT_FIELDS)
+    assert stats['count'] == len(returns)
+    assert stats['mean'] == pytest.approx(returns.mean())
+    assert stats['std'] == pytest.approx(returns.std(ddof=0))
+    assert snapshot.close('ZZZ') is None
+
+
+def test_republish_swaps_generation(market_db, publisher):
+    publisher.publish()
+    reader = SharedPanelReader(publisher.name)
+    first = reader.current()
+    previous_close = first.close('AAA').iloc[-1]
+
+    bars = make_bars(300, seed=0)
+    bars.loc[len(bars) - 1, 'Close'] *= 1.05
+    write_bars(market_db, 'AAA', bars)
+
+    assert publisher.publish() == 2
+    second = reader.current(market_db)
+    assert second is not None and second.generation == 2
+    assert second.close('AAA').iloc[-1] == pytest.approx(bars['Close'].iloc[-1])
+    assert previous_close == pytest.approx(bars['Close'].iloc[-1] / 1.05)
+
+
+@pytest.fixture
+def panel(market_db):
+    publisher = SharedPanelPublisher(market_db, f'qfl_test_{os.getpid()}_{uuid.uuid4().hex[:8]}')
+    publisher.store.changes_since(0)
+    publisher.publish()
+    reader = SharedPanelReader(publisher.name)
+    try:
+        yield publisher, reader
+    finally:
+        publisher.close()
+
+
+def test_unrelated_commit_keeps_generation_and_matches_again(market_db, panel):
+    publisher, reader = panel
+    assert reader.current(market_db).generation == 1
+
+    execute(market_db, 'CREATE TABLE analytics_results (section TEXT, key TEXT, data TEXT)')
+    assert reader.current(market_db) is None          # 로더가 확인하기 전에는 대체 경로
+
+    assert publisher.check(publisher.store.version) is False
+    snapshot = reader.current(market_db)
+    assert snapshot is not None and snapshot.generation == 1
+
+
+def test_ticker_change_publishes_new_generation(market_db, panel):
+    publisher, reader = panel
+    bars = make_bars(300, seed=0)
+    bars.loc[len(bars) - 1, 'Close'] *= 1.05
+    write_bars(market_db, 'AAA', bars)
+
+    assert reader.current(market_db) is None
+    assert publisher.check(publisher.store.version) is True
+    snapshot = reader.current(market_db)
+    assert snapshot.generation == 2
+    assert snapshot.close('AAA').iloc[-1] == pytest.approx(bars['Close'].iloc[-1])
@@ -0,0 +1,56 @@
+"""
+스트리밍 적률 vs 전체 이력 describe_returns (증분 갱신, 묶음 병합, 과거 수정 시 재계산)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer_engine import TimeSeriesAnalyzer
+from conftest import make_bars
+from streaming_stats import RunningMoments, TickerStream
+
+MOMENTS = ('mean', 'std', 'min', 'max', 'skewness', 'kurtosis')
+
+
+def _frame(n, seed=0):
+    bars = make_bars(n, seed=seed)
+    return bars.set_index(pd.DatetimeIndex(bars.pop('Date'), name='Date'))
+
+
+def _assert_matches(statistics, returns):
+    expected = TimeSeriesAnalyzer.describe_returns(returns)
+    for name in MOMENTS:
+        assert statistics[name] == pytest.approx(expected[name], rel=1e-9, abs=1e-12), name
+    assert statistics['count'] == len(returns)
+
+
+def test_running_moments_merge_matches_batch():
+    values = np.random.default_rng(3).standard_t(4, 1000) * 0.01
+    moments = RunningMoments()
+    for chunk in np.array_split(values, [1, 7, 300, 301, 650]):
+        moments.update(chunk)
+    _assert_matches(moments.statistics(), values)
+
+
+def test_ticker_stream_incremental_matches_full_history():
+    df = _frame(400)
+    stream = TickerStream('AAA')
+    first = stream.advance(df.iloc[:250])
+    assert first['reset']
+    for end in (251, 260, 400):
+        delta = stream.advance(df.iloc[:end])
+        assert not delta['reset']
+    assert stream.advance(df) is None
+    _assert_matches(stream.moments.statistics(), df['Close'].pct_change().dropna().to_numpy())
+
+
+def test_ticker_stream_recomputes_after_history_revision():
+    df = _frame(300)
+    stream = TickerStream('AAA')
+    stream.advance(df)
+    revised = df.copy()
+    revised.iloc[100, revised.columns.get_loc('Close')] *= 1.02
+    delta = stream.advance(revised)
+    assert delta['reset']
+    _assert_matches(stream.moments.statistics(), revised['Close'].pct_change().dropna().to_numpy())
@@ -0,0 +1,65 @@
+"""
+/api/ticker 기간·항목·해상도 파라미터: SQL 기간 필터, 요청 항목만 계산, 균등 다운샘플
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_bars
+
+pytest.importorskip('flask')
+
+from analyzer_engine import TimeSeriesAnalyzer
+from database_manager import DatabaseManager
+
+
+@pytest.fixture
+def client(market_db, monkeypatch):
+    import server
+    import http_cache
+
+    monkeypatch.setattr(server, 'DB_PATH', market_db)
+    monkeypatch.setattr(server, 'scheduler', None)
+    http_cache.response_cache.clear()
+    yield server.app.test_client()
+    http_cache.response_cache.clear()
+
+
+def test_read_dataframe_filters_range_in_sql(market_db):
+    with DatabaseManager(market_db) as db:
+        df = db.read_dataframe('AAA_daily', columns=['Date', 'Close'], start='2022-03-01', end='2022-03-31')
+    expected = make_bars(300, seed=0)
+    expected = expected[(expected['Date'] >= '2022-03-01') & (expected['Date'] <= '2022-03-31')]
+    assert list(df.columns) == ['Date', 'Close']
+    assert df['Date'].tolist() == expected['Date'].tolist()
+    np.testing.assert_allclose(df['Close'], expected['Close'])
+
+
+def test_fields_and_max_points():
+    df = make_bars(300)[['Date', 'Close']]
+    full = TimeSeriesAnalyzer.analyze_ticker(df.copy(), fields=['price_history', 'statistics'])
+    assert set(full) == {'price_history', 'statistics'}
+
+    small = TimeSeriesAnalyzer.analyze_ticker(df.copy(), fields=['price_history', 'qq_plot'], max_points=50)
+    prices = small['price_history']['prices']
+    assert len(prices) == 50
+    # 처음/끝 점은 항상 포함
+    assert prices[0] == full['price_history']['prices'][0]
+    assert prices[-1] == full['price_history']['prices'][-1]
+    assert len(small['qq_plot']['sample']) == 50
+
+
+def test_api_ticker_range_and_validation(client):
+    response = client.get('/api/ticker/AAA?start=2022-02-01&end=2022-02-28&fields=price_history,histogram&bins=5')
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert set(data) == {'price_history', 'histogram'}
+    dates = pd.to_datetime(data['price_history']['dates'])
+    assert dates.min() >= pd.Timestamp('2022-02-01') and dates.max() <= pd.Timestamp('2022-02-28')
+    assert len(data['histogram']['counts']) == 5
+
+    for query in ('fields=bogus', 'bins=0', 'max_points=1', 'start=2022-03-01&end=2022-02-01', 'start=notadate'):
+        response = client.get(f'/api/ticker/AAA?{query}')
+        assert response.status_code == 400, query
+        assert 'error' in response.get_json()
@@ -0,0 +1,83 @@
+"""
+헤드리스 배치 리포트: 여러 종목 패널을 워커 풀에서 렌더링하고 index.html로 모음
+종목 묶음은 연결 하나로 날짜순 로드, ACF는 묶음 전체를 FFT 한 번으로 (statsmodels acf와 같은 값)
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from conftest import TICKERS, make_bars, write_bars
+from analyzer_engine import TimeSeriesAnalyzer
+
+pytest.importorskip('matplotlib')
+import time_series_analyzer  # noqa: E402
+
+
+@pytest.fixture
+def report_db(market_db, monkeypatch):
+    monkeypatch.setattr(time_series_analyzer, 'DB_PATH', market_db)
+    return market_db
+
+
+def test_list_db_tickers(report_db):
+    assert time_series_analyzer.list_db_tickers() == sorted(TICKERS)
+
+
+def test_render_reports_writes_panel_per_ticker(report_db, tmp_path):
+    output_dir = str(tmp_path / 'reports')
+    index_path = time_series_analyzer.render_reports(
+        list(TICKERS) + ['MISSING'], output_dir, max_workers=2, chunk_size=1, nlags=20)
+
+    assert index_path == os.path.join(output_dir, 'index.html')
+    assert sorted(f for f in os.listdir(output_dir) if f.endswith('.png')) == [f'{t}.png' for t in sorted(TICKERS)]
+    with open(index_path, encoding='utf-8') as f:
+        page = f.read()
+    assert f'({len(TICKERS)}개 종목)' in page
+    # 종목 순으로 정렬된 행 (완료 순서와 무관)
+    positions = [page.index(f'<tr id="{ticker}">') for ticker in sorted(TICKERS)]
+    assert positions == sorted(positions)
+    assert 'MISSING' not in page
+
+
+def test_acf_batch_matches_statsmodels():
+    stattools = pytest.importorskip('statsmodels.tsa.stattools')
+    rng = np.random.default_rng(0)
+    series = [rng.standard_normal(n) for n in (50, 300, 1000)]
+    series[1] = np.convolve(series[1], [1.0, 0.6, 0.3], mode='same')       # 자기상관이 있는 종목
+    batch = TimeSeriesAnalyzer.calculate_acf_batch(series, nlags=30)
+    assert len(batch) == len(series)
+    for returns, values in zip(series, batch):
+        np.testing.assert_allclose(values, stattools.acf(returns, nlags=30, fft=False), atol=1e-12)
+    assert TimeSeriesAnalyzer.calculate_acf(series[2], nlags=5) == batch[2][:6]
+
+
+def test_multi_ticker_report_loads_sorted_history(report_db, tmp_path, monkeypatch):
+    # 날짜가 섞인 순서로 저장된 종목 (수집을 여러 번 나누어 한 경우)
+    bars = make_bars(300, seed=7)
+    write_bars(report_db, 'ZZZ', bars.iloc[::-1].reset_index(drop=True))
+    tickers = sorted(TICKERS) + ['ZZZ']
+
+    loaded = time_series_analyzer.load_data_from_db('ZZZ')
+    assert loaded.index.is_monotonic_increasing
+    np.testing.assert_allclose(loaded['Close'].to_numpy(), bars['Close'].to_numpy())
+
+    # 워커 없이 한 묶음을 렌더링: 묶음 안의 모든 종목이 연결 하나, ACF 배치 한 번
+    connections, batches = [], []
+    manager = time_series_analyzer.DatabaseManager
+    monkeypatch.setattr(time_series_analyzer, 'DatabaseManager',
+                        lambda path: connections.append(path) or manager(path))
+    batch_acf = TimeSeriesAnalyzer.calculate_acf_batch
+    monkeypatch.setattr(TimeSeriesAnalyzer, 'calculate_acf_batch',
+                        staticmethod(lambda series, nlags: batches.append(len(series)) or batch_acf(series, nlags)))
+    time_series_analyzer._init_report_worker(40, 20)
+    output_dir = tmp_path / 'panels'
+    output_dir.mkdir()
+    summaries = time_series_analyzer._render_ticker_chunk(tickers, str(output_dir), 'png', 40, 20)
+
+    assert [item['ticker'] for item in summaries] == tickers
+    assert connections == [report_db] and batches == [len(tickers)]
+    returns = bars['Close'].pct_change().dropna().to_numpy()
+    assert summaries[-1]['statistics']['mean'] == pytest.approx(returns.mean())
+    assert sorted(os.listdir(output_dir)) == [f'{t}.png' for t in tickers]